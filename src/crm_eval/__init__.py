@@ -7,6 +7,29 @@ __all__ = [
     "migration",
     "security",
     "integrate",
+    "ratings",
+    "build",
+    "fragments",
+    "matrix",
+    "search",
+    "dedupe",
+    "watch",
+    "shard",
+    "explain",
+    "history",
+    "bundle",
+    "session",
+    "export",
+    "coverage",
+    "normalize",
+    "compare",
+    "similar",
+    "tco",
+    "fit",
+    "telemetry",
+    "feed",
+    "simulate",
+    "memo",
     "__version__",
 ]
 
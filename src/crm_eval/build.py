@@ -0,0 +1,336 @@
+"""Incremental, content-addressed builds for the evaluation artifacts."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .data import (
+    DEFAULT_CRITERIA_PATH,
+    CriteriaConfig,
+    DataLoadError,
+    _candidate_paths,
+    iter_vendors,
+    load_criteria,
+    load_profile,
+    load_vendor_file,
+    resolve_vendor_files,
+)
+from .fragments import FragmentCache
+from .integrate import build_integration_notes
+from .migration import build_migration_plan
+from .report import build_scorecard_payload, render_markdown_scorecard
+from .scoring import ScoreResult, rank_vendors
+from .security import build_security_checklist
+
+__all__ = [
+    "ArtifactNode",
+    "BuildContext",
+    "BuildOutcome",
+    "BUILD_MANIFEST_NAME",
+    "build_artifacts",
+    "default_nodes",
+    "digest_bytes",
+    "digest_files",
+    "resolve_criteria_path",
+    "write_if_changed",
+]
+
+BUILD_MANIFEST_NAME = ".crm-eval-build.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ArtifactNode:
+    """A single output file, the input groups it depends on, and how to render it."""
+
+    name: str
+    filename: str
+    inputs: tuple[str, ...]
+    render: Callable[[BuildContext], str]
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class BuildOutcome:
+    """Result of visiting one node: ``fresh``, ``unchanged`` or ``written``."""
+
+    name: str
+    path: Path
+    status: str
+
+
+class BuildContext:
+    """Lazily loads shared inputs so parallel nodes parse and rank the catalog once.
+
+    ``catalog`` names a feed or bundle file to read instead of ``vendor_paths``.
+    """
+
+    def __init__(
+        self,
+        profile_path: Path | None,
+        criteria_path: Path | str | None,
+        vendor_paths: Sequence[Path],
+        fragments: FragmentCache | None = None,
+        *,
+        catalog: Path | None = None,
+    ) -> None:
+        self.profile_path = profile_path
+        self.fragments = fragments
+        self.criteria_path = criteria_path
+        self.vendor_paths = list(vendor_paths)
+        self.catalog = catalog
+        self._lock = threading.Lock()
+        self._profile: dict[str, Any] | None = None
+        self._criteria: CriteriaConfig | None = None
+        self._results: list[ScoreResult] | None = None
+
+    @property
+    def profile(self) -> dict[str, Any]:
+        with self._lock:
+            if self._profile is None:
+                if self.profile_path is None:
+                    raise DataLoadError("This artifact requires a business profile.")
+                self._profile = load_profile(self.profile_path)
+            return self._profile
+
+    @property
+    def criteria(self) -> CriteriaConfig:
+        with self._lock:
+            if self._criteria is None:
+                self._criteria = load_criteria(self.criteria_path)
+            return self._criteria
+
+    @property
+    def results(self) -> list[ScoreResult]:
+        criteria = self.criteria
+        with self._lock:
+            if self._results is None:
+                if self.catalog is not None:
+                    vendors = list(iter_vendors(self.catalog))
+                else:
+                    vendors = [load_vendor_file(path) for path in self.vendor_paths]
+                self._results = rank_vendors(vendors, criteria)
+            return self._results
+
+
+def default_nodes(
+    *,
+    top: int = 5,
+    migration_top: int = 3,
+    security_top: int = 5,
+    integration_top: int = 3,
+) -> list[ArtifactNode]:
+    """Return the standard artifact graph mirroring the individual CLI commands."""
+
+    scorecard_inputs = ("profile", "criteria", "vendors")
+    return [
+        ArtifactNode(
+            name="scorecard_json",
+            filename="scorecard.json",
+            inputs=scorecard_inputs,
+            params={"top": top},
+            render=lambda ctx: json.dumps(
+                build_scorecard_payload(ctx.profile, ctx.results, ctx.criteria, shortlist_size=top),
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n",
+        ),
+        ArtifactNode(
+            name="scorecard_md",
+            filename="scorecard.md",
+            inputs=scorecard_inputs,
+            params={"top": top},
+            render=lambda ctx: render_markdown_scorecard(
+                ctx.profile, ctx.results, ctx.criteria, shortlist_size=top, fragments=ctx.fragments
+            ),
+        ),
+        ArtifactNode(
+            name="migration",
+            filename="migration.md",
+            inputs=scorecard_inputs,
+            params={"top": migration_top},
+            render=lambda ctx: build_migration_plan(
+                ctx.profile, ctx.results, shortlist_size=migration_top, fragments=ctx.fragments
+            ),
+        ),
+        ArtifactNode(
+            name="security",
+            filename="security.md",
+            inputs=("criteria", "vendors"),
+            params={"top": security_top},
+            render=lambda ctx: build_security_checklist(
+                ctx.results, shortlist_size=security_top, fragments=ctx.fragments
+            ),
+        ),
+        ArtifactNode(
+            name="integration",
+            filename="integration.md",
+            inputs=scorecard_inputs,
+            params={"top": integration_top},
+            render=lambda ctx: build_integration_notes(
+                ctx.profile, ctx.results, shortlist_size=integration_top, fragments=ctx.fragments
+            ),
+        ),
+    ]
+
+
+def build_artifacts(
+    out_dir: Path | str,
+    *,
+    profile_path: Path | str | None,
+    criteria_path: Path | str | None = None,
+    vendors_dir: Path | str | None = None,
+    nodes: Sequence[ArtifactNode] | None = None,
+    jobs: int = 4,
+    force: bool = False,
+    fragments: FragmentCache | None = None,
+) -> list[BuildOutcome]:
+    """Rebuild only the artifacts whose hashed inputs changed, writing atomically.
+
+    Each node's key hashes the tool version, its parameters and the content of every input
+    group it depends on. Stale nodes are rendered in parallel and a file is only replaced when
+    the rendered content differs from what is already on disk.
+    """
+
+    out_path = Path(out_dir)
+    node_list = list(nodes) if nodes is not None else default_nodes()
+    profile = Path(profile_path) if profile_path is not None else None
+    catalog = None
+    if vendors_dir is not None and Path(vendors_dir).is_file():
+        catalog = Path(vendors_dir)
+        vendor_paths = [catalog]
+    else:
+        vendor_paths = resolve_vendor_files(vendors_dir)
+    criteria_file = resolve_criteria_path(criteria_path)
+
+    input_digests: dict[str, str] = {"vendors": digest_files(vendor_paths)}
+    input_digests["criteria"] = digest_files([criteria_file])
+    if profile is not None:
+        if not profile.exists():
+            raise DataLoadError(f"Profile not found: {profile}")
+        input_digests["profile"] = digest_files([profile])
+
+    manifest_path = out_path / BUILD_MANIFEST_NAME
+    manifest = _read_manifest(manifest_path)
+    recorded: dict[str, Any] = manifest.get("nodes", {})
+
+    keys: dict[str, str] = {}
+    stale: list[ArtifactNode] = []
+    outcomes: dict[str, BuildOutcome] = {}
+    for node in node_list:
+        missing_inputs = [group for group in node.inputs if group not in input_digests]
+        if missing_inputs:
+            raise DataLoadError(f"Artifact '{node.name}' requires: {', '.join(missing_inputs)}.")
+        keys[node.name] = _node_key(node, input_digests)
+        target = out_path / node.filename
+        entry = recorded.get(node.name, {})
+        if (
+            not force
+            and entry.get("inputs") == keys[node.name]
+            and target.exists()
+            and digest_bytes(target.read_bytes()) == entry.get("output")
+        ):
+            outcomes[node.name] = BuildOutcome(node.name, target, "fresh")
+        else:
+            stale.append(node)
+
+    if stale:
+        context = BuildContext(profile, criteria_file, vendor_paths, fragments, catalog=catalog)
+
+        def run(node: ArtifactNode) -> tuple[BuildOutcome, str]:
+            content = node.render(context)
+            target = out_path / node.filename
+            written = write_if_changed(target, content)
+            status = "written" if written else "unchanged"
+            return BuildOutcome(node.name, target, status), digest_bytes(content.encode("utf-8"))
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for outcome, output_digest in executor.map(run, stale):
+                outcomes[outcome.name] = outcome
+                recorded[outcome.name] = {"inputs": keys[outcome.name], "output": output_digest}
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "nodes": {node.name: recorded[node.name] for node in node_list if node.name in recorded},
+    }
+    write_if_changed(manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    return [outcomes[node.name] for node in node_list]
+
+
+def write_if_changed(path: Path | str, content: str) -> bool:
+    """Atomically replace ``path`` with ``content`` unless it already holds the same bytes."""
+
+    target = Path(path)
+    encoded = content.encode("utf-8")
+    if target.exists() and digest_bytes(target.read_bytes()) == digest_bytes(encoded):
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(encoded)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, target)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def digest_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 digest of ``data``."""
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_files(paths: Iterable[Path]) -> str:
+    """Hash file names and contents into a single order-sensitive digest."""
+
+    hasher = hashlib.sha256()
+    for path in paths:
+        hasher.update(path.name.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(hashlib.sha256(path.read_bytes()).digest())
+    return hasher.hexdigest()
+
+
+def _node_key(node: ArtifactNode, input_digests: Mapping[str, str]) -> str:
+    material = {
+        "node": node.name,
+        "version": __version__,
+        "params": dict(node.params),
+        "inputs": {group: input_digests[group] for group in node.inputs},
+    }
+    return digest_bytes(json.dumps(material, sort_keys=True).encode("utf-8"))
+
+
+def resolve_criteria_path(path: Path | str | None) -> Path:
+    """Find the criteria file the same way ``load_criteria`` does."""
+
+    for candidate in _candidate_paths(path, DEFAULT_CRITERIA_PATH):
+        if candidate.exists():
+            return candidate
+    raise DataLoadError(f"Unable to locate criteria configuration: {path}.")
+
+
+def _read_manifest(path: Path) -> dict[str, Any]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
@@ -0,0 +1,263 @@
+"""Single-file, compressed vendor catalog bundles with a random-access table of contents."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import yaml
+
+from .data import DataLoadError, VendorRecord, resolve_vendor_files, vendor_record_from_payload
+
+__all__ = [
+    "BUNDLE_MAGIC",
+    "BUNDLE_VERSION",
+    "BundleEntry",
+    "VendorBundle",
+    "is_bundle",
+    "pack_bundle",
+    "unpack_bundle",
+]
+
+BUNDLE_MAGIC = b"CRMBNDL\n"
+BUNDLE_VERSION = 1
+
+# magic, format version, table-of-contents offset and compressed length
+_HEADER = struct.Struct("<8sIQQ")
+
+
+@dataclass(frozen=True)
+class BundleEntry:
+    """Table-of-contents row: where one vendor file lives inside the bundle."""
+
+    slug: str
+    filename: str
+    codec: str
+    offset: int
+    length: int
+    size: int
+    sha256: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "slug": self.slug,
+            "filename": self.filename,
+            "codec": self.codec,
+            "offset": self.offset,
+            "length": self.length,
+            "size": self.size,
+            "sha256": self.sha256,
+        }
+
+
+def is_bundle(path: Path | str) -> bool:
+    """Return whether ``path`` is a file starting with the bundle magic."""
+
+    candidate = Path(path)
+    if not candidate.is_file():
+        return False
+    with candidate.open("rb") as handle:
+        return handle.read(len(BUNDLE_MAGIC)) == BUNDLE_MAGIC
+
+
+def pack_bundle(vendors_dir: Path | str | None, out: Path | str) -> list[BundleEntry]:
+    """Pack the files ``load_vendors`` would read into one bundle, preserving their bytes.
+
+    Each file is compressed on its own so any vendor can be read without the others. Files
+    whose text parses to the same value as JSON and as YAML are tagged ``json`` and decoded
+    with the faster JSON parser on load; everything else keeps the YAML codec.
+    """
+
+    if vendors_dir is not None and Path(vendors_dir).is_file():
+        raise DataLoadError(
+            f"Only a directory of vendor files can be packed; {vendors_dir} is a feed or bundle."
+        )
+    paths = resolve_vendor_files(vendors_dir)
+    target = Path(out)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    entries: list[BundleEntry] = []
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, 0))
+            for path in paths:
+                raw = path.read_bytes()
+                blob = zlib.compress(raw, 9)
+                entries.append(
+                    BundleEntry(
+                        slug=path.stem.lower(),
+                        filename=path.name,
+                        codec=_choose_codec(raw, path),
+                        offset=handle.tell(),
+                        length=len(blob),
+                        size=len(raw),
+                        sha256=hashlib.sha256(raw).hexdigest(),
+                    )
+                )
+                handle.write(blob)
+            toc_offset = handle.tell()
+            toc = zlib.compress(
+                json.dumps(
+                    {"entries": [entry.as_dict() for entry in entries]},
+                    separators=(",", ":"),
+                ).encode("utf-8"),
+                9,
+            )
+            handle.write(toc)
+            handle.seek(0)
+            handle.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, toc_offset, len(toc)))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, target)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return entries
+
+
+def unpack_bundle(bundle_path: Path | str, out_dir: Path | str) -> list[Path]:
+    """Write every bundled file back out byte-for-byte and return the written paths."""
+
+    destination = Path(out_dir)
+    destination.mkdir(parents=True, exist_ok=True)
+    written: list[Path] = []
+    with VendorBundle(bundle_path) as bundle:
+        for entry in bundle.entries:
+            target = destination / entry.filename
+            target.write_bytes(bundle.read_entry(entry))
+            written.append(target)
+    return written
+
+
+class VendorBundle:
+    """Open bundle supporting random access by slug through one file handle."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        try:
+            self._handle: BinaryIO = self.path.open("rb")
+        except FileNotFoundError as exc:
+            raise DataLoadError(f"Bundle not found: {self.path}") from exc
+        try:
+            self.entries = self._read_toc()
+        except BaseException:
+            self._handle.close()
+            raise
+        self._by_slug = {entry.slug: entry for entry in self.entries}
+
+    def __enter__(self) -> VendorBundle:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[VendorRecord]:
+        for entry in self.entries:
+            yield self._decode(entry, self._read_entry(entry))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def slugs(self) -> list[str]:
+        return [entry.slug for entry in self.entries]
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def read(self, slug: str) -> VendorRecord:
+        """Decode a single vendor without touching the rest of the bundle."""
+
+        entry = self._entry(slug)
+        return self._decode(entry, self._read_entry(entry))
+
+    def read_bytes(self, slug: str) -> bytes:
+        """Return the original file bytes for ``slug``."""
+
+        return self._read_entry(self._entry(slug))
+
+    def read_entry(self, entry: BundleEntry) -> bytes:
+        """Return the original file bytes of one table-of-contents entry.
+
+        Unlike ``read_bytes`` this tells apart files sharing a slug, such as ``foo.yml`` and
+        ``foo.yaml``.
+        """
+
+        return self._read_entry(entry)
+
+    def load_all(self) -> list[VendorRecord]:
+        """Decode every vendor in load order, matching ``load_vendors`` on the source folder."""
+
+        return list(self)
+
+    def _entry(self, slug: str) -> BundleEntry:
+        try:
+            return self._by_slug[slug.lower()]
+        except KeyError as exc:
+            raise DataLoadError(f"Vendor '{slug}' is not in bundle {self.path}.") from exc
+
+    def _read_toc(self) -> list[BundleEntry]:
+        header = self._handle.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise DataLoadError(f"{self.path} is not a crm-eval vendor bundle.")
+        magic, version, toc_offset, toc_length = _HEADER.unpack(header)
+        if magic != BUNDLE_MAGIC:
+            raise DataLoadError(f"{self.path} is not a crm-eval vendor bundle.")
+        if version != BUNDLE_VERSION:
+            raise DataLoadError(f"Bundle {self.path} uses unsupported format version {version}.")
+        self._handle.seek(toc_offset)
+        try:
+            toc = json.loads(zlib.decompress(self._handle.read(toc_length)))
+            entries = [BundleEntry(**row) for row in toc["entries"]]
+        except (zlib.error, json.JSONDecodeError, KeyError, TypeError) as exc:
+            raise DataLoadError(f"Bundle {self.path} has a corrupt table of contents.") from exc
+        for entry in entries:
+            # Unpacking joins filenames onto the output directory, so only plain names pass.
+            name = entry.filename
+            if not isinstance(name, str) or name in ("", ".", "..") or "/" in name or "\\" in name:
+                raise DataLoadError(f"Bundle {self.path} lists an unsafe filename: {name!r}.")
+        return entries
+
+    def _read_entry(self, entry: BundleEntry) -> bytes:
+        self._handle.seek(entry.offset)
+        try:
+            raw = zlib.decompress(self._handle.read(entry.length))
+        except zlib.error as exc:
+            raise DataLoadError(f"Entry '{entry.slug}' in {self.path} is corrupt.") from exc
+        if len(raw) != entry.size or hashlib.sha256(raw).hexdigest() != entry.sha256:
+            raise DataLoadError(f"Entry '{entry.slug}' in {self.path} failed its checksum.")
+        return raw
+
+    def _decode(self, entry: BundleEntry, raw: bytes) -> VendorRecord:
+        virtual_path = self.path / entry.filename
+        text = raw.decode("utf-8")
+        try:
+            payload = json.loads(text) if entry.codec == "json" else yaml.safe_load(text) or {}
+        except (json.JSONDecodeError, yaml.YAMLError) as exc:
+            raise DataLoadError(f"Parsing error in {virtual_path}: {exc}") from exc
+        return vendor_record_from_payload(virtual_path, payload)
+
+
+def _choose_codec(raw: bytes, path: Path) -> str:
+    text = raw.decode("utf-8")
+    try:
+        as_json = json.loads(text)
+    except json.JSONDecodeError:
+        return "yaml"
+    try:
+        as_yaml = yaml.safe_load(text)
+    except yaml.YAMLError as exc:
+        raise DataLoadError(f"YAML parsing error in {path}: {exc}") from exc
+    if not isinstance(as_json, dict):
+        return "yaml"
+    # Compare canonical dumps so that, say, an int and an equal float do not pass as the same.
+    same = json.dumps(as_json, sort_keys=True) == json.dumps(as_yaml, sort_keys=True, default=str)
+    return "json" if same else "yaml"
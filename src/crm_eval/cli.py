@@ -4,20 +4,102 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
+import os
 import sys
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
-from .data import DataLoadError, load_criteria, load_profile, load_vendors
+from .build import build_artifacts, default_nodes
+from .bundle import pack_bundle, unpack_bundle
+from .compare import (
+    ComparisonMatrix,
+    HeadToHead,
+    render_head_to_head,
+    write_comparison_matrix,
+)
+from .coverage import analyse_coverage, render_coverage_table
+from .data import (
+    CriteriaConfig,
+    DataLoadError,
+    VendorRecord,
+    iter_vendors,
+    load_criteria,
+    load_profile,
+    load_vendors,
+    resolve_vendor_files,
+)
+from .dedupe import DEFAULT_THRESHOLD, collapse_duplicates, find_duplicate_clusters
+from .explain import explain_rank_flips
+from .export import DEFAULT_CHUNK_ROWS, EXPORT_FORMATS, export_scores
+from .fit import (
+    DEFAULT_MAX_ITERATIONS,
+    DEFAULT_REGULARIZATION,
+    DEFAULT_TEMPERATURE,
+    fit_weights,
+    load_decisions,
+    write_criteria,
+)
+from .fragments import DEFAULT_MAX_FRAGMENTS, FragmentCache
+from .history import HistoryStore
 from .integrate import build_integration_notes
+from .memo import DEFAULT_MEMO_BYTES, ResultCache, canonical_profile, catalog_digest, memo_key
 from .migration import build_migration_plan
-from .report import build_scorecard_payload, render_markdown_scorecard
-from .scoring import rank_vendors
+from .normalize import NORMALIZATION_MODES, CatalogStats, MetricNormalizer, load_or_build_stats
+from .ratings import (
+    DEFAULT_BLEND_WEIGHT,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RATINGS_TTL,
+    RatingsFetcher,
+    blend_ratings,
+)
+from .report import (
+    SLIM_CATALOG_SCHEMA_VERSION,
+    build_scorecard_payload,
+    build_slim_scorecard_payload,
+    render_markdown_scorecard,
+)
+from .scoring import BudgetCheck, ScoreResult, rank_vendors, top_vendors
+from .search import load_or_build_index
 from .security import build_security_checklist
+from .shard import SHARD_MODES, merge_partials, score_shard
+from .similar import DEFAULT_FEATURE_WEIGHT, SimilarityIndex, shortlist_alternatives
+from .simulate import estimate_catalog, migration_volumes, shortlist_estimates
+from .tco import (
+    BUDGET_MODES,
+    DEFAULT_BUDGET_PENALTY,
+    PLAN_SELECTORS,
+    BudgetPolicy,
+    TcoEngine,
+    scenario_from_profile,
+    scenario_grid,
+)
+from .telemetry import Telemetry
+from .watch import DEFAULT_POLL_INTERVAL, ScoreWatcher, WatchUpdate
 
 DEFAULT_TOP_N = 5
 
+# Score options that name outputs or tune caches rather than change what is rendered.
+_MEMO_IGNORED = frozenset(
+    {
+        "profile",
+        "criteria",
+        "vendors_dir",
+        "out",
+        "md",
+        "catalog_out",
+        "memo",
+        "memo_size",
+        "cache_dir",
+        "events",
+        "metrics_file",
+        "fragment_cache_size",
+        "watch_interval",
+        "history_label",
+    }
+)
+
 __all__ = ["main"]
 
 
@@ -27,14 +109,28 @@ def main(argv: Iterable[str] | None = None) -> int:
     if not hasattr(args, "handler"):
         parser.print_help()
         return 1
+    command = " ".join(
+        part for part in (args.command, getattr(args, "bundle_command", None)) if part
+    )
+    telemetry = Telemetry.open(command, events_path=args.events, metrics_path=args.metrics_file)
+    args.telemetry = telemetry
+    status, code = "error", 2
     try:
-        return args.handler(args)
-    except DataLoadError as exc:
-        parser.error(str(exc))
-        return 2
-    except ValueError as exc:
-        parser.error(str(exc))
-        return 2
+        try:
+            code = args.handler(args)
+        except DataLoadError as exc:
+            telemetry.count("crm_eval_parse_errors_total")
+            telemetry.event("error", kind="data", message=str(exc))
+            parser.error(str(exc))
+            return 2
+        except ValueError as exc:
+            telemetry.event("error", kind="usage", message=str(exc))
+            parser.error(str(exc))
+            return 2
+        status = "ok" if code == 0 else "failed"
+        return code
+    finally:
+        telemetry.close(status, exit_code=code)
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -45,13 +141,48 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--vendors-dir",
         default="data/vendors",
-        help="Directory containing vendor YAML definitions.",
+        help="Directory containing vendor YAML definitions, a vendor feed or a packed bundle.",
     )
     parser.add_argument(
         "--criteria",
         default="config/criteria.yml",
         help="Path to criteria YAML file (weights/scales).",
     )
+    parser.add_argument(
+        "--cache-dir",
+        default=".crm-eval-cache",
+        help="Directory for on-disk caches (default: .crm-eval-cache).",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Collapse near-duplicate vendors to one representative while loading.",
+    )
+    parser.add_argument(
+        "--normalize",
+        choices=NORMALIZATION_MODES,
+        default="none",
+        help="Rescale each metric across the catalog before weighting (default: none).",
+    )
+    parser.add_argument(
+        "--fragment-cache-size",
+        type=int,
+        default=DEFAULT_MAX_FRAGMENTS,
+        help="Maximum rendered per-vendor fragments kept in the cache (default: 4096).",
+    )
+    parser.add_argument(
+        "--events",
+        metavar="PATH",
+        help="Append structured JSON Lines run events to this file ('-' for stderr).",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help=(
+            "Accumulate run counters and stage latency histograms in this Prometheus "
+            "text-format file, e.g. for the node-exporter textfile collector."
+        ),
+    )
 
     subparsers = parser.add_subparsers(dest="command")
 
@@ -88,6 +219,116 @@ def _build_parser() -> argparse.ArgumentParser:
             "disabled by default)."
         ),
     )
+    score_parser.add_argument(
+        "--ratings-url",
+        help="URL template for live ratings, e.g. https://ratings.example/{slug}.json.",
+    )
+    score_parser.add_argument(
+        "--ratings-ttl",
+        type=float,
+        help=(
+            "Seconds a cached rating is reused before revalidation "
+            f"(default: {DEFAULT_RATINGS_TTL})."
+        ),
+    )
+    score_parser.add_argument(
+        "--ratings-weight",
+        type=float,
+        help=(
+            f"Share of each metric taken from live ratings, 0-1 (default: {DEFAULT_BLEND_WEIGHT})."
+        ),
+    )
+    score_parser.add_argument(
+        "--ratings-concurrency",
+        type=int,
+        help=f"Maximum concurrent ratings requests (default: {DEFAULT_CONCURRENCY}).",
+    )
+    score_parser.add_argument(
+        "--explain",
+        nargs="?",
+        type=int,
+        const=0,
+        default=None,
+        metavar="K",
+        help=(
+            "Add a rank-flip analysis of adjacent vendors; with K, also every pair in the top K."
+        ),
+    )
+    score_parser.add_argument(
+        "--budget-mode",
+        choices=BUDGET_MODES,
+        default="off",
+        help=(
+            "Check each vendor's projected cost per seat against the profile budget: "
+            "penalize or filter vendors over it (default: off)."
+        ),
+    )
+    score_parser.add_argument(
+        "--budget-penalty",
+        type=float,
+        default=DEFAULT_BUDGET_PENALTY,
+        help="Points removed at twice the budget in penalize mode, pro rata below (default: 10).",
+    )
+    score_parser.add_argument(
+        "--alternatives",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Add the K most similar non-shortlisted vendors for each shortlisted vendor.",
+    )
+    score_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Score vendors as they are read, keeping only the --top best; for large JSON Lines "
+            "feeds. The scorecard then lists just the shortlist."
+        ),
+    )
+    score_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and refresh the reports when vendor, criteria or profile files change.",
+    )
+    score_parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Seconds between file polls in --watch mode (default: 0.05).",
+    )
+    score_parser.add_argument(
+        "--history",
+        metavar="DIR",
+        help="Append this run's totals and breakdowns to the history store in DIR.",
+    )
+    score_parser.add_argument(
+        "--history-label",
+        help="Optional label recorded with the run in the history store.",
+    )
+    score_parser.add_argument(
+        "--slim",
+        action="store_true",
+        help="Write the compact reference-based JSON scorecard instead of the v1 shape.",
+    )
+    score_parser.add_argument(
+        "--catalog-out",
+        metavar="PATH",
+        help="With --slim, write vendor metadata to PATH instead of embedding it.",
+    )
+    score_parser.add_argument(
+        "--memo",
+        action="store_true",
+        help=(
+            "Serve repeat evaluations from an on-disk result cache keyed by the canonical "
+            "profile, criteria and catalog."
+        ),
+    )
+    score_parser.add_argument(
+        "--memo-size",
+        type=float,
+        default=DEFAULT_MEMO_BYTES / 2**20,
+        metavar="MIB",
+        help="Size cap of the result cache in MiB (default: %(default)g).",
+    )
     score_parser.set_defaults(handler=_handle_score)
 
     migrate_parser = subparsers.add_parser(
@@ -110,6 +351,20 @@ def _build_parser() -> argparse.ArgumentParser:
         default=3,
         help="Number of vendors to feature in the plan (default: 3).",
     )
+    migrate_parser.add_argument(
+        "--estimates-out",
+        metavar="PATH",
+        help=(
+            "Simulate the profile's migration_records into every vendor in the catalog and "
+            "write the cutover estimates as JSON."
+        ),
+    )
+    migrate_parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for simulated batch failures (default: 0).",
+    )
     migrate_parser.set_defaults(handler=_handle_migrate)
 
     security_parser = subparsers.add_parser(
@@ -151,92 +406,1157 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     integrate_parser.set_defaults(handler=_handle_integrate)
 
+    build_parser = subparsers.add_parser(
+        "build",
+        help="Incrementally rebuild every artifact, skipping those whose inputs are unchanged.",
+    )
+    build_parser.add_argument(
+        "--profile",
+        required=True,
+        help="Path to the business profile YAML file.",
+    )
+    build_parser.add_argument(
+        "--out-dir",
+        default="artifacts",
+        help="Directory receiving the artifacts (default: artifacts).",
+    )
+    build_parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP_N,
+        help="Number of vendors to highlight in the scorecard (default: 5).",
+    )
+    build_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Maximum artifacts rendered in parallel (default: 4).",
+    )
+    build_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every artifact even when its inputs are unchanged.",
+    )
+    build_parser.set_defaults(handler=_handle_build)
+
+    search_parser = subparsers.add_parser(
+        "search",
+        help="Fuzzy-search vendors by name, slug, notes, capabilities, or plan names.",
+    )
+    search_parser.add_argument("query", nargs="+", help="Search terms, e.g. 'dyn 365'.")
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="Maximum number of matches to show (default: 10).",
+    )
+    search_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the persisted trigram index before searching.",
+    )
+    search_parser.add_argument(
+        "--trust-index",
+        action="store_true",
+        help="Skip checking vendor files for changes when a persisted index exists.",
+    )
+    search_parser.set_defaults(handler=_handle_search)
+
+    similar_parser = subparsers.add_parser(
+        "similar",
+        help="List the vendors most similar to a vendor by scores, capabilities and integrations.",
+    )
+    similar_parser.add_argument(
+        "slugs",
+        nargs="+",
+        metavar="slug",
+        help="Slugs of the vendors to find alternatives for.",
+    )
+    similar_parser.add_argument(
+        "--limit",
+        type=int,
+        default=5,
+        help="Number of similar vendors to show (default: 5).",
+    )
+    similar_parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Rank only vendors sharing a hash bucket with each query; pays off over many slugs.",
+    )
+    similar_parser.add_argument(
+        "--feature-weight",
+        type=float,
+        default=DEFAULT_FEATURE_WEIGHT,
+        help="Share of similarity from capabilities and integrations, 0-1 (default: 0.3).",
+    )
+    similar_parser.add_argument(
+        "--out",
+        help="Optional output path for the matches as JSON.",
+    )
+    similar_parser.set_defaults(handler=_handle_similar)
+
+    dedupe_parser = subparsers.add_parser(
+        "dedupe",
+        help="Report clusters of near-duplicate vendors (MinHash/LSH).",
+    )
+    dedupe_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Minimum estimated Jaccard similarity to treat vendors as duplicates (default: 0.7).",
+    )
+    dedupe_parser.add_argument(
+        "--out",
+        help="Optional output path for a JSON cluster report.",
+    )
+    dedupe_parser.set_defaults(handler=_handle_dedupe)
+
+    shard_parser = subparsers.add_parser(
+        "shard",
+        help="Score one shard of the vendor catalog into a partial ranking file.",
+    )
+    shard_parser.add_argument(
+        "--index",
+        type=int,
+        required=True,
+        help="Zero-based index of the shard to score.",
+    )
+    shard_parser.add_argument(
+        "--count",
+        type=int,
+        required=True,
+        help="Total number of shards the catalog is split into.",
+    )
+    shard_parser.add_argument(
+        "--mode",
+        choices=SHARD_MODES,
+        default="hash",
+        help="Assign vendors by slug hash or by contiguous file range (default: hash).",
+    )
+    shard_parser.add_argument(
+        "--out",
+        required=True,
+        help="Output path for the partial ranking (JSON Lines).",
+    )
+    shard_parser.set_defaults(handler=_handle_shard)
+
+    merge_parser = subparsers.add_parser(
+        "merge",
+        help="Merge partial rankings from every shard into the final scorecard.",
+    )
+    merge_parser.add_argument("partials", nargs="+", help="Partial ranking files, one per shard.")
+    merge_parser.add_argument(
+        "--profile",
+        required=True,
+        help="Path to the business profile YAML file.",
+    )
+    merge_parser.add_argument(
+        "--out",
+        required=True,
+        help="Output path for JSON scorecard.",
+    )
+    merge_parser.add_argument(
+        "--md",
+        required=True,
+        help="Output path for Markdown report.",
+    )
+    merge_parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP_N,
+        help="Number of vendors to highlight in reports (default: 5).",
+    )
+    merge_parser.add_argument(
+        "--history",
+        metavar="DIR",
+        help="Append this run's totals and breakdowns to the history store in DIR.",
+    )
+    merge_parser.add_argument(
+        "--history-label",
+        help="Optional label recorded with the run in the history store.",
+    )
+    merge_parser.add_argument(
+        "--slim",
+        action="store_true",
+        help="Write the compact reference-based JSON scorecard instead of the v1 shape.",
+    )
+    merge_parser.add_argument(
+        "--catalog-out",
+        metavar="PATH",
+        help="With --slim, write vendor metadata to PATH instead of embedding it.",
+    )
+    merge_parser.set_defaults(handler=_handle_merge)
+
+    export_parser = subparsers.add_parser(
+        "export",
+        help="Stream every vendor's per-metric raw and weighted scores as a flat table.",
+    )
+    export_parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="csv",
+        help="Output format: csv, tsv or the typed columnar binary format (default: csv).",
+    )
+    export_parser.add_argument(
+        "--out",
+        default="-",
+        help="Output path; '-' writes CSV/TSV to stdout (default: -).",
+    )
+    export_parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="Rows sorted in memory before spilling to disk, and rows per columnar group.",
+    )
+    export_parser.set_defaults(handler=_handle_export)
+
+    coverage_parser = subparsers.add_parser(
+        "coverage",
+        help="Report per-metric coverage, distributions, outliers and missing-default impact.",
+    )
+    coverage_parser.add_argument(
+        "--out",
+        help="Optional output path for the JSON coverage report.",
+    )
+    coverage_parser.add_argument(
+        "--examples",
+        type=int,
+        default=3,
+        help="Outlier vendors to name at each end of every metric (default: 3).",
+    )
+    coverage_parser.set_defaults(handler=_handle_coverage)
+
+    compare_parser = subparsers.add_parser(
+        "compare",
+        help="Compare vendors head to head: metrics won, lost and tied, and weighted margin.",
+    )
+    compare_parser.add_argument(
+        "--out",
+        help="Write the full pairwise matrix as JSON Lines to this path.",
+    )
+    compare_parser.add_argument(
+        "--neighbours",
+        type=int,
+        metavar="K",
+        help="Compare each vendor only with the K vendors ranked directly below it.",
+    )
+    compare_parser.add_argument(
+        "--md",
+        help="Write a per-pair Markdown comparison of the shortlisted vendors to this path.",
+    )
+    compare_parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Shortlisted vendors compared in the Markdown and terminal output (default: 5).",
+    )
+    compare_parser.set_defaults(handler=_handle_compare)
+
+    tco_parser = subparsers.add_parser(
+        "tco",
+        help="Project multi-year cost of ownership across seat, plan and growth scenarios.",
+    )
+    tco_parser.add_argument(
+        "--profile",
+        help="Business profile supplying the seat scenario and budget when no grid is given.",
+    )
+    tco_parser.add_argument(
+        "--seats",
+        type=int,
+        nargs="+",
+        help="First-year seat counts to project.",
+    )
+    tco_parser.add_argument(
+        "--plan",
+        nargs="+",
+        default=["entry"],
+        help=(
+            f"Plans to price: {', '.join(PLAN_SELECTORS)} by price position, or a plan name "
+            "(default: entry)."
+        ),
+    )
+    tco_parser.add_argument(
+        "--growth",
+        type=float,
+        nargs="+",
+        default=[0.0],
+        help="Annual seat growth rates, e.g. 0.2 for 20%% (default: 0).",
+    )
+    tco_parser.add_argument(
+        "--years",
+        type=int,
+        nargs="+",
+        default=[3],
+        help="Projection horizons in years (default: 3).",
+    )
+    tco_parser.add_argument(
+        "--add-on",
+        dest="add_ons",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Price this add-on too; vendors without it are left out. Repeatable.",
+    )
+    tco_parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Cheapest vendors shown per scenario (default: 5).",
+    )
+    tco_parser.add_argument(
+        "--out",
+        help="Optional output path for every scenario's costs as JSON.",
+    )
+    tco_parser.set_defaults(handler=_handle_tco)
+
+    fit_parser = subparsers.add_parser(
+        "fit-weights",
+        help="Fit criteria weights to past decisions and write them as a criteria file.",
+    )
+    fit_parser.add_argument(
+        "decisions",
+        help="JSON Lines or YAML file of decisions: a chosen vendor slug and rejected slugs.",
+    )
+    fit_parser.add_argument(
+        "--out",
+        required=True,
+        help="Output path for the fitted criteria YAML.",
+    )
+    fit_parser.add_argument(
+        "--match",
+        action="append",
+        default=[],
+        metavar="FIELD=VALUE",
+        help="Only fit decisions whose profile has this field value. Repeatable.",
+    )
+    fit_parser.add_argument(
+        "--temperature",
+        type=float,
+        default=DEFAULT_TEMPERATURE,
+        help=(
+            "Score gap, in points, at which a choice is about 73%% certain "
+            f"(default: {DEFAULT_TEMPERATURE:g})."
+        ),
+    )
+    fit_parser.add_argument(
+        "--regularization",
+        type=float,
+        default=DEFAULT_REGULARIZATION,
+        help=(
+            "Pull towards the --criteria weights; raise it for few decisions "
+            f"(default: {DEFAULT_REGULARIZATION:g})."
+        ),
+    )
+    fit_parser.add_argument(
+        "--max-iterations",
+        type=int,
+        default=DEFAULT_MAX_ITERATIONS,
+        help=f"Optimisation step limit (default: {DEFAULT_MAX_ITERATIONS}).",
+    )
+    fit_parser.set_defaults(handler=_handle_fit_weights)
+
+    history_parser = subparsers.add_parser(
+        "history",
+        help="Query recorded runs: list them, or trend a vendor or metric over time.",
+    )
+    history_parser.add_argument("store", help="History store directory.")
+    history_parser.add_argument("--vendor", help="Vendor slug to trend.")
+    history_parser.add_argument(
+        "--metric",
+        help="Metric to trend: the vendor's raw score with --vendor, else weight and mean.",
+    )
+    history_parser.add_argument("--since", help="Earliest ISO date or timestamp (UTC).")
+    history_parser.add_argument("--until", help="Latest ISO date or timestamp (UTC).")
+    history_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the result as JSON instead of a table.",
+    )
+    history_parser.set_defaults(handler=_handle_history)
+
+    bundle_parser = subparsers.add_parser(
+        "bundle",
+        help="Pack the vendor catalog into a single compressed file, or unpack one.",
+    )
+    bundle_commands = bundle_parser.add_subparsers(dest="bundle_command")
+    pack_parser = bundle_commands.add_parser(
+        "pack",
+        help="Pack --vendors-dir into a bundle usable anywhere --vendors-dir is accepted.",
+    )
+    pack_parser.add_argument("out", help="Output path for the bundle file.")
+    pack_parser.set_defaults(handler=_handle_bundle_pack)
+    unpack_parser = bundle_commands.add_parser(
+        "unpack",
+        help="Restore the original vendor files from a bundle.",
+    )
+    unpack_parser.add_argument("bundle", help="Bundle file to unpack.")
+    unpack_parser.add_argument(
+        "--out-dir",
+        required=True,
+        help="Directory receiving the vendor files.",
+    )
+    unpack_parser.set_defaults(handler=_handle_bundle_unpack)
+
     return parser
 
 
 def _handle_score(args: argparse.Namespace) -> int:
+    if getattr(args, "fetch_ratings", False) and not getattr(args, "ratings_url", None):
+        raise ValueError(
+            "--fetch-ratings requires --ratings-url; live ratings stay disabled otherwise."
+        )
+    if not getattr(args, "fetch_ratings", False):
+        given = [
+            flag
+            for flag, value in (
+                ("--ratings-url", args.ratings_url),
+                ("--ratings-ttl", args.ratings_ttl),
+                ("--ratings-weight", args.ratings_weight),
+                ("--ratings-concurrency", args.ratings_concurrency),
+            )
+            if value is not None
+        ]
+        if given:
+            raise ValueError(f"{', '.join(given)} can only be used with --fetch-ratings.")
+    if args.memo and (args.watch or args.stream):
+        raise ValueError("--memo cannot be combined with --watch or --stream.")
+    if getattr(args, "watch", False):
+        return _watch_score(args)
+    if args.stream:
+        return _stream_score(args)
+
+    profile = load_profile(args.profile)
+    criteria = load_criteria(args.criteria)
+    memo = None
+    if args.memo:
+        profile = canonical_profile(profile)
+        memo = _result_memo(args, profile, criteria)
+        cached = memo[0].get(memo[1])
+        if cached is not None:
+            return _emit_scorecard(args, cached)
+    vendors = _load_vendors(args)
     if getattr(args, "fetch_ratings", False):
+        vendors = _apply_live_ratings(args, vendors)
+    results = _rank_vendors(args, vendors, criteria, budget=_budget_policy(args, profile))
+    return _write_scorecard(args, profile, results, criteria, memo=memo)
+
+
+def _result_memo(
+    args: argparse.Namespace, profile: dict[str, Any], criteria: CriteriaConfig
+) -> tuple[ResultCache, str]:
+    if args.fetch_ratings or args.history:
+        raise ValueError("--memo cannot be combined with --fetch-ratings or --history.")
+    if args.memo_size <= 0:
+        raise ValueError("--memo-size must be positive.")
+    cache = ResultCache(Path(args.cache_dir) / "results", max_bytes=int(args.memo_size * 2**20))
+    args.telemetry.track_cache("results", cache)
+    variant = {
+        name: value
+        for name, value in vars(args).items()
+        if name not in _MEMO_IGNORED and isinstance(value, (str, int, float, list, type(None)))
+    }
+    if args.catalog_out:
+        variant["catalog_file"] = _catalog_file(args)
+    return cache, memo_key(profile, criteria, catalog_digest(args.vendors_dir), variant)
+
+
+def _budget_policy(args: argparse.Namespace, profile: dict[str, Any]) -> BudgetPolicy | None:
+    if args.budget_mode == "off":
+        return None
+    if args.explain is not None:
+        raise ValueError("--explain works on raw scores and cannot be combined with --budget-mode.")
+    return BudgetPolicy.from_profile(profile, mode=args.budget_mode, penalty=args.budget_penalty)
+
+
+def _stream_score(args: argparse.Namespace) -> int:
+    if args.fetch_ratings or args.dedupe or args.alternatives:
         raise ValueError(
-            "--fetch-ratings is disabled in offline mode. Remove the flag or enable "
-            "a networked implementation."
+            "--stream keeps only the shortlist and cannot be combined with --fetch-ratings, "
+            "--dedupe or --alternatives."
+        )
+    profile = load_profile(args.profile)
+    criteria = load_criteria(args.criteria)
+    budget = _budget_policy(args, profile)
+    normalizer = _normalizer(args, [], criteria)
+    scanned = 0
+
+    def counted(vendors: Iterable[VendorRecord]) -> Iterator[VendorRecord]:
+        nonlocal scanned
+        for vendor in vendors:
+            scanned += 1
+            yield vendor
+
+    with args.telemetry.stage("score", normalize=args.normalize, stream=True) as details:
+        results = top_vendors(
+            counted(iter_vendors(args.vendors_dir)),
+            criteria,
+            max(1, args.top),
+            normalizer=normalizer,
+            budget=budget,
         )
+        details["vendors"] = scanned
+        details["ranked"] = len(results)
+    args.telemetry.count("crm_eval_vendors_loaded_total", scanned)
+    print(f"Streamed {scanned} vendors.", file=sys.stdout)
+    return _write_scorecard(args, profile, results, criteria)
 
+
+def _write_scorecard(
+    args: argparse.Namespace,
+    profile: dict[str, Any],
+    results: list[ScoreResult],
+    criteria: CriteriaConfig,
+    *,
+    memo: tuple[ResultCache, str] | None = None,
+) -> int:
+    if args.catalog_out and not args.slim:
+        raise ValueError("--catalog-out requires --slim.")
+    if args.normalize != "none" and getattr(args, "explain", None) is not None:
+        raise ValueError("--explain works on raw scores and cannot be combined with --normalize.")
+    with args.telemetry.stage("render"):
+        flips = None
+        if getattr(args, "explain", None) is not None:
+            flips = explain_rank_flips(results, criteria, top_pairs=args.explain)
+        alternatives = None
+        if getattr(args, "alternatives", 0) > 0:
+            alternatives = shortlist_alternatives(
+                SimilarityIndex(results, criteria),
+                results[: max(1, args.top)],
+                k=args.alternatives,
+            )
+        build_payload = build_slim_scorecard_payload if args.slim else build_scorecard_payload
+        payload = build_payload(
+            profile,
+            results,
+            criteria,
+            shortlist_size=max(1, args.top),
+            flips=flips,
+            normalization=args.normalize,
+            alternatives=alternatives,
+        )
+        markdown = render_markdown_scorecard(
+            profile,
+            results,
+            criteria,
+            shortlist_size=max(1, args.top),
+            fragments=_fragment_cache(args),
+            flips=flips,
+        )
+
+    if args.slim:
+        top_names = ", ".join(payload["catalog"][slug]["name"] for slug in payload["shortlist"][:3])
+    else:
+        top_names = ", ".join(entry["name"] for entry in payload["shortlist"][:3])
+    rendered: dict[str, Any] = {"payload": payload, "markdown": markdown, "top_names": top_names}
+    if args.catalog_out:
+        rendered["catalog"] = {"schema": SLIM_CATALOG_SCHEMA_VERSION, "vendors": payload["catalog"]}
+        payload = {key: value for key, value in payload.items() if key != "catalog"}
+        payload["catalog_file"] = _catalog_file(args)
+        rendered["payload"] = payload
+    if memo is not None:
+        memo[0].put(memo[1], rendered)
+    if getattr(args, "history", None):
+        info = HistoryStore(args.history).append(
+            results,
+            criteria,
+            label=args.history_label,
+            metadata={"profile": str(args.profile), "command": args.command},
+        )
+        print(f"Recorded run {info.run} in {args.history}.", file=sys.stdout)
+    return _emit_scorecard(args, rendered)
+
+
+def _emit_scorecard(args: argparse.Namespace, rendered: dict[str, Any]) -> int:
+    if "catalog" in rendered:
+        _write_json(args, args.catalog_out, rendered["catalog"])
+    _write_json(args, args.out, rendered["payload"])
+    _write_text(args, args.md, rendered["markdown"])
+    print(
+        f"Scorecard generated. JSON saved to {args.out}; Markdown saved to {args.md}."
+        f" Top picks: {rendered['top_names']}",
+        file=sys.stdout,
+    )
+    return 0
+
+
+def _catalog_file(args: argparse.Namespace) -> str:
+    return os.path.relpath(Path(args.catalog_out).resolve(), Path(args.out).resolve().parent)
+
+
+def _watch_score(args: argparse.Namespace) -> int:
+    if (
+        args.fetch_ratings
+        or args.dedupe
+        or args.explain is not None
+        or args.slim
+        or args.normalize != "none"
+        or args.budget_mode != "off"
+        or args.alternatives
+        or args.stream
+    ):
+        raise ValueError(
+            "--watch cannot be combined with --fetch-ratings, --dedupe, --explain, --slim, "
+            "--normalize, --budget-mode, --alternatives or --stream."
+        )
+    watcher = ScoreWatcher(
+        profile_path=args.profile,
+        json_out=args.out,
+        md_out=args.md,
+        criteria_path=args.criteria,
+        vendors_dir=args.vendors_dir,
+        top=args.top,
+        fragments=_fragment_cache(args),
+    )
+
+    def report(update: WatchUpdate) -> None:
+        written = ", ".join(str(path) for path in update.written) or "no changes"
+        print(
+            f"Refreshed in {update.elapsed * 1000:.0f} ms "
+            f"({update.rescored} rescored): {written}",
+            file=sys.stdout,
+            flush=True,
+        )
+        args.telemetry.event(
+            "refresh",
+            rescored=update.rescored,
+            written=[str(path) for path in update.written],
+            seconds=round(update.elapsed, 6),
+        )
+        for error in update.errors:
+            args.telemetry.count("crm_eval_parse_errors_total")
+            args.telemetry.event("error", kind="data", message=str(error))
+            print(f"  skipped: {error}", file=sys.stderr, flush=True)
+
+    print("Watching for changes; press Ctrl+C to stop.", file=sys.stdout, flush=True)
+    try:
+        watcher.run(poll_interval=max(0.01, args.watch_interval), on_update=report)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _load_vendors(args: argparse.Namespace) -> list[VendorRecord]:
+    with args.telemetry.stage("load") as details:
+        vendors = load_vendors(args.vendors_dir)
+        details["vendors"] = len(vendors)
+        args.telemetry.count("crm_eval_vendors_loaded_total", len(vendors))
+        if getattr(args, "dedupe", False):
+            vendors = collapse_duplicates(vendors)
+            details["deduplicated"] = len(vendors)
+    return vendors
+
+
+def _rank_vendors(
+    args: argparse.Namespace,
+    vendors: list[VendorRecord],
+    criteria: CriteriaConfig,
+    *,
+    budget: BudgetCheck | None = None,
+) -> list[ScoreResult]:
+    with args.telemetry.stage("score", normalize=args.normalize) as details:
+        normalizer = _normalizer(args, vendors, criteria)
+        results = rank_vendors(vendors, criteria, normalizer=normalizer, budget=budget)
+        details["ranked"] = len(results)
+    return results
+
+
+def _normalizer(
+    args: argparse.Namespace, vendors: list[VendorRecord], criteria: CriteriaConfig
+) -> MetricNormalizer | None:
+    if args.normalize == "none":
+        return None
+    if args.dedupe or getattr(args, "fetch_ratings", False):
+        # The scored vendors differ from the files on disk, so cached statistics do not apply.
+        stats = CatalogStats.from_vendors(vendors, metrics=criteria.weights)
+    else:
+        stats = load_or_build_stats(args.vendors_dir, metrics=criteria.weights)
+    return MetricNormalizer(stats, args.normalize)
+
+
+def _apply_live_ratings(
+    args: argparse.Namespace,
+    vendors: list[VendorRecord],
+) -> list[VendorRecord]:
+    fetcher = RatingsFetcher(
+        args.ratings_url,
+        cache_dir=Path(args.cache_dir) / "ratings",
+        ttl=DEFAULT_RATINGS_TTL if args.ratings_ttl is None else args.ratings_ttl,
+        concurrency=(
+            DEFAULT_CONCURRENCY if args.ratings_concurrency is None else args.ratings_concurrency
+        ),
+    )
+    with args.telemetry.stage("ratings") as details:
+        ratings = fetcher.fetch(vendors)
+        details.update(fetcher.stats.as_dict())
+    stats = fetcher.stats
+    args.telemetry.cache("ratings", stats.cache_hits, stats.requests)
+    print(
+        f"Live ratings: {len(ratings)}/{len(vendors)} vendors "
+        f"({stats.requests} requests, {stats.cache_hits} cache hits, "
+        f"{stats.revalidated} revalidated, {stats.failures} failures).",
+        file=sys.stdout,
+    )
+    weight = DEFAULT_BLEND_WEIGHT if args.ratings_weight is None else args.ratings_weight
+    return blend_ratings(vendors, ratings, weight=weight)
+
+
+def _handle_migrate(args: argparse.Namespace) -> int:
     profile = load_profile(args.profile)
     criteria = load_criteria(args.criteria)
-    vendors = load_vendors(args.vendors_dir)
-    results = rank_vendors(vendors, criteria)
+    vendors = _load_vendors(args)
+    results = _rank_vendors(args, vendors, criteria)
+    volumes = migration_volumes(profile)
+    if args.estimates_out and not volumes:
+        raise ValueError("--estimates-out needs migration_records in the profile.")
 
-    payload = build_scorecard_payload(
+    shortlist = [result.vendor for result in results[: max(1, args.top)]]
+    with args.telemetry.stage("simulate", vendors=len(shortlist)):
+        estimates = shortlist_estimates(profile, shortlist, seed=args.seed)
+    markdown = build_migration_plan(
         profile,
         results,
-        criteria,
         shortlist_size=max(1, args.top),
+        fragments=_fragment_cache(args),
+        estimates=estimates,
+    )
+    _write_text(args, args.out, markdown)
+    print(f"Migration plan saved to {args.out}.", file=sys.stdout)
+    if args.estimates_out:
+        with args.telemetry.stage("simulate", vendors=len(vendors)):
+            catalog = estimate_catalog(vendors, volumes, seed=args.seed)
+        _write_json(
+            args,
+            args.estimates_out,
+            {"records": volumes, "estimates": [estimate.as_dict() for estimate in catalog]},
+        )
+        print(
+            f"Cutover estimates for {len(catalog)} vendors saved to {args.estimates_out}.",
+            file=sys.stdout,
+        )
+    return 0
+
+
+def _handle_security(args: argparse.Namespace) -> int:
+    criteria = load_criteria(args.criteria)
+    vendors = _load_vendors(args)
+    results = _rank_vendors(args, vendors, criteria)
+    markdown = build_security_checklist(
+        results,
+        shortlist_size=max(1, args.top),
+        fragments=_fragment_cache(args),
     )
-    markdown = render_markdown_scorecard(
+    _write_text(args, args.out, markdown)
+    print(f"Security checklist saved to {args.out}.", file=sys.stdout)
+    return 0
+
+
+def _handle_integrate(args: argparse.Namespace) -> int:
+    profile = load_profile(args.profile)
+    criteria = load_criteria(args.criteria)
+    vendors = _load_vendors(args)
+    results = _rank_vendors(args, vendors, criteria)
+    markdown = build_integration_notes(
         profile,
         results,
-        criteria,
         shortlist_size=max(1, args.top),
+        fragments=_fragment_cache(args),
     )
+    _write_text(args, args.out, markdown)
+    print(f"Integration notes saved to {args.out}.", file=sys.stdout)
+    return 0
 
-    _write_json(args.out, payload)
-    _write_text(args.md, markdown)
 
-    top_names = ", ".join(entry["name"] for entry in payload["shortlist"][:3])
+def _handle_build(args: argparse.Namespace) -> int:
+    if args.dedupe:
+        raise ValueError("--dedupe needs the whole catalog and cannot be used with build.")
+    if args.normalize != "none":
+        raise ValueError("build renders raw-score artifacts and cannot be used with --normalize.")
+    with args.telemetry.stage("build") as details:
+        outcomes = build_artifacts(
+            args.out_dir,
+            profile_path=args.profile,
+            criteria_path=args.criteria,
+            vendors_dir=args.vendors_dir,
+            nodes=default_nodes(top=max(1, args.top)),
+            jobs=args.jobs,
+            force=args.force,
+            fragments=_fragment_cache(args),
+        )
+        details["artifacts"] = len(outcomes)
+    for outcome in outcomes:
+        if outcome.status == "written":
+            args.telemetry.output(outcome.path, outcome.path.stat().st_size)
+    written = [outcome.path.name for outcome in outcomes if outcome.status == "written"]
+    fresh = sum(1 for outcome in outcomes if outcome.status != "written")
+    reused = sum(1 for outcome in outcomes if outcome.status == "fresh")
+    args.telemetry.cache("artifacts", reused, len(outcomes) - reused)
+    summary = ", ".join(written) if written else "nothing"
     print(
-        f"Scorecard generated. JSON saved to {args.out}; Markdown saved to {args.md}."
-        f" Top picks: {top_names}",
+        f"Build complete in {args.out_dir}: wrote {summary}; {fresh} artifact(s) up to date.",
         file=sys.stdout,
     )
     return 0
 
 
-def _handle_migrate(args: argparse.Namespace) -> int:
-    profile = load_profile(args.profile)
+def _handle_search(args: argparse.Namespace) -> int:
+    index = load_or_build_index(
+        args.vendors_dir,
+        rebuild=args.rebuild,
+        verify=not args.trust_index,
+    )
+    hits = index.search(" ".join(args.query), limit=max(1, args.limit))
+    if not hits:
+        print("No matching vendors.", file=sys.stdout)
+        return 1
+    for hit in hits:
+        print(f"{hit.score:5.2f}  {hit.slug:<24} {hit.name}  [{hit.field}]", file=sys.stdout)
+    return 0
+
+
+def _handle_similar(args: argparse.Namespace) -> int:
     criteria = load_criteria(args.criteria)
-    vendors = load_vendors(args.vendors_dir)
-    results = rank_vendors(vendors, criteria)
+    results = _rank_vendors(args, _load_vendors(args), criteria)
+    index = SimilarityIndex(results, criteria, feature_weight=args.feature_weight)
+    found: dict[str, list[dict[str, Any]]] = {}
+    for slug in args.slugs:
+        matches = index.query(slug, max(1, args.limit), approximate=args.approximate)
+        found[slug] = [match.as_dict() for match in matches]
+        if len(args.slugs) > 1:
+            print(f"Similar to {slug}:", file=sys.stdout)
+        for match in matches:
+            print(
+                f"{match.similarity:5.2f}  #{match.rank:<4} {match.slug:<24} {match.name}",
+                file=sys.stdout,
+            )
+    if args.out:
+        _write_json(args, args.out, {"matches": found})
+        print(f"Similar vendors saved to {args.out}.", file=sys.stdout)
+    return 0
 
-    markdown = build_migration_plan(profile, results, shortlist_size=max(1, args.top))
-    _write_text(args.out, markdown)
-    print(f"Migration plan saved to {args.out}.", file=sys.stdout)
+
+def _handle_dedupe(args: argparse.Namespace) -> int:
+    vendors = load_vendors(args.vendors_dir)
+    clusters = find_duplicate_clusters(vendors, threshold=args.threshold)
+    if args.out:
+        _write_json(args, args.out, {"clusters": [cluster.as_dict() for cluster in clusters]})
+    for cluster in clusters:
+        others = ", ".join(
+            member.slug for member in cluster.members if member.slug != cluster.representative.slug
+        )
+        print(
+            f"{cluster.representative.slug} <- {others} (similarity {cluster.similarity:.2f})",
+            file=sys.stdout,
+        )
+    print(f"{len(clusters)} duplicate cluster(s) across {len(vendors)} vendors.", file=sys.stdout)
     return 0
 
 
-def _handle_security(args: argparse.Namespace) -> int:
+def _handle_shard(args: argparse.Namespace) -> int:
+    if args.dedupe:
+        raise ValueError("--dedupe needs the whole catalog and cannot be used with shard.")
+    if args.normalize != "none":
+        raise ValueError("--normalize needs catalog-wide statistics and cannot be used with shard.")
+    if Path(args.vendors_dir).is_file():
+        raise ValueError(
+            "shard splits a directory of vendor files; it cannot read a feed or bundle."
+        )
     criteria = load_criteria(args.criteria)
-    vendors = load_vendors(args.vendors_dir)
-    results = rank_vendors(vendors, criteria)
-    markdown = build_security_checklist(results, shortlist_size=max(1, args.top))
-    _write_text(args.out, markdown)
-    print(f"Security checklist saved to {args.out}.", file=sys.stdout)
+    header = score_shard(
+        resolve_vendor_files(args.vendors_dir),
+        criteria,
+        args.out,
+        shard=args.index,
+        shards=args.count,
+        mode=args.mode,
+    )
+    args.telemetry.output(args.out, Path(args.out).stat().st_size)
+    print(
+        f"Shard {header.shard + 1}/{header.shards}: scored {header.count} vendors; "
+        f"partial ranking saved to {args.out}.",
+        file=sys.stdout,
+    )
     return 0
 
 
-def _handle_integrate(args: argparse.Namespace) -> int:
+def _handle_merge(args: argparse.Namespace) -> int:
+    if args.dedupe:
+        raise ValueError("Partial rankings are scored without deduplication; drop --dedupe.")
+    if args.normalize != "none":
+        raise ValueError("Partial rankings are scored without normalization; drop --normalize.")
     profile = load_profile(args.profile)
     criteria = load_criteria(args.criteria)
-    vendors = load_vendors(args.vendors_dir)
-    results = rank_vendors(vendors, criteria)
-    markdown = build_integration_notes(profile, results, shortlist_size=max(1, args.top))
-    _write_text(args.out, markdown)
-    print(f"Integration notes saved to {args.out}.", file=sys.stdout)
+    results = merge_partials(args.partials, criteria)
+    return _write_scorecard(args, profile, results, criteria)
+
+
+def _handle_coverage(args: argparse.Namespace) -> int:
+    if args.dedupe:
+        raise ValueError("--dedupe needs the whole catalog and cannot be used with coverage.")
+    report = analyse_coverage(
+        iter_vendors(args.vendors_dir),
+        load_criteria(args.criteria),
+        outlier_examples=args.examples,
+    )
+    for line in render_coverage_table(report):
+        print(line, file=sys.stdout)
+    if args.out:
+        _write_json(args, args.out, report.as_dict())
+        print(f"Coverage report saved to {args.out}.", file=sys.stdout)
+    return 0
+
+
+def _handle_compare(args: argparse.Namespace) -> int:
+    criteria = load_criteria(args.criteria)
+    results = _rank_vendors(args, _load_vendors(args), criteria)
+    matrix = ComparisonMatrix(results, criteria)
+    top = max(1, args.top)
+    if args.neighbours is not None:
+        pairs = matrix.neighbours(max(1, args.neighbours))
+        for pair in pairs:
+            if pair.a_rank <= top:
+                print(_format_head_to_head(pair), file=sys.stdout)
+        if args.out:
+            _write_json(args, args.out, [pair.as_dict() for pair in pairs])
+            print(f"{len(pairs)} neighbouring pairs saved to {args.out}.", file=sys.stdout)
+    elif args.out:
+        count = write_comparison_matrix(matrix, args.out)
+        args.telemetry.output(args.out, Path(args.out).stat().st_size)
+        print(f"Head-to-head matrix for {count} vendors saved to {args.out}.", file=sys.stdout)
+    else:
+        limit = min(top, len(matrix))
+        for a in range(limit):
+            for b in range(a + 1, limit):
+                print(_format_head_to_head(matrix.pair(a, b)), file=sys.stdout)
+    if args.md:
+        _write_text(args, args.md, render_head_to_head(matrix, top=top))
+        print(f"Head-to-head comparison saved to {args.md}.", file=sys.stdout)
     return 0
 
 
-def _write_json(path: str, payload: Any) -> None:
+def _format_head_to_head(pair: HeadToHead) -> str:
+    return (
+        f"#{pair.a_rank} {pair.a.vendor.name} vs #{pair.b_rank} {pair.b.vendor.name}: "
+        f"{pair.wins} won, {pair.losses} lost, {pair.ties} tied, margin {pair.margin:+.2f}"
+    )
+
+
+def _handle_tco(args: argparse.Namespace) -> int:
+    budget = None
+    if args.seats:
+        scenarios = scenario_grid(
+            args.seats,
+            plans=args.plan,
+            growth=args.growth,
+            years=args.years,
+            add_ons=tuple(args.add_ons),
+        )
+    elif args.profile:
+        profile = load_profile(args.profile)
+        scenario = scenario_from_profile(profile)
+        if scenario is None:
+            raise ValueError("The profile needs 'seats' or a 'company_size'; or pass --seats.")
+        scenarios = [scenario]
+        budget = profile.get("budget_per_user_per_month")
+    else:
+        raise ValueError("Pass --seats, or a --profile to project its seat scenario.")
+
+    engine = TcoEngine(_load_vendors(args))
+    if not engine.priced:
+        print("No vendor states structured pricing tiers (pricing_tco.tiers).", file=sys.stdout)
+        return 1
+    costs = engine.project_many(scenarios)
+    shown = 10
+    for scenario, row in zip(scenarios[:shown], costs, strict=False):
+        seat_months = 12 * sum(scenario.seat_schedule())
+        print(
+            f"{scenario.seats} seats, {scenario.growth:+.0%}/yr, {scenario.years} yr, "
+            f"{scenario.plan} plan:",
+            file=sys.stdout,
+        )
+        priced = sorted(
+            (cost, vendor.name)
+            for cost, vendor in zip(row, engine.vendors, strict=True)
+            if not math.isnan(cost)
+        )
+        for cost, name in priced[: max(1, args.top)]:
+            per_seat = cost / seat_months
+            flag = ""
+            if budget is not None and per_seat > float(budget):
+                flag = "  over budget"
+            print(f"  {cost:>12,.0f}  {per_seat:>8.2f}/seat-month  {name}{flag}", file=sys.stdout)
+    if len(scenarios) > shown:
+        print(f"... and {len(scenarios) - shown} more scenarios.", file=sys.stdout)
+    if args.out:
+        _write_json(
+            args,
+            args.out,
+            {
+                "vendors": [vendor.slug for vendor in engine.vendors],
+                "scenarios": [
+                    {
+                        **scenario.as_dict(),
+                        "costs": [None if math.isnan(cost) else round(cost, 2) for cost in row],
+                    }
+                    for scenario, row in zip(scenarios, costs, strict=True)
+                ],
+            },
+        )
+        print(f"Cost projections saved to {args.out}.", file=sys.stdout)
+    return 0
+
+
+def _handle_fit_weights(args: argparse.Namespace) -> int:
+    conditions: dict[str, str] = {}
+    for condition in args.match:
+        field, separator, value = condition.partition("=")
+        if not separator or not field:
+            raise ValueError(f"--match expects FIELD=VALUE, got '{condition}'.")
+        conditions[field] = value
+    decisions = [
+        decision for decision in load_decisions(args.decisions) if decision.matches(conditions)
+    ]
+    if not decisions:
+        raise ValueError("No decisions match the given --match conditions.")
+    criteria = load_criteria(args.criteria)
+    result = fit_weights(
+        decisions,
+        _load_vendors(args),
+        criteria,
+        temperature=args.temperature,
+        regularization=args.regularization,
+        max_iterations=args.max_iterations,
+    )
+    write_criteria(args.out, result.criteria(criteria.scales))
+    print(
+        f"Fitted {result.pairs} pairs ({result.unique_pairs} distinct) from "
+        f"{result.decisions} decisions in {result.iterations} steps.",
+        file=sys.stdout,
+    )
+    if result.skipped:
+        print(
+            f"Skipped {result.skipped} decisions naming vendors not in the catalog.",
+            file=sys.stdout,
+        )
+    print(
+        f"Chosen vendor ranked first: {result.baseline_top1_accuracy:.1%} -> "
+        f"{result.top1_accuracy:.1%}; pairs ordered correctly: "
+        f"{result.baseline_pairwise_accuracy:.1%} -> {result.pairwise_accuracy:.1%}.",
+        file=sys.stdout,
+    )
+    for metric, weight in sorted(result.weights.items(), key=lambda item: -item[1]):
+        before = criteria.weights.get(metric, 0)
+        print(f"  {metric:<32} {before:>3} -> {weight:>3}", file=sys.stdout)
+    print(f"Fitted criteria saved to {args.out}.", file=sys.stdout)
+    return 0
+
+
+def _handle_export(args: argparse.Namespace) -> int:
+    if args.dedupe:
+        raise ValueError("--dedupe needs the whole catalog and cannot be used with export.")
+    criteria = load_criteria(args.criteria)
+    normalizer = None
+    if args.normalize != "none":
+        stats = load_or_build_stats(args.vendors_dir, metrics=criteria.weights)
+        normalizer = MetricNormalizer(stats, args.normalize)
+    count = export_scores(
+        iter_vendors(args.vendors_dir),
+        criteria,
+        args.out,
+        fmt=args.format,
+        chunk_rows=args.chunk_rows,
+        normalizer=normalizer,
+    )
+    if args.out != "-":
+        args.telemetry.output(args.out, Path(args.out).stat().st_size)
+    destination = "stdout" if args.out == "-" else args.out
+    print(
+        f"Exported {count} vendors as {args.format} to {destination}.",
+        file=sys.stderr if args.out == "-" else sys.stdout,
+    )
+    return 0
+
+
+def _handle_history(args: argparse.Namespace) -> int:
+    store = HistoryStore(args.store)
+    window = {"since": args.since, "until": args.until}
+    if args.vendor:
+        points = store.vendor_series(args.vendor, metric=args.metric, **window)
+        rows = [point.as_dict() for point in points]
+        header = f"{'run':>5}  {'timestamp':<25} {'rank':>5} {args.metric or 'total':>12}"
+        lines = [
+            f"{p['run']:>5}  {p['timestamp']:<25} {p['rank']:>5} {p['value']:>12.2f}" for p in rows
+        ]
+    elif args.metric:
+        rows = [point.as_dict() for point in store.metric_series(args.metric, **window)]
+        header = f"{'run':>5}  {'timestamp':<25} {'weight':>7} {'mean raw':>9}"
+        lines = [
+            f"{p['run']:>5}  {p['timestamp']:<25} {p['weight']:>7.1f} {p['mean']:>9.2f}"
+            for p in rows
+        ]
+    else:
+        runs = store.runs(**window)
+        rows = [
+            {key: value for key, value in info.as_dict().items() if key not in ("offset", "length")}
+            for info in runs
+        ]
+        header = f"{'run':>5}  {'timestamp':<25} {'vendors':>7}  label"
+        lines = [
+            f"{info.run:>5}  {info.timestamp:<25} {info.vendors:>7}  {info.label or ''}"
+            for info in runs
+        ]
+
+    if args.json:
+        print(json.dumps(rows, indent=2, sort_keys=True), file=sys.stdout)
+    elif rows:
+        print("\n".join([header, *lines]), file=sys.stdout)
+    else:
+        print("No matching runs.", file=sys.stdout)
+    return 0 if rows else 1
+
+
+def _handle_bundle_pack(args: argparse.Namespace) -> int:
+    entries = pack_bundle(args.vendors_dir, args.out)
+    size = Path(args.out).stat().st_size
+    args.telemetry.output(args.out, size)
+    original = sum(entry.size for entry in entries)
+    print(
+        f"Packed {len(entries)} vendor files ({original:,} bytes) into {args.out} "
+        f"({size:,} bytes).",
+        file=sys.stdout,
+    )
+    return 0
+
+
+def _handle_bundle_unpack(args: argparse.Namespace) -> int:
+    written = unpack_bundle(args.bundle, args.out_dir)
+    print(f"Unpacked {len(written)} vendor files into {args.out_dir}.", file=sys.stdout)
+    return 0
+
+
+def _fragment_cache(args: argparse.Namespace) -> FragmentCache:
+    cache = FragmentCache(
+        Path(args.cache_dir) / "fragments",
+        max_entries=args.fragment_cache_size,
+    )
+    args.telemetry.track_cache("fragments", cache)
+    return cache
+
+
+def _write_json(args: argparse.Namespace, path: str, payload: Any) -> None:
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
     with target.open("w", encoding="utf-8") as handle:
         json.dump(payload, handle, indent=2, sort_keys=True)
         handle.write("\n")
+    args.telemetry.output(target, target.stat().st_size)
 
 
-def _write_text(path: str, content: str) -> None:
+def _write_text(args: argparse.Namespace, path: str, content: str) -> None:
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
     with target.open("w", encoding="utf-8") as handle:
         handle.write(content)
+    args.telemetry.output(target, target.stat().st_size)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,275 @@
+"""Head-to-head comparison of every vendor pair: metric wins, ties and weighted margin."""
+
+from __future__ import annotations
+
+import json
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .data import CriteriaConfig
+from .scoring import ScoreResult
+
+__all__ = [
+    "COMPARE_FORMAT",
+    "ComparisonMatrix",
+    "HeadToHead",
+    "render_head_to_head",
+    "write_comparison_matrix",
+]
+
+COMPARE_FORMAT = "crm-eval-compare/v1"
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+MAX_METRICS = 255
+
+# Lane-wise comparison tables: a lane's high byte is 0x80 when a >= b, and its low byte is
+# (a - b) mod 256, which is zero exactly when a == b.
+_IS_GE = bytes(1 if value == 0x80 else 0 for value in range(256))
+_IS_NONZERO = bytes(1 if value else 0 for value in range(256))
+_IS_ZERO = bytes(0 if value else 1 for value in range(256))
+
+
+@dataclass(frozen=True)
+class HeadToHead:
+    """How vendor ``a`` fares against vendor ``b`` metric by metric."""
+
+    a: ScoreResult
+    b: ScoreResult
+    a_rank: int
+    b_rank: int
+    wins: int
+    losses: int
+    ties: int
+    margin: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "a": self.a.vendor.slug,
+            "a_rank": self.a_rank,
+            "b": self.b.vendor.slug,
+            "b_rank": self.b_rank,
+            "wins": self.wins,
+            "losses": self.losses,
+            "ties": self.ties,
+            "margin": round(self.margin, 4),
+        }
+
+
+class ComparisonMatrix:
+    """Pairwise metric wins and ties for a ranked catalog, computed a whole row at a time.
+
+    Each metric's raw scores are replaced by their rank among the metric's distinct values and
+    stored as one byte string per column (two for metrics with more than 256 distinct values).
+    Comparing vendor ``i`` with every vendor is then a handful of C-level operations per
+    metric: the two code strings are interleaved into 16-bit lanes holding ``0x8000 + a - b``
+    via one big-integer subtraction, and translate tables turn the lanes into 0/1 "greater"
+    and "equal" bytes. Summing those as big integers adds every column's counts at once. Rows
+    with the same code on a metric share that metric's comparison, which is cached up to
+    ``cache_bytes``. Memory is O(n) per row, so the full matrix can be streamed for large n.
+    """
+
+    def __init__(
+        self,
+        results: Sequence[ScoreResult],
+        criteria: CriteriaConfig,
+        *,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ) -> None:
+        self.results = list(results)
+        self.metrics: tuple[str, ...] = tuple(criteria.weights)
+        if len(self.metrics) > MAX_METRICS:
+            raise ValueError(f"Head-to-head comparison supports at most {MAX_METRICS} metrics.")
+        self.totals = array("d", (result.total for result in self.results))
+        self._codes: list[list[int]] = []
+        self._columns: list[list[bytes]] = []
+        for metric in self.metrics:
+            column = [result.breakdown[metric]["raw"] for result in self.results]
+            distinct = {value: code for code, value in enumerate(sorted(set(column)))}
+            if len(distinct) > 1 << 16:
+                raise ValueError(f"Metric '{metric}' has too many distinct scores to compare.")
+            codes = [distinct[value] for value in column]
+            self._codes.append(codes)
+            if len(distinct) <= 256:
+                self._columns.append([bytes(codes)])
+            else:
+                self._columns.append(
+                    [bytes(code >> 8 for code in codes), bytes(code & 0xFF for code in codes)]
+                )
+        self._cache: dict[tuple[int, int], tuple[int, int]] = {}
+        self._cache_limit = max(1, cache_bytes // max(1, 2 * len(self.results)))
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def row(self, index: int) -> tuple[bytes, bytes]:
+        """Return vendor ``index``'s wins and ties against every vendor, one byte per column.
+
+        Losses are ``len(metrics) - wins - ties``; the margin is ``totals[index] - totals[j]``.
+        """
+
+        size = len(self.results)
+        wins = ties = 0
+        for metric_index in range(len(self.metrics)):
+            greater, equal = self._row_comparison(metric_index, self._codes[metric_index][index])
+            wins += greater
+            ties += equal
+        return wins.to_bytes(size, "big"), ties.to_bytes(size, "big")
+
+    def rows(self) -> Iterator[tuple[int, bytes, bytes]]:
+        """Yield ``(index, wins, ties)`` for every row in rank order."""
+
+        for index in range(len(self.results)):
+            yield (index, *self.row(index))
+
+    def pair(self, a: int, b: int) -> HeadToHead:
+        """Compare two vendors by their rank positions (0-based)."""
+
+        wins = ties = 0
+        for codes in self._codes:
+            if codes[a] > codes[b]:
+                wins += 1
+            elif codes[a] == codes[b]:
+                ties += 1
+        return self._head_to_head(a, b, wins, ties)
+
+    def neighbours(self, k: int) -> list[HeadToHead]:
+        """Compare every vendor with the ``k`` vendors ranked directly below it.
+
+        Each offset ``d`` is one diagonal of the matrix, computed for all vendors at once by
+        comparing every code string with itself shifted by ``d``.
+        """
+
+        size = len(self.results)
+        pairs: list[HeadToHead] = []
+        for offset in range(1, min(max(0, k), size - 1) + 1):
+            length = size - offset
+            wins = ties = 0
+            for column in self._columns:
+                greater, equal = _compare_digits(
+                    [digits[:length] for digits in column],
+                    [digits[offset:] for digits in column],
+                )
+                wins += greater
+                ties += equal
+            win_counts = wins.to_bytes(length, "big")
+            tie_counts = ties.to_bytes(length, "big")
+            pairs.extend(
+                self._head_to_head(i, i + offset, win_counts[i], tie_counts[i])
+                for i in range(length)
+            )
+        pairs.sort(key=lambda pair: (pair.a_rank, pair.b_rank))
+        return pairs
+
+    def _row_comparison(self, metric_index: int, code: int) -> tuple[int, int]:
+        key = (metric_index, code)
+        cached = self._cache.get(key)
+        if cached is None:
+            size = len(self.results)
+            column = self._columns[metric_index]
+            digits = [code >> 8, code & 0xFF] if len(column) == 2 else [code]
+            cached = _compare_digits([bytes((digit,)) * size for digit in digits], column)
+            if len(self._cache) >= self._cache_limit:
+                self._cache.clear()
+            self._cache[key] = cached
+        return cached
+
+    def _head_to_head(self, a: int, b: int, wins: int, ties: int) -> HeadToHead:
+        return HeadToHead(
+            a=self.results[a],
+            b=self.results[b],
+            a_rank=a + 1,
+            b_rank=b + 1,
+            wins=wins,
+            losses=len(self.metrics) - wins - ties,
+            ties=ties,
+            margin=self.totals[a] - self.totals[b],
+        )
+
+
+def write_comparison_matrix(matrix: ComparisonMatrix, out: Path | str) -> int:
+    """Stream the full matrix as JSON Lines and return the number of rows written.
+
+    The first line lists the metrics, vendor slugs in rank order and their totals; each
+    following line holds one vendor's ``wins`` and ``ties`` against every vendor, itself
+    included, in the same order.
+    """
+
+    target = Path(out)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("w", encoding="utf-8") as handle:
+        header = {
+            "format": COMPARE_FORMAT,
+            "metrics": list(matrix.metrics),
+            "vendors": [result.vendor.slug for result in matrix.results],
+            "totals": list(matrix.totals),
+        }
+        handle.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for index, wins, ties in matrix.rows():
+            row = {"vendor": matrix.results[index].vendor.slug, "wins": list(wins)}
+            row["ties"] = list(ties)
+            handle.write(json.dumps(row, separators=(",", ":")) + "\n")
+    return len(matrix)
+
+
+def render_head_to_head(matrix: ComparisonMatrix, *, top: int = 5) -> str:
+    """Render a Markdown comparison of every pair among the ``top`` ranked vendors."""
+
+    limit = min(max(1, top), len(matrix))
+    lines = ["# Head-to-Head Comparison", ""]
+    for a in range(limit):
+        for b in range(a + 1, limit):
+            pair = matrix.pair(a, b)
+            first, second = pair.a.vendor.name, pair.b.vendor.name
+            lines.append(f"## {first} (#{pair.a_rank}) vs {second} (#{pair.b_rank})")
+            lines.append("")
+            lines.append(
+                f"{first} wins {pair.wins} metrics, loses {pair.losses} and ties {pair.ties}; "
+                f"overall margin {pair.margin:+.2f} points."
+            )
+            lines.append("")
+            lines.append(f"| Metric | {first} | {second} | Weighted margin |")
+            lines.append("| :----- | ----: | ----: | ----: |")
+            for metric in matrix.metrics:
+                left = pair.a.breakdown[metric]
+                right = pair.b.breakdown[metric]
+                lines.append(
+                    f"| {metric} | {left['raw']:.2f} | {right['raw']:.2f} | "
+                    f"{left['weighted'] - right['weighted']:+.2f} |"
+                )
+            lines.append("")
+    return "\n".join(lines).strip() + "\n"
+
+
+def _compare_digits(left: list[bytes], right: list[bytes]) -> tuple[int, int]:
+    """Lane-wise ``left > right`` and ``left == right`` for multi-digit (base-256) codes."""
+
+    greater = equal = 0
+    for position, (a, b) in enumerate(zip(left, right, strict=True)):
+        digit_greater, digit_equal = _compare_bytes(a, b)
+        if position == 0:
+            greater, equal = digit_greater, digit_equal
+        else:
+            greater |= equal & digit_greater
+            equal &= digit_equal
+    return greater, equal
+
+
+def _compare_bytes(a: bytes, b: bytes) -> tuple[int, int]:
+    size = len(a)
+    if not size:
+        return 0, 0
+    lanes_a = bytearray(2 * size)
+    lanes_a[0::2] = b"\x80" * size
+    lanes_a[1::2] = a
+    lanes_b = bytearray(2 * size)
+    lanes_b[1::2] = b
+    # Every lane stays within 0x8000 ± 255, so the subtraction never borrows across lanes.
+    lanes = (int.from_bytes(lanes_a, "big") - int.from_bytes(lanes_b, "big")).to_bytes(
+        2 * size, "big"
+    )
+    at_least = int.from_bytes(lanes[0::2].translate(_IS_GE), "big")
+    differs = int.from_bytes(lanes[1::2].translate(_IS_NONZERO), "big")
+    same = int.from_bytes(lanes[1::2].translate(_IS_ZERO), "big")
+    return at_least & differs, at_least & same
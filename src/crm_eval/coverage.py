@@ -0,0 +1,330 @@
+"""Catalog-wide metric coverage, distributions, outliers and missing-default impact."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .data import CriteriaConfig, VendorRecord, metric_score
+from .scoring import DEFAULT_MISSING_SCORE
+
+__all__ = [
+    "CoverageReport",
+    "MetricCoverage",
+    "analyse_coverage",
+    "render_coverage_table",
+]
+
+MAX_RAW_SCORE = 5.0
+# Raw scores are binned at 0.01, so quantiles are exact for scores given to two decimals.
+_BINS_PER_POINT = 100
+_BIN_COUNT = int(MAX_RAW_SCORE * _BINS_PER_POINT) + 1
+_TUKEY_FENCE = 1.5
+
+
+@dataclass(frozen=True)
+class MetricCoverage:
+    """Coverage, distribution and missing-default impact for one metric.
+
+    Distribution figures cover vendors that supply a usable score. ``default_shift`` is how many
+    points each vendor missing the metric would gain (or lose) if it were scored at the catalog
+    mean instead of the missing default; ``ranks_changed`` and ``max_rank_shift`` say how many
+    of those vendors would move and by how many places.
+    """
+
+    metric: str
+    weight: float
+    present: int
+    missing: int
+    invalid: int
+    clamped: int
+    mean: float
+    stdev: float
+    minimum: float
+    q1: float
+    median: float
+    q3: float
+    maximum: float
+    histogram: tuple[int, ...]
+    outliers: int
+    outlier_examples: tuple[tuple[str, float], ...]
+    default_shift: float
+    ranks_changed: int
+    max_rank_shift: int
+    mean_rank_shift: float
+
+    @property
+    def coverage(self) -> float:
+        total = self.present + self.missing + self.invalid
+        return self.present / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "metric": self.metric,
+            "weight": self.weight,
+            "coverage": round(self.coverage, 4),
+            "present": self.present,
+            "missing": self.missing,
+            "invalid": self.invalid,
+            "clamped": self.clamped,
+            "mean": round(self.mean, 4),
+            "stdev": round(self.stdev, 4),
+            "min": self.minimum,
+            "q1": self.q1,
+            "median": self.median,
+            "q3": self.q3,
+            "max": self.maximum,
+            "histogram": list(self.histogram),
+            "outliers": self.outliers,
+            "outlier_examples": [
+                {"slug": slug, "raw": value} for slug, value in self.outlier_examples
+            ],
+            "default_shift": round(self.default_shift, 4),
+            "ranks_changed": self.ranks_changed,
+            "max_rank_shift": self.max_rank_shift,
+            "mean_rank_shift": round(self.mean_rank_shift, 4),
+        }
+
+
+@dataclass(frozen=True)
+class CoverageReport:
+    """Per-metric coverage for a whole catalog."""
+
+    vendors: int
+    complete_vendors: int
+    default_missing_score: float
+    metrics: tuple[MetricCoverage, ...]
+    unknown_metrics: dict[str, int]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "vendors": self.vendors,
+            "complete_vendors": self.complete_vendors,
+            "default_missing_score": self.default_missing_score,
+            "metrics": [metric.as_dict() for metric in self.metrics],
+            "unknown_metrics": dict(sorted(self.unknown_metrics.items())),
+        }
+
+
+class _Accumulator:
+    """Running statistics for one metric; only ``missing_totals`` grows with the catalog."""
+
+    def __init__(self) -> None:
+        self.present = self.missing = self.invalid = self.clamped = 0
+        self.total = self.total_sq = 0.0
+        self.bins = array("q", bytes(8 * _BIN_COUNT))
+        self.lowest: list[tuple[float, str]] = []  # max-heap via negated values
+        self.highest: list[tuple[float, str]] = []  # min-heap
+        self.missing_totals = array("d")
+
+
+def analyse_coverage(
+    vendors: Iterable[VendorRecord],
+    criteria: CriteriaConfig,
+    *,
+    default_missing_score: float = DEFAULT_MISSING_SCORE,
+    outlier_examples: int = 3,
+) -> CoverageReport:
+    """Profile every metric across ``vendors`` in a single streaming pass.
+
+    Scores that are absent, or present but not numeric, are counted separately and both fall
+    back to ``default_missing_score`` when computing totals; values outside 0–5 are clamped as
+    ``score_vendor`` does. Outliers lie beyond the Tukey fences ``Q1 - 1.5·IQR`` and
+    ``Q3 + 1.5·IQR``. Only one total per vendor plus one per missing score is retained, which
+    is what the rank-shift analysis needs.
+    """
+
+    if not 0 <= default_missing_score <= MAX_RAW_SCORE:
+        raise ValueError("default_missing_score must be between 0 and 5 inclusive.")
+    metrics = tuple(criteria.weights)
+    weights = [float(criteria.weights[metric]) for metric in metrics]
+    examples = max(0, outlier_examples)
+    stats = [_Accumulator() for _ in metrics]
+    unknown: dict[str, int] = {}
+    # Category scores stand in for their leaves, so they count as known too.
+    known = set(metrics)
+    for metric in metrics:
+        while "." in metric:
+            metric = metric.rpartition(".")[0]
+            known.add(metric)
+    totals = array("d")
+    complete = 0
+
+    for vendor in vendors:
+        scores = vendor.get_scores()
+        total = 0.0
+        missing_here: list[_Accumulator] = []
+        for stat, metric, weight in zip(stats, metrics, weights, strict=True):
+            value = metric_score(scores, metric)
+            if value is None:
+                stat.missing += 1
+                missing_here.append(stat)
+                value = default_missing_score
+            else:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    value = math.nan
+                if math.isnan(value):
+                    stat.invalid += 1
+                    missing_here.append(stat)
+                    value = default_missing_score
+                else:
+                    if not 0.0 <= value <= MAX_RAW_SCORE:
+                        stat.clamped += 1
+                        value = max(0.0, min(MAX_RAW_SCORE, value))
+                    stat.present += 1
+                    stat.total += value
+                    stat.total_sq += value * value
+                    stat.bins[int(value * _BINS_PER_POINT + 0.5)] += 1
+                    if examples:
+                        highest, lowest = stat.highest, stat.lowest
+                        if len(highest) < examples:
+                            heapq.heappush(highest, (value, vendor.slug))
+                            heapq.heappush(lowest, (-value, vendor.slug))
+                        else:
+                            if value > highest[0][0]:
+                                heapq.heapreplace(highest, (value, vendor.slug))
+                            if -value > lowest[0][0]:
+                                heapq.heapreplace(lowest, (-value, vendor.slug))
+            total += (value / MAX_RAW_SCORE) * weight
+        total = round(total, 4)
+        totals.append(total)
+        for stat in missing_here:
+            stat.missing_totals.append(total)
+        if not missing_here:
+            complete += 1
+        for key in scores:
+            if key not in known:
+                unknown[str(key)] = unknown.get(str(key), 0) + 1
+
+    ordered = array("d", sorted(totals))
+    coverage = tuple(
+        _summarise(metric, weight, stat, ordered, default_missing_score)
+        for metric, weight, stat in zip(metrics, weights, stats, strict=True)
+    )
+    return CoverageReport(
+        vendors=len(totals),
+        complete_vendors=complete,
+        default_missing_score=default_missing_score,
+        metrics=coverage,
+        unknown_metrics=unknown,
+    )
+
+
+def render_coverage_table(report: CoverageReport) -> list[str]:
+    """Render the report as aligned plain-text lines for the terminal."""
+
+    lines = [
+        f"{report.vendors} vendors; {report.complete_vendors} score every metric; missing "
+        f"scores default to {report.default_missing_score:g}.",
+        "",
+        f"{'metric':<32} {'wt':>4} {'cover':>6} {'miss':>6} {'mean':>5} {'sd':>5} "
+        f"{'min':>5} {'med':>5} {'max':>5} {'outl':>5} {'shift':>6} {'moved':>6} {'max mv':>6}",
+    ]
+    for metric in report.metrics:
+        absent = metric.missing + metric.invalid
+        shift = f"{metric.default_shift:>+6.2f}" if absent else f"{'-':>6}"
+        lines.append(
+            f"{metric.metric:<32} {metric.weight:>4.0f} {metric.coverage:>6.1%} "
+            f"{absent:>6} {metric.mean:>5.2f} {metric.stdev:>5.2f} "
+            f"{metric.minimum:>5.2f} {metric.median:>5.2f} {metric.maximum:>5.2f} "
+            f"{metric.outliers:>5} {shift} {metric.ranks_changed:>6} {metric.max_rank_shift:>6}"
+        )
+    if report.unknown_metrics:
+        lines.append("")
+        listed = ", ".join(
+            f"{name} ({count})" for name, count in sorted(report.unknown_metrics.items())
+        )
+        lines.append(f"Scores for metrics not in the criteria: {listed}")
+    return lines
+
+
+def _summarise(
+    metric: str,
+    weight: float,
+    stat: _Accumulator,
+    ordered_totals: array,
+    default_missing_score: float,
+) -> MetricCoverage:
+    present = stat.present
+    mean = stat.total / present if present else 0.0
+    variance = max(0.0, stat.total_sq / present - mean * mean) if present else 0.0
+    q1, median, q3 = (_quantile(stat.bins, present, q) for q in (0.25, 0.5, 0.75))
+    low_fence = q1 - _TUKEY_FENCE * (q3 - q1)
+    high_fence = q3 + _TUKEY_FENCE * (q3 - q1)
+    outliers = sum(
+        count
+        for index, count in enumerate(stat.bins)
+        if count and not low_fence <= index / _BINS_PER_POINT <= high_fence
+    )
+    examples = sorted((-value, slug) for value, slug in stat.lowest if -value < low_fence)
+    examples += sorted(
+        ((value, slug) for value, slug in stat.highest if value > high_fence), reverse=True
+    )
+
+    # Scoring absent vendors at the catalog mean would shift each of their totals by the same
+    # amount, so they keep their order among themselves and only pass (or fall behind) vendors
+    # whose totals lie strictly between the old and new value.
+    shift = (mean - default_missing_score) / MAX_RAW_SCORE * weight if present else 0.0
+    affected = array("d", sorted(stat.missing_totals))
+    moves: list[int] = []
+    if shift:
+        for total in affected:
+            low, high = sorted((total, total + shift))
+            passed = bisect_left(ordered_totals, high) - bisect_right(ordered_totals, low)
+            passed -= bisect_left(affected, high) - bisect_right(affected, low)
+            moves.append(passed)
+    changed = [move for move in moves if move]
+
+    return MetricCoverage(
+        metric=metric,
+        weight=weight,
+        present=present,
+        missing=stat.missing,
+        invalid=stat.invalid,
+        clamped=stat.clamped,
+        mean=mean,
+        stdev=math.sqrt(variance),
+        minimum=_quantile(stat.bins, present, 0.0),
+        q1=q1,
+        median=median,
+        q3=q3,
+        maximum=_quantile(stat.bins, present, 1.0),
+        histogram=_coarse_histogram(stat.bins),
+        outliers=outliers,
+        outlier_examples=tuple((slug, value) for value, slug in examples),
+        default_shift=shift,
+        ranks_changed=len(changed),
+        max_rank_shift=max(changed, default=0),
+        mean_rank_shift=sum(moves) / len(moves) if moves else 0.0,
+    )
+
+
+def _quantile(bins: array, count: int, q: float) -> float:
+    """Nearest-rank quantile read from the fine histogram."""
+
+    if not count:
+        return 0.0
+    target = max(1, math.ceil(q * count))
+    seen = 0
+    for index, size in enumerate(bins):
+        seen += size
+        if seen >= target:
+            return index / _BINS_PER_POINT
+    return MAX_RAW_SCORE
+
+
+def _coarse_histogram(bins: array) -> tuple[int, ...]:
+    """Counts per whole point: [0, 1), [1, 2), [2, 3), [3, 4) and [4, 5]."""
+
+    coarse = [0] * int(MAX_RAW_SCORE)
+    for index, size in enumerate(bins):
+        if size:
+            coarse[min(index // _BINS_PER_POINT, len(coarse) - 1)] += size
+    return tuple(coarse)
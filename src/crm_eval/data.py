@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterator, Mapping
-from dataclasses import dataclass
+import hashlib
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -15,7 +18,13 @@ __all__ = [
     "DataLoadError",
     "load_criteria",
     "load_vendors",
+    "iter_vendors",
+    "load_vendor_file",
+    "vendor_record_from_payload",
+    "resolve_vendor_files",
+    "catalog_fingerprint",
     "load_profile",
+    "metric_score",
     "DEFAULT_CRITERIA_PATH",
     "DEFAULT_VENDORS_DIR",
 ]
@@ -27,15 +36,34 @@ class DataLoadError(RuntimeError):
 
 @dataclass(frozen=True)
 class CriteriaConfig:
-    """Normalized scoring weights and descriptive scales."""
+    """Normalized scoring weights and descriptive scales.
 
-    weights: dict[str, int]
+    ``weights`` is always flat, one entry per scored metric. Hierarchical criteria are
+    compiled to their leaf metrics, named by dotted path (``sales_core.pipeline``), and
+    ``categories`` maps each top-level category to its leaves for rolling scores up.
+    """
+
+    weights: dict[str, float]
     scales: dict[int, str]
+    categories: dict[str, tuple[str, ...]] = field(default_factory=dict)
 
     def as_dict(self) -> dict[str, Any]:
         """Return a JSON-serialisable representation."""
 
-        return {"weights": dict(self.weights), "scales": dict(self.scales)}
+        data: dict[str, Any] = {"weights": dict(self.weights), "scales": dict(self.scales)}
+        if self.categories:
+            data["categories"] = {name: list(leaves) for name, leaves in self.categories.items()}
+        return data
+
+    def rollup(self, values: Mapping[str, float]) -> dict[str, float]:
+        """Sum per-metric ``values`` by category; metrics outside any category stand alone."""
+
+        totals: dict[str, float] = {}
+        owner = {leaf: name for name, leaves in self.categories.items() for leaf in leaves}
+        for metric in self.weights:
+            group = owner.get(metric, metric)
+            totals[group] = totals.get(group, 0.0) + values.get(metric, 0.0)
+        return totals
 
 
 @dataclass(frozen=True)
@@ -55,13 +83,37 @@ class VendorRecord:
         merged.setdefault("slug", self.slug)
         return merged
 
+    @cached_property
+    def content_hash(self) -> str:
+        """Stable digest of the slug, name and payload, independent of the source path."""
+
+        canonical = json.dumps(
+            {"slug": self.slug, "name": self.name, "payload": self.payload},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
     def get_scores(self) -> Mapping[str, Any]:
-        """Return the raw score dictionary from the payload, if present."""
+        """Return the raw score dictionary from the payload, if present.
+
+        Nested score groups are flattened to dotted keys once per record, so
+        ``{"sales_core": {"pipeline": 4}}`` reads as ``{"sales_core.pipeline": 4}``.
+        """
 
+        return self._scores
+
+    @cached_property
+    def _scores(self) -> Mapping[str, Any]:
         scores = self.payload.get("scores", {})
-        if isinstance(scores, Mapping):
+        if not isinstance(scores, Mapping):
+            return {}
+        if not any(isinstance(value, Mapping) for value in scores.values()):
             return scores
-        return {}
+        flat: dict[str, Any] = {}
+        _flatten_scores(scores, "", flat)
+        return flat
 
     def get_notes(self) -> list[str]:
         """Ensure notes are returned as a list of strings."""
@@ -79,68 +131,221 @@ REPO_ROOT = PACKAGE_ROOT.parent.parent
 DEFAULT_CRITERIA_PATH = REPO_ROOT / "config" / "criteria.yml"
 DEFAULT_VENDORS_DIR = REPO_ROOT / "data" / "vendors"
 
+# Compiled criteria by SHA-256 of the file bytes; cleared when it reaches the limit.
+_COMPILED_CRITERIA: dict[str, CriteriaConfig] = {}
+_COMPILED_CRITERIA_LIMIT = 64
+
 
 def load_criteria(path: Path | str | None = None) -> CriteriaConfig:
-    """Load weighting criteria from YAML, validating the total reaches 100."""
+    """Load weighting criteria from YAML, validating the total reaches 100.
+
+    A weight may instead be a category, ``{weight: 15, metrics: {pipeline: 50, ...}}``, whose
+    weight cascades to its metrics in proportion to their shares; categories nest. Compiled
+    criteria are cached by the file's content hash, so reloading an unchanged file is cheap.
+    """
 
     candidate_paths = _candidate_paths(path, DEFAULT_CRITERIA_PATH)
     for candidate in candidate_paths:
         if candidate.exists():
-            data = _read_yaml(candidate)
-            weights = data.get("weights")
-            if not isinstance(weights, Mapping):
-                raise DataLoadError(f"Weights missing or invalid in {candidate}.")
-            normalized_weights: dict[str, int] = {}
-            for key, value in weights.items():
-                try:
-                    normalized_weights[str(key)] = int(value)
-                except (TypeError, ValueError) as exc:
-                    raise DataLoadError(f"Weight for metric '{key}' must be an integer.") from exc
-            total = sum(normalized_weights.values())
-            if total != 100:
-                raise DataLoadError(
-                    f"Criteria weights must sum to 100; found {total} in {candidate}."
-                )
-            scales_raw = data.get("scales", {})
-            normalized_scales: dict[int, str] = {}
-            if isinstance(scales_raw, Mapping):
-                for key, value in scales_raw.items():
-                    try:
-                        normalized_scales[int(key)] = str(value)
-                    except (TypeError, ValueError) as exc:
-                        raise DataLoadError(f"Scale key '{key}' must be castable to int.") from exc
-            return CriteriaConfig(weights=normalized_weights, scales=normalized_scales)
+            raw = candidate.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            compiled = _COMPILED_CRITERIA.get(digest)
+            if compiled is None:
+                compiled = _compile_criteria(raw, candidate)
+                if len(_COMPILED_CRITERIA) >= _COMPILED_CRITERIA_LIMIT:
+                    _COMPILED_CRITERIA.clear()
+                _COMPILED_CRITERIA[digest] = compiled
+            return CriteriaConfig(
+                weights=dict(compiled.weights),
+                scales=dict(compiled.scales),
+                categories=dict(compiled.categories),
+            )
     searched = ", ".join(str(p) for p in candidate_paths)
     raise DataLoadError(f"Unable to locate criteria configuration. Searched: {searched}.")
 
 
+def _compile_criteria(raw: bytes, origin: Path) -> CriteriaConfig:
+    try:
+        data = yaml.safe_load(raw) or {}
+    except yaml.YAMLError as exc:
+        raise DataLoadError(f"YAML parsing error in {origin}: {exc}") from exc
+    if not isinstance(data, Mapping):
+        raise DataLoadError(f"Expected mapping at {origin}; found {type(data).__name__}.")
+    weights = data.get("weights")
+    if not isinstance(weights, Mapping):
+        raise DataLoadError(f"Weights missing or invalid in {origin}.")
+    top_level: dict[str, int] = {}
+    flat: dict[str, float] = {}
+    categories: dict[str, tuple[str, ...]] = {}
+    for key, value in weights.items():
+        name = _metric_name(key)
+        if isinstance(value, Mapping):
+            top_level[name] = _integer_weight(value.get("weight"), name)
+            leaves = _cascade(name, float(top_level[name]), value)
+            categories[name] = tuple(leaves)
+            flat.update(leaves)
+        else:
+            top_level[name] = flat[name] = _integer_weight(value, name)
+    total = sum(top_level.values())
+    if total != 100:
+        raise DataLoadError(f"Criteria weights must sum to 100; found {total} in {origin}.")
+    scales_raw = data.get("scales", {})
+    normalized_scales: dict[int, str] = {}
+    if isinstance(scales_raw, Mapping):
+        for key, value in scales_raw.items():
+            try:
+                normalized_scales[int(key)] = str(value)
+            except (TypeError, ValueError) as exc:
+                raise DataLoadError(f"Scale key '{key}' must be castable to int.") from exc
+    return CriteriaConfig(weights=flat, scales=normalized_scales, categories=categories)
+
+
+def _cascade(prefix: str, weight: float, category: Mapping[str, Any]) -> dict[str, float]:
+    """Split ``weight`` across a category's metrics by share, recursing into subcategories."""
+
+    children = category.get("metrics")
+    if not isinstance(children, Mapping) or not children:
+        raise DataLoadError(f"Category '{prefix}' needs a non-empty 'metrics' mapping.")
+    shares: dict[str, float] = {}
+    for key, value in children.items():
+        share = value.get("weight") if isinstance(value, Mapping) else value
+        try:
+            shares[_metric_name(key)] = float(share)
+        except (TypeError, ValueError) as exc:
+            raise DataLoadError(f"Share for '{prefix}.{key}' must be a number.") from exc
+    if any(share < 0 for share in shares.values()) or sum(shares.values()) <= 0:
+        raise DataLoadError(f"Shares in category '{prefix}' must be non-negative, not all zero.")
+    total = sum(shares.values())
+    leaves: dict[str, float] = {}
+    for key, value in children.items():
+        name = f"{prefix}.{_metric_name(key)}"
+        portion = weight * shares[_metric_name(key)] / total
+        if isinstance(value, Mapping):
+            leaves.update(_cascade(name, portion, value))
+        else:
+            leaves[name] = portion
+    return leaves
+
+
+def _metric_name(key: object) -> str:
+    name = str(key)
+    if "." in name:
+        raise DataLoadError(f"Metric name '{name}' may not contain '.'; nest it instead.")
+    return name
+
+
+def _integer_weight(value: object, name: str) -> int:
+    try:
+        return int(value)  # type: ignore[call-overload]
+    except (TypeError, ValueError) as exc:
+        raise DataLoadError(f"Weight for metric '{name}' must be an integer.") from exc
+
+
 def load_vendors(directory: Path | str | None = None) -> list[VendorRecord]:
-    """Load CRM vendor payloads from YAML files, skipping Salesforce entries."""
+    """Load CRM vendor payloads from YAML files, skipping Salesforce entries.
+
+    ``directory`` may also point at a single-file bundle written by ``crm-eval bundle pack``,
+    or at a JSON Lines feed (``.jsonl``/``.ndjson``, optionally gzipped) with a vendor per line.
+    """
+
+    return list(iter_vendors(directory))
+
+
+def iter_vendors(directory: Path | str | None = None) -> Iterator[VendorRecord]:
+    """Yield the vendors ``load_vendors`` returns one at a time, in the same order.
+
+    Feeds are parsed line by line as they are consumed, so iterating one holds a single
+    vendor in memory at a time.
+    """
+
+    if directory is not None:
+        from .feed import is_feed, iter_feed
 
+        if is_feed(directory):
+            yield from iter_feed(directory)
+            return
+    if directory is not None and Path(directory).is_file():
+        from .bundle import VendorBundle
+
+        with VendorBundle(directory) as bundle:
+            for vendor in bundle:
+                if not vendor.slug.startswith("salesforce"):
+                    yield vendor
+        return
+    for path in resolve_vendor_files(directory):
+        yield load_vendor_file(path)
+
+
+def resolve_vendor_files(directory: Path | str | None = None) -> list[Path]:
+    """Return the vendor YAML files ``load_vendors`` reads, in load order.
+
+    Only directories hold vendor files: a feed or bundle path raises ``DataLoadError`` rather
+    than falling back to the default catalog.
+    """
+
+    if directory is not None and Path(directory).exists() and not Path(directory).is_dir():
+        raise DataLoadError(
+            f"{directory} is a file, not a directory of vendor files; "
+            "feeds and bundles are read with iter_vendors or load_vendors."
+        )
     candidate_dirs = _candidate_paths(directory, DEFAULT_VENDORS_DIR)
     for candidate in candidate_dirs:
         if candidate.is_dir():
-            vendor_records: list[VendorRecord] = []
-            for path in sorted(candidate.glob("*.yml")) + sorted(candidate.glob("*.yaml")):
-                slug = path.stem.lower()
-                if slug.startswith("salesforce"):
-                    continue
-                payload = _read_yaml(path)
-                if not isinstance(payload, Mapping) or not payload:
-                    raise DataLoadError(f"Vendor file {path} is empty or invalid.")
-                name = str(payload.get("name") or _derive_name_from_slug(slug))
-                merged_payload = dict(payload)
-                merged_payload["name"] = name
-                vendor_records.append(
-                    VendorRecord(slug=slug, name=name, source=path, payload=merged_payload)
-                )
-            if not vendor_records:
+            vendor_paths = [
+                path
+                for path in sorted(candidate.glob("*.yml")) + sorted(candidate.glob("*.yaml"))
+                if not path.stem.lower().startswith("salesforce")
+            ]
+            if not vendor_paths:
                 raise DataLoadError(f"No vendor files found in {candidate}.")
-            return vendor_records
+            return vendor_paths
     searched = ", ".join(str(p) for p in candidate_dirs)
     raise DataLoadError(f"Unable to locate vendor directory. Searched: {searched}.")
 
 
+def catalog_fingerprint(paths: Iterable[Path]) -> str:
+    """Cheap digest of file names, sizes and modification times for cache invalidation."""
+
+    hasher = hashlib.sha256()
+    for path in paths:
+        stat = path.stat()
+        hasher.update(f"{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return hasher.hexdigest()
+
+
+def load_vendor_file(path: Path | str) -> VendorRecord:
+    """Load a single vendor YAML file into a ``VendorRecord``."""
+
+    vendor_path = Path(path)
+    return vendor_record_from_payload(vendor_path, _read_yaml(vendor_path))
+
+
+def vendor_record_from_payload(path: Path, payload: object) -> VendorRecord:
+    """Build a ``VendorRecord`` from a parsed vendor file, deriving the slug from ``path``."""
+
+    slug = path.stem.lower()
+    if not isinstance(payload, Mapping) or not payload:
+        raise DataLoadError(f"Vendor file {path} is empty or invalid.")
+    name = str(payload.get("name") or _derive_name_from_slug(slug))
+    merged_payload = dict(payload)
+    merged_payload["name"] = name
+    return VendorRecord(slug=slug, name=name, source=path, payload=merged_payload)
+
+
+def metric_score(scores: Mapping[str, Any], metric: str) -> Any:
+    """Look up ``metric`` in flattened ``scores``, falling back to its nearest scored parent.
+
+    A vendor scored only on ``sales_core`` thus keeps that score for every
+    ``sales_core.*`` metric of hierarchical criteria. Flat metrics cost a single lookup.
+    """
+
+    value = scores.get(metric)
+    while value is None and "." in metric:
+        metric = metric.rpartition(".")[0]
+        value = scores.get(metric)
+    return value
+
+
 def load_profile(path: Path | str) -> dict[str, Any]:
     """Load a business profile YAML file for scoring context."""
 
@@ -194,6 +399,15 @@ def _read_yaml(path: Path) -> dict[str, Any]:
     return dict(data)
 
 
+def _flatten_scores(scores: Mapping[str, Any], prefix: str, into: dict[str, Any]) -> None:
+    for key, value in scores.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, Mapping):
+            _flatten_scores(value, f"{name}.", into)
+        else:
+            into[name] = value
+
+
 def _derive_name_from_slug(slug: str) -> str:
     """Convert a filename slug into a human-friendly vendor name."""
 
@@ -0,0 +1,228 @@
+"""Near-duplicate vendor detection with MinHash signatures and LSH banding."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .data import VendorRecord
+
+__all__ = [
+    "DuplicateCluster",
+    "collapse_duplicates",
+    "find_duplicate_clusters",
+    "minhash_signature",
+    "vendor_tokens",
+    "DEFAULT_THRESHOLD",
+]
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_NUM_BINS = 128
+DEFAULT_BANDS = 32
+
+_HASH_BITS = 64
+_WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+@dataclass(frozen=True)
+class DuplicateCluster:
+    """Vendors judged to describe the same product; ``representative`` is kept on collapse."""
+
+    representative: VendorRecord
+    members: tuple[VendorRecord, ...]
+    similarity: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "representative": self.representative.slug,
+            "members": [member.slug for member in self.members],
+            "similarity": round(self.similarity, 4),
+        }
+
+
+def vendor_tokens(vendor: VendorRecord) -> set[str]:
+    """Normalise a vendor payload into ``path:word`` tokens, ignoring key order and case."""
+
+    tokens: set[str] = set()
+    _collect_tokens(vendor.payload, "", tokens)
+    return tokens
+
+
+def minhash_signature(tokens: set[str], num_bins: int = DEFAULT_NUM_BINS) -> tuple[int, ...]:
+    """Return a one-permutation MinHash signature with rotation densification.
+
+    Every token is hashed once; the top bits pick one of ``num_bins`` bins and the bin keeps
+    its minimum remaining value. Empty bins borrow the next non-empty bin's value (offset by
+    the distance) so that two signatures agree in a bin with probability close to the
+    Jaccard similarity of their token sets.
+    """
+
+    if num_bins < 1 or num_bins & (num_bins - 1):
+        raise ValueError("MinHash bin count must be a positive power of two.")
+    shift = _HASH_BITS - (num_bins.bit_length() - 1)
+    value_mask = (1 << shift) - 1
+    empty = 1 << shift
+    bins = [empty] * num_bins
+    for token in tokens:
+        hashed = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest())
+        index = hashed >> shift if shift < _HASH_BITS else 0
+        value = hashed & value_mask
+        if value < bins[index]:
+            bins[index] = value
+    if all(value == empty for value in bins):
+        return tuple(bins)
+
+    signature = list(bins)
+    for index in range(num_bins):
+        if bins[index] != empty:
+            continue
+        distance = 1
+        while bins[(index + distance) % num_bins] == empty:
+            distance += 1
+        signature[index] = bins[(index + distance) % num_bins] + distance * (empty + 1)
+    return tuple(signature)
+
+
+def find_duplicate_clusters(
+    vendors: Sequence[VendorRecord],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    num_bins: int = DEFAULT_NUM_BINS,
+    bands: int = DEFAULT_BANDS,
+) -> list[DuplicateCluster]:
+    """Group vendors whose estimated Jaccard similarity reaches ``threshold``.
+
+    Signatures are split into ``bands``; only vendors sharing an identical band become
+    candidate pairs, so the catalog is never compared all-against-all.
+    """
+
+    if not 0 < threshold <= 1:
+        raise ValueError("Duplicate threshold must be in (0, 1].")
+    if bands < 1 or num_bins % bands:
+        raise ValueError("Band count must evenly divide the MinHash bin count.")
+    rows = num_bins // bands
+    signatures = [minhash_signature(vendor_tokens(vendor), num_bins) for vendor in vendors]
+
+    parent = list(range(len(vendors)))
+
+    def find(item: int) -> int:
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    # Identical signatures are merged up front so exact copies never produce quadratic
+    # candidate lists inside a bucket.
+    similarities: dict[tuple[int, int], float] = {}
+    first_seen: dict[tuple[int, ...], int] = {}
+    distinct: list[int] = []
+    for index, signature in enumerate(signatures):
+        original = first_seen.setdefault(signature, index)
+        if original == index:
+            distinct.append(index)
+        else:
+            parent[index] = original
+            similarities[(original, index)] = 1.0
+
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    for index in distinct:
+        signature = signatures[index]
+        for band in range(bands):
+            key = (band, signature[band * rows : (band + 1) * rows])
+            buckets.setdefault(key, []).append(index)
+
+    checked: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for position, left in enumerate(members):
+            for right in members[position + 1 :]:
+                pair = (left, right)
+                if pair in checked or find(left) == find(right):
+                    continue
+                checked.add(pair)
+                similarity = _estimate(signatures[left], signatures[right])
+                if similarity >= threshold:
+                    similarities[pair] = similarity
+                    parent[find(right)] = find(left)
+
+    groups: dict[int, list[int]] = {}
+    for index in range(len(vendors)):
+        groups.setdefault(find(index), []).append(index)
+    weakest: dict[int, float] = {}
+    for (left, _), similarity in similarities.items():
+        root = find(left)
+        weakest[root] = min(similarity, weakest.get(root, 1.0))
+
+    clusters: list[DuplicateCluster] = []
+    for root, indices in groups.items():
+        if len(indices) < 2:
+            continue
+        members = tuple(vendors[index] for index in indices)
+        clusters.append(
+            DuplicateCluster(
+                representative=_choose_representative(members),
+                members=members,
+                similarity=weakest[root],
+            )
+        )
+    clusters.sort(key=lambda cluster: cluster.representative.slug)
+    return clusters
+
+
+def collapse_duplicates(
+    vendors: Sequence[VendorRecord],
+    clusters: Sequence[DuplicateCluster] | None = None,
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[VendorRecord]:
+    """Drop every non-representative cluster member, preserving the original order."""
+
+    if clusters is None:
+        clusters = find_duplicate_clusters(vendors, threshold=threshold)
+    dropped = {
+        member.slug
+        for cluster in clusters
+        for member in cluster.members
+        if member.slug != cluster.representative.slug
+    }
+    return [vendor for vendor in vendors if vendor.slug not in dropped]
+
+
+def _choose_representative(members: Sequence[VendorRecord]) -> VendorRecord:
+    """Prefer the most complete record: most scored metrics, then most fields, then slug."""
+
+    return min(
+        members,
+        key=lambda vendor: (
+            -len(vendor.get_scores()),
+            -len(vendor.payload),
+            len(vendor.slug),
+            vendor.slug,
+        ),
+    )
+
+
+def _estimate(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    matches = sum(1 for a, b in zip(left, right, strict=True) if a == b)
+    return matches / len(left)
+
+
+def _collect_tokens(value: Any, path: str, tokens: set[str]) -> None:
+    if isinstance(value, str):
+        words = _WORD_SPLIT.split(value.lower())
+        tokens.update(f"{path}:{word}" for word in words if word)
+    elif isinstance(value, Mapping):
+        for key, item in value.items():
+            child = f"{path}.{str(key).lower()}" if path else str(key).lower()
+            _collect_tokens(item, child, tokens)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            _collect_tokens(item, path, tokens)
+    elif value is not None:
+        for word in _WORD_SPLIT.split(str(value).lower()):
+            if word:
+                tokens.add(f"{path}:{word}")
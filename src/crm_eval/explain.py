@@ -0,0 +1,258 @@
+"""Rank-flip analysis: the smallest change that would let one vendor overtake another."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .data import CriteriaConfig
+from .scoring import ScoreResult
+
+__all__ = [
+    "RankFlip",
+    "RawScoreChange",
+    "WeightShift",
+    "explain_rank_flips",
+    "render_rank_flips",
+]
+
+MAX_RAW_SCORE = 5.0
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class WeightShift:
+    """Add ``delta`` points to one metric's weight, rescaling the others to keep the total.
+
+    ``delta`` is the exact threshold at which the two vendors tie. ``weights`` is the nearest
+    whole-point weight set that actually swaps them, loadable as a criteria file; it is
+    ``None`` for hierarchical criteria. Shifts that only tie the pair, at a weight of 0 or
+    the full total, or that no whole-point weight set realises, are not reported.
+    """
+
+    metric: str
+    delta: float
+    new_weight: float
+    weights: dict[str, int] | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "metric": self.metric,
+            "delta": round(self.delta, 4),
+            "new_weight": round(self.new_weight, 4),
+            "weights": dict(self.weights) if self.weights is not None else None,
+        }
+
+
+@dataclass(frozen=True)
+class RawScoreChange:
+    """Change one vendor's raw 0–5 score on one metric by ``delta``."""
+
+    vendor: str
+    metric: str
+    delta: float
+    new_score: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "vendor": self.vendor,
+            "metric": self.metric,
+            "delta": round(self.delta, 4),
+            "new_score": round(self.new_score, 4),
+        }
+
+
+@dataclass(frozen=True)
+class RankFlip:
+    """What it would take for ``challenger`` to move ahead of ``leader``.
+
+    ``weight_shifts`` holds the threshold shift for every metric where one exists, smallest
+    first; ``raw_change`` is the smallest single raw-score edit to either vendor.
+    """
+
+    leader: ScoreResult
+    challenger: ScoreResult
+    leader_rank: int
+    challenger_rank: int
+    gap: float
+    weight_shifts: tuple[WeightShift, ...]
+    raw_change: RawScoreChange | None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "leader": self.leader.vendor.slug,
+            "leader_rank": self.leader_rank,
+            "challenger": self.challenger.vendor.slug,
+            "challenger_rank": self.challenger_rank,
+            "gap": round(self.gap, 4),
+            "weight_shifts": [shift.as_dict() for shift in self.weight_shifts],
+            "raw_change": self.raw_change.as_dict() if self.raw_change else None,
+        }
+
+
+def explain_rank_flips(
+    results: Sequence[ScoreResult],
+    criteria: CriteriaConfig,
+    *,
+    top_pairs: int = 0,
+) -> list[RankFlip]:
+    """Analyse every adjacent pair in ``results`` and, optionally, every pair in the top k.
+
+    The total is linear in the weights, ``S = Σ w·raw/5``. For a leader/challenger pair with
+    per-metric differences ``d = (raw_leader - raw_challenger)/5`` and gap ``D = Σ w·d``,
+    adding ``δ`` to weight ``m`` while scaling the remaining weights down proportionally
+    changes the gap by ``δ·g`` with ``g = d_m - (D - w_m·d_m)/(W - w_m)``. The flip threshold
+    is therefore ``δ = -D/g``, kept only when the new weight lies strictly inside ``(0, W)``.
+    A single raw score closes the gap once it moves by ``5·D/w_m``, within the 0–5 scale.
+    """
+
+    metrics = tuple(criteria.weights)
+    weights = [float(criteria.weights[metric]) for metric in metrics]
+    total_weight = sum(weights)
+    whole = not criteria.categories and all(weight.is_integer() for weight in weights)
+    raws = [[result.breakdown[metric]["raw"] for metric in metrics] for result in results]
+
+    pairs = [(index, index + 1) for index in range(len(results) - 1)]
+    limit = min(max(0, top_pairs), len(results))
+    pairs.extend(
+        (leader, challenger) for leader in range(limit) for challenger in range(leader + 2, limit)
+    )
+    pairs.sort()
+
+    flips: list[RankFlip] = []
+    for leader, challenger in pairs:
+        leader_raw = raws[leader]
+        challenger_raw = raws[challenger]
+        diffs = [(a - b) / MAX_RAW_SCORE for a, b in zip(leader_raw, challenger_raw, strict=True)]
+        gap = sum(w * d for w, d in zip(weights, diffs, strict=True))
+
+        shifts: list[WeightShift] = []
+        for metric, weight, diff in zip(metrics, weights, diffs, strict=True):
+            rest = total_weight - weight
+            if rest <= 0:
+                continue
+            slope = diff - (gap - weight * diff) / rest
+            if abs(slope) < _EPSILON:
+                continue
+            delta = -gap / slope
+            new_weight = weight + delta
+            # At 0 or the full total the pair only ties, and the tie-break keeps their order.
+            if not _EPSILON < new_weight < total_weight - _EPSILON:
+                continue
+            rounded = None
+            if whole:
+                rounded = _whole_point_weights(metrics, weights, metric, delta, diffs)
+                if rounded is None:
+                    continue
+            shifts.append(WeightShift(metric, delta, new_weight, weights=rounded))
+        shifts.sort(key=lambda shift: (abs(shift.delta), shift.metric))
+
+        flips.append(
+            RankFlip(
+                leader=results[leader],
+                challenger=results[challenger],
+                leader_rank=leader + 1,
+                challenger_rank=challenger + 1,
+                gap=gap,
+                weight_shifts=tuple(shifts),
+                raw_change=_smallest_raw_change(
+                    results[leader], results[challenger], metrics, weights, gap
+                ),
+            )
+        )
+    return flips
+
+
+def render_rank_flips(flips: Sequence[RankFlip], *, max_rank: int) -> list[str]:
+    """Render Markdown bullets for the flips whose challenger is ranked within ``max_rank``."""
+
+    lines: list[str] = []
+    for flip in flips:
+        if flip.challenger_rank > max_rank:
+            continue
+        challenger = flip.challenger.vendor.name
+        options: list[str] = []
+        if flip.weight_shifts:
+            shift = flip.weight_shifts[0]
+            verb = "add" if shift.delta >= 0 else "remove"
+            preposition = "to" if shift.delta >= 0 else "from"
+            options.append(
+                f"{verb} {abs(shift.delta):.1f} weight points {preposition} `{shift.metric}` "
+                f"(to {shift.new_weight:.1f}, others rescaled)"
+            )
+        change = flip.raw_change
+        if change is not None:
+            owner = flip.leader.vendor.name
+            if change.vendor == flip.challenger.vendor.slug:
+                owner = challenger
+            direction = "raise" if change.delta >= 0 else "lower"
+            options.append(
+                f"{direction} {owner}'s `{change.metric}` score by {abs(change.delta):.2f} "
+                f"(to {change.new_score:.2f})"
+            )
+        remedy = " or ".join(options) if options else "no single-metric change is enough"
+        lines.append(
+            f"- **{challenger}** (#{flip.challenger_rank}) would overtake "
+            f"**{flip.leader.vendor.name}** (#{flip.leader_rank}, {flip.gap:.2f} pts ahead): "
+            f"{remedy}."
+        )
+    return lines
+
+
+def _whole_point_weights(
+    metrics: Sequence[str],
+    weights: Sequence[float],
+    metric: str,
+    delta: float,
+    diffs: Sequence[float],
+) -> dict[str, int] | None:
+    """Integer weights with the same total that put the challenger strictly ahead.
+
+    The shift is rounded away from zero to whole points and the other weights rescaled by
+    largest remainder. Rounding can leave the pair tied, so further points are tried until
+    the challenger leads or the metric's weight would reach 0 or the full total.
+    """
+
+    total = round(sum(weights))
+    index = metrics.index(metric)
+    rest = total - weights[index]
+    step = 1 if delta > 0 else -1
+    points = math.ceil(abs(delta) - _EPSILON)
+    while 0 < weights[index] + step * points < total:
+        target = int(weights[index]) + step * points
+        exact = [weight * (total - target) / rest for weight in weights]
+        rounded = [math.floor(value) for value in exact]
+        rounded[index] = target
+        others = [position for position in range(len(weights)) if position != index]
+        others.sort(key=lambda position: (rounded[position] - exact[position], position))
+        for position in others[: total - sum(rounded)]:
+            rounded[position] += 1
+        if sum(w * d for w, d in zip(rounded, diffs, strict=True)) < -_EPSILON:
+            return dict(zip(metrics, rounded, strict=True))
+        points += 1
+    return None
+
+
+def _smallest_raw_change(
+    leader: ScoreResult,
+    challenger: ScoreResult,
+    metrics: Sequence[str],
+    weights: Sequence[float],
+    gap: float,
+) -> RawScoreChange | None:
+    best: RawScoreChange | None = None
+    for metric, weight in zip(metrics, weights, strict=True):
+        if weight <= 0:
+            continue
+        delta = MAX_RAW_SCORE * gap / weight
+        if best is not None and delta >= abs(best.delta):
+            continue
+        raised = challenger.breakdown[metric]["raw"] + delta
+        lowered = leader.breakdown[metric]["raw"] - delta
+        if raised <= MAX_RAW_SCORE + _EPSILON:
+            best = RawScoreChange(challenger.vendor.slug, metric, delta, min(raised, MAX_RAW_SCORE))
+        elif lowered >= -_EPSILON:
+            best = RawScoreChange(leader.vendor.slug, metric, -delta, max(lowered, 0.0))
+    return best
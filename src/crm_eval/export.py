@@ -0,0 +1,298 @@
+"""Stream the ranked vendor × metric score matrix to CSV, TSV or a typed columnar file."""
+
+from __future__ import annotations
+
+import csv
+import heapq
+import json
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Any
+
+from .data import CriteriaConfig, DataLoadError, VendorRecord
+from .scoring import DEFAULT_MISSING_SCORE, Normalizer, score_vendor
+
+__all__ = [
+    "COLUMNAR_FORMAT",
+    "COLUMNAR_MAGIC",
+    "DEFAULT_CHUNK_ROWS",
+    "EXPORT_FORMATS",
+    "export_columns",
+    "export_scores",
+    "iter_ranked_rows",
+    "read_columnar",
+]
+
+EXPORT_FORMATS = ("csv", "tsv", "columnar")
+COLUMNAR_FORMAT = "crm-eval-columnar/v1"
+COLUMNAR_MAGIC = b"CRMCOL1\n"
+DEFAULT_CHUNK_ROWS = 50_000
+
+_COUNT = struct.Struct("<I")
+_LENGTH = struct.Struct("<Q")
+_ARRAY_CODES = {"i64": "q", "f64": "d"}
+
+
+def export_columns(criteria: CriteriaConfig) -> list[tuple[str, str]]:
+    """Return ``(name, type)`` for every exported column, in order.
+
+    Each metric contributes a ``<metric>.raw`` and a ``<metric>.weighted`` column, rounded like
+    the JSON scorecard; ``missing_metrics`` joins the defaulted metrics with ``;``.
+    """
+
+    columns = [("rank", "i64"), ("slug", "str"), ("name", "str"), ("total", "f64")]
+    for metric in criteria.weights:
+        columns.append((f"{metric}.raw", "f64"))
+        columns.append((f"{metric}.weighted", "f64"))
+    columns.append(("missing_metrics", "str"))
+    return columns
+
+
+def iter_ranked_rows(
+    vendors: Iterable[VendorRecord],
+    criteria: CriteriaConfig,
+    *,
+    default_missing_score: float = DEFAULT_MISSING_SCORE,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    normalizer: Normalizer | None = None,
+) -> Iterator[tuple[Any, ...]]:
+    """Score ``vendors`` one at a time and yield flat rows in ``rank_vendors`` order.
+
+    Only compact rows are kept, never payloads. Once more than ``chunk_rows`` have been seen,
+    each sorted chunk is spilled to a temporary file and the chunks are k-way merged, so
+    memory stays bounded by the chunk size however large the catalog is.
+    """
+
+    if chunk_rows < 1:
+        raise ValueError("Chunk size must be at least 1 row.")
+    metrics = tuple(criteria.weights)
+    with ExitStack() as stack:
+        runs: list[Iterator[list[Any]]] = []
+        chunk: list[list[Any]] = []
+        for position, vendor in enumerate(vendors):
+            result = score_vendor(
+                vendor,
+                criteria.weights,
+                default_missing_score=default_missing_score,
+                normalizer=normalizer,
+            )
+            cells: list[Any] = []
+            for metric in metrics:
+                values = result.breakdown[metric]
+                cells.append(round(values["raw"], 2))
+                cells.append(round(values["weighted"], 4))
+            chunk.append(
+                [
+                    -result.total,
+                    vendor.name.lower(),
+                    position,
+                    vendor.slug,
+                    vendor.name,
+                    cells,
+                    ";".join(result.missing_metrics),
+                ]
+            )
+            if len(chunk) >= chunk_rows:
+                runs.append(_spill(chunk, stack))
+                chunk = []
+        chunk.sort(key=lambda row: row[:3])
+        runs.append(iter(chunk))
+
+        merged = heapq.merge(*runs, key=lambda row: row[:3]) if len(runs) > 1 else runs[0]
+        for rank, (neg_total, _, _, slug, name, cells, missing) in enumerate(merged, start=1):
+            yield (rank, slug, name, -neg_total, *cells, missing)
+
+
+def export_scores(
+    vendors: Iterable[VendorRecord],
+    criteria: CriteriaConfig,
+    out: Path | str,
+    *,
+    fmt: str = "csv",
+    default_missing_score: float = DEFAULT_MISSING_SCORE,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    normalizer: Normalizer | None = None,
+) -> int:
+    """Write the ranked score matrix to ``out`` (``-`` for stdout) and return the row count.
+
+    ``columnar`` files hold row groups of up to ``chunk_rows`` rows; within a group each column
+    is one zlib-compressed block of little-endian ``i64``/``f64`` values or, for strings,
+    ``i64`` end offsets followed by UTF-8 bytes. ``read_columnar`` reads them back.
+    """
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Export format must be one of: {', '.join(EXPORT_FORMATS)}.")
+    columns = export_columns(criteria)
+    rows = iter_ranked_rows(
+        vendors,
+        criteria,
+        default_missing_score=default_missing_score,
+        chunk_rows=chunk_rows,
+        normalizer=normalizer,
+    )
+    if fmt == "columnar":
+        if str(out) == "-":
+            raise ValueError("The columnar format needs a file path, not stdout.")
+        return _write_columnar(Path(out), columns, rows, chunk_rows)
+
+    with ExitStack() as stack:
+        if str(out) == "-":
+            handle: IO[str] = sys.stdout
+        else:
+            target = Path(out)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            handle = stack.enter_context(target.open("w", encoding="utf-8", newline=""))
+        writer = csv.writer(handle, delimiter="," if fmt == "csv" else "\t", lineterminator="\n")
+        writer.writerow(name for name, _ in columns)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def read_columnar(
+    path: Path | str,
+) -> tuple[list[tuple[str, str]], Iterator[dict[str, Sequence[Any]]]]:
+    """Open a columnar export, returning its columns and a lazy iterator of row groups.
+
+    Each row group maps column names to equal-length sequences.
+    """
+
+    source = Path(path)
+    try:
+        with source.open("rb") as handle:
+            columns = _read_schema(handle, source)
+    except FileNotFoundError as exc:
+        raise DataLoadError(f"Columnar export not found: {source}") from exc
+
+    def groups() -> Iterator[dict[str, Sequence[Any]]]:
+        with source.open("rb") as handle:
+            _read_schema(handle, source)
+            while True:
+                (count,) = _COUNT.unpack(_read_exact(handle, _COUNT.size, source))
+                if count == 0:
+                    return
+                group: dict[str, Sequence[Any]] = {}
+                for name, kind in columns:
+                    (length,) = _LENGTH.unpack(_read_exact(handle, _LENGTH.size, source))
+                    try:
+                        block = zlib.decompress(_read_exact(handle, length, source))
+                    except zlib.error as exc:
+                        raise DataLoadError(f"Column '{name}' in {source} is corrupt.") from exc
+                    group[name] = _decode_column(kind, block, count)
+                yield group
+
+    return columns, groups()
+
+
+def _spill(chunk: list[list[Any]], stack: ExitStack) -> Iterator[list[Any]]:
+    chunk.sort(key=lambda row: row[:3])
+    handle = stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8"))
+    for row in chunk:
+        handle.write(json.dumps(row, separators=(",", ":")))
+        handle.write("\n")
+    handle.seek(0)
+    return (json.loads(line) for line in handle)
+
+
+def _write_columnar(
+    target: Path,
+    columns: list[tuple[str, str]],
+    rows: Iterator[tuple[Any, ...]],
+    group_rows: int,
+) -> int:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    schema = json.dumps(
+        {"format": COLUMNAR_FORMAT, "columns": [list(column) for column in columns]},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    count = 0
+    with target.open("wb") as handle:
+        handle.write(COLUMNAR_MAGIC)
+        handle.write(_COUNT.pack(len(schema)))
+        handle.write(schema)
+        group: list[tuple[Any, ...]] = []
+        for row in rows:
+            group.append(row)
+            if len(group) >= group_rows:
+                _write_group(handle, columns, group)
+                count += len(group)
+                group = []
+        if group:
+            _write_group(handle, columns, group)
+            count += len(group)
+        handle.write(_COUNT.pack(0))
+    return count
+
+
+def _write_group(handle: IO[bytes], columns: list[tuple[str, str]], group: list[tuple]) -> None:
+    handle.write(_COUNT.pack(len(group)))
+    for index, (_, kind) in enumerate(columns):
+        block = zlib.compress(_encode_column(kind, [row[index] for row in group]), 6)
+        handle.write(_LENGTH.pack(len(block)))
+        handle.write(block)
+
+
+def _encode_column(kind: str, values: list[Any]) -> bytes:
+    if kind == "str":
+        blobs = [str(value).encode("utf-8") for value in values]
+        ends = array("q")
+        offset = 0
+        for blob in blobs:
+            offset += len(blob)
+            ends.append(offset)
+        return _little_endian(ends) + b"".join(blobs)
+    return _little_endian(array(_ARRAY_CODES[kind], values))
+
+
+def _decode_column(kind: str, block: bytes, count: int) -> Sequence[Any]:
+    if kind == "str":
+        ends = _from_little_endian("q", block[: count * 8])
+        text = block[count * 8 :]
+        start = 0
+        strings: list[str] = []
+        for end in ends:
+            strings.append(text[start:end].decode("utf-8"))
+            start = end
+        return strings
+    return _from_little_endian(_ARRAY_CODES[kind], block)
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(code: str, data: bytes) -> array:
+    values = array(code)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _read_schema(handle: IO[bytes], source: Path) -> list[tuple[str, str]]:
+    if handle.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise DataLoadError(f"{source} is not a crm-eval columnar export.")
+    (length,) = _COUNT.unpack(_read_exact(handle, _COUNT.size, source))
+    try:
+        schema = json.loads(_read_exact(handle, length, source))
+        return [(str(name), str(kind)) for name, kind in schema["columns"]]
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+        raise DataLoadError(f"{source} has a malformed columnar schema.") from exc
+
+
+def _read_exact(handle: IO[bytes], size: int, source: Path) -> bytes:
+    data = handle.read(size)
+    if len(data) != size:
+        raise DataLoadError(f"Columnar export {source} is truncated.")
+    return data
@@ -0,0 +1,86 @@
+"""Streaming JSON Lines vendor feeds, optionally gzip-compressed."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import re
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from .data import DataLoadError, VendorRecord, vendor_record_from_payload
+
+__all__ = ["FEED_SUFFIXES", "feed_slug", "is_feed", "iter_feed"]
+
+FEED_SUFFIXES = (".jsonl", ".ndjson")
+
+# Read-ahead for decompressed feeds; gzip's own buffer is small for multi-gigabyte inputs.
+_READ_BUFFER = 1 << 20
+
+
+def is_feed(path: Path | str) -> bool:
+    """Return whether ``path`` names a JSON Lines feed: ``.jsonl`` or ``.ndjson``, maybe ``.gz``."""
+
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes.pop()
+    return bool(suffixes) and suffixes[-1] in FEED_SUFFIXES
+
+
+def iter_feed(path: Path | str) -> Iterator[VendorRecord]:
+    """Yield one ``VendorRecord`` per line of a feed, reading it incrementally.
+
+    Each non-blank line is a vendor payload as a JSON object. Its slug is the ``slug`` field,
+    else derived from ``name``; vendors whose slug starts with ``salesforce`` are skipped, as
+    in a vendor directory. Records get a virtual source path ``<feed>/<slug>.json``. Only one
+    line is decoded at a time, so memory stays flat however large the feed is.
+    """
+
+    feed_path = Path(path)
+    try:
+        handle = _open(feed_path)
+    except FileNotFoundError as exc:
+        raise DataLoadError(f"Vendor feed not found: {feed_path}") from exc
+    with handle:
+        try:
+            for number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    payload = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+                    raise DataLoadError(
+                        f"Invalid JSON on line {number} of {feed_path}: {exc}"
+                    ) from exc
+                if not isinstance(payload, dict) or not payload:
+                    raise DataLoadError(f"Line {number} of {feed_path} is empty or invalid.")
+                slug = feed_slug(payload)
+                if not slug:
+                    raise DataLoadError(
+                        f"Line {number} of {feed_path} needs a 'slug' or 'name' field."
+                    )
+                if slug.startswith("salesforce"):
+                    continue
+                yield vendor_record_from_payload(feed_path / f"{slug}.json", payload)
+        except (OSError, EOFError, zlib.error) as exc:
+            raise DataLoadError(f"Could not read vendor feed {feed_path}: {exc}") from exc
+
+
+def feed_slug(payload: dict[str, object]) -> str:
+    """The slug a feed record is loaded under: its ``slug`` field, else its slugified ``name``."""
+
+    explicit = payload.get("slug")
+    source = explicit if explicit else payload.get("name")
+    if not source:
+        return ""
+    return re.sub(r"[^a-z0-9]+", "_", str(source).lower()).strip("_")
+
+
+def _open(path: Path) -> BinaryIO:
+    if path.suffix.lower() == ".gz":
+        compressed = gzip.open(path, "rb")
+        return io.BufferedReader(compressed, buffer_size=_READ_BUFFER)  # type: ignore[arg-type]
+    return path.open("rb", buffering=_READ_BUFFER)
@@ -0,0 +1,384 @@
+"""Fit criteria weights to historical vendor selections with a pairwise ranking loss."""
+
+from __future__ import annotations
+
+import json
+import math
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import repeat
+from operator import add, mul, neg, sub, truediv
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .data import CriteriaConfig, DataLoadError, VendorRecord, load_profile, metric_score
+from .scoring import DEFAULT_MISSING_SCORE
+
+__all__ = [
+    "Decision",
+    "FitResult",
+    "fit_weights",
+    "load_decisions",
+    "round_weights",
+    "write_criteria",
+]
+
+MAX_RAW_SCORE = 5.0
+WEIGHT_TOTAL = 100
+DEFAULT_TEMPERATURE = 5.0
+DEFAULT_REGULARIZATION = 0.1
+DEFAULT_MAX_ITERATIONS = 500
+# Margins are clipped here so exp(-margin) stays finite.
+_MAX_EXPONENT = 700.0
+
+
+@dataclass(frozen=True)
+class Decision:
+    """One past evaluation: the vendor the client chose over the ones it rejected.
+
+    ``scores`` optionally pins the raw scores vendors had at the time, by slug and metric;
+    anything not pinned is read from the current catalog.
+    """
+
+    chosen: str
+    rejected: tuple[str, ...]
+    profile: dict[str, Any] = field(default_factory=dict)
+    scores: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], *, base_dir: Path | None = None) -> Decision:
+        chosen = data.get("chosen")
+        rejected = data.get("rejected")
+        if not isinstance(chosen, str) or not chosen:
+            raise DataLoadError("Each decision needs a 'chosen' vendor slug.")
+        if isinstance(rejected, str):
+            rejected = [rejected]
+        if not isinstance(rejected, Iterable) or not rejected:
+            raise DataLoadError(f"Decision for '{chosen}' needs at least one rejected vendor.")
+        profile = data.get("profile") or {}
+        if isinstance(profile, str):
+            path = Path(profile)
+            if base_dir is not None and not path.is_absolute():
+                path = base_dir / path
+            profile = load_profile(path)
+        if not isinstance(profile, Mapping):
+            raise DataLoadError(f"Decision for '{chosen}' has an invalid profile.")
+        scores = data.get("scores") or {}
+        if not isinstance(scores, Mapping) or not all(
+            isinstance(values, Mapping) for values in scores.values()
+        ):
+            raise DataLoadError(f"Decision for '{chosen}' has invalid pinned scores.")
+        return cls(
+            chosen=chosen,
+            rejected=tuple(str(slug) for slug in rejected if str(slug) != chosen),
+            profile=dict(profile),
+            scores={str(slug): dict(values) for slug, values in scores.items()},
+        )
+
+    def matches(self, conditions: Mapping[str, str]) -> bool:
+        """True when every ``profile`` field named in ``conditions`` has that value (or contains
+        it, for list fields)."""
+
+        for key, wanted in conditions.items():
+            value = self.profile.get(key)
+            if isinstance(value, (list, tuple)):
+                if wanted not in {str(item) for item in value}:
+                    return False
+            elif str(value) != wanted:
+                return False
+        return True
+
+
+@dataclass(frozen=True)
+class FitResult:
+    """Fitted weights with how well they, and the starting weights, explain the decisions."""
+
+    weights: dict[str, int]
+    exact_weights: dict[str, float]
+    loss: float
+    iterations: int
+    decisions: int
+    pairs: int
+    unique_pairs: int
+    skipped: int
+    pairwise_accuracy: float
+    baseline_pairwise_accuracy: float
+    top1_accuracy: float
+    baseline_top1_accuracy: float
+
+    def criteria(self, scales: Mapping[int, str]) -> CriteriaConfig:
+        return CriteriaConfig(weights=dict(self.weights), scales=dict(scales))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "weights": dict(self.weights),
+            "exact_weights": {m: round(w, 4) for m, w in self.exact_weights.items()},
+            "loss": round(self.loss, 6),
+            "iterations": self.iterations,
+            "decisions": self.decisions,
+            "pairs": self.pairs,
+            "unique_pairs": self.unique_pairs,
+            "skipped": self.skipped,
+            "pairwise_accuracy": round(self.pairwise_accuracy, 4),
+            "baseline_pairwise_accuracy": round(self.baseline_pairwise_accuracy, 4),
+            "top1_accuracy": round(self.top1_accuracy, 4),
+            "baseline_top1_accuracy": round(self.baseline_top1_accuracy, 4),
+        }
+
+
+def load_decisions(path: Path | str) -> list[Decision]:
+    """Read decisions from JSON Lines, or from YAML/JSON holding a list or ``decisions: [...]``.
+
+    A string ``profile`` is a path to a profile file, relative to the decisions file.
+    """
+
+    source = Path(path)
+    try:
+        text = source.read_text(encoding="utf-8")
+    except FileNotFoundError as exc:
+        raise DataLoadError(f"Decisions file not found: {source}") from exc
+    try:
+        if source.suffix == ".jsonl":
+            records: Any = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            records = yaml.safe_load(text)
+    except (json.JSONDecodeError, yaml.YAMLError) as exc:
+        raise DataLoadError(f"Could not parse decisions in {source}: {exc}") from exc
+    if isinstance(records, Mapping):
+        records = records.get("decisions")
+    if not isinstance(records, list):
+        raise DataLoadError(f"{source} must hold a list of decisions.")
+    decisions: list[Decision] = []
+    for record in records:
+        if not isinstance(record, Mapping):
+            raise DataLoadError(f"Every decision in {source} must be a mapping.")
+        decisions.append(Decision.from_dict(record, base_dir=source.parent))
+    return decisions
+
+
+def fit_weights(
+    decisions: Sequence[Decision],
+    vendors: Iterable[VendorRecord],
+    criteria: CriteriaConfig,
+    *,
+    temperature: float = DEFAULT_TEMPERATURE,
+    regularization: float = DEFAULT_REGULARIZATION,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    tolerance: float = 1e-9,
+    default_missing_score: float = DEFAULT_MISSING_SCORE,
+) -> FitResult:
+    """Fit non-negative weights summing to 100 so chosen vendors outscore rejected ones.
+
+    Every (chosen, rejected) pair contributes ``log(1 + exp(-Δ / temperature))``, where ``Δ`` is
+    the chosen vendor's lead in total points, and ``regularization`` pulls the weights towards
+    ``criteria``'s. The weights stay on the simplex under exponentiated-gradient steps with
+    backtracking. Identical pairs are collapsed into one weighted difference vector and the
+    vectors are stored column-major, so each step is a few passes over the unique pairs.
+    Decisions naming vendors missing from ``vendors`` are skipped.
+    """
+
+    if temperature <= 0:
+        raise ValueError("temperature must be positive.")
+    if regularization < 0:
+        raise ValueError("regularization must be non-negative.")
+    metrics = tuple(criteria.weights)
+    if not metrics:
+        raise ValueError("The criteria define no metrics to weight.")
+    catalog = {vendor.slug: vendor for vendor in vendors}
+    vectors: dict[str, tuple[float, ...]] = {}
+
+    def vector(slug: str, pinned: Mapping[str, Mapping[str, Any]]) -> tuple[float, ...] | None:
+        if slug in pinned:
+            vendor = catalog.get(slug)
+            scores = {**(vendor.get_scores() if vendor else {}), **pinned[slug]}
+            return _score_vector(scores, metrics, default_missing_score)
+        if slug not in vectors:
+            vendor = catalog.get(slug)
+            if vendor is None:
+                return None
+            vectors[slug] = _score_vector(vendor.get_scores(), metrics, default_missing_score)
+        return vectors[slug]
+
+    groups: list[list[tuple[float, ...]]] = []
+    counts: dict[tuple[float, ...], int] = {}
+    skipped = 0
+    for decision in decisions:
+        chosen = vector(decision.chosen, decision.scores)
+        rejected = [vector(slug, decision.scores) for slug in decision.rejected]
+        if chosen is None or any(other is None for other in rejected) or not rejected:
+            skipped += 1
+            continue
+        groups.append([chosen, *rejected])  # type: ignore[list-item]
+        for other in rejected:
+            difference = tuple(map(sub, chosen, other))  # type: ignore[arg-type]
+            counts[difference] = counts.get(difference, 0) + 1
+    if not counts:
+        raise ValueError("No usable decisions: every one names a vendor missing from the catalog.")
+
+    columns = [array("d", column) for column in zip(*counts, strict=True)]
+    multiplicity = array("d", counts.values())
+    pairs = int(sum(multiplicity))
+    scale = WEIGHT_TOTAL / temperature
+    prior_total = sum(criteria.weights.values()) or 1
+    prior = [max(0.0, criteria.weights[m] / prior_total) for m in metrics]
+
+    def objective(weights: list[float]) -> tuple[float, list[float]]:
+        margins = [0.0] * len(multiplicity)
+        for column, weight in zip(columns, weights, strict=True):
+            if weight:
+                margins = list(map(add, margins, map(mul, column, repeat(weight * scale))))
+        # exp(-margin) once per pair gives both log(1 + e^-m) and the pull e^-m / (1 + e^-m).
+        decays = list(map(math.exp, map(neg, map(max, margins, repeat(-_MAX_EXPONENT)))))
+        loss = sum(map(mul, map(math.log1p, decays), multiplicity)) / pairs
+        pulls = list(map(mul, map(truediv, decays, map(add, decays, repeat(1.0))), multiplicity))
+        gradient = [
+            -scale * sum(map(mul, column, pulls)) / pairs + 2 * regularization * (weight - anchor)
+            for column, weight, anchor in zip(columns, weights, prior, strict=True)
+        ]
+        loss += regularization * sum((w - a) ** 2 for w, a in zip(weights, prior, strict=True))
+        return loss, gradient
+
+    # Exponentiated gradient cannot revive an exactly zero weight, so start inside the simplex.
+    weights = [0.5 * anchor + 0.5 / len(metrics) for anchor in prior]
+    loss, gradient = objective(weights)
+    step = 1.0
+    iterations = 0
+    while iterations < max(0, max_iterations):
+        iterations += 1
+        shift = min(gradient)
+        candidate = [
+            w * math.exp(-step * (g - shift)) for w, g in zip(weights, gradient, strict=True)
+        ]
+        total = sum(candidate)
+        candidate = [w / total for w in candidate]
+        new_loss, new_gradient = objective(candidate)
+        if new_loss > loss:
+            step *= 0.5
+            if step < 1e-12:
+                break
+            continue
+        improvement = loss - new_loss
+        weights, loss, gradient = candidate, new_loss, new_gradient
+        step *= 1.25
+        if improvement <= tolerance * max(1.0, loss):
+            break
+
+    exact = {metric: WEIGHT_TOTAL * weight for metric, weight in zip(metrics, weights, strict=True)}
+    baseline = [criteria.weights[m] / prior_total * WEIGHT_TOTAL for m in metrics]
+    fitted = [exact[m] for m in metrics]
+    return FitResult(
+        weights=round_weights(exact),
+        exact_weights=exact,
+        loss=loss,
+        iterations=iterations,
+        decisions=len(groups),
+        pairs=pairs,
+        unique_pairs=len(multiplicity),
+        skipped=skipped,
+        pairwise_accuracy=_pairwise_accuracy(columns, multiplicity, fitted, pairs),
+        baseline_pairwise_accuracy=_pairwise_accuracy(columns, multiplicity, baseline, pairs),
+        top1_accuracy=_top1_accuracy(groups, fitted),
+        baseline_top1_accuracy=_top1_accuracy(groups, baseline),
+    )
+
+
+def round_weights(exact: Mapping[str, float], total: int = WEIGHT_TOTAL) -> dict[str, int]:
+    """Round to integers summing to ``total``, giving leftover points to the largest remainders."""
+
+    scale = total / (sum(exact.values()) or 1.0)
+    scaled = {metric: value * scale for metric, value in exact.items()}
+    rounded = {metric: math.floor(value) for metric, value in scaled.items()}
+    leftover = total - sum(rounded.values())
+    by_remainder = sorted(scaled, key=lambda metric: (rounded[metric] - scaled[metric], metric))
+    for metric in by_remainder[:leftover]:
+        rounded[metric] += 1
+    return rounded
+
+
+def write_criteria(path: Path | str, criteria: CriteriaConfig) -> None:
+    """Write ``criteria`` as YAML that ``load_criteria`` reads back.
+
+    Dotted metrics of hierarchical criteria are written as nested categories whose shares
+    are the leaf weights, so the file compiles back to the same flat weights.
+    """
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    document = {"weights": _nest_weights(criteria.weights), "scales": dict(criteria.scales)}
+    target.write_text(
+        yaml.safe_dump(document, sort_keys=False, allow_unicode=True), encoding="utf-8"
+    )
+
+
+def _nest_weights(weights: Mapping[str, float]) -> dict[str, Any]:
+    tree: dict[str, Any] = {}
+    for metric, weight in weights.items():
+        *parents, leaf = metric.split(".")
+        node = tree
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = weight
+    return {name: _nest_node(node) for name, node in tree.items()}
+
+
+def _nest_node(node: Any) -> Any:
+    if not isinstance(node, dict):
+        return node
+    metrics = {name: _nest_node(child) for name, child in node.items()}
+    shares = {name: _node_weight(child) for name, child in metrics.items()}
+    if not any(shares.values()):
+        # A category fitted down to zero still needs shares the loader accepts.
+        metrics = {name: _with_weight(child, 1) for name, child in metrics.items()}
+    return {"weight": sum(shares.values()), "metrics": metrics}
+
+
+def _node_weight(node: Any) -> Any:
+    return node["weight"] if isinstance(node, dict) else node
+
+
+def _with_weight(node: Any, weight: int) -> Any:
+    return {**node, "weight": weight} if isinstance(node, dict) else weight
+
+
+def _score_vector(
+    scores: Mapping[str, Any], metrics: Sequence[str], default_missing_score: float
+) -> tuple[float, ...]:
+    """Raw scores clamped and scaled to 0–1, as ``score_vendor`` weighs them."""
+
+    vector: list[float] = []
+    for metric in metrics:
+        value = metric_score(scores, metric)
+        try:
+            number = float(value) if value is not None else default_missing_score
+        except (TypeError, ValueError):
+            number = default_missing_score
+        if math.isnan(number):
+            number = default_missing_score
+        vector.append(max(0.0, min(MAX_RAW_SCORE, number)) / MAX_RAW_SCORE)
+    return tuple(vector)
+
+
+def _pairwise_accuracy(
+    columns: Sequence[array], multiplicity: array, weights: Sequence[float], pairs: int
+) -> float:
+    margins = [0.0] * len(multiplicity)
+    for column, weight in zip(columns, weights, strict=True):
+        margins = list(map(add, margins, map(mul, column, repeat(weight))))
+    won = math.fsum(
+        count for margin, count in zip(margins, multiplicity, strict=True) if margin > 1e-9
+    )
+    return won / pairs
+
+
+def _top1_accuracy(groups: Sequence[Sequence[Sequence[float]]], weights: Sequence[float]) -> float:
+    if not groups:
+        return 0.0
+    correct = 0
+    for chosen, *rejected in groups:
+        best = sum(map(mul, chosen, weights))
+        if all(sum(map(mul, other, weights)) < best - 1e-9 for other in rejected):
+            correct += 1
+    return correct / len(groups)
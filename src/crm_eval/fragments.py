@@ -0,0 +1,151 @@
+"""Cache of rendered per-vendor Markdown fragments shared across report builders."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from .scoring import ScoreResult
+
+__all__ = ["FragmentCache", "fragment_key", "DEFAULT_MAX_FRAGMENTS"]
+
+DEFAULT_MAX_FRAGMENTS = 4096
+FRAGMENT_VERSION = 1
+
+Renderer = Callable[[ScoreResult], list[str]]
+
+
+def fragment_key(kind: str, result: ScoreResult) -> str:
+    """Key a fragment by its kind, the vendor content hash and the score-derived fields."""
+
+    material = json.dumps(
+        [
+            FRAGMENT_VERSION,
+            kind,
+            result.vendor.content_hash,
+            result.total,
+            list(result.missing_metrics),
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class FragmentCache:
+    """Thread-safe LRU of rendered fragments with an optional on-disk layer.
+
+    The in-memory layer keeps at most ``max_entries`` fragments. When ``directory`` is given,
+    fragments are also persisted one file per key so later runs and other profiles reuse
+    them; the least recently used files are pruned once the directory exceeds the same cap.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str | None = None,
+        *,
+        max_entries: int = DEFAULT_MAX_FRAGMENTS,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("Fragment cache size must be at least 1.")
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_count: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(self, kind: str, result: ScoreResult, renderer: Renderer) -> list[str]:
+        """Return the cached lines for ``(kind, result)``, rendering them on a miss."""
+
+        key = fragment_key(kind, result)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(cached)
+        cached = self._read_disk(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+                self._remember(key, cached)
+            return list(cached)
+
+        lines = tuple(renderer(result))
+        with self._lock:
+            self.misses += 1
+            self._remember(key, lines)
+        self._write_disk(key, lines)
+        return list(lines)
+
+    def clear(self) -> None:
+        """Drop the in-memory layer; on-disk fragments are left for later runs."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, lines: tuple[str, ...]) -> None:
+        self._entries[key] = lines
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str) -> tuple[str, ...] | None:
+        if self.directory is None:
+            return None
+        path = self.directory / f"{key}.json"
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                lines = json.load(handle)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if not isinstance(lines, list):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return tuple(str(line) for line in lines)
+
+    def _write_disk(self, key: str, lines: tuple[str, ...]) -> None:
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / f"{key}.json"
+        temp = target.with_name(f".{target.name}.{threading.get_ident()}.tmp")
+        with temp.open("w", encoding="utf-8") as handle:
+            json.dump(list(lines), handle)
+        temp.replace(target)
+        with self._lock:
+            if self._disk_count is None:
+                self._disk_count = sum(1 for _ in self.directory.glob("*.json"))
+            else:
+                self._disk_count += 1
+            over_capacity = self._disk_count > self.max_entries
+        if over_capacity:
+            self._prune_disk(self.directory)
+
+    def _prune_disk(self, directory: Path) -> None:
+        """Remove least recently used files until the directory is 10% under the cap."""
+
+        files = []
+        for path in directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                continue
+        files.sort()
+        keep = max(1, int(self.max_entries * 0.9))
+        for _, path in files[: max(0, len(files) - keep)]:
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._disk_count = min(len(files), keep)
@@ -0,0 +1,355 @@
+"""Append-only, compressed store of scorecard runs with indexed trend queries."""
+
+from __future__ import annotations
+
+import json
+import re
+import struct
+import zlib
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+from . import __version__
+from .data import CriteriaConfig, DataLoadError
+from .scoring import ScoreResult
+
+__all__ = [
+    "HistoryStore",
+    "MetricPoint",
+    "RunInfo",
+    "SeriesPoint",
+]
+
+HISTORY_VERSION = 1
+SEGMENT_NAME = "runs.z"
+INDEX_NAME = "index.jsonl"
+SERIES_DIR = "series"
+
+_FRAME = struct.Struct("<I")
+_UNSAFE = re.compile(r"[^0-9a-z_.-]+")
+
+
+@dataclass(frozen=True)
+class RunInfo:
+    """Index entry for one recorded run."""
+
+    run: int
+    timestamp: str
+    label: str | None
+    metadata: dict[str, Any]
+    metrics: tuple[str, ...]
+    weights: tuple[float, ...]
+    means: tuple[float, ...]
+    vendors: int
+    offset: int
+    length: int
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "run": self.run,
+            "timestamp": self.timestamp,
+            "label": self.label,
+            "metadata": dict(self.metadata),
+            "metrics": list(self.metrics),
+            "weights": list(self.weights),
+            "means": list(self.means),
+            "vendors": self.vendors,
+            "offset": self.offset,
+            "length": self.length,
+        }
+
+
+@dataclass(frozen=True)
+class SeriesPoint:
+    """A vendor's total (or one metric's raw score) in one run."""
+
+    run: int
+    timestamp: str
+    rank: int
+    value: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "run": self.run,
+            "timestamp": self.timestamp,
+            "rank": self.rank,
+            "value": round(self.value, 4),
+        }
+
+
+@dataclass(frozen=True)
+class MetricPoint:
+    """A metric's weight and catalog-wide mean raw score in one run."""
+
+    run: int
+    timestamp: str
+    weight: float
+    mean: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "run": self.run,
+            "timestamp": self.timestamp,
+            "weight": self.weight,
+            "mean": round(self.mean, 4),
+        }
+
+
+class HistoryStore:
+    """Directory holding every recorded run; nothing is ever rewritten in place.
+
+    ``runs.z`` is a sequence of length-prefixed zlib frames, one full run each. ``index.jsonl``
+    gets one small line per run (metadata, weights, per-metric means and the frame offset) and
+    is written last, so a run only exists once its index line does. ``series/<slug>.jsonl``
+    gets one line per run a vendor appears in, so a vendor's trend is read from one small file
+    without decompressing any run.
+    """
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+
+    def append(
+        self,
+        results: Sequence[ScoreResult],
+        criteria: CriteriaConfig,
+        *,
+        label: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        timestamp: datetime | None = None,
+    ) -> RunInfo:
+        """Record one ranked run and return its index entry.
+
+        The segment is locked exclusively from reading the last run id until the index line is
+        written, so concurrent writers sharing a store get distinct, consecutive run ids.
+        """
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        with (self.root / SEGMENT_NAME).open("ab") as handle, _exclusive(handle):
+            return self._append(handle, results, criteria, label, metadata, timestamp)
+
+    def _append(
+        self,
+        handle: BinaryIO,
+        results: Sequence[ScoreResult],
+        criteria: CriteriaConfig,
+        label: str | None,
+        metadata: Mapping[str, Any] | None,
+        timestamp: datetime | None,
+    ) -> RunInfo:
+        runs = self.runs()
+        run_id = runs[-1].run + 1 if runs else 1
+        moment = (timestamp or datetime.now(UTC)).astimezone(UTC)
+        stamp = moment.isoformat(timespec="seconds")
+        run_metadata = {"tool_version": __version__, **dict(metadata or {})}
+        metrics = tuple(criteria.weights)
+        rows = [[result.breakdown[metric]["raw"] for metric in metrics] for result in results]
+        means = tuple(
+            sum(row[index] for row in rows) / len(rows) if rows else 0.0
+            for index in range(len(metrics))
+        )
+        record = {
+            "version": HISTORY_VERSION,
+            "run": run_id,
+            "timestamp": stamp,
+            "label": label,
+            "metadata": run_metadata,
+            "metrics": list(metrics),
+            "weights": [criteria.weights[metric] for metric in metrics],
+            "vendors": [
+                {
+                    "slug": result.vendor.slug,
+                    "name": result.vendor.name,
+                    "total": result.total,
+                    "raw": row,
+                    "missing_metrics": list(result.missing_metrics),
+                }
+                for result, row in zip(results, rows, strict=True)
+            ],
+        }
+
+        frame = zlib.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"), 6)
+        handle.seek(0, 2)
+        offset = handle.tell()
+        handle.write(_FRAME.pack(len(frame)))
+        handle.write(frame)
+        handle.flush()
+
+        series_dir = self.root / SERIES_DIR
+        series_dir.mkdir(exist_ok=True)
+        for rank, (result, row) in enumerate(zip(results, rows, strict=True), start=1):
+            line = json.dumps(
+                {"run": run_id, "at": offset, "rank": rank, "total": result.total, "raw": row},
+                separators=(",", ":"),
+            )
+            _append_line(series_dir / _series_name(result.vendor.slug), line)
+
+        info = RunInfo(
+            run=run_id,
+            timestamp=stamp,
+            label=label,
+            metadata=run_metadata,
+            metrics=metrics,
+            weights=tuple(float(criteria.weights[metric]) for metric in metrics),
+            means=means,
+            vendors=len(results),
+            offset=offset,
+            length=_FRAME.size + len(frame),
+        )
+        _append_line(self.root / INDEX_NAME, json.dumps(info.as_dict(), separators=(",", ":")))
+        return info
+
+    def runs(self, *, since: str | None = None, until: str | None = None) -> list[RunInfo]:
+        """Return indexed runs, optionally limited to ISO timestamps in ``[since, until]``."""
+
+        index_path = self.root / INDEX_NAME
+        if not index_path.exists():
+            return []
+        runs: list[RunInfo] = []
+        with index_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append is not a committed run.
+                    continue
+                info = RunInfo(
+                    run=int(data["run"]),
+                    timestamp=str(data["timestamp"]),
+                    label=data.get("label"),
+                    metadata=dict(data.get("metadata") or {}),
+                    metrics=tuple(data["metrics"]),
+                    weights=tuple(float(value) for value in data["weights"]),
+                    means=tuple(float(value) for value in data["means"]),
+                    vendors=int(data["vendors"]),
+                    offset=int(data["offset"]),
+                    length=int(data["length"]),
+                )
+                if _in_window(info.timestamp, since, until):
+                    runs.append(info)
+        return runs
+
+    def vendor_series(
+        self,
+        slug: str,
+        *,
+        metric: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> list[SeriesPoint]:
+        """Return a vendor's total, or its raw score for ``metric``, in every matching run."""
+
+        runs = {info.run: info for info in self.runs(since=since, until=until)}
+        series_path = self.root / SERIES_DIR / _series_name(slug)
+        if not series_path.exists():
+            return []
+        points: list[SeriesPoint] = []
+        with series_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                info = runs.get(int(data["run"]))
+                # Rows left by an append that never reached the index carry another offset.
+                if info is None or info.offset != data.get("at"):
+                    continue
+                if metric is None:
+                    value = float(data["total"])
+                elif metric in info.metrics:
+                    value = float(data["raw"][info.metrics.index(metric)])
+                else:
+                    continue
+                points.append(SeriesPoint(info.run, info.timestamp, int(data["rank"]), value))
+        return points
+
+    def metric_series(
+        self,
+        metric: str,
+        *,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> list[MetricPoint]:
+        """Return the metric's weight and catalog mean raw score per run, from the index."""
+
+        return [
+            MetricPoint(
+                info.run,
+                info.timestamp,
+                info.weights[info.metrics.index(metric)],
+                info.means[info.metrics.index(metric)],
+            )
+            for info in self.runs(since=since, until=until)
+            if metric in info.metrics
+        ]
+
+    def load_run(self, run: int) -> dict[str, Any]:
+        """Decompress and return the full record of one run."""
+
+        info = next((entry for entry in self.runs() if entry.run == run), None)
+        if info is None:
+            raise DataLoadError(f"Run {run} is not recorded in {self.root}.")
+        with (self.root / SEGMENT_NAME).open("rb") as handle:
+            handle.seek(info.offset)
+            (size,) = _FRAME.unpack(handle.read(_FRAME.size))
+            try:
+                return json.loads(zlib.decompress(handle.read(size)))
+            except zlib.error as exc:
+                raise DataLoadError(f"Run {run} in {self.root} is corrupt.") from exc
+
+
+@contextmanager
+def _exclusive(handle: BinaryIO) -> Iterator[None]:
+    """Hold an exclusive lock on ``handle``'s file, blocking until other writers release it."""
+
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        return
+    # msvcrt locks a byte range; the first byte stands for the whole segment.
+    handle.seek(0)
+    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+    try:
+        yield
+    finally:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _append_line(path: Path, line: str) -> None:
+    """Append ``line``, first terminating any torn line left by an interrupted writer."""
+
+    with path.open("ab") as handle:
+        if handle.tell():
+            with path.open("rb") as reader:
+                reader.seek(-1, 2)
+                if reader.read(1) != b"\n":
+                    handle.write(b"\n")
+        handle.write(line.encode("utf-8") + b"\n")
+
+
+def _series_name(slug: str) -> str:
+    return f"{_UNSAFE.sub('_', slug.lower())}.jsonl"
+
+
+def _in_window(timestamp: str, since: str | None, until: str | None) -> bool:
+    # ISO-8601 UTC timestamps sort lexically; a bare ``until`` date covers that whole day.
+    if since is not None and timestamp < since:
+        return False
+    if until is not None and timestamp[: len(until)] > until:
+        return False
+    return True
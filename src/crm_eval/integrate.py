@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Iterable, Mapping, Sequence
 
+from .fragments import FragmentCache
 from .scoring import ScoreResult
 
 __all__ = ["build_integration_notes"]
@@ -14,8 +15,12 @@ def build_integration_notes(
     ranked_vendors: Sequence[ScoreResult],
     *,
     shortlist_size: int = 3,
+    fragments: FragmentCache | None = None,
 ) -> str:
-    """Produce Markdown guidance for integrations and verification steps."""
+    """Produce Markdown guidance for integrations and verification steps.
+
+    Per-vendor snapshots are served from ``fragments`` when a cache is supplied.
+    """
 
     shortlist_size = max(1, shortlist_size)
     top_vendors = list(ranked_vendors[:shortlist_size])
@@ -43,27 +48,10 @@ def build_integration_notes(
     lines.append("## Vendor Capabilities Snapshot")
     lines.append("")
     for result in top_vendors:
-        vendor = result.vendor.as_dict()
-        raw_integrations = vendor.get("integrations", {})
-        integrations = raw_integrations if isinstance(raw_integrations, Mapping) else {}
-        apis = ", ".join(integrations.get("apis", [])) if integrations else ""
-        ipaas = ", ".join(integrations.get("ipaas", [])) if integrations else ""
-        sdks = ", ".join(integrations.get("sdks", [])) if integrations else ""
-        webhooks = integrations.get("webhooks") if integrations else "?"
-        lines.append(f"- **{vendor['name']}** (score {result.total:.2f})")
-        lines.append(
-            f"  - APIs: {apis or 'documented REST endpoints'}; " f"SDKs: {sdks or 'via REST/OData'}"
-        )
-        lines.append(f"  - Webhooks available: {webhooks}")
-        if ipaas:
-            lines.append(f"  - iPaaS connectors: {ipaas}")
-        capabilities = vendor.get("capabilities", [])
-        if capabilities:
-            cap_text = ", ".join(map(str, capabilities))
-            lines.append(f"  - Profile-aligned capabilities: {cap_text}")
-        missing = result.missing_metrics
-        if missing:
-            lines.append(f"  - Metrics requiring validation: {', '.join(missing)}")
+        if fragments is None:
+            lines.extend(_render_vendor_snapshot(result))
+        else:
+            lines.extend(fragments.render("integration", result, _render_vendor_snapshot))
     lines.append("")
 
     lines.append("## Verification Steps")
@@ -90,6 +78,32 @@ def build_integration_notes(
     return "\n".join(lines).strip() + "\n"
 
 
+def _render_vendor_snapshot(result: ScoreResult) -> list[str]:
+    lines: list[str] = []
+    vendor = result.vendor.as_dict()
+    raw_integrations = vendor.get("integrations", {})
+    integrations = raw_integrations if isinstance(raw_integrations, Mapping) else {}
+    apis = ", ".join(integrations.get("apis", [])) if integrations else ""
+    ipaas = ", ".join(integrations.get("ipaas", [])) if integrations else ""
+    sdks = ", ".join(integrations.get("sdks", [])) if integrations else ""
+    webhooks = integrations.get("webhooks") if integrations else "?"
+    lines.append(f"- **{vendor['name']}** (score {result.total:.2f})")
+    lines.append(
+        f"  - APIs: {apis or 'documented REST endpoints'}; " f"SDKs: {sdks or 'via REST/OData'}"
+    )
+    lines.append(f"  - Webhooks available: {webhooks}")
+    if ipaas:
+        lines.append(f"  - iPaaS connectors: {ipaas}")
+    capabilities = vendor.get("capabilities", [])
+    if capabilities:
+        cap_text = ", ".join(map(str, capabilities))
+        lines.append(f"  - Profile-aligned capabilities: {cap_text}")
+    missing = result.missing_metrics
+    if missing:
+        lines.append(f"  - Metrics requiring validation: {', '.join(missing)}")
+    return lines
+
+
 def _format_items(value: object) -> str:
     if isinstance(value, Iterable) and not isinstance(value, (str, bytes)):
         items = [str(item) for item in value]
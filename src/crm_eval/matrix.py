@@ -0,0 +1,329 @@
+"""Shared base score matrix with cheap per-profile adjustment overlays."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .data import CriteriaConfig, VendorRecord
+from .scoring import DEFAULT_MISSING_SCORE, ScoreResult, rank_vendors
+from .tco import vendor_pricing
+
+__all__ = [
+    "ProfileAdjustments",
+    "ProfileScore",
+    "ScoreMatrix",
+    "vendor_entry_price",
+]
+
+GLOBAL_REGION = "GLOBAL"
+
+
+@dataclass(frozen=True)
+class ProfileAdjustments:
+    """Points subtracted from the 0–100 base score for profile-specific gaps."""
+
+    must_have_penalty: float = 10.0
+    region_penalty: float = 15.0
+    budget_penalty: float = 10.0
+
+    def __post_init__(self) -> None:
+        if min(self.must_have_penalty, self.region_penalty, self.budget_penalty) < 0:
+            raise ValueError("Profile adjustment penalties must be non-negative.")
+
+
+@dataclass(frozen=True)
+class ProfileScore:
+    """A vendor's base result together with its profile-adjusted total."""
+
+    result: ScoreResult
+    total: float
+    missing_must_haves: tuple[str, ...]
+    uncovered_regions: tuple[str, ...]
+    over_budget: bool
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "slug": self.result.vendor.slug,
+            "name": self.result.vendor.name,
+            "base_score": round(self.result.total, 2),
+            "score": round(self.total, 2),
+            "missing_must_haves": list(self.missing_must_haves),
+            "uncovered_regions": list(self.uncovered_regions),
+            "over_budget": self.over_budget,
+        }
+
+
+@dataclass(frozen=True)
+class _CompiledProfile:
+    must_have: tuple[str, ...]
+    required_mask: int
+    regions: tuple[str, ...]
+    region_bits: tuple[int, ...]
+    budget: float | None
+
+
+class ScoreMatrix:
+    """Base scores for a catalog under one ``CriteriaConfig``, computed once.
+
+    Rows follow ``rank_vendors`` order. Capabilities and data-residency regions are packed
+    into bitmasks and rows sharing the same (capabilities, regions, entry price) signature are
+    grouped, so a profile overlay computes one penalty per group rather than per vendor.
+    Because a penalty shifts a whole group uniformly, each group stays sorted and ranking a
+    profile is a k-way merge of the group heads.
+    """
+
+    def __init__(self, results: Sequence[ScoreResult], criteria: CriteriaConfig) -> None:
+        self.criteria = criteria
+        self.results = list(results)
+        self.metrics: tuple[str, ...] = tuple(criteria.weights)
+        self.totals = array("d", (result.total for result in self.results))
+        self.slugs: tuple[str, ...] = tuple(result.vendor.slug for result in self.results)
+
+        self._capability_bits: dict[str, int] = {}
+        self._region_bits: dict[str, int] = {}
+        self.capability_masks: list[int] = []
+        self.region_masks: list[int] = []
+        prices: list[float] = []
+        for result in self.results:
+            payload = result.vendor.payload
+            self.capability_masks.append(
+                self._mask(self._capability_bits, _normalise_capabilities(payload))
+            )
+            regions = _vendor_regions(payload)
+            if regions is None or GLOBAL_REGION in regions:
+                self.region_masks.append(-1)
+            else:
+                self.region_masks.append(self._mask(self._region_bits, regions))
+            price = vendor_entry_price(result.vendor)
+            prices.append(math.nan if price is None else price)
+        self.entry_prices = array("d", prices)
+        self._names = [result.vendor.name.lower() for result in self.results]
+
+        groups: dict[tuple[int, int, float], list[int]] = {}
+        for i in range(len(self.results)):
+            price = -1.0 if math.isnan(self.entry_prices[i]) else self.entry_prices[i]
+            key = (self.capability_masks[i], self.region_masks[i], price)
+            groups.setdefault(key, []).append(i)
+        self._groups = list(groups.items())
+
+    @classmethod
+    def from_vendors(
+        cls,
+        vendors: Sequence[VendorRecord],
+        criteria: CriteriaConfig,
+        *,
+        default_missing_score: float = DEFAULT_MISSING_SCORE,
+    ) -> ScoreMatrix:
+        """Score ``vendors`` once and wrap the ranking in a matrix."""
+
+        results = rank_vendors(vendors, criteria, default_missing_score=default_missing_score)
+        return cls(results, criteria)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def overlay(
+        self,
+        profile: Mapping[str, Any],
+        adjustments: ProfileAdjustments | None = None,
+    ) -> array:
+        """Return adjusted totals for every row, aligned with ``results``."""
+
+        penalties = self._group_penalties(self._compile(profile), adjustments)
+        adjusted = array("d", self.totals)
+        for (_, rows), penalty in zip(self._groups, penalties, strict=True):
+            if penalty:
+                for i in rows:
+                    adjusted[i] -= penalty
+        return adjusted
+
+    def evaluate(
+        self,
+        profile: Mapping[str, Any],
+        *,
+        top: int | None = None,
+        adjustments: ProfileAdjustments | None = None,
+    ) -> list[ProfileScore]:
+        """Rank the catalog for ``profile`` by adjusted total, then name."""
+
+        compiled = self._compile(profile)
+        penalties = self._group_penalties(compiled, adjustments)
+        totals = self.totals
+        names = self._names
+
+        heads: list[tuple[float, str, int, int, int]] = []
+        for group_index, ((_, rows), penalty) in enumerate(
+            zip(self._groups, penalties, strict=True)
+        ):
+            first = rows[0]
+            heads.append((penalty - totals[first], names[first], first, group_index, 0))
+        heapq.heapify(heads)
+
+        limit = len(totals) if top is None else max(1, min(top, len(totals)))
+        ranked: list[ProfileScore] = []
+        while heads and len(ranked) < limit:
+            neg_total, _, i, group_index, position = heapq.heappop(heads)
+            ranked.append(self._profile_score(i, -neg_total, compiled))
+            rows = self._groups[group_index][1]
+            if position + 1 < len(rows):
+                following = rows[position + 1]
+                penalty = penalties[group_index]
+                heapq.heappush(
+                    heads,
+                    (
+                        penalty - totals[following],
+                        names[following],
+                        following,
+                        group_index,
+                        position + 1,
+                    ),
+                )
+        return ranked
+
+    def evaluate_many(
+        self,
+        profiles: Iterable[Mapping[str, Any]],
+        *,
+        top: int | None = None,
+        adjustments: ProfileAdjustments | None = None,
+    ) -> list[list[ProfileScore]]:
+        """Evaluate many profiles against the same base matrix."""
+
+        return [self.evaluate(profile, top=top, adjustments=adjustments) for profile in profiles]
+
+    def _compile(self, profile: Mapping[str, Any]) -> _CompiledProfile:
+        must_have = tuple(
+            dict.fromkeys(_normalise_capabilities({"capabilities": profile.get("must_have")}))
+        )
+        required = 0
+        for capability in must_have:
+            if capability in self._capability_bits:
+                required |= 1 << self._capability_bits[capability]
+        regions = tuple(
+            dict.fromkeys(
+                region
+                for region in _as_upper_list(profile.get("regions"))
+                if region != GLOBAL_REGION
+            )
+        )
+        region_bits = tuple(
+            1 << self._region_bits[region] if region in self._region_bits else 0
+            for region in regions
+        )
+        budget_raw = profile.get("budget_per_user_per_month")
+        try:
+            budget = float(budget_raw) if budget_raw is not None else None
+        except (TypeError, ValueError):
+            budget = None
+        return _CompiledProfile(
+            must_have=must_have,
+            required_mask=required,
+            regions=regions,
+            region_bits=region_bits,
+            budget=budget,
+        )
+
+    def _group_penalties(
+        self,
+        compiled: _CompiledProfile,
+        adjustments: ProfileAdjustments | None,
+    ) -> list[float]:
+        adjust = adjustments or ProfileAdjustments()
+        # Capabilities no vendor offers have no bit and count as missing everywhere.
+        unknown = len(compiled.must_have) - compiled.required_mask.bit_count()
+        penalties: list[float] = []
+        for (capability_mask, region_mask, price), _ in self._groups:
+            penalty = 0.0
+            if compiled.must_have:
+                missing = (compiled.required_mask & ~capability_mask).bit_count() + unknown
+                penalty += adjust.must_have_penalty * missing
+            if compiled.regions and region_mask != -1:
+                uncovered = sum(1 for bit in compiled.region_bits if not region_mask & bit)
+                penalty += adjust.region_penalty * uncovered / len(compiled.regions)
+            if compiled.budget is not None and price >= 0 and price > compiled.budget:
+                penalty += adjust.budget_penalty
+            penalties.append(penalty)
+        return penalties
+
+    def _profile_score(self, i: int, total: float, compiled: _CompiledProfile) -> ProfileScore:
+        result = self.results[i]
+        offered = set(_normalise_capabilities(result.vendor.payload))
+        missing = tuple(cap for cap in compiled.must_have if cap not in offered)
+        mask = self.region_masks[i]
+        uncovered = tuple(
+            region
+            for region, bit in zip(compiled.regions, compiled.region_bits, strict=True)
+            if mask != -1 and not mask & bit
+        )
+        price = self.entry_prices[i]
+        over_budget = (
+            compiled.budget is not None and not math.isnan(price) and price > compiled.budget
+        )
+        return ProfileScore(
+            result=result,
+            total=round(total, 4),
+            missing_must_haves=missing,
+            uncovered_regions=uncovered,
+            over_budget=over_budget,
+        )
+
+    @staticmethod
+    def _mask(bits: dict[str, int], values: Iterable[str]) -> int:
+        mask = 0
+        for value in values:
+            bit = bits.setdefault(value, len(bits))
+            mask |= 1 << bit
+        return mask
+
+
+def vendor_entry_price(vendor: VendorRecord) -> float | None:
+    """Return the vendor's entry price per user per month when the payload states one.
+
+    Reads the numeric ``pricing_tco.per_user_per_month`` field, falling back to the cheapest
+    structured pricing tier; free-text pricing notes are ignored.
+    """
+
+    pricing = vendor.payload.get("pricing_tco")
+    if not isinstance(pricing, Mapping):
+        return None
+    value = pricing.get("per_user_per_month")
+    if value is None:
+        tiers = vendor_pricing(vendor)
+        return tiers.tiers[0].per_user_per_month if tiers is not None else None
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalise_capabilities(payload: Mapping[str, Any]) -> list[str]:
+    raw = payload.get("capabilities")
+    if isinstance(raw, str):
+        raw = [raw]
+    if not isinstance(raw, Iterable):
+        return []
+    return [str(item).strip().lower() for item in raw if str(item).strip()]
+
+
+def _vendor_regions(payload: Mapping[str, Any]) -> list[str] | None:
+    security = payload.get("security")
+    if not isinstance(security, Mapping) or not security.get("data_residency"):
+        return None
+    return _as_upper_list(security.get("data_residency"))
+
+
+def _as_upper_list(value: object) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, Iterable):
+        return []
+    return [str(item).strip().upper() for item in value if str(item).strip()]
@@ -0,0 +1,219 @@
+"""Canonical business profiles and an on-disk cache of rendered results keyed by them."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .data import CriteriaConfig, catalog_fingerprint, resolve_vendor_files
+
+__all__ = [
+    "DEFAULT_MEMO_BYTES",
+    "ResultCache",
+    "canonical_profile",
+    "catalog_digest",
+    "criteria_digest",
+    "memo_key",
+    "profile_hash",
+]
+
+DEFAULT_MEMO_BYTES = 64 * 1024 * 1024
+MEMO_VERSION = 1
+
+# Capability lists compare case-insensitively, as the matrix matches them; regions upper-case.
+_LOWER_LISTS = frozenset({"must_have", "nice_to_have"})
+_UPPER_LISTS = frozenset({"regions"})
+# Mappings whose order carries meaning: migration objects are imported in the order given.
+_ORDERED_MAPPINGS = frozenset({"migration_records"})
+
+
+def canonical_profile(profile: Mapping[str, Any]) -> dict[str, Any]:
+    """Return ``profile`` in a normal form shared by every semantically identical profile.
+
+    Keys are sorted and strings stripped; keys set to null are dropped. Lists of plain values
+    are treated as sets: sorted and de-duplicated, with ``must_have`` and ``nice_to_have``
+    lower-cased and ``regions`` upper-cased, and a single string in those fields becomes a
+    one-item list. Lists of mappings keep their order, as does ``migration_records``.
+    """
+
+    return _canonical_mapping(profile, ordered=False)
+
+
+def profile_hash(profile: Mapping[str, Any]) -> str:
+    """Stable SHA-256 of the canonical form of ``profile``."""
+
+    return _digest(canonical_profile(profile))
+
+
+def criteria_digest(criteria: CriteriaConfig) -> str:
+    """SHA-256 of the criteria, weight order included since reports follow it."""
+
+    return _digest(criteria.as_dict())
+
+
+def catalog_digest(vendors_dir: Path | str | None = None) -> str:
+    """Cheap fingerprint of the catalog ``load_vendors(vendors_dir)`` would read.
+
+    A feed or bundle file is fingerprinted as one file; a directory by its vendor files.
+    Both use names, sizes and modification times, so nothing is parsed.
+    """
+
+    if vendors_dir is not None and Path(vendors_dir).is_file():
+        paths = [Path(vendors_dir)]
+    else:
+        paths = resolve_vendor_files(vendors_dir)
+    return _digest([str(paths[0].resolve().parent), catalog_fingerprint(paths)])
+
+
+def memo_key(
+    profile: Mapping[str, Any],
+    criteria: CriteriaConfig,
+    catalog: str,
+    variant: Mapping[str, Any] | None = None,
+) -> str:
+    """Key a rendered result by profile, criteria, catalog fingerprint and render options."""
+
+    return _digest(
+        [
+            MEMO_VERSION,
+            __version__,
+            profile_hash(profile),
+            criteria_digest(criteria),
+            catalog,
+            dict(sorted((variant or {}).items())),
+        ]
+    )
+
+
+class ResultCache:
+    """Rendered results on disk, one JSON file per key, bounded by total size.
+
+    Reads refresh a file's modification time; once the files exceed ``max_bytes`` the least
+    recently used are removed until the directory is 10% under the cap. Entries are written
+    atomically, so concurrent runs sharing the directory never read a partial entry.
+    """
+
+    def __init__(self, directory: Path | str, *, max_bytes: int = DEFAULT_MEMO_BYTES) -> None:
+        if max_bytes < 1:
+            raise ValueError("Result cache size must be at least 1 byte.")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._disk_bytes: int | None = None
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the entry stored under ``key``, or ``None``."""
+
+        path = self.directory / f"{key}.json"
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (FileNotFoundError, json.JSONDecodeError):
+            entry = None
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry["value"]
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None:
+        """Store ``value`` under ``key``, evicting old entries if the cache grows too large."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / f"{key}.json"
+        encoded = json.dumps({"key": key, "value": dict(value)}, sort_keys=True).encode("utf-8")
+        temp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp.write_bytes(encoded)
+        temp.replace(target)
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for size, _ in self._files())
+            else:
+                self._disk_bytes += len(encoded)
+            over_capacity = self._disk_bytes > self.max_bytes
+        if over_capacity:
+            self._prune()
+
+    def size(self) -> int:
+        """Bytes currently stored."""
+
+        return sum(size for size, _ in self._files())
+
+    def _files(self) -> list[tuple[int, Path]]:
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_size, path))
+            except FileNotFoundError:
+                continue
+        return files
+
+    def _prune(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        budget = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= budget:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+
+def _canonical_mapping(value: Mapping[Any, Any], *, ordered: bool) -> dict[str, Any]:
+    items = [(str(key).strip(), item) for key, item in value.items() if item is not None]
+    if not ordered:
+        items.sort(key=lambda pair: pair[0])
+    return {
+        key: _canonical_value(key, item, ordered=key in _ORDERED_MAPPINGS) for key, item in items
+    }
+
+
+def _canonical_value(key: str, value: Any, *, ordered: bool = False) -> Any:
+    if isinstance(value, Mapping):
+        return _canonical_mapping(value, ordered=ordered)
+    if isinstance(value, str) and key in _LOWER_LISTS | _UPPER_LISTS:
+        value = [value]
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonical_value("", item) for item in value if item is not None]
+        if key in _LOWER_LISTS:
+            items = [item.lower() if isinstance(item, str) else item for item in items]
+        elif key in _UPPER_LISTS:
+            items = [item.upper() if isinstance(item, str) else item for item in items]
+        if any(isinstance(item, (dict, list)) for item in items):
+            return items
+        unique = {_encode(item): item for item in items if item != ""}
+        return [unique[encoded] for encoded in sorted(unique)]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(_encode(value).encode("utf-8")).hexdigest()
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
 
+from .fragments import FragmentCache
 from .scoring import ScoreResult
+from .simulate import MigrationEstimate, format_duration, shortlist_estimates
 
 __all__ = ["build_migration_plan"]
 
@@ -13,11 +15,21 @@ def build_migration_plan(
     profile: Mapping[str, object],
     ranked_vendors: Sequence[ScoreResult],
     shortlist_size: int = 3,
+    *,
+    fragments: FragmentCache | None = None,
+    estimates: Sequence[MigrationEstimate] | None = None,
 ) -> str:
-    """Return a Markdown migration plan covering prep, pilot, rollout, and validation."""
+    """Return a Markdown migration plan covering prep, pilot, rollout, and validation.
+
+    Per-vendor recommendations are served from ``fragments`` when a cache is supplied.
+    ``estimates`` adds simulated cutover windows; when omitted they are simulated for the
+    shortlist if the profile declares ``migration_records``.
+    """
 
     shortlist_size = max(1, shortlist_size)
     top_vendors = list(ranked_vendors[:shortlist_size])
+    if estimates is None:
+        estimates = shortlist_estimates(profile, [result.vendor for result in top_vendors])
     plan_lines: list[str] = []
     plan_lines.append("# CRM Migration & Rollout Plan")
     plan_lines.append("")
@@ -37,21 +49,18 @@ def build_migration_plan(
     plan_lines.append("## Recommended Vendors To Validate")
     plan_lines.append("")
     for idx, result in enumerate(top_vendors, start=1):
-        vendor = result.vendor.as_dict()
-        strengths = vendor.get("notes", [])
-        raw_integrations = vendor.get("integrations", {})
-        integrations = raw_integrations if isinstance(raw_integrations, Mapping) else {}
-        apis = ", ".join(integrations.get("apis", [])) if integrations else ""
-        ipaas = ", ".join(integrations.get("ipaas", [])) if integrations else ""
-        plan_lines.append(f"{idx}. **{vendor['name']}** — score {result.total:.2f}/100")
-        if strengths:
-            plan_lines.append(f"   - Highlights: {strengths[0]}")
-        if ipaas:
-            plan_lines.append(f"   - iPaaS / connectors: {ipaas}")
-        if apis:
-            plan_lines.append(f"   - APIs/webhooks: {apis}")
+        if fragments is None:
+            vendor_lines = _render_vendor_recommendation(result)
+        else:
+            vendor_lines = fragments.render("migration", result, _render_vendor_recommendation)
+        plan_lines.append(f"{idx}. {vendor_lines[0]}")
+        plan_lines.extend(vendor_lines[1:])
     plan_lines.append("")
 
+    if estimates:
+        plan_lines.extend(_render_cutover_estimates(estimates))
+        plan_lines.append("")
+
     plan_lines.append("## Phase 0 – Preparation (Weeks -6 to -2)")
     plan_lines.append("- Inventory objects, fields, automations, and integration touchpoints.")
     plan_lines.append("- Dedupe records and lock a stakeholder-approved historical cutoff date.")
@@ -124,3 +133,51 @@ def build_migration_plan(
     plan_lines.append("- Maintain a feedback backlog for continuous roadmap tuning.")
 
     return "\n".join(plan_lines).strip() + "\n"
+
+
+def _render_cutover_estimates(estimates: Sequence[MigrationEstimate]) -> list[str]:
+    records = estimates[0].records
+    lines = [
+        "## Estimated Cutover Windows",
+        "",
+        f"Simulated import of {records:,} records in batches, with rate limits and retries.",
+        "",
+        "| Vendor | Import path | Batches | Retries | Estimated window |",
+        "| :----- | :---------- | ------: | ------: | ---------------: |",
+    ]
+    for estimate in estimates:
+        path = "bulk API" if estimate.limits.bulk_api else "REST API"
+        lines.append(
+            f"| {estimate.name} | {path} | {estimate.batches:,} | {estimate.retries:,} "
+            f"| {format_duration(estimate.seconds)} |"
+        )
+    lines.append("")
+    lines.append(
+        "- Size the legacy freeze window to the chosen vendor's estimate plus reconciliation."
+    )
+    failed = [estimate for estimate in estimates if estimate.failed_records]
+    for estimate in failed:
+        lines.append(
+            f"- {estimate.name}: {estimate.failed_records:,} records exhausted their retries; "
+            "plan a re-run pass."
+        )
+    return lines
+
+
+def _render_vendor_recommendation(result: ScoreResult) -> list[str]:
+    """Render one recommended vendor; the caller prefixes the list number."""
+
+    vendor = result.vendor.as_dict()
+    strengths = vendor.get("notes", [])
+    raw_integrations = vendor.get("integrations", {})
+    integrations = raw_integrations if isinstance(raw_integrations, Mapping) else {}
+    apis = ", ".join(integrations.get("apis", [])) if integrations else ""
+    ipaas = ", ".join(integrations.get("ipaas", [])) if integrations else ""
+    lines = [f"**{vendor['name']}** — score {result.total:.2f}/100"]
+    if strengths:
+        lines.append(f"   - Highlights: {strengths[0]}")
+    if ipaas:
+        lines.append(f"   - iPaaS / connectors: {ipaas}")
+    if apis:
+        lines.append(f"   - APIs/webhooks: {apis}")
+    return lines
@@ -0,0 +1,231 @@
+"""Catalog-wide per-metric statistics and normalization of raw scores before weighting."""
+
+from __future__ import annotations
+
+import json
+import math
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .data import (
+    VendorRecord,
+    catalog_fingerprint,
+    iter_vendors,
+    metric_score,
+    resolve_vendor_files,
+)
+
+__all__ = [
+    "NORMALIZATION_MODES",
+    "STATS_FILENAME",
+    "CatalogStats",
+    "MetricNormalizer",
+    "MetricStats",
+    "load_or_build_stats",
+]
+
+NORMALIZATION_MODES = ("none", "minmax", "zscore", "percentile")
+STATS_FILENAME = ".crm-eval-stats.json"
+STATS_VERSION = 1
+MAX_RAW_SCORE = 5.0
+_MIDPOINT = MAX_RAW_SCORE / 2
+
+
+@dataclass(frozen=True)
+class MetricStats:
+    """Distribution of one metric's clamped raw scores, as sorted distinct values and counts."""
+
+    values: tuple[float, ...]
+    counts: tuple[int, ...]
+    count: int = field(init=False)
+    mean: float = field(init=False)
+    stdev: float = field(init=False)
+    cumulative: tuple[int, ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        count = sum(self.counts)
+        mean = sum(v * c for v, c in zip(self.values, self.counts, strict=True)) / count
+        variance = sum(c * (v - mean) ** 2 for v, c in zip(self.values, self.counts, strict=True))
+        running = 0
+        cumulative: list[int] = []
+        for size in self.counts:
+            running += size
+            cumulative.append(running)
+        object.__setattr__(self, "count", count)
+        object.__setattr__(self, "mean", mean)
+        object.__setattr__(self, "stdev", math.sqrt(variance / count))
+        object.__setattr__(self, "cumulative", tuple(cumulative))
+
+    @property
+    def minimum(self) -> float:
+        return self.values[0]
+
+    @property
+    def maximum(self) -> float:
+        return self.values[-1]
+
+    def percentile(self, value: float) -> float:
+        """Mid-rank percentile of ``value`` among the catalog's scores, in ``[0, 1]``."""
+
+        index = bisect_left(self.values, value)
+        below = self.cumulative[index - 1] if index else 0
+        present = index < len(self.values) and self.values[index] == value
+        equal = self.counts[index] if present else 0
+        return (below + 0.5 * equal) / self.count
+
+
+@dataclass(frozen=True)
+class CatalogStats:
+    """Statistics for every metric any vendor scores, independent of the criteria weights."""
+
+    metrics: dict[str, MetricStats]
+
+    @classmethod
+    def from_vendors(
+        cls, vendors: Iterable[VendorRecord], *, metrics: Iterable[str] = ()
+    ) -> CatalogStats:
+        """Gather value counts for every numeric score in one pass over ``vendors``.
+
+        Scores are clamped to 0–5 as ``score_vendor`` does; absent and non-numeric scores are
+        left out, so the missing default never skews a metric's distribution. Dotted criteria
+        ``metrics`` are tallied with the score each vendor is ranked on, falling back to the
+        parent like ``metric_score``, so hierarchical leaves normalize on the same scale.
+        """
+
+        derived = _derived_metrics(metrics)
+        tallies: dict[str, dict[float, int]] = {}
+        for vendor in vendors:
+            scores = vendor.get_scores()
+            values = dict(scores)
+            for metric in derived:
+                if metric not in values:
+                    values[metric] = metric_score(scores, metric)
+            for metric, value in values.items():
+                try:
+                    number = float(value)
+                except (TypeError, ValueError):
+                    continue
+                if math.isnan(number):
+                    continue
+                number = max(0.0, min(MAX_RAW_SCORE, number))
+                tally = tallies.setdefault(str(metric), {})
+                tally[number] = tally.get(number, 0) + 1
+        metrics: dict[str, MetricStats] = {}
+        for metric, tally in tallies.items():
+            values = tuple(sorted(tally))
+            metrics[metric] = MetricStats(values, tuple(tally[value] for value in values))
+        return cls(metrics)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            metric: [list(stats.values), list(stats.counts)]
+            for metric, stats in sorted(self.metrics.items())
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> CatalogStats:
+        return cls(
+            {
+                str(metric): MetricStats(
+                    tuple(float(v) for v in values), tuple(int(c) for c in counts)
+                )
+                for metric, (values, counts) in data.items()
+            }
+        )
+
+
+class MetricNormalizer:
+    """Maps a clamped raw score onto the 0–5 scale according to ``mode``.
+
+    ``minmax`` stretches each metric's catalog range to 0–5; ``zscore`` scores ``2.5 + z``,
+    so one standard deviation is one point, clamped to 0–5; ``percentile`` scores five times
+    the mid-rank percentile. Metrics with no spread, or that no vendor scores, pass through
+    unchanged. Results are memoized per distinct value, so normalizing adds a dictionary lookup
+    per score.
+    """
+
+    def __init__(self, stats: CatalogStats, mode: str) -> None:
+        if mode not in NORMALIZATION_MODES:
+            raise ValueError(
+                f"Normalization mode must be one of: {', '.join(NORMALIZATION_MODES)}."
+            )
+        self.stats = stats
+        self.mode = mode
+        self._memo: dict[tuple[str, float], float] = {}
+
+    def __call__(self, metric: str, raw: float) -> float:
+        key = (metric, raw)
+        normalized = self._memo.get(key)
+        if normalized is None:
+            normalized = self._memo[key] = self._normalize(metric, raw)
+        return normalized
+
+    def _normalize(self, metric: str, raw: float) -> float:
+        stats = self.stats.metrics.get(metric)
+        if self.mode == "none" or stats is None:
+            return raw
+        if self.mode == "percentile":
+            return MAX_RAW_SCORE * stats.percentile(raw)
+        if self.mode == "minmax":
+            spread = stats.maximum - stats.minimum
+            if spread <= 0:
+                return raw
+            return max(0.0, min(MAX_RAW_SCORE, MAX_RAW_SCORE * (raw - stats.minimum) / spread))
+        if stats.stdev <= 0:
+            return raw
+        return max(0.0, min(MAX_RAW_SCORE, _MIDPOINT + (raw - stats.mean) / stats.stdev))
+
+
+def load_or_build_stats(
+    vendors_dir: Path | str | None = None, *, metrics: Iterable[str] = ()
+) -> CatalogStats:
+    """Return catalog statistics stored next to the catalog, rebuilding them when stale.
+
+    The cache lives in the vendor directory (or beside a bundle file) and is keyed by the
+    catalog's file names, sizes and modification times, like the search index, and by the
+    dotted criteria ``metrics`` passed to ``CatalogStats.from_vendors``.
+    """
+
+    derived = _derived_metrics(metrics)
+
+    if vendors_dir is not None and Path(vendors_dir).is_file():
+        bundle = Path(vendors_dir)
+        sources = [bundle]
+        stats_path = bundle.with_name(f"{bundle.name}.stats.json")
+    else:
+        sources = resolve_vendor_files(vendors_dir)
+        stats_path = sources[0].parent / STATS_FILENAME
+    fingerprint = catalog_fingerprint(sources)
+
+    try:
+        with stats_path.open("r", encoding="utf-8") as handle:
+            stored = json.load(handle)
+        if (
+            stored.get("version") == STATS_VERSION
+            and stored.get("fingerprint") == fingerprint
+            and stored.get("derived", []) == derived
+        ):
+            return CatalogStats.from_dict(stored["metrics"])
+    except (OSError, json.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError):
+        pass
+
+    stats = CatalogStats.from_vendors(iter_vendors(vendors_dir), metrics=derived)
+    document = {
+        "version": STATS_VERSION,
+        "fingerprint": fingerprint,
+        "derived": derived,
+        "metrics": stats.as_dict(),
+    }
+    try:
+        stats_path.write_text(json.dumps(document, separators=(",", ":")), encoding="utf-8")
+    except OSError:
+        pass
+    return stats
+
+
+def _derived_metrics(metrics: Iterable[str]) -> list[str]:
+    # Flat metrics are the vendors' own score keys; only dotted leaves can fall back.
+    return sorted({metric for metric in metrics if "." in metric})
@@ -0,0 +1,337 @@
+"""Concurrent live-ratings fetcher backed by an on-disk HTTP cache."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import http.client
+import json
+import time
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, urlsplit
+
+from .data import VendorRecord, metric_score
+
+__all__ = [
+    "FetchStats",
+    "RatingsFetcher",
+    "blend_ratings",
+    "DEFAULT_CONCURRENCY",
+    "DEFAULT_RATINGS_TTL",
+    "DEFAULT_BLEND_WEIGHT",
+]
+
+DEFAULT_RATINGS_TTL = 24 * 60 * 60
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST_RATE = 5.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_BLEND_WEIGHT = 0.3
+
+_RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchStats:
+    """Counters describing how a fetch run was served."""
+
+    requests: int = 0
+    cache_hits: int = 0
+    revalidated: int = 0
+    retries: int = 0
+    failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "revalidated": self.revalidated,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+@dataclass
+class RatingsFetcher:
+    """Fetch per-vendor rating documents concurrently with caching and retries.
+
+    ``url_template`` is formatted with the vendor ``slug``. Each response is expected to be
+    a JSON object whose ``scores`` mapping holds metric ratings on the 0–5 scale.
+    """
+
+    url_template: str
+    cache_dir: Path | str | None = None
+    ttl: float = DEFAULT_RATINGS_TTL
+    concurrency: int = DEFAULT_CONCURRENCY
+    per_host_rate: float = DEFAULT_PER_HOST_RATE
+    retries: int = DEFAULT_RETRIES
+    backoff: float = DEFAULT_BACKOFF
+    timeout: float = DEFAULT_TIMEOUT
+
+    def __post_init__(self) -> None:
+        if "{slug}" not in self.url_template:
+            raise ValueError("Ratings URL template must contain a '{slug}' placeholder.")
+        if self.concurrency < 1:
+            raise ValueError("Ratings concurrency must be at least 1.")
+        self.stats = FetchStats()
+
+    def fetch(self, vendors: Sequence[VendorRecord]) -> dict[str, dict[str, float]]:
+        """Synchronously fetch ratings for ``vendors`` keyed by slug."""
+
+        return asyncio.run(self.fetch_async(vendors))
+
+    async def fetch_async(self, vendors: Sequence[VendorRecord]) -> dict[str, dict[str, float]]:
+        """Fetch ratings for ``vendors`` using bounded concurrency; failures are skipped."""
+
+        cache = _ResponseCache(Path(self.cache_dir)) if self.cache_dir is not None else None
+        pool = _ConnectionPool(self.timeout)
+        limiter = _HostRateLimiter(self.per_host_rate)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            fetched = await asyncio.gather(
+                *(
+                    self._fetch_one(vendor.slug, cache, pool, limiter, semaphore, executor)
+                    for vendor in vendors
+                )
+            )
+        finally:
+            executor.shutdown(wait=True)
+            pool.close()
+        return {
+            vendor.slug: scores
+            for vendor, scores in zip(vendors, fetched, strict=True)
+            if scores is not None
+        }
+
+    async def _fetch_one(
+        self,
+        slug: str,
+        cache: _ResponseCache | None,
+        pool: _ConnectionPool,
+        limiter: _HostRateLimiter,
+        semaphore: asyncio.Semaphore,
+        executor: ThreadPoolExecutor,
+    ) -> dict[str, float] | None:
+        url = self.url_template.format(slug=quote(slug, safe=""))
+        entry = cache.get(url) if cache is not None else None
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+            self.stats.cache_hits += 1
+            return _parse_ratings(entry["body"])
+
+        headers: dict[str, str] = {"Accept": "application/json"}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        loop = asyncio.get_running_loop()
+        host = urlsplit(url).netloc
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self.stats.retries += 1
+                await limiter.wait(host)
+                self.stats.requests += 1
+                try:
+                    status, response_headers, body = await loop.run_in_executor(
+                        executor, pool.request, url, headers
+                    )
+                except (OSError, http.client.HTTPException):
+                    await asyncio.sleep(self.backoff * (2**attempt))
+                    continue
+
+                if status == 304 and entry is not None:
+                    self.stats.revalidated += 1
+                    entry["fetched_at"] = time.time()
+                    cache.put(url, entry)
+                    return _parse_ratings(entry["body"])
+                if status == 200:
+                    text = body.decode("utf-8", errors="replace")
+                    if cache is not None:
+                        cache.put(
+                            url,
+                            {
+                                "url": url,
+                                "fetched_at": time.time(),
+                                "etag": response_headers.get("etag"),
+                                "last_modified": response_headers.get("last-modified"),
+                                "body": text,
+                            },
+                        )
+                    return _parse_ratings(text)
+                if status not in _RETRYABLE_STATUSES:
+                    break
+                delay = self.backoff * (2**attempt)
+                retry_after = response_headers.get("retry-after", "")
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+                await asyncio.sleep(delay)
+
+        self.stats.failures += 1
+        if entry is not None:
+            return _parse_ratings(entry["body"])
+        return None
+
+
+def blend_ratings(
+    vendors: Sequence[VendorRecord],
+    ratings: Mapping[str, Mapping[str, float]],
+    *,
+    weight: float = DEFAULT_BLEND_WEIGHT,
+) -> list[VendorRecord]:
+    """Return vendors whose ``scores`` blend local values with fetched live ratings.
+
+    Metrics present locally become ``(1 - weight) * local + weight * live``; metrics only
+    available from the live source are taken as-is.
+    """
+
+    if weight < 0 or weight > 1:
+        raise ValueError("Ratings blend weight must be between 0 and 1 inclusive.")
+
+    blended: list[VendorRecord] = []
+    for vendor in vendors:
+        live = ratings.get(vendor.slug)
+        if not live:
+            blended.append(vendor)
+            continue
+        scores: dict[str, Any] = dict(vendor.get_scores())
+        for metric, live_value in live.items():
+            local_value = metric_score(scores, metric)
+            try:
+                local_float = float(local_value) if local_value is not None else None
+            except (TypeError, ValueError):
+                local_float = None
+            if local_float is None:
+                scores[metric] = live_value
+            else:
+                scores[metric] = round((1 - weight) * local_float + weight * live_value, 4)
+        payload = dict(vendor.payload)
+        payload["scores"] = scores
+        blended.append(replace(vendor, payload=payload))
+    return blended
+
+
+def _parse_ratings(body: str) -> dict[str, float] | None:
+    """Extract numeric 0–5 metric ratings from a JSON response body."""
+
+    try:
+        document = json.loads(body)
+    except json.JSONDecodeError:
+        return None
+    scores = document.get("scores") if isinstance(document, Mapping) else None
+    if not isinstance(scores, Mapping):
+        return None
+    parsed: dict[str, float] = {}
+    for metric, value in scores.items():
+        if isinstance(value, bool):
+            continue
+        try:
+            parsed[str(metric)] = max(0.0, min(5.0, float(value)))
+        except (TypeError, ValueError):
+            continue
+    return parsed
+
+
+class _ResponseCache:
+    """One JSON file per URL holding the body plus validators for revalidation."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        try:
+            with self._path(url).open("r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url:
+            return None
+        return entry
+
+    def put(self, url: str, entry: Mapping[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self._path(url)
+        temp = target.with_suffix(".tmp")
+        with temp.open("w", encoding="utf-8") as handle:
+            json.dump(dict(entry), handle)
+        temp.replace(target)
+
+
+class _ConnectionPool:
+    """Keep-alive HTTP connections reused per host; safe to call from worker threads."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+
+    def request(self, url: str, headers: Mapping[str, str]) -> tuple[int, dict[str, str], bytes]:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        connection = self._acquire(key)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        try:
+            connection.request("GET", path, headers=dict(headers))
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        if response.will_close:
+            connection.close()
+        else:
+            self._idle.setdefault(key, []).append(connection)
+        return response.status, response_headers, body
+
+    def _acquire(self, key: tuple[str, str]) -> http.client.HTTPConnection:
+        idle = self._idle.get(key)
+        if idle:
+            try:
+                return idle.pop()
+            except IndexError:
+                pass
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        if scheme == "http":
+            return http.client.HTTPConnection(netloc, timeout=self.timeout)
+        raise ValueError(f"Unsupported ratings URL scheme: {scheme!r}.")
+
+    def close(self) -> None:
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+
+
+class _HostRateLimiter:
+    """Space requests to the same host at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        loop = asyncio.get_running_loop()
+        async with lock:
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
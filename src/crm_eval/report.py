@@ -2,16 +2,30 @@
 
 from __future__ import annotations
 
+import json
 from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
 
-from .data import CriteriaConfig
+from .data import CriteriaConfig, DataLoadError
+from .explain import RankFlip, render_rank_flips
+from .fragments import FragmentCache
 from .scoring import ScoreResult
+from .similar import SimilarVendor
 
 SCHEMA_VERSION = "crm-eval-scorecard/v1"
+SLIM_SCHEMA_VERSION = "crm-eval-scorecard-slim/v1"
+SLIM_CATALOG_SCHEMA_VERSION = "crm-eval-catalog/v1"
 
 __all__ = [
     "SCHEMA_VERSION",
+    "SLIM_CATALOG_SCHEMA_VERSION",
+    "SLIM_SCHEMA_VERSION",
     "build_scorecard_payload",
+    "build_slim_scorecard_payload",
+    "build_vendor_entry",
+    "inflate_scorecard_payload",
+    "load_scorecard_payload",
     "render_markdown_scorecard",
 ]
 
@@ -22,36 +36,22 @@ def build_scorecard_payload(
     criteria: CriteriaConfig,
     *,
     shortlist_size: int = 5,
+    flips: Sequence[RankFlip] | None = None,
+    normalization: str | None = None,
+    alternatives: Mapping[str, Sequence[SimilarVendor]] | None = None,
 ) -> dict[str, object]:
-    """Create a deterministic JSON-serialisable payload summarising scoring results."""
+    """Create a deterministic JSON-serialisable payload summarising scoring results.
+
+    When ``flips`` is supplied the payload gains a ``rank_flips`` list; a ``normalization``
+    mode other than ``none`` is recorded under ``normalization``. ``alternatives`` maps
+    shortlisted slugs to their nearest neighbours and is stored under ``alternatives``.
+    Hierarchical criteria add ``categories`` and a per-vendor ``category_scores`` roll-up.
+    """
 
     shortlist_size = max(1, shortlist_size)
-    vendor_entries: list[dict[str, object]] = []
-    for rank, result in enumerate(results, start=1):
-        vendor_snapshot = result.vendor.as_dict()
-        breakdown = {
-            metric: {
-                "raw": round(values["raw"], 2),
-                "weighted": round(values["weighted"], 4),
-                "weight": round(values["weight"], 2),
-            }
-            for metric, values in result.breakdown.items()
-        }
-        strengths, tradeoffs = _partition_notes(result.vendor.get_notes())
-        vendor_entries.append(
-            {
-                "rank": rank,
-                "name": vendor_snapshot.get("name", result.vendor.name),
-                "slug": vendor_snapshot.get("slug", result.vendor.slug),
-                "score": round(result.total, 2),
-                "breakdown": breakdown,
-                "missing_metrics": list(result.missing_metrics),
-                "capabilities": vendor_snapshot.get("capabilities", []),
-                "strengths": strengths,
-                "tradeoffs": tradeoffs,
-                "notes": vendor_snapshot.get("notes", []),
-            }
-        )
+    vendor_entries = [
+        build_vendor_entry(rank, result, criteria) for rank, result in enumerate(results, start=1)
+    ]
 
     payload: dict[str, object] = {
         "schema": SCHEMA_VERSION,
@@ -61,19 +61,272 @@ def build_scorecard_payload(
         "vendors": vendor_entries,
         "shortlist": vendor_entries[:shortlist_size],
     }
+    if criteria.categories:
+        payload["categories"] = _categories_section(criteria)
+    if flips is not None:
+        payload["rank_flips"] = [flip.as_dict() for flip in flips]
+    if normalization and normalization != "none":
+        payload["normalization"] = normalization
+    if alternatives is not None:
+        payload["alternatives"] = _alternatives_section(alternatives)
+    return payload
+
+
+def build_slim_scorecard_payload(
+    profile: Mapping[str, object],
+    results: Sequence[ScoreResult],
+    criteria: CriteriaConfig,
+    *,
+    shortlist_size: int = 5,
+    flips: Sequence[RankFlip] | None = None,
+    normalization: str | None = None,
+    alternatives: Mapping[str, Sequence[SimilarVendor]] | None = None,
+) -> dict[str, object]:
+    """Create a compact payload that ``inflate_scorecard_payload`` turns back into v1.
+
+    Vendor metadata (name, capabilities, strengths, trade-offs, notes) is stored once under
+    ``catalog`` keyed by slug, ``shortlist`` lists slugs, and each ranked vendor keeps its raw
+    and weighted scores as arrays aligned to ``metrics``. Ranks are implied by list order and
+    per-metric weights come from ``weights``. Category roll-ups, when present, are arrays in
+    the order ``categories`` groups the metrics. Slugs must be unique.
+    """
+
+    shortlist_size = max(1, shortlist_size)
+    metrics = list(criteria.weights)
+    catalog: dict[str, dict[str, object]] = {}
+    rows: list[dict[str, object]] = []
+    for result in results:
+        vendor_snapshot = result.vendor.as_dict()
+        slug = vendor_snapshot.get("slug", result.vendor.slug)
+        if slug in catalog:
+            raise ValueError(f"Slim scorecards need unique vendor slugs; '{slug}' repeats.")
+        strengths, tradeoffs = _partition_notes(result.vendor.get_notes())
+        catalog[slug] = {
+            "name": vendor_snapshot.get("name", result.vendor.name),
+            "capabilities": vendor_snapshot.get("capabilities", []),
+            "strengths": strengths,
+            "tradeoffs": tradeoffs,
+            "notes": vendor_snapshot.get("notes", []),
+        }
+        row: dict[str, object] = {
+            "slug": slug,
+            "score": round(result.total, 2),
+            "raw": [round(result.breakdown[metric]["raw"], 2) for metric in metrics],
+            "weighted": [round(result.breakdown[metric]["weighted"], 4) for metric in metrics],
+            "missing_metrics": list(result.missing_metrics),
+        }
+        if criteria.categories:
+            row["category_scores"] = list(_category_scores(result, criteria).values())
+        rows.append(row)
+
+    payload: dict[str, object] = {
+        "schema": SLIM_SCHEMA_VERSION,
+        "profile": dict(profile),
+        "weights": dict(criteria.weights),
+        "scales": dict(criteria.scales),
+        "metrics": metrics,
+        "catalog": catalog,
+        "vendors": rows,
+        "shortlist": [row["slug"] for row in rows[:shortlist_size]],
+    }
+    if criteria.categories:
+        payload["categories"] = _categories_section(criteria)
+    if flips is not None:
+        payload["rank_flips"] = [flip.as_dict() for flip in flips]
+    if normalization and normalization != "none":
+        payload["normalization"] = normalization
+    if alternatives is not None:
+        payload["alternatives"] = _alternatives_section(alternatives)
     return payload
 
 
+def inflate_scorecard_payload(
+    payload: Mapping[str, Any],
+    catalog: Mapping[str, Mapping[str, Any]] | None = None,
+) -> dict[str, object]:
+    """Rebuild the v1 payload from a slim one; v1 payloads are returned unchanged.
+
+    ``catalog`` supplies the vendor metadata when it was written to a separate file.
+    """
+
+    schema = payload.get("schema")
+    if schema == SCHEMA_VERSION:
+        return dict(payload)
+    if schema != SLIM_SCHEMA_VERSION:
+        raise DataLoadError(f"Unsupported scorecard schema: {schema!r}.")
+    if catalog is None:
+        catalog = payload.get("catalog")
+    if catalog is None:
+        raise DataLoadError("Slim scorecard has no vendor catalog; supply it separately.")
+
+    metrics = list(payload["metrics"])
+    weights = payload["weights"]
+    categories = payload.get("categories")
+    groups = None
+    if categories:
+        groups = list(_criteria_from_payload(metrics, categories).rollup({}))
+    entries: list[dict[str, object]] = []
+    by_slug: dict[str, dict[str, object]] = {}
+    for rank, row in enumerate(payload["vendors"], start=1):
+        slug = row["slug"]
+        try:
+            details = catalog[slug]
+        except KeyError as exc:
+            raise DataLoadError(f"Vendor '{slug}' is missing from the scorecard catalog.") from exc
+        entry = {
+            "rank": rank,
+            "name": details["name"],
+            "slug": slug,
+            "score": row["score"],
+            "breakdown": {
+                metric: {
+                    "raw": raw,
+                    "weighted": weighted,
+                    "weight": round(float(weights[metric]), 2),
+                }
+                for metric, raw, weighted in zip(metrics, row["raw"], row["weighted"], strict=True)
+            },
+            "missing_metrics": list(row["missing_metrics"]),
+            "capabilities": details["capabilities"],
+            "strengths": details["strengths"],
+            "tradeoffs": details["tradeoffs"],
+            "notes": details["notes"],
+        }
+        if groups is not None:
+            entry["category_scores"] = dict(zip(groups, row["category_scores"], strict=True))
+        entries.append(entry)
+        by_slug[slug] = entry
+
+    inflated: dict[str, object] = {
+        "schema": SCHEMA_VERSION,
+        "profile": dict(payload["profile"]),
+        "weights": dict(weights),
+        "scales": dict(payload["scales"]),
+        "vendors": entries,
+        "shortlist": [by_slug[slug] for slug in payload["shortlist"]],
+    }
+    if categories:
+        inflated["categories"] = categories
+    for optional in ("rank_flips", "normalization", "alternatives"):
+        if optional in payload:
+            inflated[optional] = payload[optional]
+    return inflated
+
+
+def load_scorecard_payload(path: Path | str) -> dict[str, object]:
+    """Read a scorecard JSON file of either schema and return it in the v1 shape.
+
+    A slim payload's ``catalog_file`` is resolved relative to the scorecard itself.
+    """
+
+    scorecard_path = Path(path)
+    payload = _read_json(scorecard_path)
+    catalog = None
+    if payload.get("schema") == SLIM_SCHEMA_VERSION and "catalog" not in payload:
+        catalog_name = payload.get("catalog_file")
+        if not catalog_name:
+            raise DataLoadError(f"Slim scorecard {scorecard_path} names no catalog file.")
+        document = _read_json(scorecard_path.parent / catalog_name)
+        if document.get("schema") != SLIM_CATALOG_SCHEMA_VERSION:
+            raise DataLoadError(f"{catalog_name} is not a crm-eval scorecard catalog.")
+        catalog = document["vendors"]
+    try:
+        return inflate_scorecard_payload(payload, catalog)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise DataLoadError(f"Scorecard {scorecard_path} is malformed: {exc}") from exc
+
+
+def _read_json(path: Path) -> dict[str, Any]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except FileNotFoundError as exc:
+        raise DataLoadError(f"Scorecard file not found: {path}") from exc
+    except json.JSONDecodeError as exc:
+        raise DataLoadError(f"JSON parsing error in {path}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise DataLoadError(f"Expected a JSON object in {path}.")
+    return data
+
+
+def _alternatives_section(
+    alternatives: Mapping[str, Sequence[SimilarVendor]],
+) -> dict[str, list[dict[str, Any]]]:
+    return {slug: [match.as_dict() for match in matches] for slug, matches in alternatives.items()}
+
+
+def _categories_section(criteria: CriteriaConfig) -> dict[str, list[str]]:
+    return {name: list(leaves) for name, leaves in criteria.categories.items()}
+
+
+def _criteria_from_payload(
+    metrics: Sequence[str], categories: Mapping[str, Sequence[str]]
+) -> CriteriaConfig:
+    """Rebuild enough criteria to order roll-ups; ``metrics`` keeps its order through JSON."""
+
+    return CriteriaConfig(
+        weights=dict.fromkeys(metrics, 0.0),
+        scales={},
+        categories={name: tuple(leaves) for name, leaves in categories.items()},
+    )
+
+
+def _category_scores(result: ScoreResult, criteria: CriteriaConfig) -> dict[str, float]:
+    weighted = {metric: values["weighted"] for metric, values in result.breakdown.items()}
+    return {group: round(value, 4) for group, value in criteria.rollup(weighted).items()}
+
+
+def build_vendor_entry(
+    rank: int, result: ScoreResult, criteria: CriteriaConfig | None = None
+) -> dict[str, object]:
+    """One vendor's entry in the scorecard ``vendors`` and ``shortlist`` lists."""
+
+    vendor_snapshot = result.vendor.as_dict()
+    breakdown = {
+        metric: {
+            "raw": round(values["raw"], 2),
+            "weighted": round(values["weighted"], 4),
+            "weight": round(values["weight"], 2),
+        }
+        for metric, values in result.breakdown.items()
+    }
+    strengths, tradeoffs = _partition_notes(result.vendor.get_notes())
+    entry: dict[str, object] = {
+        "rank": rank,
+        "name": vendor_snapshot.get("name", result.vendor.name),
+        "slug": vendor_snapshot.get("slug", result.vendor.slug),
+        "score": round(result.total, 2),
+        "breakdown": breakdown,
+        "missing_metrics": list(result.missing_metrics),
+        "capabilities": vendor_snapshot.get("capabilities", []),
+        "strengths": strengths,
+        "tradeoffs": tradeoffs,
+        "notes": vendor_snapshot.get("notes", []),
+    }
+    if criteria is not None and criteria.categories:
+        entry["category_scores"] = _category_scores(result, criteria)
+    return entry
+
+
 def render_markdown_scorecard(
     profile: Mapping[str, object],
     results: Sequence[ScoreResult],
     criteria: CriteriaConfig,
     *,
     shortlist_size: int = 5,
+    fragments: FragmentCache | None = None,
+    flips: Sequence[RankFlip] | None = None,
 ) -> str:
-    """Render a Markdown report mirroring the JSON payload."""
+    """Render a Markdown report mirroring the JSON payload.
 
-    payload = build_scorecard_payload(profile, results, criteria, shortlist_size=shortlist_size)
+    Deep-dive sections are served from ``fragments`` when a cache is supplied; ``flips`` adds
+    a section describing what would reorder the shortlist.
+    """
+
+    shortlist = [
+        build_vendor_entry(rank, result, criteria)
+        for rank, result in enumerate(results[: max(1, shortlist_size)], start=1)
+    ]
     lines: list[str] = []
     lines.append("# CRM Evaluation Scorecard")
     lines.append("")
@@ -84,15 +337,37 @@ def render_markdown_scorecard(
 
     lines.append("## Top Vendors Overview")
     lines.append("")
-    lines.extend(_render_top_table(payload["shortlist"]))
+    lines.extend(_render_top_table(shortlist))
     lines.append("")
 
+    if criteria.categories:
+        lines.append("## Category Scores")
+        lines.append("")
+        lines.extend(_render_category_table(shortlist))
+        lines.append("")
+
     lines.append("## Deep Dive on Top Choices")
     lines.append("")
-    for entry in payload["shortlist"][:3]:
-        lines.extend(_render_vendor_detail(entry))
+    for entry, result in zip(shortlist[:3], results, strict=False):
+        if fragments is None:
+            lines.extend(_render_vendor_detail(entry))
+        else:
+            lines.append(_render_vendor_heading(entry))
+            lines.extend(
+                fragments.render(
+                    "scorecard_detail", result, lambda _result, e=entry: _render_vendor_body(e)
+                )
+            )
         lines.append("")
 
+    if flips is not None:
+        flip_lines = render_rank_flips(flips, max_rank=shortlist_size)
+        if flip_lines:
+            lines.append("## What Would Change the Ranking")
+            lines.append("")
+            lines.extend(flip_lines)
+            lines.append("")
+
     lines.append("## How to Use This Scorecard")
     lines.append("")
     lines.append(
@@ -175,12 +450,31 @@ def _render_top_table(shortlist: Sequence[Mapping[str, object]]) -> list[str]:
     return rows
 
 
+def _render_category_table(shortlist: Sequence[Mapping[str, Any]]) -> list[str]:
+    groups = list(shortlist[0]["category_scores"]) if shortlist else []
+    rows = [
+        "| Vendor | " + " | ".join(groups) + " |",
+        "| :----- |" + " ----: |" * len(groups),
+    ]
+    for entry in shortlist:
+        scores = entry["category_scores"]
+        cells = " | ".join(f"{scores[group]:.2f}" for group in groups)
+        rows.append(f"| {entry['name']} | {cells} |")
+    return rows
+
+
 def _render_vendor_detail(entry: Mapping[str, object]) -> list[str]:
-    lines: list[str] = []
+    return [_render_vendor_heading(entry), *_render_vendor_body(entry)]
+
+
+def _render_vendor_heading(entry: Mapping[str, object]) -> str:
     name = entry.get("name", "Unnamed Vendor")
     score = entry.get("score", 0.0)
-    lines.append(f"### {entry['rank']}. {name} — {score:.2f}/100")
-    lines.append("")
+    return f"### {entry['rank']}. {name} — {score:.2f}/100"
+
+
+def _render_vendor_body(entry: Mapping[str, object]) -> list[str]:
+    lines: list[str] = [""]
     strengths = entry.get("strengths", [])
     tradeoffs = entry.get("tradeoffs", [])
     capabilities = entry.get("capabilities", [])
@@ -2,28 +2,45 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
-from dataclasses import dataclass
+import heapq
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
 from typing import Any
 
-from .data import CriteriaConfig, VendorRecord
+from .data import CriteriaConfig, VendorRecord, metric_score
 
-__all__ = ["ScoreResult", "score_vendor", "rank_vendors"]
+__all__ = [
+    "BudgetCheck",
+    "Normalizer",
+    "ScoreResult",
+    "score_vendor",
+    "iter_scores",
+    "rank_vendors",
+    "top_vendors",
+]
 
 DEFAULT_MISSING_SCORE = 2.0
 
+Normalizer = Callable[[str, float], float]
+# Returns points to subtract from a vendor's total, or ``None`` to leave it out of the ranking.
+BudgetCheck = Callable[[VendorRecord], float | None]
+
 
 @dataclass(frozen=True)
 class ScoreResult:
-    """Represents weighted score output for a single vendor."""
+    """Represents weighted score output for a single vendor.
+
+    ``budget_penalty`` records points already subtracted from ``total`` for exceeding a budget.
+    """
 
     vendor: VendorRecord
     total: float
     breakdown: dict[str, dict[str, float]]
     missing_metrics: list[str]
+    budget_penalty: float = 0.0
 
     def as_dict(self) -> dict[str, Any]:
-        return {
+        payload: dict[str, Any] = {
             "vendor": self.vendor.as_dict(),
             "score": round(self.total, 2),
             "breakdown": {
@@ -36,6 +53,9 @@ class ScoreResult:
             },
             "missing_metrics": list(self.missing_metrics),
         }
+        if self.budget_penalty:
+            payload["budget_penalty"] = round(self.budget_penalty, 4)
+        return payload
 
 
 def score_vendor(
@@ -43,8 +63,13 @@ def score_vendor(
     weights: Mapping[str, int],
     *,
     default_missing_score: float = DEFAULT_MISSING_SCORE,
+    normalizer: Normalizer | None = None,
 ) -> ScoreResult:
-    """Calculate the weighted score for a vendor using the provided metric weights."""
+    """Calculate the weighted score for a vendor using the provided metric weights.
+
+    A ``normalizer`` maps each clamped raw score to the 0–5 value that is weighted; the
+    breakdown then records it under ``normalized`` next to the untouched ``raw`` score.
+    """
 
     if default_missing_score < 0 or default_missing_score > 5:
         raise ValueError("default_missing_score must be between 0 and 5 inclusive.")
@@ -56,6 +81,8 @@ def score_vendor(
     raw_scores = vendor.get_scores()
     for metric, weight in weights.items():
         raw_value = raw_scores.get(metric)
+        if raw_value is None and "." in metric:
+            raw_value = metric_score(raw_scores, metric)
         if raw_value is None:
             raw_value = default_missing_score
             missing_metrics.append(metric)
@@ -66,12 +93,22 @@ def score_vendor(
                 f"Score for metric '{metric}' in vendor '{vendor.name}' must be numeric."
             ) from exc
         raw_clamped = max(0.0, min(5.0, raw_float))
-        weighted_score = (raw_clamped / 5.0) * float(weight)
-        breakdown[metric] = {
-            "raw": raw_clamped,
-            "weighted": weighted_score,
-            "weight": float(weight),
-        }
+        if normalizer is None:
+            weighted_score = (raw_clamped / 5.0) * float(weight)
+            breakdown[metric] = {
+                "raw": raw_clamped,
+                "weighted": weighted_score,
+                "weight": float(weight),
+            }
+        else:
+            normalized = normalizer(metric, raw_clamped)
+            weighted_score = (normalized / 5.0) * float(weight)
+            breakdown[metric] = {
+                "raw": raw_clamped,
+                "normalized": normalized,
+                "weighted": weighted_score,
+                "weight": float(weight),
+            }
         total_score += weighted_score
 
     return ScoreResult(
@@ -87,12 +124,84 @@ def rank_vendors(
     criteria: CriteriaConfig,
     *,
     default_missing_score: float = DEFAULT_MISSING_SCORE,
+    normalizer: Normalizer | None = None,
+    budget: BudgetCheck | None = None,
 ) -> list[ScoreResult]:
-    """Score and rank vendors, returning results sorted by total descending then name."""
-
-    results = [
-        score_vendor(vendor, criteria.weights, default_missing_score=default_missing_score)
-        for vendor in vendors
-    ]
-    results.sort(key=lambda item: (-item.total, item.vendor.name.lower()))
+    """Score and rank vendors, returning results sorted by total descending then name.
+
+    A ``budget`` check is consulted per vendor: vendors it rejects are dropped and any
+    penalty it returns is subtracted from the total before sorting.
+    """
+
+    results = list(
+        iter_scores(
+            vendors,
+            criteria,
+            default_missing_score=default_missing_score,
+            normalizer=normalizer,
+            budget=budget,
+        )
+    )
+    results.sort(key=_rank_key)
     return results
+
+
+def top_vendors(
+    vendors: Iterable[VendorRecord],
+    criteria: CriteriaConfig,
+    k: int,
+    *,
+    default_missing_score: float = DEFAULT_MISSING_SCORE,
+    normalizer: Normalizer | None = None,
+    budget: BudgetCheck | None = None,
+) -> list[ScoreResult]:
+    """Return the first ``k`` results ``rank_vendors`` would, consuming ``vendors`` lazily.
+
+    Only the best ``k`` results are held at any time, so a vendor generator such as a
+    streamed feed is scored in memory bounded by ``k`` rather than by the catalog size.
+    """
+
+    if k < 1:
+        raise ValueError("k must be at least 1.")
+    scored = iter_scores(
+        vendors,
+        criteria,
+        default_missing_score=default_missing_score,
+        normalizer=normalizer,
+        budget=budget,
+    )
+    return heapq.nsmallest(k, scored, key=_rank_key)
+
+
+def iter_scores(
+    vendors: Iterable[VendorRecord],
+    criteria: CriteriaConfig,
+    *,
+    default_missing_score: float = DEFAULT_MISSING_SCORE,
+    normalizer: Normalizer | None = None,
+    budget: BudgetCheck | None = None,
+) -> Iterator[ScoreResult]:
+    """Score vendors one at a time in input order, applying ``budget`` as ``rank_vendors`` does."""
+
+    for vendor in vendors:
+        result = score_vendor(
+            vendor,
+            criteria.weights,
+            default_missing_score=default_missing_score,
+            normalizer=normalizer,
+        )
+        if budget is not None:
+            penalty = budget(vendor)
+            if penalty is None:
+                continue
+            if penalty:
+                result = replace(
+                    result,
+                    total=round(result.total - penalty, 4),
+                    budget_penalty=penalty,
+                )
+        yield result
+
+
+def _rank_key(result: ScoreResult) -> tuple[float, str]:
+    return -result.total, result.vendor.name.lower()
@@ -0,0 +1,274 @@
+"""Trigram fuzzy search over vendor names, slugs, notes, capabilities and plans."""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+import struct
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .data import (
+    DataLoadError,
+    VendorRecord,
+    catalog_fingerprint,
+    iter_vendors,
+    resolve_vendor_files,
+)
+
+__all__ = [
+    "SearchHit",
+    "TrigramIndex",
+    "INDEX_FILENAME",
+    "load_or_build_index",
+]
+
+INDEX_FILENAME = ".crm-eval-search.idx"
+INDEX_MAGIC = b"CRMTRI1\n"
+INDEX_VERSION = 2
+
+FIELDS: tuple[str, ...] = ("name", "slug", "capabilities", "plan_names", "notes")
+FIELD_WEIGHTS: tuple[float, ...] = (1.0, 0.9, 0.8, 0.6, 0.5)
+DEFAULT_MIN_SCORE = 0.3
+
+_WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A ranked match; ``field`` names the field that produced the best score."""
+
+    slug: str
+    name: str
+    score: float
+    field: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "slug": self.slug,
+            "name": self.name,
+            "score": round(self.score, 4),
+            "field": self.field,
+        }
+
+
+class TrigramIndex:
+    """Inverted index from ``field id + padded word trigram`` keys to vendor doc ids.
+
+    A document's score for a query is the best field weight times the share of the query's
+    trigrams found in that field, so partial words ("dyn") and reordered tokens still match.
+    """
+
+    def __init__(
+        self,
+        docs: Sequence[tuple[str, str]],
+        postings: Mapping[str, Sequence[int]],
+    ) -> None:
+        self.docs = list(docs)
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @classmethod
+    def build(cls, vendors: Iterable[VendorRecord]) -> TrigramIndex:
+        """Index the searchable fields of ``vendors``."""
+
+        docs: list[tuple[str, str]] = []
+        postings: dict[str, array] = {}
+        for doc_id, vendor in enumerate(vendors):
+            docs.append((vendor.slug, vendor.name))
+            for field_id, text in enumerate(_field_texts(vendor)):
+                for trigram in _trigrams(text):
+                    postings.setdefault(f"{field_id}{trigram}", array("I")).append(doc_id)
+        return cls(docs, postings)
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        min_score: float = DEFAULT_MIN_SCORE,
+    ) -> list[SearchHit]:
+        """Return up to ``limit`` hits scoring at least ``min_score``, best first."""
+
+        query_trigrams = _trigrams(query)
+        if not query_trigrams:
+            return []
+        limit = max(1, limit)
+        total = len(query_trigrams)
+        best: dict[int, tuple[float, int]] = {}
+        for field_id, weight in enumerate(FIELD_WEIGHTS):
+            counts: Counter[int] = Counter()
+            for trigram in query_trigrams:
+                doc_ids = self._postings.get(f"{field_id}{trigram}")
+                if doc_ids is not None:
+                    counts.update(doc_ids)
+            if not counts:
+                continue
+            # A document outside this field's top ``limit`` counts cannot reach the overall
+            # top ``limit`` through this field, so only counts at or above that cut matter.
+            ranked_counts = sorted(counts.values(), reverse=True)
+            cutoff = max(
+                math.ceil(min_score * total / weight - 1e-9),
+                ranked_counts[min(limit, len(ranked_counts)) - 1],
+            )
+            for doc_id, count in counts.items():
+                if count < cutoff:
+                    continue
+                score = weight * count / total
+                current = best.get(doc_id)
+                if current is None or score > current[0]:
+                    best[doc_id] = (score, field_id)
+
+        ranked = heapq.nsmallest(
+            limit,
+            best.items(),
+            key=lambda item: (-item[1][0], self.docs[item[0]][1].lower()),
+        )
+        return [
+            SearchHit(
+                slug=self.docs[doc_id][0],
+                name=self.docs[doc_id][1],
+                score=score,
+                field=FIELDS[field_id],
+            )
+            for doc_id, (score, field_id) in ranked
+        ]
+
+    def save(self, path: Path | str, *, fingerprint: str) -> None:
+        """Persist the index as a JSON header followed by one packed uint32 postings blob."""
+
+        keys = sorted(self._postings)
+        blob = array("I")
+        counts: list[int] = []
+        for key in keys:
+            doc_ids = self._postings[key]
+            blob.extend(doc_ids)
+            counts.append(len(doc_ids))
+        if sys.byteorder != "little":
+            blob.byteswap()
+        header = json.dumps(
+            {
+                "version": INDEX_VERSION,
+                "fingerprint": fingerprint,
+                "fields": list(FIELDS),
+                "docs": self.docs,
+                "keys": keys,
+                "counts": counts,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        target = Path(path)
+        temp = target.with_name(f".{target.name}.tmp")
+        with temp.open("wb") as handle:
+            handle.write(INDEX_MAGIC)
+            handle.write(struct.pack("<I", len(header)))
+            handle.write(header)
+            handle.write(blob.tobytes())
+        temp.replace(target)
+
+    @classmethod
+    def load(cls, path: Path | str) -> tuple[TrigramIndex, str]:
+        """Load a persisted index, returning it with the catalog fingerprint it was built from."""
+
+        with Path(path).open("rb") as handle:
+            if handle.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise DataLoadError(f"{path} is not a crm-eval search index.")
+            (header_length,) = struct.unpack("<I", handle.read(4))
+            header = json.loads(handle.read(header_length))
+            blob = array("I")
+            blob.frombytes(handle.read())
+        if header.get("version") != INDEX_VERSION or header.get("fields") != list(FIELDS):
+            raise DataLoadError(f"Search index {path} was built by an incompatible version.")
+        if sys.byteorder != "little":
+            blob.byteswap()
+
+        view = memoryview(blob)
+        postings: dict[str, memoryview] = {}
+        offset = 0
+        for key, count in zip(header["keys"], header["counts"], strict=True):
+            postings[key] = view[offset : offset + count]
+            offset += count
+        docs = [(str(slug), str(name)) for slug, name in header["docs"]]
+        return cls(docs, postings), str(header["fingerprint"])
+
+
+def load_or_build_index(
+    vendors_dir: Path | str | None = None,
+    *,
+    rebuild: bool = False,
+    verify: bool = True,
+) -> TrigramIndex:
+    """Return the index stored next to the catalog, rebuilding it when stale or missing.
+
+    The index lives in the vendor directory, or beside a feed or bundle file. With
+    ``verify=False`` a persisted index is trusted without re-checking the catalog's file sizes
+    and modification times, which keeps lookups in the millisecond range on very large
+    catalogs.
+    """
+
+    if vendors_dir is not None and Path(vendors_dir).is_file():
+        catalog = Path(vendors_dir)
+        vendor_paths = [catalog]
+        index_path = catalog.with_name(f"{catalog.name}{INDEX_FILENAME}")
+    else:
+        vendor_paths = resolve_vendor_files(vendors_dir)
+        index_path = vendor_paths[0].parent / INDEX_FILENAME
+    fingerprint = catalog_fingerprint(vendor_paths) if verify or rebuild else None
+    if not rebuild and index_path.exists():
+        try:
+            index, stored_fingerprint = TrigramIndex.load(index_path)
+        except (DataLoadError, ValueError, KeyError, struct.error):
+            index = None
+        if index is not None and (fingerprint is None or stored_fingerprint == fingerprint):
+            return index
+
+    index = TrigramIndex.build(iter_vendors(vendors_dir))
+    try:
+        index.save(
+            index_path,
+            fingerprint=fingerprint or catalog_fingerprint(vendor_paths),
+        )
+    except OSError:
+        pass
+    return index
+
+
+def _field_texts(vendor: VendorRecord) -> list[str]:
+    payload = vendor.payload
+    return [
+        vendor.name,
+        vendor.slug,
+        " ".join(_as_strings(payload.get("capabilities"))),
+        " ".join(_as_strings(payload.get("plan_names"))),
+        " ".join(vendor.get_notes()),
+    ]
+
+
+def _as_strings(value: object) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, Iterable):
+        return [str(item) for item in value]
+    return []
+
+
+def _trigrams(text: str) -> set[str]:
+    """Padded trigrams per word: two leading spaces and one trailing, as in pg_trgm."""
+
+    grams: set[str] = set()
+    for word in _WORD_SPLIT.split(text.lower()):
+        if not word:
+            continue
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
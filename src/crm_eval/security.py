@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
 
+from .fragments import FragmentCache
 from .scoring import ScoreResult
 
 __all__ = ["build_security_checklist"]
@@ -13,8 +14,12 @@ def build_security_checklist(
     ranked_vendors: Sequence[ScoreResult],
     *,
     shortlist_size: int = 5,
+    fragments: FragmentCache | None = None,
 ) -> str:
-    """Generate a Markdown security/compliance checklist informed by top vendors."""
+    """Generate a Markdown security/compliance checklist informed by top vendors.
+
+    Per-vendor snapshots are served from ``fragments`` when a cache is supplied.
+    """
 
     shortlist_size = max(1, shortlist_size)
     top_vendors = list(ranked_vendors[:shortlist_size])
@@ -49,27 +54,10 @@ def build_security_checklist(
     lines.append("## Vendor Snapshots")
     lines.append("")
     for result in top_vendors:
-        vendor = result.vendor.as_dict()
-        security = vendor.get("security", {})
-        compliance = (
-            ", ".join(security.get("compliance", [])) if isinstance(security, Mapping) else ""
-        )
-        sso = security.get("sso", "unspecified") if isinstance(security, Mapping) else "unspecified"
-        mfa = security.get("mfa", "unspecified") if isinstance(security, Mapping) else "unspecified"
-        lines.append(f"- **{vendor['name']}** (score {result.total:.2f})")
-        lines.append(f"  - SSO: {sso}; MFA available: {mfa}")
-        if compliance:
-            lines.append(f"  - Noted attestations/certifications: {compliance}")
-        data_residency = security.get("data_residency") if isinstance(security, Mapping) else None
-        if data_residency:
-            if isinstance(data_residency, list):
-                residency = ", ".join(data_residency)
-            else:
-                residency = str(data_residency)
-            lines.append(f"  - Data residency options: {residency}")
-        missing = result.missing_metrics
-        if missing:
-            lines.append(f"  - Metrics to validate: {', '.join(missing)}")
+        if fragments is None:
+            lines.extend(_render_vendor_snapshot(result))
+        else:
+            lines.extend(fragments.render("security", result, _render_vendor_snapshot))
     lines.append("")
 
     lines.append("## Verification Steps")
@@ -78,3 +66,27 @@ def build_security_checklist(
     lines.append("- Perform quarterly access reviews and webhook/API credential rotation.")
 
     return "\n".join(lines).strip() + "\n"
+
+
+def _render_vendor_snapshot(result: ScoreResult) -> list[str]:
+    lines: list[str] = []
+    vendor = result.vendor.as_dict()
+    security = vendor.get("security", {})
+    compliance = ", ".join(security.get("compliance", [])) if isinstance(security, Mapping) else ""
+    sso = security.get("sso", "unspecified") if isinstance(security, Mapping) else "unspecified"
+    mfa = security.get("mfa", "unspecified") if isinstance(security, Mapping) else "unspecified"
+    lines.append(f"- **{vendor['name']}** (score {result.total:.2f})")
+    lines.append(f"  - SSO: {sso}; MFA available: {mfa}")
+    if compliance:
+        lines.append(f"  - Noted attestations/certifications: {compliance}")
+    data_residency = security.get("data_residency") if isinstance(security, Mapping) else None
+    if data_residency:
+        if isinstance(data_residency, list):
+            residency = ", ".join(data_residency)
+        else:
+            residency = str(data_residency)
+        lines.append(f"  - Data residency options: {residency}")
+    missing = result.missing_metrics
+    if missing:
+        lines.append(f"  - Metrics to validate: {', '.join(missing)}")
+    return lines
@@ -0,0 +1,302 @@
+"""Long-lived evaluation session that memoizes catalog, rankings and reports."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .data import CriteriaConfig, VendorRecord, load_criteria, load_profile, load_vendors
+from .fragments import FragmentCache
+from .integrate import build_integration_notes
+from .matrix import ProfileScore, ScoreMatrix
+from .memo import canonical_profile, profile_hash
+from .migration import build_migration_plan
+from .normalize import NORMALIZATION_MODES, CatalogStats, MetricNormalizer
+from .report import build_scorecard_payload, render_markdown_scorecard
+from .scoring import DEFAULT_MISSING_SCORE, ScoreResult, rank_vendors
+from .security import build_security_checklist
+
+__all__ = ["EvaluationSession", "DEFAULT_SESSION_ENTRIES"]
+
+DEFAULT_SESSION_ENTRIES = 256
+
+T = TypeVar("T")
+ProfileInput = Mapping[str, Any] | Path | str
+
+_VENDORS_KEY = ("vendors",)
+_CRITERIA_KEY = ("criteria",)
+_RESULTS_KEY = ("results",)
+_STATS_KEY = ("stats",)
+_MATRIX_KEY = ("matrix",)
+_MISSING = object()
+
+
+class _Pending:
+    """A value being computed by one thread that other threads can wait for."""
+
+    def __init__(self) -> None:
+        self._done = threading.Event()
+        self._value: Any = None
+        self._error: BaseException | None = None
+
+    def resolve(self, value: Any = None, error: BaseException | None = None) -> None:
+        self._value = value
+        self._error = error
+        self._done.set()
+
+    def wait(self) -> Any:
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class EvaluationSession:
+    """Owns a catalog and criteria and memoizes every ranking and report derived from them.
+
+    Warm lookups do not take the lock. A cold entry is computed by exactly one thread while
+    concurrent callers for the same key wait for it, and callers for other keys proceed in
+    parallel. ``invalidate`` (or ``set_vendors``/``set_criteria``) drops the affected entries;
+    computations that started before an invalidation are returned to their callers but never
+    cached. Profiles are keyed and rendered in canonical form, so profiles differing only in
+    key order, list order or capability casing share entries. Returned objects are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        *,
+        vendors_dir: Path | str | None = None,
+        criteria_path: Path | str | None = None,
+        vendors: Sequence[VendorRecord] | None = None,
+        criteria: CriteriaConfig | None = None,
+        fragments: FragmentCache | None = None,
+        default_missing_score: float = DEFAULT_MISSING_SCORE,
+        normalization: str = "none",
+        max_entries: int = DEFAULT_SESSION_ENTRIES,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("Session cache size must be at least 1.")
+        if normalization not in NORMALIZATION_MODES:
+            raise ValueError(
+                f"Normalization mode must be one of: {', '.join(NORMALIZATION_MODES)}."
+            )
+        self.vendors_dir = vendors_dir
+        self.criteria_path = criteria_path
+        self.fragments = fragments if fragments is not None else FragmentCache()
+        self.default_missing_score = default_missing_score
+        self.normalization = normalization
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._base: dict[tuple[str], Any] = {}
+        self._memo: OrderedDict[Hashable, Any] = OrderedDict()
+        self._pending: dict[Hashable, _Pending] = {}
+        if vendors is not None:
+            self._base[_VENDORS_KEY] = list(vendors)
+        if criteria is not None:
+            self._base[_CRITERIA_KEY] = criteria
+
+    @property
+    def vendors(self) -> list[VendorRecord]:
+        """The catalog, loaded from ``vendors_dir`` on first use."""
+
+        return self._cached(_VENDORS_KEY, lambda: load_vendors(self.vendors_dir))
+
+    @property
+    def criteria(self) -> CriteriaConfig:
+        """The criteria, loaded from ``criteria_path`` on first use."""
+
+        return self._cached(_CRITERIA_KEY, lambda: load_criteria(self.criteria_path))
+
+    @property
+    def stats(self) -> CatalogStats:
+        """Per-metric statistics of the catalog, gathered once for normalization."""
+
+        return self._cached(
+            _STATS_KEY,
+            lambda: CatalogStats.from_vendors(self.vendors, metrics=self.criteria.weights),
+        )
+
+    def results(self) -> list[ScoreResult]:
+        """Every vendor ranked like ``rank_vendors``, normalized when the session asks for it."""
+
+        def rank() -> list[ScoreResult]:
+            normalizer = None
+            if self.normalization != "none":
+                normalizer = MetricNormalizer(self.stats, self.normalization)
+            return rank_vendors(
+                self.vendors,
+                self.criteria,
+                default_missing_score=self.default_missing_score,
+                normalizer=normalizer,
+            )
+
+        return self._cached(_RESULTS_KEY, rank)
+
+    @property
+    def matrix(self) -> ScoreMatrix:
+        """The ranking packed for cheap per-profile overlays, built once."""
+
+        return self._cached(_MATRIX_KEY, lambda: ScoreMatrix(self.results(), self.criteria))
+
+    def profile_ranking(
+        self, profile: ProfileInput, *, top: int | None = None
+    ) -> list[ProfileScore]:
+        """The catalog re-ranked for ``profile``'s must-haves, regions and budget."""
+
+        profile_data, key = self._profile(profile)
+        return self._cached(
+            ("profile_ranking", key, top), lambda: self.matrix.evaluate(profile_data, top=top)
+        )
+
+    def shortlist(self, size: int = 5) -> list[ScoreResult]:
+        """The top ``size`` results."""
+
+        return self.results()[: max(1, size)]
+
+    def scorecard_payload(self, profile: ProfileInput, *, top: int = 5) -> dict[str, object]:
+        """The JSON scorecard payload for ``profile``."""
+
+        profile_data, key = self._profile(profile)
+        return self._cached(
+            ("scorecard_payload", key, top),
+            lambda: build_scorecard_payload(
+                profile_data,
+                self.results(),
+                self.criteria,
+                shortlist_size=top,
+                normalization=self.normalization,
+            ),
+        )
+
+    def scorecard_markdown(self, profile: ProfileInput, *, top: int = 5) -> str:
+        """The Markdown scorecard for ``profile``."""
+
+        profile_data, key = self._profile(profile)
+        return self._cached(
+            ("scorecard_markdown", key, top),
+            lambda: render_markdown_scorecard(
+                profile_data,
+                self.results(),
+                self.criteria,
+                shortlist_size=top,
+                fragments=self.fragments,
+            ),
+        )
+
+    def migration_plan(self, profile: ProfileInput, *, top: int = 3) -> str:
+        """The migration plan Markdown for ``profile``."""
+
+        profile_data, key = self._profile(profile)
+        return self._cached(
+            ("migration", key, top),
+            lambda: build_migration_plan(
+                profile_data, self.results(), shortlist_size=top, fragments=self.fragments
+            ),
+        )
+
+    def security_checklist(self, *, top: int = 5) -> str:
+        """The security checklist Markdown; it does not depend on a profile."""
+
+        return self._cached(
+            ("security", top),
+            lambda: build_security_checklist(
+                self.results(), shortlist_size=top, fragments=self.fragments
+            ),
+        )
+
+    def integration_notes(self, profile: ProfileInput, *, top: int = 3) -> str:
+        """The integration notes Markdown for ``profile``."""
+
+        profile_data, key = self._profile(profile)
+        return self._cached(
+            ("integration", key, top),
+            lambda: build_integration_notes(
+                profile_data, self.results(), shortlist_size=top, fragments=self.fragments
+            ),
+        )
+
+    def invalidate(self, *, vendors: bool = True, criteria: bool = True) -> None:
+        """Forget derived results and reload the selected inputs from disk on next use."""
+
+        with self._lock:
+            self._generation += 1
+            if vendors:
+                self._base.pop(_VENDORS_KEY, None)
+            if criteria:
+                self._base.pop(_CRITERIA_KEY, None)
+            self._memo.clear()
+            # Callers arriving from now on must not join computations over the old inputs.
+            self._pending.clear()
+
+    def set_vendors(self, vendors: Sequence[VendorRecord]) -> None:
+        """Replace the catalog in memory and drop everything derived from it."""
+
+        with self._lock:
+            self.invalidate(vendors=True, criteria=False)
+            self._base[_VENDORS_KEY] = list(vendors)
+
+    def set_criteria(self, criteria: CriteriaConfig) -> None:
+        """Replace the criteria in memory and drop everything derived from them."""
+
+        with self._lock:
+            self.invalidate(vendors=False, criteria=True)
+            self._base[_CRITERIA_KEY] = criteria
+
+    def _profile(self, profile: ProfileInput) -> tuple[Mapping[str, Any], str]:
+        data = load_profile(profile) if isinstance(profile, (str, Path)) else profile
+        canonical = canonical_profile(data)
+        return canonical, profile_hash(canonical)
+
+    def _forget_pending(self, key: Hashable, pending: _Pending) -> None:
+        # After an invalidation the slot may already belong to a newer computation.
+        if self._pending.get(key) is pending:
+            del self._pending[key]
+
+    def _cached(self, key: Hashable, compute: Callable[[], T]) -> T:
+        store: dict[Any, Any] = self._base if key in (_VENDORS_KEY, _CRITERIA_KEY) else self._memo
+        value = store.get(key, _MISSING)
+        if value is not _MISSING:
+            if store is self._memo:
+                # Refresh recency without the lock; the entry may have just been evicted.
+                with contextlib.suppress(KeyError):
+                    self._memo.move_to_end(key)
+            return value
+
+        with self._lock:
+            value = store.get(key, _MISSING)
+            if value is not _MISSING:
+                if store is self._memo:
+                    self._memo.move_to_end(key)
+                return value
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _Pending()
+                generation = self._generation
+        if not owner:
+            return pending.wait()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._forget_pending(key, pending)
+            pending.resolve(error=exc)
+            raise
+        with self._lock:
+            self._forget_pending(key, pending)
+            if generation == self._generation:
+                if store is self._memo:
+                    self._memo[key] = value
+                    while len(self._memo) > self.max_entries:
+                        self._memo.popitem(last=False)
+                else:
+                    self._base[key] = value
+        pending.resolve(value)
+        return value
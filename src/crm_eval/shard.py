@@ -0,0 +1,253 @@
+"""Score one shard of the catalog and k-way merge partial rankings back together."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .build import write_if_changed
+from .data import CriteriaConfig, DataLoadError, VendorRecord, load_vendor_file
+from .scoring import DEFAULT_MISSING_SCORE, ScoreResult, score_vendor
+
+__all__ = [
+    "PARTIAL_FORMAT",
+    "SHARD_MODES",
+    "PartialHeader",
+    "criteria_digest",
+    "merge_partials",
+    "read_partial",
+    "score_shard",
+    "select_shard",
+]
+
+PARTIAL_FORMAT = "crm-eval-partial/v1"
+SHARD_MODES = ("hash", "range")
+
+
+@dataclass(frozen=True)
+class PartialHeader:
+    """First line of a partial ranking: which slice of which catalog it covers."""
+
+    shard: int
+    shards: int
+    mode: str
+    criteria: str
+    count: int
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "format": PARTIAL_FORMAT,
+            "shard": self.shard,
+            "shards": self.shards,
+            "mode": self.mode,
+            "criteria": self.criteria,
+            "count": self.count,
+        }
+
+
+def criteria_digest(criteria: CriteriaConfig) -> str:
+    """Digest of the weights and scales, used to refuse merging mismatched shards."""
+
+    canonical = json.dumps(criteria.as_dict(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def select_shard(
+    paths: Sequence[Path],
+    *,
+    shard: int,
+    shards: int,
+    mode: str = "hash",
+) -> list[tuple[int, Path]]:
+    """Return ``(catalog position, path)`` pairs belonging to ``shard`` of ``shards``.
+
+    ``hash`` assigns each file by a stable hash of its slug, so adding a vendor only moves that
+    vendor; ``range`` splits the load order into contiguous, near-equal blocks.
+    """
+
+    if shards < 1 or not 0 <= shard < shards:
+        raise ValueError(f"Shard index must be between 0 and {shards - 1}.")
+    if mode not in SHARD_MODES:
+        raise ValueError(f"Shard mode must be one of: {', '.join(SHARD_MODES)}.")
+    if mode == "range":
+        start = len(paths) * shard // shards
+        stop = len(paths) * (shard + 1) // shards
+        return list(enumerate(paths))[start:stop]
+    return [
+        (position, path)
+        for position, path in enumerate(paths)
+        if _slug_bucket(path.stem.lower(), shards) == shard
+    ]
+
+
+def score_shard(
+    paths: Sequence[Path],
+    criteria: CriteriaConfig,
+    out: Path | str,
+    *,
+    shard: int,
+    shards: int,
+    mode: str = "hash",
+    default_missing_score: float = DEFAULT_MISSING_SCORE,
+) -> PartialHeader:
+    """Score one shard of ``paths`` and write it as a sorted JSON Lines partial ranking.
+
+    ``paths`` must be the full catalog in load order (``resolve_vendor_files``) so that every
+    shard agrees on positions; each line stores the vendor payload, its score breakdown and its
+    catalog position, which breaks ties exactly as ``rank_vendors`` does.
+    """
+
+    selected = select_shard(paths, shard=shard, shards=shards, mode=mode)
+    scored = [
+        (
+            position,
+            score_vendor(
+                load_vendor_file(path),
+                criteria.weights,
+                default_missing_score=default_missing_score,
+            ),
+        )
+        for position, path in selected
+    ]
+    scored.sort(key=lambda item: (-item[1].total, item[1].vendor.name.lower(), item[0]))
+
+    header = PartialHeader(
+        shard=shard,
+        shards=shards,
+        mode=mode,
+        criteria=criteria_digest(criteria),
+        count=len(scored),
+    )
+    lines = [json.dumps(header.as_dict(), sort_keys=True)]
+    lines.extend(
+        json.dumps(_encode_result(position, result), sort_keys=True, default=str)
+        for position, result in scored
+    )
+    write_if_changed(out, "\n".join(lines) + "\n")
+    return header
+
+
+def read_partial(path: Path | str) -> tuple[PartialHeader, Iterator[tuple[Any, ...]]]:
+    """Open a partial ranking, returning its header and a lazy iterator of sort entries.
+
+    Entries are ``(-total, lowered name, position, ScoreResult)`` tuples, already in merge
+    order, so any number of partials can be streamed through ``heapq.merge``.
+    """
+
+    partial_path = Path(path)
+    try:
+        with partial_path.open("r", encoding="utf-8") as handle:
+            raw_header = json.loads(handle.readline() or "{}")
+    except FileNotFoundError as exc:
+        raise DataLoadError(f"Partial ranking not found: {partial_path}") from exc
+    except json.JSONDecodeError as exc:
+        raise DataLoadError(f"{partial_path} is not a crm-eval partial ranking.") from exc
+    if not isinstance(raw_header, dict) or raw_header.get("format") != PARTIAL_FORMAT:
+        raise DataLoadError(f"{partial_path} is not a crm-eval partial ranking.")
+    try:
+        header = PartialHeader(
+            shard=int(raw_header["shard"]),
+            shards=int(raw_header["shards"]),
+            mode=str(raw_header["mode"]),
+            criteria=str(raw_header["criteria"]),
+            count=int(raw_header["count"]),
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise DataLoadError(f"Partial ranking {partial_path} has a malformed header.") from exc
+
+    def entries() -> Iterator[tuple[Any, ...]]:
+        with partial_path.open("r", encoding="utf-8") as handle:
+            handle.readline()
+            for line_number, line in enumerate(handle, start=2):
+                if not line.strip():
+                    continue
+                try:
+                    position, result = _decode_result(json.loads(line))
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+                    raise DataLoadError(
+                        f"Malformed entry on line {line_number} of {partial_path}."
+                    ) from exc
+                yield (-result.total, result.vendor.name.lower(), position, result)
+
+    return header, entries()
+
+
+def merge_partials(
+    paths: Sequence[Path | str],
+    criteria: CriteriaConfig | None = None,
+) -> list[ScoreResult]:
+    """K-way merge partial rankings into the ordering ``rank_vendors`` would produce.
+
+    Every shard of one run must be supplied exactly once; when ``criteria`` is given the
+    partials must also have been scored with it.
+    """
+
+    if not paths:
+        raise ValueError("At least one partial ranking is required.")
+    opened = [read_partial(path) for path in paths]
+    headers = [header for header, _ in opened]
+    first = headers[0]
+    if any(
+        (header.shards, header.mode, header.criteria) != (first.shards, first.mode, first.criteria)
+        for header in headers
+    ):
+        raise DataLoadError("Partial rankings come from different shard layouts or criteria.")
+    if criteria is not None and criteria_digest(criteria) != first.criteria:
+        raise DataLoadError("Partial rankings were scored with different criteria weights.")
+    seen = sorted(header.shard for header in headers)
+    if seen != list(range(first.shards)):
+        missing = sorted(set(range(first.shards)) - set(seen))
+        duplicated = sorted({shard for shard in seen if seen.count(shard) > 1})
+        details = []
+        if missing:
+            details.append(f"missing {', '.join(map(str, missing))}")
+        if duplicated:
+            details.append(f"duplicated {', '.join(map(str, duplicated))}")
+        raise DataLoadError(f"Incomplete set of {first.shards} shards: {'; '.join(details)}.")
+
+    merged = heapq.merge(*(entries for _, entries in opened), key=lambda entry: entry[:3])
+    return [entry[3] for entry in merged]
+
+
+def _slug_bucket(slug: str, shards: int) -> int:
+    digest = hashlib.sha256(slug.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def _encode_result(position: int, result: ScoreResult) -> dict[str, Any]:
+    vendor = result.vendor
+    return {
+        "position": position,
+        "slug": vendor.slug,
+        "name": vendor.name,
+        "source": str(vendor.source),
+        "payload": vendor.payload,
+        "total": result.total,
+        "breakdown": result.breakdown,
+        "missing_metrics": result.missing_metrics,
+    }
+
+
+def _decode_result(data: dict[str, Any]) -> tuple[int, ScoreResult]:
+    vendor = VendorRecord(
+        slug=str(data["slug"]),
+        name=str(data["name"]),
+        source=Path(data["source"]),
+        payload=dict(data["payload"]),
+    )
+    breakdown = {
+        str(metric): {key: float(value) for key, value in values.items()}
+        for metric, values in data["breakdown"].items()
+    }
+    result = ScoreResult(
+        vendor=vendor,
+        total=float(data["total"]),
+        breakdown=breakdown,
+        missing_metrics=[str(metric) for metric in data["missing_metrics"]],
+    )
+    return int(data["position"]), result
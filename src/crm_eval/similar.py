@@ -0,0 +1,312 @@
+"""Nearest-neighbour index of vendors by score profile, capabilities and integrations."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from array import array
+from collections import Counter
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from itertools import repeat
+from operator import add, gt, mul, sub
+from typing import Any
+
+from .data import CriteriaConfig, VendorRecord
+from .scoring import ScoreResult
+
+__all__ = [
+    "DEFAULT_FEATURE_WEIGHT",
+    "SimilarVendor",
+    "SimilarityIndex",
+    "shortlist_alternatives",
+    "vendor_features",
+]
+
+DEFAULT_FEATURE_WEIGHT = 0.3
+DEFAULT_TABLES = 12
+DEFAULT_HASH_BITS = 10
+# Each hashing hyperplane is a random ±1 combination of this many metrics.
+_PLANE_METRICS = 4
+# Approximate queries give up on their candidate set and scan everything past this share.
+_MAX_CANDIDATE_SHARE = 0.25
+
+
+@dataclass(frozen=True)
+class SimilarVendor:
+    """A neighbour of the queried vendor; ``rank`` and ``total`` come from the scored run."""
+
+    slug: str
+    name: str
+    rank: int
+    total: float
+    similarity: float
+    score_similarity: float
+    feature_similarity: float
+    shared_features: tuple[str, ...]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "slug": self.slug,
+            "name": self.name,
+            "rank": self.rank,
+            "score": round(self.total, 2),
+            "similarity": round(self.similarity, 4),
+            "score_similarity": round(self.score_similarity, 4),
+            "feature_similarity": round(self.feature_similarity, 4),
+            "shared_features": list(self.shared_features),
+        }
+
+
+class SimilarityIndex:
+    """Cosine k-nearest-neighbour index over ranked vendors.
+
+    Similarity blends two cosines: one between the vendors' weighted metric scores, centred
+    on the catalog mean so it measures a shared profile rather than overall quality, and one
+    between their capability and integration feature sets. ``feature_weight`` sets the blend.
+
+    Score vectors are unit-length and stored column-major in ``float32`` arrays, so an exact
+    query is one multiply-add pass per metric over the whole catalog plus a postings lookup
+    per feature. Approximate queries rank only vendors sharing a hash bucket with the
+    query. Each table hashes a vendor to the signs of its score vector's projections onto
+    ``hash_bits`` sparse random hyperplanes, so vendors at a small angle usually share a bucket
+    in at least one table. The tables are built on the first approximate query.
+    """
+
+    def __init__(
+        self,
+        results: Sequence[ScoreResult],
+        criteria: CriteriaConfig,
+        *,
+        feature_weight: float = DEFAULT_FEATURE_WEIGHT,
+        tables: int = DEFAULT_TABLES,
+        hash_bits: int = DEFAULT_HASH_BITS,
+        seed: int = 0,
+    ) -> None:
+        if not 0.0 <= feature_weight <= 1.0:
+            raise ValueError("feature_weight must be between 0 and 1 inclusive.")
+        self.results = list(results)
+        self.metrics: tuple[str, ...] = tuple(criteria.weights)
+        self.feature_weight = feature_weight
+        self._slots: dict[str, int] = {}
+        for position, result in enumerate(self.results):
+            self._slots.setdefault(result.vendor.slug, position)
+
+        size = len(self.results)
+        metrics = self.metrics
+        rows = [
+            [breakdown[metric]["weighted"] for metric in metrics]
+            for breakdown in (result.breakdown for result in self.results)
+        ]
+        columns = list(zip(*rows, strict=True)) if rows else [() for _ in metrics]
+        del rows
+        centred = [
+            list(map(sub, column, repeat(sum(column) / size if size else 0.0)))
+            for column in columns
+        ]
+        del columns
+        squares = (map(mul, column, column) for column in centred)
+        norms = [math.sqrt(sum(values)) for values in zip(*squares, strict=True)]
+        scale = [1.0 / norm if norm > 1e-12 else 0.0 for norm in norms]
+        self._columns = [array("f", map(mul, column, scale)) for column in centred]
+
+        self.vocabulary: list[str] = []
+        feature_ids: dict[str, int] = {}
+        self._features: list[tuple[int, ...]] = []
+        self._postings: dict[int, array] = {}
+        self._feature_scale = array("f")
+        for position, result in enumerate(self.results):
+            ids: list[int] = []
+            for feature in sorted(vendor_features(result.vendor)):
+                feature_id = feature_ids.get(feature)
+                if feature_id is None:
+                    feature_id = feature_ids[feature] = len(self.vocabulary)
+                    self.vocabulary.append(feature)
+                ids.append(feature_id)
+                self._postings.setdefault(feature_id, array("I")).append(position)
+            self._features.append(tuple(ids))
+            self._feature_scale.append(1.0 / math.sqrt(len(ids)) if ids else 0.0)
+
+        self._tables = max(1, tables)
+        self._hash_bits = max(1, hash_bits)
+        self._seed = seed
+        self._signatures: list[list[bytes]] = []
+        self._buckets: list[dict[tuple[int, ...], list[int]]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __contains__(self, slug: object) -> bool:
+        return slug in self._slots
+
+    def query(
+        self,
+        slug: str,
+        k: int = 5,
+        *,
+        approximate: bool = False,
+        exclude: Collection[str] = (),
+    ) -> list[SimilarVendor]:
+        """Return the ``k`` vendors most similar to ``slug``, best first, ties by rank."""
+
+        position = self._slots.get(slug)
+        if position is None:
+            raise ValueError(f"Unknown vendor slug '{slug}'.")
+        skip = {position}
+        skip.update(self._slots[other] for other in exclude if other in self._slots)
+        k = max(1, k)
+
+        candidates = self._candidates(position) if approximate else None
+        if candidates is not None and len(candidates) - len(skip) >= k:
+            scored = {
+                other: self._similarity(position, other)
+                for other in candidates
+                if other not in skip
+            }
+            best = heapq.nlargest(k, sorted(scored), key=lambda other: scored[other][0])
+            return [self._neighbour(position, other, *scored[other]) for other in best]
+
+        combined, features = self._scan(position)
+        best = heapq.nlargest(
+            k,
+            (other for other in range(len(self.results)) if other not in skip),
+            key=combined.__getitem__,
+        )
+        return [
+            self._neighbour(
+                position,
+                other,
+                combined[other],
+                self._score_similarity(position, other),
+                features.get(other, 0.0),
+            )
+            for other in best
+        ]
+
+    def _scan(self, position: int) -> tuple[list[float], dict[int, float]]:
+        """Blended similarity of ``position`` to every vendor, plus the non-zero feature cosines."""
+
+        blend = 1.0 - self.feature_weight
+        combined = [0.0] * len(self.results)
+        for column in self._columns:
+            weight = column[position] * blend
+            if weight:
+                combined = list(map(add, combined, map(mul, column, repeat(weight))))
+        shared: Counter[int] = Counter()
+        for feature_id in self._features[position]:
+            shared.update(self._postings[feature_id])
+        features: dict[int, float] = {}
+        own_scale = self._feature_scale[position]
+        for other, count in shared.items():
+            cosine = count * own_scale * self._feature_scale[other]
+            features[other] = cosine
+            combined[other] += self.feature_weight * cosine
+        return combined, features
+
+    def _similarity(self, position: int, other: int) -> tuple[float, float, float]:
+        scores = self._score_similarity(position, other)
+        shared = len(set(self._features[position]).intersection(self._features[other]))
+        features = shared * self._feature_scale[position] * self._feature_scale[other]
+        blended = (1.0 - self.feature_weight) * scores + self.feature_weight * features
+        return blended, scores, features
+
+    def _score_similarity(self, position: int, other: int) -> float:
+        return sum(column[position] * column[other] for column in self._columns)
+
+    def _neighbour(
+        self,
+        position: int,
+        other: int,
+        similarity: float,
+        score_similarity: float,
+        feature_similarity: float,
+    ) -> SimilarVendor:
+        result = self.results[other]
+        shared = set(self._features[position]).intersection(self._features[other])
+        return SimilarVendor(
+            slug=result.vendor.slug,
+            name=result.vendor.name,
+            rank=other + 1,
+            total=result.total,
+            similarity=similarity,
+            score_similarity=score_similarity,
+            feature_similarity=feature_similarity,
+            shared_features=tuple(sorted(self.vocabulary[feature] for feature in shared)),
+        )
+
+    def _candidates(self, position: int) -> set[int] | None:
+        """Vendors sharing a hash bucket with ``position``, or ``None`` to scan everything."""
+
+        tables = self._buckets if self._buckets is not None else self._build_tables()
+        limit = _MAX_CANDIDATE_SHARE * len(self.results)
+        found: set[int] = set()
+        for bits, buckets in zip(self._signatures, tables, strict=True):
+            found.update(buckets[tuple(bit[position] for bit in bits)])
+            if len(found) > limit:
+                return None
+        return found
+
+    def _build_tables(self) -> list[dict[tuple[int, ...], list[int]]]:
+        rng = random.Random(self._seed)
+        size = len(self.results)
+        metric_ids = range(len(self.metrics))
+        chosen = min(_PLANE_METRICS, len(self.metrics))
+        signatures: list[list[bytes]] = []
+        tables: list[dict[tuple[int, ...], list[int]]] = []
+        for _ in range(self._tables):
+            bits: list[bytes] = []
+            for _ in range(self._hash_bits):
+                projection = [0.0] * size
+                for metric in rng.sample(metric_ids, chosen):
+                    sign = add if rng.random() < 0.5 else sub
+                    projection = list(map(sign, projection, self._columns[metric]))
+                bits.append(bytes(map(gt, projection, repeat(0.0))))
+            buckets: dict[tuple[int, ...], list[int]] = {}
+            for position, key in enumerate(zip(*bits, strict=True)):
+                buckets.setdefault(key, []).append(position)
+            signatures.append(bits)
+            tables.append(buckets)
+        self._signatures = signatures
+        self._buckets = tables
+        return tables
+
+
+def shortlist_alternatives(
+    index: SimilarityIndex,
+    shortlist: Iterable[ScoreResult],
+    *,
+    k: int = 3,
+    approximate: bool = False,
+) -> dict[str, list[SimilarVendor]]:
+    """The ``k`` closest vendors outside the shortlist for every shortlisted vendor."""
+
+    slugs = [result.vendor.slug for result in shortlist]
+    return {
+        slug: index.query(slug, k, approximate=approximate, exclude=slugs)
+        for slug in slugs
+        if slug in index
+    }
+
+
+def vendor_features(vendor: VendorRecord) -> frozenset[str]:
+    """Capability and integration features, e.g. ``capability:cpq`` or ``integration:apis:rest``."""
+
+    payload = vendor.payload
+    features = {f"capability:{item.lower()}" for item in _as_strings(payload.get("capabilities"))}
+    integrations = payload.get("integrations")
+    if isinstance(integrations, Mapping):
+        for kind, value in integrations.items():
+            if value is True:
+                features.add(f"integration:{kind}")
+            elif value:
+                features.update(f"integration:{kind}:{item.lower()}" for item in _as_strings(value))
+    return frozenset(features)
+
+
+def _as_strings(value: object) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, Iterable) and not isinstance(value, Mapping):
+        return [str(item) for item in value]
+    return []
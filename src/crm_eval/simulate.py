@@ -0,0 +1,315 @@
+"""Discrete-event simulation of data-migration throughput into each vendor."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, fields, replace
+from typing import Any
+
+from .data import DataLoadError, VendorRecord
+
+__all__ = [
+    "BULK_LIMITS",
+    "REST_LIMITS",
+    "ImportLimits",
+    "ImportSimulation",
+    "MigrationEstimate",
+    "estimate_catalog",
+    "estimate_cutover",
+    "format_duration",
+    "migration_volumes",
+    "shortlist_estimates",
+    "simulate_import",
+    "vendor_limits",
+]
+
+
+@dataclass(frozen=True)
+class ImportLimits:
+    """How a vendor accepts imported records.
+
+    Records go in batches of ``batch_size`` over at most ``concurrency`` parallel requests,
+    started no faster than ``requests_per_minute``. A batch takes ``batch_overhead_seconds``
+    plus ``seconds_per_record`` for each record, and fails with probability ``failure_rate``;
+    a failed batch is retried whole after ``backoff_seconds``, doubling per attempt, up to
+    ``max_attempts`` attempts in total.
+    """
+
+    bulk_api: bool
+    batch_size: int
+    concurrency: int
+    requests_per_minute: float
+    batch_overhead_seconds: float
+    seconds_per_record: float
+    failure_rate: float = 0.01
+    max_attempts: int = 4
+    backoff_seconds: float = 5.0
+
+    def __post_init__(self) -> None:
+        if self.batch_size < 1 or self.concurrency < 1 or self.max_attempts < 1:
+            raise ValueError("Batch size, concurrency and attempts must be at least 1.")
+        if self.requests_per_minute <= 0:
+            raise ValueError("The request rate limit must be positive.")
+        if min(self.batch_overhead_seconds, self.seconds_per_record, self.backoff_seconds) < 0:
+            raise ValueError("Import timings must not be negative.")
+        if not 0 <= self.failure_rate < 1:
+            raise ValueError("The batch failure rate must be at least 0 and below 1.")
+
+    def as_dict(self) -> dict[str, Any]:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+# Asynchronous bulk jobs: large batches, few concurrent jobs, slow to start.
+BULK_LIMITS = ImportLimits(
+    bulk_api=True,
+    batch_size=10_000,
+    concurrency=5,
+    requests_per_minute=60,
+    batch_overhead_seconds=30.0,
+    seconds_per_record=0.002,
+    failure_rate=0.02,
+    backoff_seconds=30.0,
+)
+# Record-level REST endpoints with batch writes, throttled by the API rate limit.
+REST_LIMITS = ImportLimits(
+    bulk_api=False,
+    batch_size=100,
+    concurrency=4,
+    requests_per_minute=120,
+    batch_overhead_seconds=0.5,
+    seconds_per_record=0.01,
+    failure_rate=0.01,
+    backoff_seconds=2.0,
+)
+
+
+@dataclass(frozen=True)
+class MigrationEstimate:
+    """Simulated import of one profile's records into one vendor."""
+
+    slug: str
+    name: str
+    limits: ImportLimits
+    records: int
+    batches: int
+    requests: int
+    retries: int
+    failed_records: int
+    seconds: float
+    objects: dict[str, float]
+
+    @property
+    def hours(self) -> float:
+        return self.seconds / 3600
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "slug": self.slug,
+            "name": self.name,
+            "bulk_api": self.limits.bulk_api,
+            "records": self.records,
+            "batches": self.batches,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failed_records": self.failed_records,
+            "hours": round(self.hours, 2),
+            "objects": {name: round(seconds / 3600, 2) for name, seconds in self.objects.items()},
+            "limits": self.limits.as_dict(),
+        }
+
+
+@dataclass(frozen=True)
+class ImportSimulation:
+    """Totals of one simulated import; ``objects`` holds each object's import time."""
+
+    batches: int
+    requests: int
+    retries: int
+    failed_records: int
+    seconds: float
+    objects: dict[str, float]
+
+
+def migration_volumes(profile: Mapping[str, Any]) -> dict[str, int]:
+    """Records to migrate per object from the profile's ``migration_records`` mapping.
+
+    Objects are imported in the order given, so list parents (accounts) before the records
+    that reference them (contacts, deals). Returns an empty dict when the profile has none.
+    """
+
+    raw = profile.get("migration_records")
+    if raw is None:
+        return {}
+    if not isinstance(raw, Mapping):
+        raise ValueError("The profile's migration_records must map object names to counts.")
+    volumes: dict[str, int] = {}
+    for name, count in raw.items():
+        if isinstance(count, bool):
+            raise ValueError(f"Record count for '{name}' must be a whole number.")
+        try:
+            volumes[str(name)] = int(count)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Record count for '{name}' must be a whole number.") from exc
+        if volumes[str(name)] < 0:
+            raise ValueError(f"Record count for '{name}' must not be negative.")
+    return volumes
+
+
+def vendor_limits(vendor: VendorRecord) -> ImportLimits:
+    """The vendor's import limits: bulk or REST defaults by ``data.bulk_api``, then overrides.
+
+    Any ``ImportLimits`` field other than ``bulk_api`` can be overridden under
+    ``data.import_limits``, e.g. a documented rate limit as ``requests_per_minute``.
+    """
+
+    section = vendor.payload.get("data")
+    data = section if isinstance(section, Mapping) else {}
+    limits = BULK_LIMITS if data.get("bulk_api") is True else REST_LIMITS
+    overrides = data.get("import_limits")
+    if overrides is None:
+        return limits
+    if not isinstance(overrides, Mapping):
+        raise DataLoadError(f"data.import_limits for vendor '{vendor.slug}' must be a mapping.")
+    kinds = {field.name: field.type for field in fields(ImportLimits) if field.name != "bulk_api"}
+    changes: dict[str, Any] = {}
+    for key, value in overrides.items():
+        kind = kinds.get(str(key))
+        if kind is None:
+            raise DataLoadError(f"Unknown import limit '{key}' for vendor '{vendor.slug}'.")
+        try:
+            if isinstance(value, bool):
+                raise TypeError(value)
+            changes[str(key)] = int(value) if kind == "int" else float(value)
+        except (TypeError, ValueError) as exc:
+            raise DataLoadError(
+                f"Import limit '{key}' for vendor '{vendor.slug}' must be numeric."
+            ) from exc
+    try:
+        return replace(limits, **changes)
+    except ValueError as exc:
+        raise DataLoadError(f"Invalid import limits for vendor '{vendor.slug}': {exc}") from exc
+
+
+def simulate_import(
+    volumes: Mapping[str, int], limits: ImportLimits, *, seed: int = 0
+) -> ImportSimulation:
+    """Simulate importing ``volumes`` object by object under ``limits``.
+
+    Workers are a heap of the times they next fall idle. Each takes the next due retry, or
+    else the next fresh batch, and starts it once the rate limiter allows, one start every
+    ``60 / requests_per_minute`` seconds. An object's import ends when its last batch
+    settles; the next object starts only then. Failures are drawn from a generator seeded by
+    ``seed``, so the same inputs always give the same estimate.
+    """
+
+    rng = random.Random(seed)
+    interval = 60.0 / limits.requests_per_minute
+    clock = next_start = 0.0
+    batches = requests = retries = failed = 0
+    objects: dict[str, float] = {}
+    for name, records in volumes.items():
+        started = clock
+        full, rest = divmod(records, limits.batch_size)
+        pending = deque([limits.batch_size] * full + ([rest] if rest else []))
+        batches += len(pending)
+        waiting: list[tuple[float, int, int, int]] = []
+        workers = [clock] * min(limits.concurrency, len(pending))
+        while pending or waiting:
+            idle = heapq.heappop(workers)
+            if waiting and (not pending or waiting[0][0] <= idle):
+                ready, _, size, attempt = heapq.heappop(waiting)
+                idle = max(idle, ready)
+            else:
+                size, attempt = pending.popleft(), 1
+            begin = max(idle, next_start)
+            next_start = begin + interval
+            end = begin + limits.batch_overhead_seconds + size * limits.seconds_per_record
+            requests += 1
+            if rng.random() < limits.failure_rate:
+                if attempt < limits.max_attempts:
+                    retries += 1
+                    backoff = limits.backoff_seconds * 2 ** (attempt - 1)
+                    heapq.heappush(waiting, (end + backoff, requests, size, attempt + 1))
+                else:
+                    failed += size
+            clock = max(clock, end)
+            heapq.heappush(workers, end)
+        objects[name] = clock - started
+    return ImportSimulation(
+        batches=batches,
+        requests=requests,
+        retries=retries,
+        failed_records=failed,
+        seconds=clock,
+        objects=objects,
+    )
+
+
+def estimate_cutover(
+    vendor: VendorRecord, volumes: Mapping[str, int], *, seed: int = 0
+) -> MigrationEstimate:
+    """Estimate how long importing ``volumes`` into ``vendor`` takes."""
+
+    return estimate_catalog([vendor], volumes, seed=seed)[0]
+
+
+def estimate_catalog(
+    vendors: Iterable[VendorRecord], volumes: Mapping[str, int], *, seed: int = 0
+) -> list[MigrationEstimate]:
+    """Estimate every vendor's cutover, fastest first.
+
+    Vendors sharing the same import limits share one simulation, so a catalog relying on the
+    bulk and REST defaults costs two simulations however many vendors it holds.
+    """
+
+    records = sum(volumes.values())
+    simulations: dict[ImportLimits, ImportSimulation] = {}
+    estimates: list[MigrationEstimate] = []
+    for vendor in vendors:
+        limits = vendor_limits(vendor)
+        simulation = simulations.get(limits)
+        if simulation is None:
+            simulation = simulations[limits] = simulate_import(volumes, limits, seed=seed)
+        estimates.append(
+            MigrationEstimate(
+                slug=vendor.slug,
+                name=vendor.name,
+                limits=limits,
+                records=records,
+                batches=simulation.batches,
+                requests=simulation.requests,
+                retries=simulation.retries,
+                failed_records=simulation.failed_records,
+                seconds=simulation.seconds,
+                objects=dict(simulation.objects),
+            )
+        )
+    estimates.sort(key=lambda estimate: (estimate.seconds, estimate.name.lower()))
+    return estimates
+
+
+def format_duration(seconds: float) -> str:
+    """``seconds`` as a short human duration: minutes below an hour, hours below two days."""
+
+    if seconds < 3600:
+        return f"{math.ceil(seconds / 60)} min"
+    if seconds < 48 * 3600:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 86400:.1f} days"
+
+
+def shortlist_estimates(
+    profile: Mapping[str, Any], vendors: Sequence[VendorRecord], *, seed: int = 0
+) -> list[MigrationEstimate] | None:
+    """Estimates for ``vendors`` in the given order, or ``None`` if the profile has no volumes."""
+
+    volumes = migration_volumes(profile)
+    if not volumes:
+        return None
+    estimates = estimate_catalog(vendors, volumes, seed=seed)
+    by_slug = {estimate.slug: estimate for estimate in estimates}
+    return [by_slug[vendor.slug] for vendor in vendors]
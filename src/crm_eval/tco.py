@@ -0,0 +1,413 @@
+"""Structured pricing tiers and multi-year total-cost-of-ownership projections."""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from itertools import product, repeat
+from operator import add, mul
+from typing import Any
+
+from .data import DataLoadError, VendorRecord
+
+__all__ = [
+    "BUDGET_MODES",
+    "PLAN_SELECTORS",
+    "AddOn",
+    "BudgetPolicy",
+    "PricingTier",
+    "TcoEngine",
+    "TcoScenario",
+    "VendorPricing",
+    "scenario_from_profile",
+    "scenario_grid",
+    "vendor_pricing",
+    "vendor_tco",
+]
+
+# Plan selectors pick a tier by price position, since plan names differ between vendors.
+PLAN_SELECTORS = ("entry", "middle", "top")
+BUDGET_MODES = ("off", "penalize", "filter")
+DEFAULT_BUDGET_PENALTY = 10.0
+DEFAULT_YEARS = 3
+MONTHS = 12
+
+_NUMBER = re.compile(r"\d+")
+
+
+@dataclass(frozen=True)
+class PricingTier:
+    """One plan: a per-seat price, a seat minimum and an optional flat platform fee."""
+
+    plan: str
+    per_user_per_month: float
+    min_seats: int = 1
+    platform_fee_per_month: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "plan": self.plan,
+            "per_user_per_month": self.per_user_per_month,
+            "min_seats": self.min_seats,
+            "platform_fee_per_month": self.platform_fee_per_month,
+        }
+
+
+@dataclass(frozen=True)
+class AddOn:
+    """An optional extra billed per seat, per month, or both."""
+
+    name: str
+    per_user_per_month: float = 0.0
+    per_month: float = 0.0
+
+
+@dataclass(frozen=True)
+class VendorPricing:
+    """A vendor's pricing tiers, cheapest per seat first, and its add-ons by name."""
+
+    tiers: tuple[PricingTier, ...]
+    add_ons: dict[str, AddOn]
+
+    def tier(self, plan: str) -> PricingTier | None:
+        """Return the tier named ``plan`` or picked by a ``PLAN_SELECTORS`` position."""
+
+        if plan == "entry":
+            return self.tiers[0]
+        if plan == "middle":
+            return self.tiers[(len(self.tiers) - 1) // 2]
+        if plan == "top":
+            return self.tiers[-1]
+        wanted = plan.lower()
+        return next((tier for tier in self.tiers if tier.plan.lower() == wanted), None)
+
+
+@dataclass(frozen=True)
+class TcoScenario:
+    """Seats in the first year, compounded by ``growth`` each later year, on one plan."""
+
+    seats: int
+    years: int = DEFAULT_YEARS
+    growth: float = 0.0
+    plan: str = "entry"
+    add_ons: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.seats < 1:
+            raise ValueError("A TCO scenario needs at least one seat.")
+        if self.years < 1:
+            raise ValueError("A TCO scenario must cover at least one year.")
+        if self.growth <= -1:
+            raise ValueError("Seat growth must be greater than -100% per year.")
+
+    def seat_schedule(self) -> tuple[int, ...]:
+        """Seats in use each year, rounded up."""
+
+        return tuple(
+            max(1, math.ceil(self.seats * (1 + self.growth) ** year - 1e-9))
+            for year in range(self.years)
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "seats": self.seats,
+            "years": self.years,
+            "growth": self.growth,
+            "plan": self.plan,
+            "add_ons": list(self.add_ons),
+        }
+
+
+def vendor_pricing(vendor: VendorRecord) -> VendorPricing | None:
+    """Read ``pricing_tco.tiers`` and ``pricing_tco.add_ons``; ``None`` when there are no tiers.
+
+    ``tiers`` maps each plan in ``plan_names`` to ``per_user_per_month`` and optionally
+    ``min_seats`` and ``platform_fee_per_month``; ``add_ons`` maps names to a
+    ``per_user_per_month`` and/or ``per_month`` price.
+    """
+
+    pricing = vendor.payload.get("pricing_tco")
+    if not isinstance(pricing, Mapping) or not pricing.get("tiers"):
+        return None
+    raw_tiers = pricing["tiers"]
+    if not isinstance(raw_tiers, Mapping):
+        raise DataLoadError(f"pricing_tco.tiers for vendor '{vendor.slug}' must be a mapping.")
+    plans = {str(plan).lower() for plan in vendor.payload.get("plan_names") or ()}
+    tiers: list[PricingTier] = []
+    for plan, spec in raw_tiers.items():
+        if plans and str(plan).lower() not in plans:
+            raise DataLoadError(
+                f"Pricing tier '{plan}' for vendor '{vendor.slug}' is not one of its plan_names."
+            )
+        fields = _mapping(spec, f"tier '{plan}'", vendor)
+        tiers.append(
+            PricingTier(
+                plan=str(plan),
+                per_user_per_month=_price(fields.get("per_user_per_month"), plan, vendor),
+                min_seats=int(_price(fields.get("min_seats", 1), plan, vendor)),
+                platform_fee_per_month=_price(
+                    fields.get("platform_fee_per_month", 0), plan, vendor
+                ),
+            )
+        )
+    tiers.sort(key=lambda tier: (tier.per_user_per_month, tier.platform_fee_per_month))
+
+    add_ons: dict[str, AddOn] = {}
+    raw_add_ons = pricing.get("add_ons") or {}
+    for name, spec in _mapping(raw_add_ons, "add_ons", vendor).items():
+        fields = _mapping(spec, f"add-on '{name}'", vendor)
+        add_ons[str(name)] = AddOn(
+            name=str(name),
+            per_user_per_month=_price(fields.get("per_user_per_month", 0), name, vendor),
+            per_month=_price(fields.get("per_month", 0), name, vendor),
+        )
+    return VendorPricing(tiers=tuple(tiers), add_ons=add_ons)
+
+
+def vendor_tco(vendor: VendorRecord, scenario: TcoScenario) -> float | None:
+    """Total cost of ``scenario`` for one vendor, or ``None`` if it cannot be priced."""
+
+    pricing = vendor_pricing(vendor)
+    if pricing is None:
+        return None
+    terms = _plan_terms(pricing, scenario.plan, scenario.add_ons)
+    if terms is None:
+        return None
+    unit, minimum, fixed = terms
+    billed = sum(max(seats, minimum) for seats in scenario.seat_schedule())
+    return MONTHS * (unit * billed + fixed * scenario.years)
+
+
+@dataclass(frozen=True)
+class _PlanColumns:
+    unit: array
+    fixed: array
+    by_minimum: array
+    minimums: list[float]
+
+
+class TcoEngine:
+    """Projects scenario costs for a whole catalog at once.
+
+    Each (plan, add-ons) combination is compiled once into three aligned columns: the monthly
+    price per billed seat, the seat minimum and the flat monthly fees. A scenario's cost is
+    then ``12 · (unit · Σ billed seats + fixed · years)`` evaluated column-wise. Billed seats
+    equal used seats unless a vendor's minimum exceeds a year's seat count, so only vendors
+    whose minimum lies above the scenario's smallest year, found by bisecting the sorted
+    minimums, need a per-vendor correction. Unpriced vendors cost NaN.
+    """
+
+    def __init__(self, vendors: Sequence[VendorRecord]) -> None:
+        self.vendors = list(vendors)
+        self.pricing: list[VendorPricing | None] = [vendor_pricing(v) for v in self.vendors]
+        self._compiled: dict[tuple[str, tuple[str, ...]], _PlanColumns] = {}
+
+    def __len__(self) -> int:
+        return len(self.vendors)
+
+    @property
+    def priced(self) -> int:
+        return sum(1 for pricing in self.pricing if pricing is not None)
+
+    def project(self, scenario: TcoScenario) -> array:
+        """Total cost of ``scenario`` for every vendor, aligned with ``vendors``."""
+
+        columns = self._columns(scenario.plan, scenario.add_ons)
+        schedule = scenario.seat_schedule()
+        costs = array(
+            "d",
+            map(
+                add,
+                map(mul, columns.unit, repeat(MONTHS * sum(schedule))),
+                map(mul, columns.fixed, repeat(MONTHS * scenario.years)),
+            ),
+        )
+        minimums = columns.minimums
+        for position in range(bisect_right(minimums, min(schedule)), len(minimums)):
+            minimum = minimums[position]
+            shortfall = sum(minimum - seats for seats in schedule if seats < minimum)
+            index = columns.by_minimum[position]
+            costs[index] += MONTHS * columns.unit[index] * shortfall
+        return costs
+
+    def project_many(self, scenarios: Iterable[TcoScenario]) -> list[array]:
+        """Project every scenario; rows follow ``scenarios``, columns follow ``vendors``."""
+
+        return [self.project(scenario) for scenario in scenarios]
+
+    def monthly_per_seat(self, scenario: TcoScenario) -> array:
+        """Total cost divided by the seat-months actually used, per vendor."""
+
+        seat_months = MONTHS * sum(scenario.seat_schedule())
+        return array("d", (cost / seat_months for cost in self.project(scenario)))
+
+    def _columns(self, plan: str, add_ons: tuple[str, ...]) -> _PlanColumns:
+        key = (plan, tuple(sorted(add_ons)))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            unit, fixed, minimum = array("d"), array("d"), array("d")
+            for pricing in self.pricing:
+                terms = _plan_terms(pricing, plan, add_ons) or (math.nan, 0.0, math.nan)
+                unit.append(terms[0])
+                minimum.append(terms[1])
+                fixed.append(terms[2])
+            order = sorted(range(len(minimum)), key=minimum.__getitem__)
+            compiled = _PlanColumns(
+                unit=unit,
+                fixed=fixed,
+                by_minimum=array("q", order),
+                minimums=[minimum[index] for index in order],
+            )
+            self._compiled[key] = compiled
+        return compiled
+
+
+class BudgetPolicy:
+    """A ``rank_vendors`` budget check comparing projected cost per seat with a budget.
+
+    In ``penalize`` mode a vendor over budget loses ``penalty`` points scaled by how far it is
+    over, reaching the full penalty at twice the budget; ``filter`` drops it instead. Vendors
+    without structured pricing are never penalised.
+    """
+
+    def __init__(
+        self,
+        budget: float,
+        scenario: TcoScenario,
+        *,
+        mode: str = "penalize",
+        penalty: float = DEFAULT_BUDGET_PENALTY,
+    ) -> None:
+        if mode not in BUDGET_MODES[1:]:
+            raise ValueError(f"Budget mode must be one of: {', '.join(BUDGET_MODES[1:])}.")
+        if budget <= 0:
+            raise ValueError("The budget per user per month must be positive.")
+        if penalty < 0:
+            raise ValueError("The budget penalty must be non-negative.")
+        self.budget = budget
+        self.scenario = scenario
+        self.mode = mode
+        self.penalty = penalty
+        self._seat_months = MONTHS * sum(scenario.seat_schedule())
+
+    @classmethod
+    def from_profile(
+        cls,
+        profile: Mapping[str, Any],
+        *,
+        mode: str = "penalize",
+        penalty: float = DEFAULT_BUDGET_PENALTY,
+    ) -> BudgetPolicy:
+        """Build a policy from ``budget_per_user_per_month`` and the profile's seat scenario."""
+
+        budget = profile.get("budget_per_user_per_month")
+        try:
+            budget_value = float(budget) if budget is not None else None
+        except (TypeError, ValueError):
+            budget_value = None
+        if budget_value is None:
+            raise ValueError("The profile needs a numeric budget_per_user_per_month.")
+        scenario = scenario_from_profile(profile)
+        if scenario is None:
+            raise ValueError("The profile needs 'seats' or a 'company_size' to project costs.")
+        return cls(budget_value, scenario, mode=mode, penalty=penalty)
+
+    def __call__(self, vendor: VendorRecord) -> float | None:
+        cost = vendor_tco(vendor, self.scenario)
+        if cost is None:
+            return 0.0
+        overrun = cost / self._seat_months / self.budget - 1
+        if overrun <= 1e-9:
+            return 0.0
+        if self.mode == "filter":
+            return None
+        return self.penalty * min(1.0, overrun)
+
+
+def scenario_grid(
+    seats: Iterable[int],
+    *,
+    plans: Iterable[str] = ("entry",),
+    growth: Iterable[float] = (0.0,),
+    years: Iterable[int] = (DEFAULT_YEARS,),
+    add_ons: tuple[str, ...] = (),
+) -> list[TcoScenario]:
+    """Every combination of seat count, plan, growth rate and horizon."""
+
+    return [
+        TcoScenario(seats=s, years=y, growth=g, plan=p, add_ons=add_ons)
+        for s, p, g, y in product(seats, plans, growth, years)
+    ]
+
+
+def scenario_from_profile(profile: Mapping[str, Any]) -> TcoScenario | None:
+    """Derive the profile's cost scenario, or ``None`` when it gives no seat count.
+
+    Seats come from ``seats`` or the top of ``company_size`` (``"10-50"`` gives 50); optional
+    ``seat_growth``, ``tco_years``, ``plan`` and ``add_ons`` complete the scenario.
+    """
+
+    seats = profile.get("seats")
+    if seats is None:
+        numbers = _NUMBER.findall(str(profile.get("company_size") or ""))
+        seats = max(int(number) for number in numbers) if numbers else None
+    if seats is None:
+        return None
+    raw_add_ons = profile.get("add_ons") or ()
+    if isinstance(raw_add_ons, str):
+        raw_add_ons = [raw_add_ons]
+    try:
+        return TcoScenario(
+            seats=int(seats),
+            years=int(profile.get("tco_years", DEFAULT_YEARS)),
+            growth=float(profile.get("seat_growth", 0.0)),
+            plan=str(profile.get("plan", "entry")),
+            add_ons=tuple(str(name) for name in raw_add_ons),
+        )
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"The profile's TCO scenario is invalid: {exc}") from exc
+
+
+def _plan_terms(
+    pricing: VendorPricing | None, plan: str, add_ons: Iterable[str]
+) -> tuple[float, float, float] | None:
+    """``(monthly price per billed seat, seat minimum, flat monthly fees)`` for a plan."""
+
+    if pricing is None:
+        return None
+    tier = pricing.tier(plan)
+    if tier is None:
+        return None
+    unit = tier.per_user_per_month
+    fixed = tier.platform_fee_per_month
+    for name in add_ons:
+        add_on = pricing.add_ons.get(name)
+        if add_on is None:
+            return None
+        unit += add_on.per_user_per_month
+        fixed += add_on.per_month
+    return unit, float(tier.min_seats), fixed
+
+
+def _mapping(value: object, what: str, vendor: VendorRecord) -> Mapping[str, Any]:
+    if not isinstance(value, Mapping):
+        raise DataLoadError(f"Pricing {what} for vendor '{vendor.slug}' must be a mapping.")
+    return value
+
+
+def _price(value: object, what: object, vendor: VendorRecord) -> float:
+    if isinstance(value, bool) or value is None:
+        raise DataLoadError(f"Pricing for '{what}' in vendor '{vendor.slug}' must be numeric.")
+    try:
+        number = float(value)
+    except (TypeError, ValueError) as exc:
+        raise DataLoadError(
+            f"Pricing for '{what}' in vendor '{vendor.slug}' must be numeric."
+        ) from exc
+    if number < 0 or math.isnan(number):
+        raise DataLoadError(f"Pricing for '{what}' in vendor '{vendor.slug}' must not be negative.")
+    return number
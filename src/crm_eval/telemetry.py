@@ -0,0 +1,323 @@
+"""Structured run events as JSON Lines and run metrics in Prometheus text format."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Protocol, TextIO
+
+__all__ = [
+    "DURATION_BUCKETS",
+    "METRICS",
+    "Telemetry",
+    "read_metrics",
+]
+
+# Upper bounds, in seconds, of the stage and run duration histogram buckets.
+DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+# Every metric the CLI reports: name -> (type, help).
+METRICS: dict[str, tuple[str, str]] = {
+    "crm_eval_runs_total": ("counter", "Finished crm-eval runs by command and status."),
+    "crm_eval_run_duration_seconds": ("histogram", "Wall time of whole crm-eval runs."),
+    "crm_eval_stage_duration_seconds": ("histogram", "Wall time of each stage within a run."),
+    "crm_eval_vendors_loaded_total": ("counter", "Vendor records loaded from the catalog."),
+    "crm_eval_cache_requests_total": ("counter", "Cache lookups by cache and result."),
+    "crm_eval_parse_errors_total": ("counter", "Inputs that failed to load or parse."),
+    "crm_eval_output_bytes_total": ("counter", "Bytes written to output files."),
+    "crm_eval_last_run_timestamp_seconds": ("gauge", "Unix time the last run finished."),
+}
+
+_HISTOGRAM_SUFFIXES = ("_bucket", "_sum", "_count")
+_SAMPLE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)\s*$")
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class CacheCounters(Protocol):
+    hits: int
+    misses: int
+
+
+class Telemetry:
+    """Collects one run's events and metrics; a no-op unless an events or metrics sink is set.
+
+    Events are JSON objects written one per line as they happen, each carrying the run id and
+    command. Metrics accumulate in memory and are merged into ``metrics_path`` by ``close``:
+    counters and histograms add to the values already in the file, so the file keeps growing
+    across runs the way Prometheus expects, and the file is replaced atomically for the
+    node-exporter textfile collector. Runs sharing one metrics file concurrently can lose each
+    other's increments; give parallel jobs their own file.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        *,
+        events: TextIO | None = None,
+        metrics_path: Path | str | None = None,
+        run_id: str | None = None,
+    ) -> None:
+        self.command = command
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.metrics_path = Path(metrics_path) if metrics_path is not None else None
+        self.enabled = events is not None or self.metrics_path is not None
+        self._events = events
+        self._owns_events = False
+        self._samples: dict[tuple[str, Labels], float] = {}
+        self._caches: list[tuple[str, CacheCounters]] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._closed = False
+        self.event("run_start")
+
+    @classmethod
+    def open(
+        cls,
+        command: str,
+        *,
+        events_path: Path | str | None = None,
+        metrics_path: Path | str | None = None,
+    ) -> Telemetry:
+        """Telemetry appending events to ``events_path`` (``-`` for stderr)."""
+
+        events: TextIO | None = None
+        owned = False
+        if events_path == "-":
+            events = sys.stderr
+        elif events_path is not None:
+            target = Path(events_path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            events = target.open("a", encoding="utf-8")
+            owned = True
+        telemetry = cls(command, events=events, metrics_path=metrics_path)
+        telemetry._owns_events = owned
+        return telemetry
+
+    def event(self, name: str, **fields: Any) -> None:
+        """Write one event line; ``fields`` must be JSON-serializable."""
+
+        if self._events is None:
+            return
+        record = {
+            "ts": round(time.time(), 3),
+            "run": self.run_id,
+            "command": self.command,
+            "event": name,
+            **fields,
+        }
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        with self._lock:
+            self._events.write(line + "\n")
+            self._events.flush()
+
+    @contextmanager
+    def stage(self, name: str, **fields: Any) -> Iterator[dict[str, Any]]:
+        """Time a stage, emitting ``stage_start`` and ``stage_end`` events.
+
+        The yielded dict is added to the ``stage_end`` event, so callers can attach counts
+        they only know once the stage has run.
+        """
+
+        if not self.enabled:
+            yield {}
+            return
+        self.event("stage_start", stage=name, **fields)
+        details: dict[str, Any] = {}
+        started = time.perf_counter()
+        status = "error"
+        try:
+            yield details
+            status = "ok"
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe("crm_eval_stage_duration_seconds", elapsed, stage=name)
+            self.event(
+                "stage_end",
+                stage=name,
+                status=status,
+                seconds=round(elapsed, 6),
+                **fields,
+                **details,
+            )
+
+    def count(self, metric: str, value: float = 1, **labels: str) -> None:
+        """Add ``value`` to a counter; the run's command is added as a label."""
+
+        if self.enabled:
+            self._add(metric, self._labels(labels), value)
+
+    def observe(self, metric: str, seconds: float, **labels: str) -> None:
+        """Record one observation in a histogram using ``DURATION_BUCKETS``."""
+
+        if not self.enabled:
+            return
+        base = self._labels(labels)
+        for bound in DURATION_BUCKETS:
+            bucket = _with_label(base, "le", _format_bound(bound))
+            self._add(f"{metric}_bucket", bucket, 1 if seconds <= bound else 0)
+        self._add(f"{metric}_bucket", _with_label(base, "le", "+Inf"), 1)
+        self._add(f"{metric}_sum", base, seconds)
+        self._add(f"{metric}_count", base, 1)
+
+    def cache(self, name: str, hits: int, misses: int) -> None:
+        """Record a cache's lookups as hit and miss counts plus a ``cache`` event."""
+
+        if not self.enabled or not hits + misses:
+            return
+        self.count("crm_eval_cache_requests_total", hits, cache=name, result="hit")
+        self.count("crm_eval_cache_requests_total", misses, cache=name, result="miss")
+        self.event("cache", cache=name, hits=hits, misses=misses)
+
+    def track_cache(self, name: str, cache: CacheCounters) -> None:
+        """Read ``cache.hits`` and ``cache.misses`` when the run closes."""
+
+        if self.enabled:
+            self._caches.append((name, cache))
+
+    def output(self, path: Path | str, size: int) -> None:
+        """Record a written output file and its size in bytes."""
+
+        if self.enabled:
+            self.count("crm_eval_output_bytes_total", size)
+            self.event("output", path=str(path), bytes=size)
+
+    def close(self, status: str, *, exit_code: int | None = None) -> None:
+        """Finish the run: emit ``run_end`` and merge this run's metrics into the metrics file."""
+
+        if self._closed:
+            return
+        self._closed = True
+        if self.enabled:
+            totals: dict[str, tuple[int, int]] = {}
+            for name, cache in self._caches:
+                hits, misses = totals.get(name, (0, 0))
+                totals[name] = (hits + cache.hits, misses + cache.misses)
+            for name, (hits, misses) in totals.items():
+                self.cache(name, hits, misses)
+            elapsed = time.perf_counter() - self._started
+            self.count("crm_eval_runs_total", status=status)
+            self.observe("crm_eval_run_duration_seconds", elapsed)
+            self.event("run_end", status=status, exit_code=exit_code, seconds=round(elapsed, 6))
+            if self.metrics_path is not None:
+                self._write_metrics(self.metrics_path)
+        if self._owns_events and self._events is not None:
+            self._events.close()
+
+    def _labels(self, labels: Mapping[str, str]) -> Labels:
+        return tuple(sorted({"command": self.command, **labels}.items()))
+
+    def _add(self, metric: str, labels: Labels, value: float) -> None:
+        with self._lock:
+            key = (metric, labels)
+            self._samples[key] = self._samples.get(key, 0.0) + value
+
+    def _write_metrics(self, path: Path) -> None:
+        samples = read_metrics(path) if path.exists() else {}
+        for key, value in self._samples.items():
+            samples[key] = samples.get(key, 0.0) + value
+        gauge = ("crm_eval_last_run_timestamp_seconds", self._labels({}))
+        samples[gauge] = round(time.time(), 3)
+
+        lines: list[str] = []
+        for metric, (kind, help_text) in METRICS.items():
+            suffixes = _HISTOGRAM_SUFFIXES if kind == "histogram" else ("",)
+            names = {f"{metric}{suffix}": order for order, suffix in enumerate(suffixes)}
+            series = sorted(
+                (key for key in samples if key[0] in names),
+                key=lambda key: _series_order(key[1], names[key[0]]),
+            )
+            if not series:
+                continue
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(
+                f"{name}{_render_labels(labels)} {_format_value(samples[(name, labels)])}"
+                for name, labels in series
+            )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        staging.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(staging, path)
+
+
+def read_metrics(path: Path | str) -> dict[tuple[str, Labels], float]:
+    """Parse the samples of a Prometheus text-format file into ``{(name, labels): value}``.
+
+    Comment lines and samples that do not parse are ignored.
+    """
+
+    samples: dict[tuple[str, Labels], float] = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        match = _SAMPLE.match(line)
+        if match is None or line.startswith("#"):
+            continue
+        name, raw_labels, raw_value = match.groups()
+        try:
+            value = float(raw_value)
+        except ValueError:
+            continue
+        labels = tuple(
+            sorted((key, _unescape(value)) for key, value in _LABEL.findall(raw_labels or ""))
+        )
+        samples[(name, labels)] = value
+    return samples
+
+
+def _with_label(labels: Labels, key: str, value: str) -> Labels:
+    return tuple(sorted((*labels, (key, value))))
+
+
+def _series_order(labels: Labels, suffix: int) -> tuple[Any, ...]:
+    """Group a histogram's series by label set: buckets in ascending ``le``, then sum, count."""
+
+    plain = tuple(item for item in labels if item[0] != "le")
+    bound = dict(labels).get("le")
+    return plain, suffix, float("inf") if bound in (None, "+Inf") else float(bound)
+
+
+def _render_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    rendered = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + rendered + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+
+
+def _format_bound(bound: float) -> str:
+    return format(bound, "g")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
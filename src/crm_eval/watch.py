@@ -0,0 +1,305 @@
+"""Watch vendor, criteria and profile files and refresh the scorecard incrementally."""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .build import resolve_criteria_path, write_if_changed
+from .data import (
+    CriteriaConfig,
+    DataLoadError,
+    load_criteria,
+    load_profile,
+    load_vendor_file,
+    resolve_vendor_files,
+)
+from .fragments import FragmentCache
+from .report import build_scorecard_payload, build_vendor_entry, render_markdown_scorecard
+from .scoring import ScoreResult, score_vendor
+
+__all__ = [
+    "ScoreWatcher",
+    "WatchUpdate",
+    "DEFAULT_POLL_INTERVAL",
+    "DEFAULT_DEBOUNCE",
+]
+
+DEFAULT_POLL_INTERVAL = 0.05
+DEFAULT_DEBOUNCE = 0.02
+
+_Stamp = tuple[int, int]
+_RANK_LINE = '\n  "rank": 0,\n'
+_ENTRY_INDENT = "    "
+
+
+@dataclass(frozen=True)
+class WatchUpdate:
+    """What one refresh reparsed, rescored and rewrote."""
+
+    changed: tuple[str, ...]
+    rescored: int
+    written: tuple[Path, ...]
+    elapsed: float
+    errors: tuple[str, ...] = field(default_factory=tuple)
+
+
+def _rank_key(result: ScoreResult) -> tuple[float, str]:
+    return (-result.total, result.vendor.name.lower())
+
+
+class ScoreWatcher:
+    """Keep a scorecard in sync with its inputs, doing work proportional to the edit.
+
+    Files are polled by ``(mtime_ns, size)``. A change in a vendor file reparses and rescores
+    that vendor only and moves its result within the ranked list; a criteria change rescores
+    every vendor from the already-parsed records; a profile change only re-renders. Reports
+    are rendered through the fragment cache and written only when their content differs.
+    """
+
+    def __init__(
+        self,
+        *,
+        profile_path: Path | str,
+        json_out: Path | str,
+        md_out: Path | str,
+        criteria_path: Path | str | None = None,
+        vendors_dir: Path | str | None = None,
+        top: int = 5,
+        fragments: FragmentCache | None = None,
+    ) -> None:
+        if vendors_dir is not None and Path(vendors_dir).is_file():
+            raise DataLoadError(
+                f"Watching needs a directory of vendor files; {vendors_dir} is a feed or bundle."
+            )
+        self.profile_path = Path(profile_path)
+        self.criteria_path = resolve_criteria_path(criteria_path)
+        self.vendors_dir = vendors_dir
+        self.json_out = Path(json_out)
+        self.md_out = Path(md_out)
+        self.top = max(1, top)
+        self.fragments = fragments if fragments is not None else FragmentCache()
+
+        self._stamps: dict[Path, _Stamp] = {}
+        self._results: dict[Path, ScoreResult] = {}
+        self._ranked: list[ScoreResult] = []
+        self._profile: dict[str, Any] | None = None
+        self._criteria: CriteriaConfig | None = None
+        self._encoded: dict[int, tuple[ScoreResult, str, str]] = {}
+        self._vendor_dir: Path | None = None
+        self._dir_stamp: int | None = None
+        self._vendor_paths: list[Path] = []
+
+    @property
+    def results(self) -> list[ScoreResult]:
+        """The current ranking, ordered like ``rank_vendors``."""
+
+        return list(self._ranked)
+
+    def refresh(self, *, force: bool = False) -> WatchUpdate | None:
+        """Apply any changes since the last call; return ``None`` when nothing changed."""
+
+        started = time.perf_counter()
+        snapshot = self._snapshot()
+        changed = [path for path, stamp in snapshot.items() if self._stamps.get(path) != stamp]
+        removed = [path for path in self._stamps if path not in snapshot]
+        if not (changed or removed or force):
+            return None
+
+        errors: list[str] = []
+        rerank_all = force or self._criteria is None
+        if force or self._profile is None or self.profile_path in changed:
+            profile = self._reload(load_profile, self.profile_path, self._profile, errors)
+            self._profile = profile
+        if rerank_all or self.criteria_path in changed:
+            criteria = self._reload(load_criteria, self.criteria_path, self._criteria, errors)
+            rerank_all = rerank_all or criteria is not self._criteria
+            self._criteria = criteria
+        profile, criteria = self._profile, self._criteria
+        if profile is None or criteria is None:
+            raise DataLoadError("The watched profile and criteria have not been loaded.")
+
+        for path in removed:
+            result = self._results.pop(path, None)
+            if result is not None:
+                self._discard(result)
+
+        weights = criteria.weights
+        rescored = 0
+        for path in changed:
+            if path in (self.profile_path, self.criteria_path):
+                continue
+            previous = self._results.get(path)
+            try:
+                vendor = load_vendor_file(path)
+                if previous is not None and previous.vendor.content_hash == vendor.content_hash:
+                    continue
+                result = score_vendor(vendor, weights)
+            except (DataLoadError, ValueError) as exc:
+                # Keep the last good version of a file that is mid-edit or malformed.
+                errors.append(str(exc))
+                continue
+            self._results[path] = result
+            if not rerank_all:
+                rescored += 1
+                if previous is not None:
+                    self._discard(previous)
+                bisect.insort(self._ranked, result, key=_rank_key)
+
+        if rerank_all:
+            # Entries embed criteria-dependent category scores, so none of the text is reusable.
+            self._encoded = {}
+            self._results = {
+                path: score_vendor(result.vendor, weights) for path, result in self._results.items()
+            }
+            rescored = len(self._results)
+            self._ranked = sorted(self._results.values(), key=_rank_key)
+
+        # Broken files are stamped too; the next save changes the stamp and retries them.
+        self._stamps = snapshot
+
+        written = self._render(profile, criteria)
+        return WatchUpdate(
+            changed=tuple(sorted(path.name for path in (*changed, *removed))),
+            rescored=rescored,
+            written=written,
+            elapsed=time.perf_counter() - started,
+            errors=tuple(errors),
+        )
+
+    def run(
+        self,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        on_update: Callable[[WatchUpdate], None] | None = None,
+        max_updates: int | None = None,
+    ) -> None:
+        """Poll until interrupted, coalescing bursts of saves within ``debounce`` seconds."""
+
+        update = self.refresh(force=True)
+        if on_update is not None and update is not None:
+            on_update(update)
+        updates = 1
+        while max_updates is None or updates < max_updates:
+            time.sleep(poll_interval)
+            if self._snapshot() == self._stamps:
+                continue
+            # Wait for the burst to settle: no further stamp changes for ``debounce`` seconds.
+            settled = self._snapshot()
+            while True:
+                time.sleep(debounce)
+                current = self._snapshot()
+                if current == settled:
+                    break
+                settled = current
+            update = self.refresh()
+            if update is not None:
+                updates += 1
+                if on_update is not None:
+                    on_update(update)
+
+    @staticmethod
+    def _reload(
+        loader: Callable[[Path], Any],
+        path: Path,
+        current: Any,
+        errors: list[str],
+    ) -> Any:
+        try:
+            return loader(path)
+        except (DataLoadError, ValueError) as exc:
+            if current is None:
+                raise
+            errors.append(str(exc))
+            return current
+
+    def _discard(self, result: ScoreResult) -> None:
+        key = _rank_key(result)
+        index = bisect.bisect_left(self._ranked, key, key=_rank_key)
+        while index < len(self._ranked) and _rank_key(self._ranked[index]) == key:
+            if self._ranked[index] is result:
+                del self._ranked[index]
+                return
+            index += 1
+
+    def _snapshot(self) -> dict[Path, _Stamp]:
+        # The directory listing only changes when files are added, removed or renamed, which
+        # bumps the directory mtime; otherwise the previous listing is reused.
+        dir_stamp = None
+        if self._vendor_dir is not None:
+            try:
+                dir_stamp = os.stat(self._vendor_dir).st_mtime_ns
+            except FileNotFoundError:
+                dir_stamp = None
+        if dir_stamp is None or dir_stamp != self._dir_stamp:
+            self._vendor_paths = resolve_vendor_files(self.vendors_dir)
+            self._vendor_dir = self._vendor_paths[0].parent
+            self._dir_stamp = os.stat(self._vendor_dir).st_mtime_ns
+
+        stamps: dict[Path, _Stamp] = {}
+        for path in (self.profile_path, self.criteria_path, *self._vendor_paths):
+            try:
+                info = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamps[path] = (info.st_mtime_ns, info.st_size)
+        return stamps
+
+    def _render(self, profile: dict[str, Any], criteria: CriteriaConfig) -> tuple[Path, ...]:
+        # The Markdown report only reads the shortlist, so only the top results are passed.
+        markdown = render_markdown_scorecard(
+            profile,
+            self._ranked[: self.top],
+            criteria,
+            shortlist_size=self.top,
+            fragments=self.fragments,
+        )
+        written: list[Path] = []
+        if write_if_changed(self.json_out, self._encode_payload(profile, criteria)):
+            written.append(self.json_out)
+        if write_if_changed(self.md_out, markdown):
+            written.append(self.md_out)
+        return tuple(written)
+
+    def _encode_payload(self, profile: dict[str, Any], criteria: CriteriaConfig) -> str:
+        """Serialise the scorecard payload exactly as ``json.dumps(indent=2, sort_keys=True)``.
+
+        Each vendor entry is encoded once per result and split around its ``rank`` line, so a
+        refresh only encodes changed vendors and splices the new ranks into cached text.
+        """
+
+        encoded: dict[int, tuple[ScoreResult, str, str]] = {}
+        entries: list[str] = []
+        for rank, result in enumerate(self._ranked, start=1):
+            cached = self._encoded.get(id(result))
+            if cached is None or cached[0] is not result:
+                cached = (result, *_encode_entry(result, criteria))
+            encoded[id(result)] = cached
+            entries.append(f"{cached[1]}{rank}{cached[2]}")
+        self._encoded = encoded
+
+        placeholders = {"shortlist": "\0shortlist\0", "vendors": "\0vendors\0"}
+        skeleton = build_scorecard_payload(profile, [], criteria, shortlist_size=1)
+        skeleton.update(placeholders)
+        text = json.dumps(skeleton, indent=2, sort_keys=True) + "\n"
+        for key, rows in (("shortlist", entries[: self.top]), ("vendors", entries)):
+            block = "[\n" + ",\n".join(rows) + "\n  ]" if rows else "[]"
+            text = text.replace(json.dumps(placeholders[key]), block, 1)
+        return text
+
+
+def _encode_entry(result: ScoreResult, criteria: CriteriaConfig) -> tuple[str, str]:
+    """Return a list item's JSON text split into the parts before and after its rank."""
+
+    text = json.dumps(build_vendor_entry(0, result, criteria), indent=2, sort_keys=True)
+    head, tail = text.split(_RANK_LINE, 1)
+    nested = "\n" + _ENTRY_INDENT
+    head = _ENTRY_INDENT + (head + '\n  "rank": ').replace("\n", nested)
+    return head, (",\n" + tail).replace("\n", nested)
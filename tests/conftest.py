@@ -1,4 +1,5 @@
 import sys
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
@@ -47,3 +48,114 @@ def make_vendor_record(tmp_path: Path, sample_weights: dict[str, int]):
         return VendorRecord(slug=vendor_path.stem, name=name, source=vendor_path, payload=payload)
 
     return factory
+
+
+@pytest.fixture
+def make_catalog(make_vendor_record, sample_weights: dict[str, int]):
+    """Build ``count`` "Vendor NN" records scored by ``score(index, position)``.
+
+    ``position`` is the metric's place in ``sample_weights``; a ``None`` score leaves the metric
+    out. The default cycles every metric through 0-5.
+    """
+
+    def factory(
+        count: int = 25, score: Callable[[int, int], float | None] | None = None
+    ) -> list[VendorRecord]:
+        score = score or (lambda index, position: (index * 7 + position) % 6)
+        vendors = []
+        for index in range(count):
+            scores = {}
+            for position, metric in enumerate(sample_weights):
+                value = score(index, position)
+                if value is not None:
+                    scores[metric] = value
+            vendors.append(make_vendor_record(f"Vendor {index:02d}", scores))
+        return vendors
+
+    return factory
+
+
+@pytest.fixture
+def sample_environment(tmp_path: Path):
+    vendors_dir = tmp_path / "vendors"
+    vendors_dir.mkdir()
+    (vendors_dir / "alpha.yml").write_text(
+        """
+name: Alpha CRM
+scores:
+  integrations_apis: 5
+  customization_extensibility: 4
+  usability_admin: 4
+  analytics_ai: 3
+  security_compliance: 4
+  sales_core: 5
+  service: 3
+  marketing: 3
+  pricing_tco: 4
+  data_migration_portability: 3
+  support_ecosystem_viability: 4
+notes:
+  - "Strengths: fast to deploy"
+  - "Trade-offs: fewer enterprise controls"
+        """.strip(),
+        encoding="utf-8",
+    )
+    (vendors_dir / "beta.yml").write_text(
+        """
+name: Beta CRM
+scores:
+  integrations_apis: 4
+  customization_extensibility: 4
+  usability_admin: 5
+  analytics_ai: 4
+  security_compliance: 4
+  sales_core: 4
+  service: 4
+  marketing: 4
+  pricing_tco: 3
+  data_migration_portability: 4
+  support_ecosystem_viability: 3
+notes:
+  - "Strengths: balanced feature set"
+  - "Trade-offs: pricing higher"
+        """.strip(),
+        encoding="utf-8",
+    )
+
+    criteria_file = tmp_path / "criteria.yml"
+    criteria_file.write_text(
+        """
+weights:
+  integrations_apis: 12
+  customization_extensibility: 10
+  usability_admin: 10
+  analytics_ai: 10
+  security_compliance: 10
+  sales_core: 15
+  service: 7
+  marketing: 7
+  pricing_tco: 9
+  data_migration_portability: 5
+  support_ecosystem_viability: 5
+scales:
+  0: absent
+  5: excellent
+        """.strip(),
+        encoding="utf-8",
+    )
+
+    profile_file = tmp_path / "profile.yml"
+    profile_file.write_text(
+        """
+company_size: "50-100"
+regions: ["US"]
+must_have: ["email_calendar_sync"]
+        """.strip(),
+        encoding="utf-8",
+    )
+
+    return {
+        "vendors": vendors_dir,
+        "criteria": criteria_file,
+        "profile": profile_file,
+    }
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.build import BUILD_MANIFEST_NAME, build_artifacts, write_if_changed
+
+
+def _build(env, out_dir: Path, **kwargs):
+    outcomes = build_artifacts(
+        out_dir,
+        profile_path=env["profile"],
+        criteria_path=env["criteria"],
+        vendors_dir=env["vendors"],
+        **kwargs,
+    )
+    return {outcome.name: outcome.status for outcome in outcomes}
+
+
+def test_build_skips_fresh_nodes(sample_environment, tmp_path: Path):
+    out_dir = tmp_path / "artifacts"
+    first = _build(sample_environment, out_dir)
+    assert set(first.values()) == {"written"}
+    assert (out_dir / BUILD_MANIFEST_NAME).exists()
+
+    second = _build(sample_environment, out_dir)
+    assert set(second.values()) == {"fresh"}
+
+
+def test_build_profile_change_leaves_security(sample_environment, tmp_path: Path):
+    out_dir = tmp_path / "artifacts"
+    _build(sample_environment, out_dir)
+    security_mtime = (out_dir / "security.md").stat().st_mtime_ns
+
+    sample_environment["profile"].write_text(
+        'company_size: "100-250"\nregions: ["EU"]\n', encoding="utf-8"
+    )
+    statuses = _build(sample_environment, out_dir)
+    assert statuses["security"] == "fresh"
+    assert statuses["scorecard_md"] == "written"
+    assert (out_dir / "security.md").stat().st_mtime_ns == security_mtime
+
+
+def test_build_rebuilds_tampered_output(sample_environment, tmp_path: Path):
+    out_dir = tmp_path / "artifacts"
+    _build(sample_environment, out_dir)
+    (out_dir / "integration.md").write_text("edited by hand\n", encoding="utf-8")
+    statuses = _build(sample_environment, out_dir, jobs=1)
+    assert statuses["integration"] == "written"
+    assert statuses["migration"] == "fresh"
+
+
+def test_write_if_changed(tmp_path: Path):
+    target = tmp_path / "out.md"
+    assert write_if_changed(target, "hello\n") is True
+    assert write_if_changed(target, "hello\n") is False
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_cli_build(sample_environment, tmp_path: Path, capsys):
+    out_dir = tmp_path / "artifacts"
+    args = [
+        "--vendors-dir",
+        str(sample_environment["vendors"]),
+        "--criteria",
+        str(sample_environment["criteria"]),
+        "build",
+        "--profile",
+        str(sample_environment["profile"]),
+        "--out-dir",
+        str(out_dir),
+    ]
+    assert cli.main(args) == 0
+    assert cli.main(args) == 0
+    assert "wrote nothing; 5 artifact(s) up to date" in capsys.readouterr().out
+
+    for flag in (["--dedupe"], ["--normalize", "zscore"]):
+        with pytest.raises(SystemExit):
+            cli.main([*flag, *args])
@@ -0,0 +1,124 @@
+import json
+import zlib
+from pathlib import Path
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.bundle import _HEADER, VendorBundle, pack_bundle, unpack_bundle
+from crm_eval.data import DEFAULT_VENDORS_DIR, DataLoadError, load_vendors, resolve_vendor_files
+from crm_eval.search import INDEX_FILENAME
+
+
+def test_bundle_loads_like_directory(tmp_path: Path):
+    bundle_path = tmp_path / "vendors.crmb"
+    entries = pack_bundle(DEFAULT_VENDORS_DIR, bundle_path)
+    assert [entry.filename for entry in entries] == [
+        path.name for path in resolve_vendor_files(DEFAULT_VENDORS_DIR)
+    ]
+
+    from_dir = load_vendors(DEFAULT_VENDORS_DIR)
+    from_bundle = load_vendors(bundle_path)
+    assert [(v.slug, v.name, v.payload) for v in from_bundle] == [
+        (v.slug, v.name, v.payload) for v in from_dir
+    ]
+    assert [v.content_hash for v in from_bundle] == [v.content_hash for v in from_dir]
+
+    with VendorBundle(bundle_path) as bundle:
+        assert bundle.read("ZOHO").payload == next(v for v in from_dir if v.slug == "zoho").payload
+        with pytest.raises(DataLoadError):
+            bundle.read("missing")
+
+
+def test_unpack_restores_bytes(sample_environment, tmp_path: Path):
+    bundle_path = tmp_path / "vendors.crmb"
+    pack_bundle(sample_environment["vendors"], bundle_path)
+    written = unpack_bundle(bundle_path, tmp_path / "restored")
+    for path in written:
+        original = sample_environment["vendors"] / path.name
+        assert path.read_bytes() == original.read_bytes()
+
+
+def test_corrupt_entry_is_rejected(sample_environment, tmp_path: Path):
+    bundle_path = tmp_path / "vendors.crmb"
+    entries = pack_bundle(sample_environment["vendors"], bundle_path)
+    data = bytearray(bundle_path.read_bytes())
+    data[entries[0].offset + 4] ^= 0xFF
+    bundle_path.write_bytes(bytes(data))
+    with pytest.raises(DataLoadError):
+        load_vendors(bundle_path)
+
+
+def test_cli_score_from_bundle(sample_environment, tmp_path: Path):
+    bundle_path = tmp_path / "vendors.crmb"
+    vendors = str(sample_environment["vendors"])
+    assert cli.main(["--vendors-dir", vendors, "bundle", "pack", str(bundle_path)]) == 0
+
+    outputs = []
+    for source in (vendors, str(bundle_path)):
+        out = tmp_path / "scorecard.json"
+        md = tmp_path / "scorecard.md"
+        args = ["--profile", str(sample_environment["profile"]), "--out", str(out)]
+        assert cli.main(["--vendors-dir", source, "score", *args, "--md", str(md)]) == 0
+        outputs.append((out.read_text(encoding="utf-8"), md.read_text(encoding="utf-8")))
+    assert outputs[0] == outputs[1]
+
+
+def test_cli_commands_read_or_reject_a_bundle(sample_environment, tmp_path: Path, capsys):
+    bundle_path = tmp_path / "vendors.crmb"
+    vendors = str(sample_environment["vendors"])
+    pack_bundle(vendors, bundle_path)
+    criteria = ["--criteria", str(sample_environment["criteria"])]
+    profile = str(sample_environment["profile"])
+
+    assert cli.main(["--vendors-dir", str(bundle_path), *criteria, "search", "beta"]) == 0
+    assert "beta" in capsys.readouterr().out
+    assert (tmp_path / f"vendors.crmb{INDEX_FILENAME}").exists()
+
+    scorecards = []
+    for name, source in (("dir", vendors), ("bundle", str(bundle_path))):
+        out_dir = tmp_path / name
+        args = ["build", "--profile", profile, "--out-dir", str(out_dir)]
+        assert cli.main(["--vendors-dir", source, *criteria, *args]) == 0
+        scorecards.append((out_dir / "scorecard.md").read_text(encoding="utf-8"))
+    assert scorecards[0] == scorecards[1]
+
+    rejected = [
+        ["score", "--profile", profile, "--out", "c.json", "--md", "c.md", "--watch"],
+        ["shard", "--index", "0", "--count", "2", "--out", str(tmp_path / "part.jsonl")],
+        ["bundle", "pack", str(tmp_path / "again.crmb")],
+    ]
+    for args in rejected:
+        with pytest.raises(SystemExit):
+            cli.main(["--vendors-dir", str(bundle_path), *criteria, *args])
+        assert "feed or bundle" in capsys.readouterr().err
+    assert sorted(path.name for path in sample_environment["vendors"].iterdir()) == [
+        "alpha.yml",
+        "beta.yml",
+    ]
+
+
+def test_unpack_keeps_files_sharing_a_slug_apart(sample_environment, tmp_path: Path):
+    vendors_dir = sample_environment["vendors"]
+    (vendors_dir / "alpha.yaml").write_text("name: Alpha Regional\n", encoding="utf-8")
+    bundle_path = tmp_path / "vendors.crmb"
+    pack_bundle(vendors_dir, bundle_path)
+    for path in unpack_bundle(bundle_path, tmp_path / "restored"):
+        assert path.read_bytes() == (vendors_dir / path.name).read_bytes()
+
+
+def test_unsafe_bundle_filenames_are_rejected(sample_environment, tmp_path: Path):
+    bundle_path = tmp_path / "vendors.crmb"
+    pack_bundle(sample_environment["vendors"], bundle_path)
+    data = bytearray(bundle_path.read_bytes())
+    magic, version, toc_offset, toc_length = _HEADER.unpack_from(data)
+    toc = json.loads(zlib.decompress(bytes(data[toc_offset : toc_offset + toc_length])))
+    toc["entries"][0]["filename"] = "../escaped.yml"
+    patched = zlib.compress(json.dumps(toc).encode("utf-8"))
+    data[toc_offset:] = patched
+    data[: _HEADER.size] = _HEADER.pack(magic, version, toc_offset, len(patched))
+    bundle_path.write_bytes(bytes(data))
+
+    with pytest.raises(DataLoadError, match="unsafe filename"):
+        unpack_bundle(bundle_path, tmp_path / "restored" / "inner")
+    assert not (tmp_path / "restored" / "escaped.yml").exists()
@@ -0,0 +1,86 @@
+import json
+
+from crm_eval import cli
+from crm_eval.compare import COMPARE_FORMAT, ComparisonMatrix, render_head_to_head
+from crm_eval.scoring import rank_vendors
+
+
+def _ranked(criteria_config, make_catalog, count=30, spread=6):
+    def score(index, position):
+        return ((index * 7 + position * 3) % spread) * 5 / (spread - 1)
+
+    return rank_vendors(make_catalog(count, score), criteria_config)
+
+
+def _brute_force(results, metrics, a, b):
+    wins = ties = 0
+    for metric in metrics:
+        left = results[a].breakdown[metric]["raw"]
+        right = results[b].breakdown[metric]["raw"]
+        wins += left > right
+        ties += left == right
+    return wins, ties
+
+
+def test_rows_match_pairwise_comparison(criteria_config, make_catalog):
+    results = _ranked(criteria_config, make_catalog)
+    matrix = ComparisonMatrix(results, criteria_config, cache_bytes=64)
+
+    for a in range(len(results)):
+        wins, ties = matrix.row(a)
+        for b in range(len(results)):
+            assert (wins[b], ties[b]) == _brute_force(results, matrix.metrics, a, b)
+    pair = matrix.pair(0, 1)
+    assert pair.wins + pair.losses + pair.ties == len(matrix.metrics)
+    assert pair.margin == results[0].total - results[1].total
+
+
+def test_wide_metrics_use_two_digit_codes(criteria_config, make_catalog):
+    # 400 distinct values per metric exceed one byte, exercising the base-256 comparison.
+    results = _ranked(criteria_config, make_catalog, count=400, spread=401)
+    matrix = ComparisonMatrix(results, criteria_config)
+
+    for a in (0, 17, 399):
+        wins, ties = matrix.row(a)
+        assert [(wins[b], ties[b]) for b in range(len(results))] == [
+            _brute_force(results, matrix.metrics, a, b) for b in range(len(results))
+        ]
+
+
+def test_neighbours_cover_shifted_diagonals(criteria_config, make_catalog):
+    results = _ranked(criteria_config, make_catalog, count=12)
+    matrix = ComparisonMatrix(results, criteria_config)
+
+    pairs = matrix.neighbours(3)
+    assert [(p.a_rank, p.b_rank) for p in pairs] == [
+        (a + 1, b + 1) for a in range(12) for b in range(a + 1, min(a + 4, 12))
+    ]
+    assert pairs == [matrix.pair(p.a_rank - 1, p.b_rank - 1) for p in pairs]
+    assert matrix.neighbours(50)[-1].b_rank == 12
+
+
+def test_markdown_lists_each_shortlisted_pair(criteria_config, make_catalog):
+    results = _ranked(criteria_config, make_catalog)
+    markdown = render_head_to_head(ComparisonMatrix(results, criteria_config), top=3)
+
+    assert markdown.count("\n## ") == 3
+    first, second = results[0].vendor.name, results[1].vendor.name
+    assert f"## {first} (#1) vs {second} (#2)" in markdown
+    assert f"| Metric | {first} | {second} | Weighted margin |" in markdown
+
+
+def test_cli_compare_writes_matrix_and_markdown(sample_environment, tmp_path, capsys):
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    out, md = tmp_path / "matrix.jsonl", tmp_path / "compare.md"
+    assert cli.main(root + ["compare", "--out", str(out), "--md", str(md)]) == 0
+
+    header, *rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert header["format"] == COMPARE_FORMAT
+    assert header["vendors"] == ["alpha", "beta"]
+    assert [row["vendor"] for row in rows] == header["vendors"]
+    assert rows[0]["ties"][0] == len(header["metrics"])
+    assert "## Alpha CRM (#1) vs Beta CRM (#2)" in md.read_text()
+
+    assert cli.main(root + ["compare", "--neighbours", "1"]) == 0
+    assert "#1 Alpha CRM vs #2 Beta CRM" in capsys.readouterr().out
@@ -0,0 +1,79 @@
+import json
+
+from crm_eval import cli
+from crm_eval.coverage import analyse_coverage
+from crm_eval.scoring import rank_vendors
+
+
+def _score(index, position):
+    # Every third vendor leaves the first metric unscored.
+    if position == 0 and index % 3 == 0:
+        return None
+    return round(1 + ((index * 37 + position * 11) % 97) / 25, 2)
+
+
+def test_coverage_counts_and_distribution(
+    criteria_config, make_catalog, make_vendor_record, sample_weights
+):
+    vendors = make_catalog(30, _score)
+    vendors.append(make_vendor_record("Odd", {**{m: 3 for m in sample_weights}, "typo": 1}))
+    first, second = list(sample_weights)[:2]
+    vendors[1].payload["scores"][second] = "n/a"
+    vendors[2].payload["scores"][second] = 9
+
+    report = analyse_coverage(vendors, criteria_config)
+    by_metric = {metric.metric: metric for metric in report.metrics}
+
+    assert report.vendors == 31
+    assert by_metric[first].missing == 10
+    assert by_metric[first].coverage == 21 / 31
+    assert by_metric[second].invalid == 1
+    assert by_metric[second].clamped == 1
+    assert by_metric[second].maximum == 5.0
+    assert report.unknown_metrics == {"typo": 1}
+    assert sum(by_metric[first].histogram) == by_metric[first].present
+    assert by_metric[first].q1 <= by_metric[first].median <= by_metric[first].q3
+
+
+def test_rank_shift_matches_rescoring_with_the_mean(
+    criteria_config, make_catalog, make_vendor_record, sample_weights
+):
+    vendors = make_catalog(30, _score)
+    first = next(iter(sample_weights))
+    coverage = next(m for m in analyse_coverage(vendors, criteria_config).metrics)
+
+    before = [r.vendor.slug for r in rank_vendors(vendors, criteria_config)]
+    imputed = [
+        make_vendor_record(v.name, {first: coverage.mean, **v.get_scores()}) for v in vendors
+    ]
+    after = [r.vendor.slug for r in rank_vendors(imputed, criteria_config)]
+    moves = [
+        abs(before.index(v.slug) - after.index(v.slug))
+        for v in vendors
+        if first not in v.get_scores()
+    ]
+
+    assert coverage.metric == first
+    assert coverage.ranks_changed == sum(1 for move in moves if move)
+    assert coverage.max_rank_shift == max(moves)
+
+
+def test_outliers_use_tukey_fences(criteria_config, make_vendor_record, sample_weights):
+    metric = next(iter(sample_weights))
+    vendors = [make_vendor_record(f"Steady {i}", {metric: 3 + (i % 2) * 0.5}) for i in range(20)]
+    vendors.append(make_vendor_record("Sinker", {metric: 0.5}))
+
+    coverage = analyse_coverage(vendors, criteria_config).metrics[0]
+    assert coverage.outliers == 1
+    assert coverage.outlier_examples == (("sinker", 0.5),)
+
+
+def test_cli_coverage_writes_json(sample_environment, tmp_path, capsys):
+    out = tmp_path / "coverage.json"
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    assert cli.main(root + ["coverage", "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["vendors"] == 2
+    assert "cover" in capsys.readouterr().out
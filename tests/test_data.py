@@ -10,8 +10,22 @@ from crm_eval.data import (
     load_criteria,
     load_profile,
     load_vendors,
+    metric_score,
 )
 
+NESTED_CRITERIA = """\
+weights:
+  sales_core:
+    weight: 60
+    metrics:
+      pipeline: 3
+      forecasting:
+        weight: 1
+        metrics: {accuracy: 1, rollups: 1}
+  service: 40
+scales: {0: none, 5: excellent}
+"""
+
 
 def test_load_criteria_success():
     criteria = load_criteria(Path("config/criteria.yml"))
@@ -155,3 +169,71 @@ def test_candidate_paths_with_relative(monkeypatch, tmp_path: Path):
     default = tmp_path / "config" / "criteria.yml"
     paths = list(data_module._candidate_paths(None, default))
     assert paths[-1] == default.resolve()
+
+
+def test_load_criteria_compiles_nested_categories(tmp_path: Path):
+    criteria_file = tmp_path / "criteria.yml"
+    criteria_file.write_text(NESTED_CRITERIA, encoding="utf-8")
+    criteria = load_criteria(criteria_file)
+    assert criteria.weights == {
+        "sales_core.pipeline": 45.0,
+        "sales_core.forecasting.accuracy": 7.5,
+        "sales_core.forecasting.rollups": 7.5,
+        "service": 40,
+    }
+    assert criteria.categories == {
+        "sales_core": (
+            "sales_core.pipeline",
+            "sales_core.forecasting.accuracy",
+            "sales_core.forecasting.rollups",
+        )
+    }
+    assert criteria.as_dict()["categories"]["sales_core"][0] == "sales_core.pipeline"
+    rolled = criteria.rollup({metric: 1.0 for metric in criteria.weights})
+    assert rolled == {"sales_core": 3.0, "service": 1.0}
+
+
+def test_load_criteria_reuses_compiled_criteria(tmp_path: Path, monkeypatch):
+    criteria_file = tmp_path / "criteria.yml"
+    criteria_file.write_text(NESTED_CRITERIA, encoding="utf-8")
+    first = load_criteria(criteria_file)
+    first.weights["service"] = 0
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("criteria were compiled twice")
+
+    monkeypatch.setattr(data_module, "_compile_criteria", fail)
+    again = load_criteria(criteria_file)
+    assert again.weights["service"] == 40
+    assert again is not first
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [
+        "sales_core: {weight: 100, metrics: {}}",
+        "sales_core: {weight: 100, metrics: {a: 0, b: 0}}",
+        "sales_core: {weight: 100, metrics: {a: -1, b: 2}}",
+        "sales_core: {weight: 100, metrics: {a: lots}}",
+        "sales_core.pipeline: 100",
+    ],
+)
+def test_load_criteria_rejects_bad_categories(tmp_path: Path, weights: str):
+    criteria_file = tmp_path / "criteria.yml"
+    criteria_file.write_text(f"weights:\n  {weights}\n", encoding="utf-8")
+    with pytest.raises(DataLoadError):
+        load_criteria(criteria_file)
+
+
+def test_nested_scores_flatten_and_fall_back_to_parents(tmp_path: Path):
+    record = VendorRecord(
+        slug="nested",
+        name="Nested",
+        source=tmp_path / "nested.yml",
+        payload={"scores": {"sales_core": {"pipeline": 4, "forecasting": 3}, "service": 2}},
+    )
+    scores = record.get_scores()
+    assert scores == {"sales_core.pipeline": 4, "sales_core.forecasting": 3, "service": 2}
+    assert metric_score(scores, "sales_core.forecasting.accuracy") == 3
+    assert metric_score(scores, "service.tickets") == 2
+    assert metric_score(scores, "marketing.email") is None
@@ -0,0 +1,51 @@
+from dataclasses import replace
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import DEFAULT_VENDORS_DIR, load_vendors
+from crm_eval.dedupe import (
+    collapse_duplicates,
+    find_duplicate_clusters,
+    minhash_signature,
+    vendor_tokens,
+)
+
+
+def _regional_edition(vendor, suffix):
+    payload = dict(vendor.payload)
+    payload["name"] = f"{vendor.name} {suffix.upper()}"
+    return replace(vendor, slug=f"{vendor.slug}_{suffix}", name=payload["name"], payload=payload)
+
+
+def test_catalog_has_no_duplicates():
+    assert find_duplicate_clusters(load_vendors(DEFAULT_VENDORS_DIR)) == []
+
+
+def test_regional_edition_is_clustered_and_collapsed():
+    vendors = load_vendors(DEFAULT_VENDORS_DIR)
+    original = next(vendor for vendor in vendors if vendor.slug == "zoho")
+    catalog = vendors + [_regional_edition(original, "eu")]
+
+    clusters = find_duplicate_clusters(catalog)
+    assert [sorted(m.slug for m in c.members) for c in clusters] == [["zoho", "zoho_eu"]]
+    assert clusters[0].representative.slug == "zoho"
+    assert clusters[0].similarity >= 0.7
+
+    collapsed = collapse_duplicates(catalog, clusters)
+    assert [vendor.slug for vendor in collapsed] == [vendor.slug for vendor in vendors]
+
+
+def test_signature_ignores_key_order(make_vendor_record):
+    first = make_vendor_record(name="Alpha", scores={"a": 1, "b": 2})
+    second = replace(first, payload=dict(reversed(list(first.payload.items()))))
+    assert vendor_tokens(first) == vendor_tokens(second)
+    assert minhash_signature(vendor_tokens(first)) == minhash_signature(vendor_tokens(second))
+    with pytest.raises(ValueError):
+        minhash_signature({"x"}, num_bins=100)
+
+
+def test_cli_dedupe_reports_clusters(sample_environment, capsys):
+    exit_code = cli.main(["--vendors-dir", str(sample_environment["vendors"]), "dedupe"])
+    assert exit_code == 0
+    assert "0 duplicate cluster(s) across 2 vendors." in capsys.readouterr().out
@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from crm_eval import cli
+from crm_eval.data import CriteriaConfig, load_criteria
+from crm_eval.explain import explain_rank_flips, render_rank_flips
+from crm_eval.scoring import rank_vendors, score_vendor
+
+
+@pytest.fixture
+def ranked(criteria_config, make_vendor_record):
+    metrics = list(criteria_config.weights)
+    alpha = {metric: 5 if i % 2 else 3 for i, metric in enumerate(metrics)}
+    gamma = {metric: 2 if i < 3 else 4 for i, metric in enumerate(metrics)}
+    vendors = [
+        make_vendor_record(name="Alpha", scores=alpha),
+        make_vendor_record(name="Beta", scores={metric: 4 for metric in metrics}),
+        make_vendor_record(name="Gamma", scores=gamma),
+    ]
+    return rank_vendors(vendors, criteria_config)
+
+
+def _shifted(criteria: CriteriaConfig, metric: str, delta: float) -> dict[str, float]:
+    rest = sum(criteria.weights.values()) - criteria.weights[metric]
+    return {
+        name: weight + delta if name == metric else weight * (1 - delta / rest)
+        for name, weight in criteria.weights.items()
+    }
+
+
+def test_weight_shifts_close_the_gap_exactly(ranked, criteria_config):
+    flips = explain_rank_flips(ranked, criteria_config, top_pairs=3)
+    assert [(f.leader_rank, f.challenger_rank) for f in flips] == [(1, 2), (1, 3), (2, 3)]
+    assert any(flip.weight_shifts for flip in flips)
+    for flip in flips:
+        assert flip.gap == pytest.approx(flip.leader.total - flip.challenger.total, abs=1e-3)
+        for shift in flip.weight_shifts:
+            weights = _shifted(criteria_config, shift.metric, shift.delta)
+            assert sum(weights.values()) == pytest.approx(100)
+            leader = score_vendor(flip.leader.vendor, weights).total
+            challenger = score_vendor(flip.challenger.vendor, weights).total
+            assert leader == pytest.approx(challenger, abs=1e-3)
+
+
+def test_whole_point_shifts_load_and_swap_the_pair(ranked, criteria_config, tmp_path: Path):
+    flips = explain_rank_flips(ranked, criteria_config, top_pairs=3)
+    suggested = [(flip, shift) for flip in flips for shift in flip.weight_shifts if shift.weights]
+    assert suggested
+    path = tmp_path / "shifted.yml"
+    for flip, shift in suggested:
+        path.write_text(yaml.safe_dump({"weights": shift.weights}), encoding="utf-8")
+        weights = load_criteria(path).weights
+        moved = weights[shift.metric] - criteria_config.weights[shift.metric]
+        assert abs(moved) >= abs(shift.delta)
+        leader = score_vendor(flip.leader.vendor, weights).total
+        challenger = score_vendor(flip.challenger.vendor, weights).total
+        assert challenger > leader
+
+
+def test_shifts_that_only_tie_at_the_boundary_are_dropped(make_vendor_record):
+    criteria = CriteriaConfig(weights={"sales_core": 50, "service": 50}, scales={})
+    vendors = [
+        make_vendor_record(name="Leader", scores={"sales_core": 4, "service": 5}),
+        make_vendor_record(name="Zeta", scores={"sales_core": 4, "service": 3}),
+    ]
+    flips = explain_rank_flips(rank_vendors(vendors, criteria), criteria)
+    assert flips[0].weight_shifts == ()
+    assert "weight points" not in render_rank_flips(flips, max_rank=2)[0]
+
+
+def test_raw_change_is_smallest_feasible(ranked, criteria_config):
+    flip = explain_rank_flips(ranked, criteria_config)[0]
+    change = flip.raw_change
+    assert change is not None
+    heaviest = max(criteria_config.weights.values())
+    assert abs(change.delta) == pytest.approx(5 * flip.gap / heaviest)
+    assert 0 <= change.new_score <= 5
+
+
+def test_cli_explain_adds_section(sample_environment, tmp_path: Path):
+    out = tmp_path / "scorecard.json"
+    md = tmp_path / "scorecard.md"
+    exit_code = cli.main(
+        [
+            "--vendors-dir",
+            str(sample_environment["vendors"]),
+            "--criteria",
+            str(sample_environment["criteria"]),
+            "score",
+            "--profile",
+            str(sample_environment["profile"]),
+            "--out",
+            str(out),
+            "--md",
+            str(md),
+            "--explain",
+        ]
+    )
+    assert exit_code == 0
+    payload = json.loads(out.read_text(encoding="utf-8"))
+    assert [(f["leader"], f["challenger"]) for f in payload["rank_flips"]] == [("alpha", "beta")]
+    assert "## What Would Change the Ranking" in md.read_text(encoding="utf-8")
@@ -0,0 +1,70 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import DataLoadError, load_criteria, load_vendors
+from crm_eval.export import export_columns, export_scores, iter_ranked_rows, read_columnar
+from crm_eval.scoring import rank_vendors
+
+
+def test_rows_follow_rank_vendors_order(criteria_config, make_catalog):
+    vendors = make_catalog()
+    rows = list(iter_ranked_rows(vendors, criteria_config))
+    ranked = rank_vendors(vendors, criteria_config)
+
+    assert [row[1] for row in rows] == [result.vendor.slug for result in ranked]
+    assert [row[0] for row in rows] == list(range(1, len(vendors) + 1))
+    first_metric = next(iter(criteria_config.weights))
+    assert rows[0][4] == round(ranked[0].breakdown[first_metric]["raw"], 2)
+    assert rows[0][5] == round(ranked[0].breakdown[first_metric]["weighted"], 4)
+    assert len(rows[0]) == len(export_columns(criteria_config))
+
+
+def test_spilled_chunks_merge_to_the_same_ranking(criteria_config, make_catalog):
+    vendors = make_catalog()
+    in_memory = list(iter_ranked_rows(vendors, criteria_config))
+    spilled = list(iter_ranked_rows(iter(vendors), criteria_config, chunk_rows=4))
+    assert spilled == in_memory
+
+
+def test_columnar_round_trip(criteria_config, make_catalog, tmp_path):
+    vendors = make_catalog()
+    out = tmp_path / "scores.col"
+    assert export_scores(vendors, criteria_config, out, fmt="columnar", chunk_rows=10) == 25
+
+    columns, groups = read_columnar(out)
+    assert columns == export_columns(criteria_config)
+    groups = list(groups)
+    assert [len(group["rank"]) for group in groups] == [10, 10, 5]
+    rows = [
+        tuple(group[name][index] for name, _ in columns)
+        for group in groups
+        for index in range(len(group["rank"]))
+    ]
+    assert rows == list(iter_ranked_rows(vendors, criteria_config))
+
+    out.write_bytes(out.read_bytes()[:-20])
+    with pytest.raises(DataLoadError):
+        list(read_columnar(out)[1])
+
+
+def test_cli_export_tsv_to_stdout(sample_environment, capsys):
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    assert cli.main(root + ["export", "--format", "tsv"]) == 0
+
+    rows = list(csv.reader(capsys.readouterr().out.splitlines(), delimiter="\t"))
+    criteria = load_criteria(sample_environment["criteria"])
+    ranked = rank_vendors(load_vendors(sample_environment["vendors"]), criteria)
+    assert rows[0] == [name for name, _ in export_columns(criteria)]
+    assert [row[1] for row in rows[1:]] == [result.vendor.slug for result in ranked]
+    assert float(rows[1][3]) == ranked[0].total
+
+
+def test_export_rejects_columnar_stdout(criteria_config, make_vendor_record):
+    with pytest.raises(ValueError):
+        export_scores([make_vendor_record()], criteria_config, "-", fmt="columnar")
+    with pytest.raises(ValueError):
+        export_scores([make_vendor_record()], criteria_config, Path("x.csv"), fmt="xlsx")
@@ -0,0 +1,112 @@
+import gzip
+import json
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import DataLoadError, iter_vendors, load_vendors, resolve_vendor_files
+from crm_eval.feed import feed_slug, is_feed, iter_feed
+from crm_eval.search import INDEX_FILENAME
+
+
+def _write_feed(path, records):
+    lines = "\n".join(json.dumps(record) for record in records) + "\n"
+    if path.suffix == ".gz":
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            handle.write(lines)
+    else:
+        path.write_text(lines, encoding="utf-8")
+    return path
+
+
+def _directory_as_feed(vendors_dir, path):
+    records = [{"slug": vendor.slug, **vendor.payload} for vendor in load_vendors(vendors_dir)]
+    return _write_feed(path, records)
+
+
+def test_feeds_load_like_the_directory(sample_environment, tmp_path):
+    expected = load_vendors(sample_environment["vendors"])
+    for name in ("vendors.jsonl", "vendors.ndjson.gz"):
+        feed = _directory_as_feed(sample_environment["vendors"], tmp_path / name)
+        loaded = load_vendors(feed)
+        assert [vendor.slug for vendor in loaded] == [vendor.slug for vendor in expected]
+        assert [vendor.name for vendor in loaded] == [vendor.name for vendor in expected]
+        assert loaded[0].source == feed / "alpha.json"
+        assert loaded[0].get_scores() == expected[0].get_scores()
+    assert is_feed("feed.JSONL") and is_feed("a/b.jsonl.gz") and not is_feed("bundle.crmb")
+
+
+def test_feed_slugs_and_salesforce_exclusion(tmp_path):
+    feed = _write_feed(
+        tmp_path / "feed.jsonl",
+        [
+            {"name": "Monday Sales CRM", "scores": {}},
+            {"name": "Salesforce Sales Cloud", "scores": {}},
+            {"slug": "Zoho", "scores": {}},
+        ],
+    )
+    vendors = list(iter_feed(feed))
+    assert [vendor.slug for vendor in vendors] == ["monday_sales_crm", "zoho"]
+    assert vendors[1].name == "Zoho"
+    assert feed_slug({"name": "  HubSpot / CRM "}) == "hubspot_crm"
+
+
+def test_feed_is_parsed_lazily_and_validated(tmp_path):
+    feed = tmp_path / "feed.jsonl"
+    feed.write_text('{"name": "Alpha"}\n\n{"name": \n', encoding="utf-8")
+    vendors = iter_vendors(feed)
+    assert next(vendors).slug == "alpha"
+    with pytest.raises(DataLoadError, match="line 3"):
+        next(vendors)
+
+    for line in ("[1, 2]", "{}", '{"scores": {}}'):
+        feed.write_text(line + "\n", encoding="utf-8")
+        with pytest.raises(DataLoadError, match="Line 1"):
+            load_vendors(feed)
+    broken = tmp_path / "feed.jsonl.gz"
+    broken.write_bytes(b"not gzip at all")
+    with pytest.raises(DataLoadError):
+        load_vendors(broken)
+    with pytest.raises(DataLoadError):
+        load_vendors(tmp_path / "missing.jsonl")
+
+
+def test_cli_streams_a_feed_into_the_shortlist(sample_environment, tmp_path, capsys):
+    feed = _directory_as_feed(sample_environment["vendors"], tmp_path / "vendors.jsonl.gz")
+    root = ["--vendors-dir", str(feed), "--criteria", str(sample_environment["criteria"])]
+    card = tmp_path / "card.json"
+    args = ["score", "--profile", str(sample_environment["profile"]), "--top", "1", "--stream"]
+    args += ["--out", str(card), "--md", str(tmp_path / "card.md")]
+    assert cli.main(root + args) == 0
+    assert "Streamed 2 vendors" in capsys.readouterr().out
+    assert [entry["slug"] for entry in json.loads(card.read_text())["vendors"]] == ["alpha"]
+
+    with pytest.raises(SystemExit):
+        cli.main(root + args + ["--alternatives", "1"])
+
+
+def test_file_catalogs_never_fall_back_to_the_default(sample_environment, tmp_path, capsys):
+    feed = _directory_as_feed(sample_environment["vendors"], tmp_path / "vendors.jsonl")
+    with pytest.raises(DataLoadError):
+        resolve_vendor_files(feed)
+
+    root = ["--vendors-dir", str(feed), "--criteria", str(sample_environment["criteria"])]
+    profile = str(sample_environment["profile"])
+    assert cli.main(root + ["search", "alpha"]) == 0
+    assert "alpha" in capsys.readouterr().out
+    assert (tmp_path / f"vendors.jsonl{INDEX_FILENAME}").exists()
+    assert cli.main(root + ["build", "--profile", profile, "--out-dir", str(tmp_path / "a")]) == 0
+    scorecard = json.loads((tmp_path / "a" / "scorecard.json").read_text())
+    assert [entry["slug"] for entry in scorecard["vendors"]] == ["alpha", "beta"]
+
+    rejected = [
+        ["score", "--profile", profile, "--out", "c.json", "--md", "c.md", "--watch"],
+        ["shard", "--index", "0", "--count", "2", "--out", str(tmp_path / "part.jsonl")],
+        ["bundle", "pack", str(tmp_path / "vendors.crmb")],
+    ]
+    for args in rejected:
+        with pytest.raises(SystemExit):
+            cli.main(root + args)
+        assert "feed or bundle" in capsys.readouterr().err
+    assert not (tmp_path / "vendors.crmb").exists()
+    assert not (sample_environment["vendors"] / INDEX_FILENAME).exists()
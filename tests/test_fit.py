@@ -0,0 +1,124 @@
+import json
+import random
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import CriteriaConfig, DataLoadError, load_criteria
+from crm_eval.fit import Decision, fit_weights, load_decisions, round_weights, write_criteria
+
+
+def _catalog(make_catalog, count=30):
+    rng = random.Random(7)
+    return make_catalog(count, lambda index, position: round(rng.uniform(0, 5), 1))
+
+
+def test_fit_recovers_the_metrics_behind_past_choices(criteria_config, make_catalog):
+    vendors = _catalog(make_catalog)
+    rng = random.Random(3)
+
+    def hidden(vendor):
+        scores = vendor.payload["scores"]
+        return 3 * scores["security_compliance"] + 2 * scores["service"] + scores["sales_core"]
+
+    decisions = []
+    for _ in range(400):
+        candidates = sorted(rng.sample(vendors, 4), key=hidden, reverse=True)
+        decisions.append(
+            Decision(chosen=candidates[0].slug, rejected=tuple(v.slug for v in candidates[1:]))
+        )
+    result = fit_weights(decisions, vendors, criteria_config, regularization=0.0)
+
+    assert sum(result.weights.values()) == 100
+    assert all(weight >= 0 for weight in result.weights.values())
+    top = sorted(result.weights, key=result.weights.get, reverse=True)[:3]
+    assert top == ["security_compliance", "service", "sales_core"]
+    assert result.pairs == 1200 and result.unique_pairs <= result.pairs
+    assert result.top1_accuracy > result.baseline_top1_accuracy
+    assert result.pairwise_accuracy > 0.9
+
+
+def test_regularization_and_unknown_vendors(criteria_config, make_catalog, sample_weights):
+    vendors = _catalog(make_catalog, count=4)
+    slugs = [vendor.slug for vendor in vendors]
+    decisions = [
+        Decision(chosen=slugs[0], rejected=(slugs[1],)),
+        Decision(chosen="missing", rejected=(slugs[1],)),
+    ]
+    anchored = fit_weights(decisions, vendors, criteria_config, regularization=1e6)
+    assert anchored.weights == criteria_config.weights
+    assert anchored.skipped == 1 and anchored.decisions == 1
+
+    # Pinned scores override the catalog for that decision only.
+    pinned = Decision(
+        chosen=slugs[1],
+        rejected=(slugs[0],),
+        scores={slugs[1]: {metric: 5 for metric in sample_weights}},
+    )
+    assert fit_weights([pinned], vendors, criteria_config).pairwise_accuracy == 1.0
+    with pytest.raises(ValueError):
+        fit_weights(decisions[1:], vendors, criteria_config)
+    with pytest.raises(ValueError):
+        fit_weights(decisions, vendors, criteria_config, temperature=0)
+
+
+def test_rounding_and_criteria_round_trip(criteria_config, tmp_path):
+    rounded = round_weights({"a": 33.4, "b": 33.3, "c": 33.3})
+    assert rounded == {"a": 34, "b": 33, "c": 33}
+    assert sum(round_weights({"a": 1.0, "b": 2.0, "c": 4.0}).values()) == 100
+
+    path = tmp_path / "fitted" / "criteria.yml"
+    write_criteria(path, criteria_config)
+    loaded = load_criteria(path)
+    assert loaded.weights == criteria_config.weights
+    assert loaded.scales == criteria_config.scales
+
+    nested = CriteriaConfig(
+        weights={"sales.pipeline": 30, "sales.quoting": 0, "service.cases": 0, "pricing": 70},
+        scales={},
+    )
+    write_criteria(path, nested)
+    reloaded = load_criteria(path)
+    assert reloaded.weights == nested.weights
+    assert set(reloaded.categories) == {"sales", "service"}
+
+
+def test_load_decisions_formats(tmp_path):
+    (tmp_path / "smb.yml").write_text("company_size: '10-50'\nregions: [EU, US]\n")
+    lines = [
+        {"profile": "smb.yml", "chosen": "alpha", "rejected": ["beta", "alpha"]},
+        {"profile": {"company_size": "500+"}, "chosen": "beta", "rejected": "alpha"},
+    ]
+    jsonl = tmp_path / "decisions.jsonl"
+    jsonl.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+    decisions = load_decisions(jsonl)
+    assert decisions[0].rejected == ("beta",)
+    assert decisions[0].matches({"company_size": "10-50", "regions": "EU"})
+    assert not decisions[1].matches({"company_size": "10-50"})
+
+    yaml_file = tmp_path / "decisions.yml"
+    yaml_file.write_text("decisions:\n  - chosen: alpha\n    rejected: [beta]\n")
+    assert load_decisions(yaml_file) == [Decision(chosen="alpha", rejected=("beta",))]
+    yaml_file.write_text("decisions:\n  - chosen: alpha\n")
+    with pytest.raises(DataLoadError):
+        load_decisions(yaml_file)
+    with pytest.raises(DataLoadError):
+        load_decisions(tmp_path / "missing.jsonl")
+
+
+def test_cli_fit_weights(sample_environment, tmp_path, capsys):
+    decisions = tmp_path / "decisions.jsonl"
+    decisions.write_text(
+        json.dumps({"profile": {"company_size": "50-100"}, "chosen": "beta", "rejected": ["alpha"]})
+        + "\n"
+    )
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    out = tmp_path / "fitted.yml"
+    args = ["fit-weights", str(decisions), "--match", "company_size=50-100", "--out", str(out)]
+    assert cli.main(root + args) == 0
+    assert "Fitted criteria saved" in capsys.readouterr().out
+    assert sum(load_criteria(out).weights.values()) == 100
+
+    with pytest.raises(SystemExit):
+        cli.main(root + ["fit-weights", str(decisions), "--match", "industry=retail", "--out", "x"])
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from crm_eval.fragments import FragmentCache
+from crm_eval.integrate import build_integration_notes
+from crm_eval.migration import build_migration_plan
+from crm_eval.report import render_markdown_scorecard
+from crm_eval.scoring import rank_vendors
+from crm_eval.security import build_security_checklist
+
+
+@pytest.fixture
+def ranked(criteria_config, make_vendor_record):
+    vendors = [make_vendor_record(name=name) for name in ("Alpha", "Beta", "Gamma")]
+    return rank_vendors(vendors, criteria_config)
+
+
+def test_cached_output_matches_uncached(ranked, criteria_config, tmp_path: Path):
+    profile = {"company_size": "10-50", "must_have": ["helpdesk"]}
+    cache = FragmentCache(tmp_path / "fragments")
+    builders = [
+        lambda **kw: build_security_checklist(ranked, **kw),
+        lambda **kw: build_integration_notes(profile, ranked, **kw),
+        lambda **kw: build_migration_plan(profile, ranked, **kw),
+        lambda **kw: render_markdown_scorecard(profile, ranked, criteria_config, **kw),
+    ]
+    for _ in range(2):
+        for build in builders:
+            assert build(fragments=cache) == build()
+    assert cache.misses == 12
+    assert cache.hits == 12
+
+
+def test_disk_layer_survives_new_instance(ranked, tmp_path: Path):
+    build_security_checklist(ranked, fragments=FragmentCache(tmp_path / "fragments"))
+    fresh = FragmentCache(tmp_path / "fragments")
+    build_security_checklist(ranked, fragments=fresh)
+    assert fresh.misses == 0 and fresh.hits == 3
+
+
+def test_lru_eviction_respects_cap(ranked, tmp_path: Path):
+    cache = FragmentCache(tmp_path / "fragments", max_entries=2)
+    build_security_checklist(ranked, fragments=cache)
+    assert len(cache) == 2
+    assert len(list((tmp_path / "fragments").glob("*.json"))) <= 2
+
+
+def test_score_change_invalidates(criteria_config, make_vendor_record):
+    cache = FragmentCache()
+    first = rank_vendors([make_vendor_record(name="Alpha")], criteria_config)
+    build_security_checklist(first, fragments=cache)
+    rescored = rank_vendors(
+        [make_vendor_record(name="Alpha", scores={"sales_core": 1})], criteria_config
+    )
+    build_security_checklist(rescored, fragments=cache)
+    assert cache.misses == 2
@@ -0,0 +1,101 @@
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+
+from crm_eval import cli
+from crm_eval.history import INDEX_NAME, HistoryStore
+from crm_eval.scoring import rank_vendors
+
+
+def _run(store, vendors, criteria, day: int, **kwargs):
+    moment = datetime(2026, 1, day, tzinfo=UTC)
+    return store.append(rank_vendors(vendors, criteria), criteria, timestamp=moment, **kwargs)
+
+
+def test_vendor_and_metric_series(tmp_path: Path, criteria_config, make_vendor_record):
+    store = HistoryStore(tmp_path / "history")
+    alpha = make_vendor_record(name="Alpha", scores={m: 4 for m in criteria_config.weights})
+    beta = make_vendor_record(name="Beta", scores={m: 3 for m in criteria_config.weights})
+    _run(store, [alpha, beta], criteria_config, 1, label="baseline")
+    improved = make_vendor_record(name="Beta", scores={m: 5 for m in criteria_config.weights})
+    _run(store, [alpha, improved], criteria_config, 2)
+
+    totals = store.vendor_series("beta")
+    assert [(p.run, p.rank, p.value) for p in totals] == [(1, 2, 60.0), (2, 1, 100.0)]
+    sales = store.vendor_series("beta", metric="sales_core", since="2026-01-02")
+    assert [(p.run, p.value) for p in sales] == [(2, 5.0)]
+    weights = store.metric_series("sales_core", until="2026-01-01")
+    assert [(p.run, p.weight, p.mean) for p in weights] == [(1, 15.0, 3.5)]
+
+    record = store.load_run(1)
+    assert record["label"] == "baseline"
+    assert [vendor["slug"] for vendor in record["vendors"]] == ["alpha", "beta"]
+
+
+def test_uncommitted_rows_are_ignored(tmp_path: Path, criteria_config, make_vendor_record):
+    store = HistoryStore(tmp_path / "history")
+    vendor = make_vendor_record(name="Alpha")
+    _run(store, [vendor], criteria_config, 1)
+    # Simulate an append that wrote its series rows but died before the index line.
+    index = store.root / INDEX_NAME
+    committed = index.read_text(encoding="utf-8")
+    _run(store, [vendor], criteria_config, 2)
+    index.write_text(committed + '{"run": 3, "torn', encoding="utf-8")
+    _run(store, [vendor], criteria_config, 3)
+
+    assert [point.timestamp[:10] for point in store.vendor_series("alpha")] == [
+        "2026-01-01",
+        "2026-01-03",
+    ]
+    assert [info.run for info in store.runs()] == [1, 2]
+
+
+def test_concurrent_appends_get_distinct_run_ids(
+    tmp_path: Path, criteria_config, make_vendor_record
+):
+    vendor = make_vendor_record(name="Alpha")
+    barrier = threading.Barrier(6)
+
+    def writer(day: int) -> None:
+        # Separate stores model separate scheduled jobs sharing one history directory.
+        store = HistoryStore(tmp_path / "history")
+        barrier.wait()
+        for offset in range(4):
+            _run(store, [vendor], criteria_config, day + offset)
+
+    threads = [threading.Thread(target=writer, args=(day,)) for day in range(1, 25, 4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store = HistoryStore(tmp_path / "history")
+    assert [info.run for info in store.runs()] == list(range(1, 25))
+    assert sorted(point.run for point in store.vendor_series("alpha")) == list(range(1, 25))
+    assert all(store.load_run(run)["run"] == run for run in range(1, 25))
+
+
+def test_cli_score_records_history(sample_environment, tmp_path: Path, capsys):
+    history = tmp_path / "history"
+    args = [
+        "--vendors-dir",
+        str(sample_environment["vendors"]),
+        "--criteria",
+        str(sample_environment["criteria"]),
+        "score",
+        "--profile",
+        str(sample_environment["profile"]),
+        "--out",
+        str(tmp_path / "s.json"),
+        "--md",
+        str(tmp_path / "s.md"),
+        "--history",
+        str(history),
+    ]
+    assert cli.main(args) == 0
+    assert cli.main(args) == 0
+    capsys.readouterr()
+    assert cli.main(["history", str(history), "--vendor", "alpha"]) == 0
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 3 and output[1].split()[0] == "1"
+    assert cli.main(["history", str(history), "--vendor", "unknown"]) == 1
@@ -0,0 +1,56 @@
+import pytest
+
+from crm_eval.matrix import ProfileAdjustments, ScoreMatrix
+from crm_eval.scoring import rank_vendors
+
+
+@pytest.fixture
+def catalog(criteria_config, make_vendor_record):
+    vendors = []
+    for index, name in enumerate(["Alpha", "Beta", "Gamma", "Delta", "Epsilon"]):
+        record = make_vendor_record(
+            name=name, scores={metric: 5 - index % 3 for metric in criteria_config.weights}
+        )
+        record.payload["capabilities"] = ["helpdesk"] if index % 2 else ["chat"]
+        record.payload["security"] = {"data_residency": ["EU"] if index == 0 else ["US"]}
+        vendors.append(record)
+    return vendors
+
+
+def test_empty_profile_matches_rank_vendors(catalog, criteria_config):
+    matrix = ScoreMatrix.from_vendors(catalog, criteria_config)
+    expected = rank_vendors(catalog, criteria_config)
+    evaluated = matrix.evaluate({})
+    assert [item.result.vendor.slug for item in evaluated] == [r.vendor.slug for r in expected]
+    assert [item.total for item in evaluated] == [r.total for r in expected]
+
+
+def test_overlay_applies_must_have_and_region(catalog, criteria_config):
+    matrix = ScoreMatrix.from_vendors(catalog, criteria_config)
+    evaluated = matrix.evaluate({"must_have": ["Helpdesk"], "regions": ["us"]})
+    by_slug = {item.result.vendor.slug: item for item in evaluated}
+    assert by_slug["alpha"].missing_must_haves == ("helpdesk",)
+    assert by_slug["alpha"].uncovered_regions == ("US",)
+    assert by_slug["alpha"].total == pytest.approx(by_slug["alpha"].result.total - 25)
+    assert by_slug["beta"].total == by_slug["beta"].result.total
+
+
+def test_top_k_matches_full_evaluation(catalog, criteria_config):
+    matrix = ScoreMatrix.from_vendors(catalog, criteria_config)
+    profiles = [{"must_have": ["chat"]}, {"must_have": ["helpdesk", "unknown"]}, {}]
+    adjustments = ProfileAdjustments(must_have_penalty=30)
+    full = matrix.evaluate_many(profiles, adjustments=adjustments)
+    top = matrix.evaluate_many(profiles, top=2, adjustments=adjustments)
+    for complete, truncated in zip(full, top, strict=True):
+        assert [item.as_dict() for item in truncated] == [item.as_dict() for item in complete[:2]]
+
+
+def test_overlay_aligned_with_results(catalog, criteria_config):
+    matrix = ScoreMatrix.from_vendors(catalog, criteria_config)
+    adjusted = matrix.overlay({"budget_per_user_per_month": 10})
+    assert list(adjusted) == list(matrix.totals)
+
+
+def test_negative_penalty_rejected():
+    with pytest.raises(ValueError):
+        ProfileAdjustments(region_penalty=-1)
@@ -0,0 +1,104 @@
+import json
+import os
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import CriteriaConfig
+from crm_eval.memo import (
+    ResultCache,
+    canonical_profile,
+    catalog_digest,
+    memo_key,
+    profile_hash,
+)
+
+
+def test_equivalent_profiles_share_a_canonical_form():
+    first = {
+        "regions": ["US", "eu"],
+        "must_have": ["Basic_Automation", " email_calendar_sync"],
+        "company_size": "50-100",
+        "budget_per_user_per_month": None,
+        "migration_records": {"accounts": 10, "contacts": 20},
+    }
+    second = {
+        "company_size": " 50-100",
+        "migration_records": {"accounts": 10, "contacts": 20},
+        "must_have": ["email_calendar_sync", "basic_automation", "EMAIL_CALENDAR_SYNC"],
+        "regions": ["EU", "US"],
+    }
+    canonical = canonical_profile(first)
+    assert canonical == canonical_profile(second)
+    assert list(canonical) == ["company_size", "migration_records", "must_have", "regions"]
+    assert canonical["must_have"] == ["basic_automation", "email_calendar_sync"]
+    assert profile_hash(first) == profile_hash(second)
+    assert canonical_profile({"regions": "us"})["regions"] == ["US"]
+
+    # Import order is significant, as is any other value.
+    reordered = {**second, "migration_records": {"contacts": 20, "accounts": 10}}
+    assert profile_hash(reordered) != profile_hash(second)
+    assert profile_hash({**second, "industry": "retail"}) != profile_hash(second)
+
+
+def test_memo_key_covers_criteria_catalog_and_options(criteria_config, sample_environment):
+    profile = {"company_size": "50-100"}
+    catalog = catalog_digest(sample_environment["vendors"])
+    key = memo_key(profile, criteria_config, catalog, {"top": 5})
+    assert key == memo_key(dict(profile), criteria_config, catalog, {"top": 5})
+    assert key != memo_key(profile, criteria_config, catalog, {"top": 3})
+    assert key != memo_key(profile, criteria_config, "other", {"top": 5})
+    reweighted = CriteriaConfig(
+        weights=dict(reversed(list(criteria_config.weights.items()))),
+        scales=criteria_config.scales,
+    )
+    assert key != memo_key(profile, reweighted, catalog, {"top": 5})
+
+    alpha = sample_environment["vendors"] / "alpha.yml"
+    alpha.write_text(alpha.read_text() + "\n")
+    assert catalog_digest(sample_environment["vendors"]) != catalog
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=1_200)
+    filler = "x" * 300
+    for stamp, key in enumerate(("a", "b", "c")):
+        cache.put(key, {"markdown": filler})
+        os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+    assert cache.get("a") == {"markdown": filler}
+    cache.put("d", {"markdown": filler})
+    assert cache.size() <= 1_080
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    (tmp_path / "e.json").write_text("{not json")
+    assert cache.get("e") is None
+    with pytest.raises(ValueError):
+        ResultCache(tmp_path, max_bytes=0)
+
+
+def test_cli_memo_serves_equivalent_profiles_from_cache(sample_environment, tmp_path, capsys):
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    root += ["--cache-dir", str(tmp_path / "cache")]
+    variant = tmp_path / "variant.yml"
+    variant.write_text("must_have: [EMAIL_CALENDAR_SYNC]\nregions: us\ncompany_size: '50-100'\n")
+
+    outputs = []
+    for index, profile in enumerate([sample_environment["profile"], variant, variant]):
+        out, md = tmp_path / f"card{index}.json", tmp_path / f"card{index}.md"
+        args = ["score", "--memo", "--profile", str(profile), "--out", str(out), "--md", str(md)]
+        assert cli.main(root + args) == 0
+        outputs.append((json.loads(out.read_text()), md.read_text()))
+        if index == 0:
+            # A changed vendor file must not be served from the cache.
+            beta = sample_environment["vendors"] / "beta.yml"
+            beta.write_text(beta.read_text().replace("Beta CRM", "Gamma CRM"))
+    assert outputs[1] == outputs[2]
+    assert "Gamma CRM" in outputs[1][1] and "Gamma CRM" not in outputs[0][1]
+    assert len(list((tmp_path / "cache" / "results").glob("*.json"))) == 2
+    assert "Top picks" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        cli.main(root + ["score", "--memo", "--stream", "--profile", str(variant)] + args[4:])
@@ -0,0 +1,131 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import CriteriaConfig, load_criteria
+from crm_eval.normalize import (
+    STATS_FILENAME,
+    CatalogStats,
+    MetricNormalizer,
+    load_or_build_stats,
+)
+from crm_eval.scoring import rank_vendors
+from crm_eval.session import EvaluationSession
+
+
+def test_catalog_stats_and_modes(make_vendor_record):
+    vendors = [make_vendor_record(f"V{i}", {"m": value}) for i, value in enumerate([1, 2, 2, 5])]
+    vendors.append(make_vendor_record("Odd", {"m": "n/a", "other": 7}))
+    stats = CatalogStats.from_vendors(vendors)
+
+    metric = stats.metrics["m"]
+    assert (metric.values, metric.counts) == ((1.0, 2.0, 5.0), (1, 2, 1))
+    assert metric.mean == 2.5
+    assert metric.percentile(2.0) == 0.5
+    assert stats.metrics["other"].values == (5.0,)
+
+    assert MetricNormalizer(stats, "minmax")("m", 1.0) == 0.0
+    assert MetricNormalizer(stats, "minmax")("m", 5.0) == 5.0
+    assert MetricNormalizer(stats, "zscore")("m", 2.5) == 2.5
+    assert MetricNormalizer(stats, "percentile")("m", 5.0) == pytest.approx(4.375)
+    assert MetricNormalizer(stats, "zscore")("other", 5.0) == 5.0
+    assert MetricNormalizer(stats, "minmax")("unknown", 3.0) == 3.0
+    with pytest.raises(ValueError):
+        MetricNormalizer(stats, "log")
+
+
+def test_minmax_rescales_a_compressed_metric(make_vendor_record):
+    criteria = CriteriaConfig(weights={"inflated": 60, "spread": 40}, scales={})
+    vendors = [
+        make_vendor_record("Leans Inflated", {"inflated": 5.0, "spread": 0.0}),
+        make_vendor_record("Leans Spread", {"inflated": 4.6, "spread": 5.0}),
+        make_vendor_record("Middle", {"inflated": 4.8, "spread": 2.5}),
+    ]
+    raw = rank_vendors(vendors, criteria)
+    assert raw[0].vendor.name == "Leans Spread"
+    assert raw[-1].vendor.name == "Leans Inflated"
+
+    normalizer = MetricNormalizer(CatalogStats.from_vendors(vendors), "minmax")
+    ranked = rank_vendors(vendors, criteria, normalizer=normalizer)
+    assert ranked[0].vendor.name == "Leans Inflated"
+    assert ranked[0].breakdown["inflated"] == {
+        "raw": 5.0,
+        "normalized": 5.0,
+        "weighted": 60.0,
+        "weight": 60.0,
+    }
+
+
+def test_hierarchical_leaves_normalize_like_flat_metrics(make_vendor_record, tmp_path: Path):
+    criteria_file = tmp_path / "nested.yml"
+    criteria_file.write_text(
+        "weights:\n"
+        "  sales_core: {weight: 50, metrics: {pipeline: 1, forecasting: 1}}\n"
+        "  service: 50\n",
+        encoding="utf-8",
+    )
+    criteria = load_criteria(criteria_file)
+    vendors = [
+        make_vendor_record("Low", {"sales_core": 1.0, "service": 1.0}),
+        make_vendor_record("High", {"sales_core": {"pipeline": 5.0}, "service": 5.0}),
+        make_vendor_record("Mid", {"sales_core": 3.0, "service": 3.0}),
+    ]
+    stats = CatalogStats.from_vendors(vendors, metrics=criteria.weights)
+    assert stats.metrics["sales_core.forecasting"].values == (1.0, 3.0)
+    assert stats.metrics["sales_core.pipeline"].values == (1.0, 3.0, 5.0)
+
+    ranked = rank_vendors(vendors, criteria, normalizer=MetricNormalizer(stats, "minmax"))
+    mid = next(result for result in ranked if result.vendor.name == "Mid")
+    assert mid.breakdown["sales_core.pipeline"]["normalized"] == 2.5
+    assert mid.breakdown["sales_core.forecasting"]["normalized"] == 5.0
+    assert mid.breakdown["service"]["normalized"] == 2.5
+
+
+def test_stats_are_cached_next_to_the_catalog(sample_environment, monkeypatch):
+    vendors_dir = Path(sample_environment["vendors"])
+    builds = []
+    original = CatalogStats.from_vendors.__func__
+
+    def counting(cls, vendors, **kwargs):
+        builds.append(1)
+        return original(cls, vendors, **kwargs)
+
+    monkeypatch.setattr(CatalogStats, "from_vendors", classmethod(counting))
+    first = load_or_build_stats(vendors_dir)
+    assert (vendors_dir / STATS_FILENAME).exists()
+    assert load_or_build_stats(vendors_dir) == first
+    assert len(builds) == 1
+
+    alpha = vendors_dir / "alpha.yml"
+    alpha.write_text(alpha.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+    assert load_or_build_stats(vendors_dir) == first
+    assert len(builds) == 2
+
+    nested = load_or_build_stats(vendors_dir, metrics=["sales_core.pipeline"])
+    assert nested.metrics["sales_core.pipeline"] == first.metrics["sales_core"]
+    assert load_or_build_stats(vendors_dir, metrics=["sales_core.pipeline"]) == nested
+    assert len(builds) == 3
+
+
+def test_cli_score_normalize_matches_session(sample_environment, tmp_path):
+    out = tmp_path / "scorecard.json"
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"]), "--normalize", "percentile"]
+    args = ["score", "--profile", str(sample_environment["profile"]), "--out", str(out)]
+    args += ["--md", str(tmp_path / "scorecard.md")]
+    assert cli.main(root + args) == 0
+
+    payload = json.loads(out.read_text(encoding="utf-8"))
+    session = EvaluationSession(
+        vendors_dir=sample_environment["vendors"],
+        criteria_path=sample_environment["criteria"],
+        normalization="percentile",
+    )
+    expected = json.loads(json.dumps(session.scorecard_payload(sample_environment["profile"])))
+    assert payload["normalization"] == "percentile"
+    assert payload == expected
+
+    with pytest.raises(SystemExit):
+        cli.main(root + args + ["--explain"])
@@ -0,0 +1,90 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from crm_eval.ratings import RatingsFetcher, blend_ratings
+
+
+@pytest.fixture
+def ratings_server():
+    state = {"requests": [], "fail_once": {"beta"}}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # noqa: N802 - http.server naming
+            slug = self.path.strip("/").removesuffix(".json")
+            state["requests"].append(slug)
+            if slug in state["fail_once"]:
+                state["fail_once"].discard(slug)
+                self._send(503, b"")
+                return
+            if slug == "missing":
+                self._send(404, b"")
+                return
+            etag = f'"{slug}-v1"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", etag=etag)
+                return
+            body = json.dumps({"scores": {"sales_core": 1, "service": 5}}).encode("utf-8")
+            self._send(200, body, etag=etag)
+
+        def _send(self, status, body, etag=None):
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield f"http://{host}:{port}/{{slug}}.json", state
+    server.shutdown()
+    server.server_close()
+
+
+def _fetcher(url: str, cache_dir: Path, ttl: float) -> RatingsFetcher:
+    return RatingsFetcher(url, cache_dir=cache_dir, ttl=ttl, per_host_rate=0, backoff=0.01)
+
+
+def test_fetch_retries_and_caches(ratings_server, make_vendor_record, tmp_path: Path):
+    url, state = ratings_server
+    vendors = [make_vendor_record(name=name) for name in ("Alpha", "Beta", "Missing")]
+
+    first = _fetcher(url, tmp_path / "cache", ttl=3600)
+    ratings = first.fetch(vendors)
+    assert set(ratings) == {"alpha", "beta"}
+    assert ratings["alpha"] == {"sales_core": 1.0, "service": 5.0}
+    assert first.stats.retries == 1 and first.stats.failures == 1
+
+    state["requests"].clear()
+    second = _fetcher(url, tmp_path / "cache", ttl=3600)
+    assert second.fetch(vendors) == ratings
+    assert state["requests"] == ["missing"]
+    assert second.stats.cache_hits == 2
+
+
+def test_fetch_revalidates_with_etag(ratings_server, make_vendor_record, tmp_path: Path):
+    url, _ = ratings_server
+    vendors = [make_vendor_record(name="Alpha")]
+    _fetcher(url, tmp_path / "cache", ttl=0).fetch(vendors)
+
+    stale = _fetcher(url, tmp_path / "cache", ttl=0)
+    assert stale.fetch(vendors)["alpha"]["service"] == 5.0
+    assert stale.stats.revalidated == 1
+
+
+def test_blend_ratings_mixes_scores(make_vendor_record):
+    vendor = make_vendor_record(name="Alpha", scores={"sales_core": 5})
+    blended = blend_ratings([vendor], {"alpha": {"sales_core": 1.0, "service": 3.0}}, weight=0.5)
+    assert blended[0].get_scores() == {"sales_core": 3.0, "service": 3.0}
+    assert vendor.get_scores() == {"sales_core": 5}
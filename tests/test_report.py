@@ -1,4 +1,18 @@
-from crm_eval.report import build_scorecard_payload, render_markdown_scorecard
+import json
+from pathlib import Path
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import CriteriaConfig, DataLoadError
+from crm_eval.report import (
+    SLIM_SCHEMA_VERSION,
+    build_scorecard_payload,
+    build_slim_scorecard_payload,
+    inflate_scorecard_payload,
+    load_scorecard_payload,
+    render_markdown_scorecard,
+)
 from crm_eval.scoring import rank_vendors
 
 
@@ -24,3 +38,75 @@ def test_render_markdown_contains_table(criteria_config, make_vendor_record):
     markdown = render_markdown_scorecard(profile, results, criteria_config, shortlist_size=2)
     assert "| Rank | Vendor |" in markdown
     assert "## Profile Snapshot" in markdown
+
+
+def test_slim_payload_inflates_to_v1(criteria_config, make_vendor_record):
+    results = _make_results(criteria_config, make_vendor_record)
+    profile = {"company_size": "50-100", "regions": ["US"]}
+    full = build_scorecard_payload(profile, results, criteria_config, shortlist_size=1)
+    slim = build_slim_scorecard_payload(profile, results, criteria_config, shortlist_size=1)
+
+    assert slim["schema"] == SLIM_SCHEMA_VERSION
+    assert slim["shortlist"] == [full["shortlist"][0]["slug"]]
+    assert len(slim["vendors"][0]["raw"]) == len(slim["metrics"])
+    assert "capabilities" not in slim["vendors"][0]
+    round_trip = json.loads(json.dumps(slim, sort_keys=True))
+    assert inflate_scorecard_payload(round_trip) == json.loads(json.dumps(full))
+
+
+def test_hierarchical_criteria_roll_up_by_category(make_vendor_record):
+    criteria = CriteriaConfig(
+        weights={"sales_core.pipeline": 30.0, "sales_core.quoting": 20.0, "service": 50},
+        scales={},
+        categories={"sales_core": ("sales_core.pipeline", "sales_core.quoting")},
+    )
+    vendors = [
+        make_vendor_record("Prime CRM", {"sales_core": {"pipeline": 5, "quoting": 0}}),
+        make_vendor_record("Second CRM", {"sales_core": 2, "service": 5}),
+    ]
+    results = rank_vendors(vendors, criteria)
+    full = build_scorecard_payload({}, results, criteria)
+    assert full["categories"] == {"sales_core": ["sales_core.pipeline", "sales_core.quoting"]}
+    second = full["vendors"][0]
+    assert second["name"] == "Second CRM"
+    assert second["category_scores"] == {"sales_core": 20.0, "service": 50.0}
+
+    slim = build_slim_scorecard_payload({}, results, criteria)
+    round_trip = json.loads(json.dumps(slim, sort_keys=True))
+    assert inflate_scorecard_payload(round_trip) == json.loads(json.dumps(full))
+
+    markdown = render_markdown_scorecard({}, results, criteria)
+    assert "## Category Scores" in markdown
+    assert "| Second CRM | 20.00 | 50.00 |" in markdown
+
+
+def test_slim_payload_rejects_duplicate_slugs(criteria_config, make_vendor_record):
+    vendor = make_vendor_record(name="Prime CRM")
+    results = rank_vendors([vendor, vendor], criteria_config)
+    with pytest.raises(ValueError):
+        build_slim_scorecard_payload({}, results, criteria_config)
+
+
+def test_cli_slim_scorecard_with_external_catalog(sample_environment, tmp_path: Path):
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    outputs = {}
+    for mode, extra in (("full", []), ("slim", ["--slim", "--catalog-out"])):
+        out = tmp_path / mode / "scorecard.json"
+        args = ["score", "--profile", str(sample_environment["profile"]), "--out", str(out)]
+        args += ["--md", str(tmp_path / mode / "scorecard.md")]
+        if extra:
+            args += [*extra, str(tmp_path / "shared" / "catalog.json")]
+        assert cli.main(root + args) == 0
+        outputs[mode] = out
+
+    slim = json.loads(outputs["slim"].read_text(encoding="utf-8"))
+    assert slim["catalog_file"] == "../shared/catalog.json"
+    assert "catalog" not in slim
+    full = json.loads(outputs["full"].read_text(encoding="utf-8"))
+    assert load_scorecard_payload(outputs["slim"]) == full
+    assert load_scorecard_payload(outputs["full"]) == full
+
+    (tmp_path / "shared" / "catalog.json").unlink()
+    with pytest.raises(DataLoadError):
+        load_scorecard_payload(outputs["slim"])
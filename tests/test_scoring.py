@@ -1,6 +1,6 @@
 import pytest
 
-from crm_eval.scoring import DEFAULT_MISSING_SCORE, rank_vendors, score_vendor
+from crm_eval.scoring import DEFAULT_MISSING_SCORE, rank_vendors, score_vendor, top_vendors
 
 
 def test_score_vendor_defaults_missing(criteria_config, make_vendor_record):
@@ -50,3 +50,20 @@ def test_score_result_as_dict(criteria_config, make_vendor_record):
     result = score_vendor(make_vendor_record(), criteria_config.weights)
     exported = result.as_dict()
     assert exported["vendor"]["name"] == result.vendor.name
+
+
+def test_top_vendors_matches_rank_vendors_prefix(criteria_config, make_vendor_record):
+    vendors = [
+        make_vendor_record(name=f"Vendor {index}", scores={"sales_core": index % 4})
+        for index in range(12)
+    ]
+
+    def budget(vendor):
+        return None if vendor.name == "Vendor 3" else 0.5 * (vendor.name == "Vendor 7")
+
+    ranked = rank_vendors(vendors, criteria_config, budget=budget)
+    top = top_vendors(iter(vendors), criteria_config, 5, budget=budget)
+    assert top == ranked[:5]
+    assert len(top_vendors(iter(vendors), criteria_config, 50)) == 12
+    with pytest.raises(ValueError):
+        top_vendors(vendors, criteria_config, 0)
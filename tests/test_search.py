@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from crm_eval import cli
+from crm_eval.data import DEFAULT_VENDORS_DIR, load_vendors
+from crm_eval.search import INDEX_FILENAME, TrigramIndex, load_or_build_index
+
+
+def test_fuzzy_queries_against_catalog():
+    index = TrigramIndex.build(load_vendors(DEFAULT_VENDORS_DIR))
+    assert index.search("zoho")[0].slug == "zoho"
+    assert index.search("dyn 365")[0].slug == "dynamics365"
+    helpdesk = index.search("helpdesk", limit=20)
+    assert helpdesk and all(hit.field == "capabilities" for hit in helpdesk)
+    assert index.search("qqqqzz") == []
+
+
+def test_index_persists_and_refreshes(sample_environment):
+    vendors_dir: Path = sample_environment["vendors"]
+    index = load_or_build_index(vendors_dir)
+    assert (vendors_dir / INDEX_FILENAME).exists()
+    assert index.search("alpha")[0].slug == "alpha"
+
+    (vendors_dir / "gamma.yml").write_text("name: Gamma Sales Cloud\n", encoding="utf-8")
+    assert load_or_build_index(vendors_dir, verify=False).search("gamma") == []
+    assert load_or_build_index(vendors_dir).search("gamma")[0].slug == "gamma"
+
+
+def test_round_trip_preserves_results(sample_environment, tmp_path: Path):
+    index = TrigramIndex.build(load_vendors(sample_environment["vendors"]))
+    index.save(tmp_path / "index.idx", fingerprint="abc")
+    loaded, fingerprint = TrigramIndex.load(tmp_path / "index.idx")
+    assert fingerprint == "abc"
+    assert loaded.search("beta crm") == index.search("beta crm")
+
+
+def test_cli_search(sample_environment, capsys):
+    exit_code = cli.main(["--vendors-dir", str(sample_environment["vendors"]), "search", "alfa"])
+    assert exit_code == 0
+    assert "Alpha CRM" in capsys.readouterr().out
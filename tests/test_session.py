@@ -0,0 +1,166 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from crm_eval.data import DataLoadError, load_criteria, load_profile, load_vendors
+from crm_eval.matrix import ScoreMatrix
+from crm_eval.migration import build_migration_plan
+from crm_eval.report import build_scorecard_payload, render_markdown_scorecard
+from crm_eval.scoring import rank_vendors
+from crm_eval.security import build_security_checklist
+from crm_eval.session import EvaluationSession
+
+
+@pytest.fixture
+def session(sample_environment) -> EvaluationSession:
+    return EvaluationSession(
+        vendors_dir=sample_environment["vendors"],
+        criteria_path=sample_environment["criteria"],
+    )
+
+
+def test_session_outputs_match_stateless_functions(session, sample_environment) -> None:
+    profile = load_profile(sample_environment["profile"])
+    criteria = load_criteria(sample_environment["criteria"])
+    results = rank_vendors(load_vendors(sample_environment["vendors"]), criteria)
+
+    assert session.scorecard_payload(sample_environment["profile"], top=1) == (
+        build_scorecard_payload(profile, results, criteria, shortlist_size=1)
+    )
+    assert session.scorecard_markdown(profile, top=1) == render_markdown_scorecard(
+        profile, results, criteria, shortlist_size=1
+    )
+    assert session.migration_plan(profile) == build_migration_plan(profile, results)
+    assert session.security_checklist() == build_security_checklist(results)
+    assert [result.vendor.slug for result in session.shortlist(1)] == ["alpha"]
+
+
+def test_session_memoizes_until_invalidated(session, sample_environment) -> None:
+    first = session.scorecard_payload(sample_environment["profile"])
+    assert session.scorecard_payload(sample_environment["profile"]) is first
+    assert session.results() is session.results()
+
+    beta = Path(sample_environment["vendors"]) / "beta.yml"
+    beta.write_text(beta.read_text(encoding="utf-8").replace("Beta", "Gamma"), encoding="utf-8")
+    assert session.scorecard_payload(sample_environment["profile"]) is first
+
+    session.invalidate(criteria=False)
+    refreshed = session.scorecard_payload(sample_environment["profile"])
+    assert refreshed is not first
+    assert "Gamma CRM" in {vendor["name"] for vendor in refreshed["vendors"]}
+
+
+def test_set_criteria_drops_derived_results(session, make_vendor_record) -> None:
+    criteria = session.criteria
+    session.set_vendors(
+        [
+            make_vendor_record("Low", {metric: 1 for metric in criteria.weights}),
+            make_vendor_record("High", {metric: 5 for metric in criteria.weights}),
+        ]
+    )
+    ranked = session.results()
+    assert [result.vendor.name for result in ranked] == ["High", "Low"]
+
+    session.set_criteria(criteria)
+    assert session.results() is not ranked
+    assert session.criteria is criteria
+
+
+def test_concurrent_readers_share_one_computation(session, sample_environment, monkeypatch):
+    import crm_eval.session as session_module
+
+    calls = []
+    original = session_module.rank_vendors
+
+    def counting_rank(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(session_module, "rank_vendors", counting_rank)
+    barrier = threading.Barrier(8)
+    outputs: list[str] = []
+
+    def reader() -> None:
+        barrier.wait()
+        outputs.append(session.scorecard_markdown(sample_environment["profile"]))
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(outputs) == 8
+    assert all(output is outputs[0] for output in outputs)
+
+
+def test_callers_after_invalidation_do_not_join_stale_work(session, monkeypatch):
+    import crm_eval.session as session_module
+
+    started, release = threading.Event(), threading.Event()
+    original = session_module.rank_vendors
+
+    def slow_first_rank(vendors, *args, **kwargs):
+        if not started.is_set():
+            started.set()
+            release.wait(timeout=5)
+        return original(vendors, *args, **kwargs)
+
+    monkeypatch.setattr(session_module, "rank_vendors", slow_first_rank)
+    vendors = session.vendors
+    stale: list[int] = []
+    thread = threading.Thread(target=lambda: stale.append(len(session.results())))
+    thread.start()
+    assert started.wait(timeout=5)
+
+    session.set_vendors(vendors[:1])
+    assert len(session.results()) == 1
+    release.set()
+    thread.join()
+    assert stale == [2]
+    assert len(session.results()) == 1
+
+
+def test_failed_computation_is_not_cached(sample_environment, tmp_path: Path) -> None:
+    vendors_dir = tmp_path / "empty"
+    vendors_dir.mkdir()
+    session = EvaluationSession(
+        vendors_dir=vendors_dir, criteria_path=sample_environment["criteria"]
+    )
+    with pytest.raises(DataLoadError):
+        session.results()
+
+    source = Path(sample_environment["vendors"]) / "alpha.yml"
+    (vendors_dir / "alpha.yml").write_text(source.read_text(encoding="utf-8"), encoding="utf-8")
+    assert [result.vendor.slug for result in session.results()] == ["alpha"]
+
+
+def test_equivalent_profiles_share_session_entries(session) -> None:
+    first = session.scorecard_payload({"regions": ["US", "EU"], "must_have": ["Helpdesk"]})
+    second = session.scorecard_payload({"must_have": ["helpdesk"], "regions": ["eu", "us"]})
+    assert second is first
+    assert first["profile"] == {"must_have": ["helpdesk"], "regions": ["EU", "US"]}
+
+
+def test_recently_read_entries_survive_eviction(sample_environment) -> None:
+    session = EvaluationSession(
+        vendors_dir=sample_environment["vendors"],
+        criteria_path=sample_environment["criteria"],
+        max_entries=3,
+    )
+    first = session.scorecard_payload({"regions": ["US"]})
+    second = session.scorecard_payload({"regions": ["EU"]})
+    assert session.scorecard_payload({"regions": ["US"]}) is first
+    session.scorecard_payload({"regions": ["APAC"]})
+    assert session.scorecard_payload({"regions": ["US"]}) is first
+    assert session.scorecard_payload({"regions": ["EU"]}) is not second
+
+
+def test_profile_ranking_overlays_the_shared_matrix(session) -> None:
+    profile = {"must_have": ["Helpdesk"], "regions": ["us"]}
+    expected = ScoreMatrix(session.results(), session.criteria).evaluate(profile, top=2)
+    ranking = session.profile_ranking(profile, top=2)
+    assert [score.as_dict() for score in ranking] == [score.as_dict() for score in expected]
+    assert session.profile_ranking({"regions": ["US"], "must_have": ["helpdesk"]}, top=2) is ranking
@@ -0,0 +1,83 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import (
+    DEFAULT_VENDORS_DIR,
+    DataLoadError,
+    load_criteria,
+    load_vendors,
+    resolve_vendor_files,
+)
+from crm_eval.scoring import rank_vendors
+from crm_eval.shard import merge_partials, score_shard, select_shard
+
+
+def _partials(tmp_path: Path, criteria, *, shards: int, mode: str) -> list[Path]:
+    paths = resolve_vendor_files(DEFAULT_VENDORS_DIR)
+    outputs = []
+    for shard in range(shards):
+        out = tmp_path / f"part-{shard}.jsonl"
+        score_shard(paths, criteria, out, shard=shard, shards=shards, mode=mode)
+        outputs.append(out)
+    return outputs
+
+
+@pytest.mark.parametrize("mode", ["hash", "range"])
+def test_merge_matches_rank_vendors(tmp_path: Path, mode):
+    criteria = load_criteria()
+    expected = rank_vendors(load_vendors(DEFAULT_VENDORS_DIR), criteria)
+    merged = merge_partials(list(reversed(_partials(tmp_path, criteria, shards=3, mode=mode))))
+    assert [r.vendor.slug for r in merged] == [r.vendor.slug for r in expected]
+    assert [r.total for r in merged] == [r.total for r in expected]
+    assert merged[0].breakdown == expected[0].breakdown
+
+
+def test_shards_partition_the_catalog():
+    paths = resolve_vendor_files(DEFAULT_VENDORS_DIR)
+    for mode in ("hash", "range"):
+        chosen = [select_shard(paths, shard=i, shards=4, mode=mode) for i in range(4)]
+        assert sorted(position for part in chosen for position, _ in part) == list(
+            range(len(paths))
+        )
+    with pytest.raises(ValueError):
+        select_shard(paths, shard=4, shards=4)
+
+
+def test_merge_rejects_incomplete_or_mismatched(tmp_path: Path):
+    criteria = load_criteria()
+    partials = _partials(tmp_path, criteria, shards=2, mode="hash")
+    with pytest.raises(DataLoadError, match="missing 1"):
+        merge_partials(partials[:1])
+    with pytest.raises(DataLoadError, match="duplicated 0"):
+        merge_partials([partials[0], partials[0], partials[1]])
+    other = type(criteria)(weights={**criteria.weights}, scales={})
+    with pytest.raises(DataLoadError):
+        merge_partials(partials, other)
+
+
+def test_cli_shard_and_merge(sample_environment, tmp_path: Path):
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    parts = []
+    for index in range(2):
+        part = tmp_path / f"shard-{index}.jsonl"
+        args = ["shard", "--index", str(index), "--count", "2", "--out", str(part)]
+        assert cli.main(root + args) == 0
+        parts.append(str(part))
+
+    outputs = {}
+    for command in (["merge", *parts], ["score"]):
+        out = tmp_path / f"{command[0]}.json"
+        md = tmp_path / f"{command[0]}.md"
+        args = ["--profile", str(sample_environment["profile"]), "--out", str(out), "--md", str(md)]
+        assert cli.main(root + command + args) == 0
+        outputs[command[0]] = (json.loads(out.read_text()), md.read_text())
+    assert outputs["merge"] == outputs["score"]
+
+    with pytest.raises(SystemExit):
+        cli.main(
+            [*root, "--dedupe", "merge", *parts, "--profile", str(sample_environment["profile"])]
+        )
@@ -0,0 +1,110 @@
+import json
+import math
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.report import (
+    build_scorecard_payload,
+    build_slim_scorecard_payload,
+    inflate_scorecard_payload,
+)
+from crm_eval.scoring import rank_vendors
+from crm_eval.similar import SimilarityIndex, shortlist_alternatives, vendor_features
+
+
+def _catalog(make_catalog, count=40):
+    def score(index, position):
+        return (index * 7 + position * 3) % 6 * 0.9 + (index % 3) * 0.1
+
+    vendors = make_catalog(count, score)
+    for index, record in enumerate(vendors):
+        record.payload["capabilities"] = [f"cap_{index % 5}", f"cap_{index % 7}"]
+        record.payload["integrations"] = {"apis": ["REST"], "webhooks": index % 2 == 0}
+    return vendors
+
+
+def _brute_force(results, criteria, feature_weight, a, b):
+    def centred(index):
+        return [
+            results[index].breakdown[metric]["weighted"]
+            - sum(r.breakdown[metric]["weighted"] for r in results) / len(results)
+            for metric in criteria.weights
+        ]
+
+    left, right = centred(a), centred(b)
+    dot = sum(x * y for x, y in zip(left, right, strict=True))
+    norms = math.sqrt(sum(x * x for x in left)) * math.sqrt(sum(y * y for y in right))
+    features_a = vendor_features(results[a].vendor)
+    features_b = vendor_features(results[b].vendor)
+    shared = len(features_a & features_b) / math.sqrt(len(features_a) * len(features_b))
+    return (1 - feature_weight) * (dot / norms if norms else 0.0) + feature_weight * shared
+
+
+def test_exact_query_matches_brute_force(criteria_config, make_catalog):
+    results = rank_vendors(_catalog(make_catalog), criteria_config)
+    index = SimilarityIndex(results, criteria_config, feature_weight=0.4)
+
+    slug = results[3].vendor.slug
+    matches = index.query(slug, 5)
+    expected = sorted(
+        (other for other in range(len(results)) if other != 3),
+        key=lambda other: -_brute_force(results, criteria_config, 0.4, 3, other),
+    )
+    assert [match.rank - 1 for match in matches] == expected[:5]
+    for match in matches:
+        assert match.similarity == pytest.approx(
+            _brute_force(results, criteria_config, 0.4, 3, match.rank - 1), abs=1e-5
+        )
+    assert slug not in {match.slug for match in matches}
+
+
+def test_approximate_query_reranks_exactly(criteria_config, make_catalog):
+    results = rank_vendors(_catalog(make_catalog), criteria_config)
+    index = SimilarityIndex(results, criteria_config)
+
+    for result in results[:10]:
+        exact = {match.slug: match.similarity for match in index.query(result.vendor.slug, 3)}
+        for match in index.query(result.vendor.slug, 3, approximate=True):
+            assert match.slug != result.vendor.slug
+            if match.slug in exact:
+                assert match.similarity == pytest.approx(exact[match.slug], abs=1e-5)
+    with pytest.raises(ValueError):
+        index.query("missing", 3)
+
+
+def test_alternatives_section_skips_the_shortlist(criteria_config, make_catalog):
+    results = rank_vendors(_catalog(make_catalog), criteria_config)
+    alternatives = shortlist_alternatives(
+        SimilarityIndex(results, criteria_config), results[:3], k=2
+    )
+    shortlisted = {result.vendor.slug for result in results[:3]}
+    assert list(alternatives) == [result.vendor.slug for result in results[:3]]
+    assert all(
+        len(matches) == 2 and not {match.slug for match in matches} & shortlisted
+        for matches in alternatives.values()
+    )
+
+    payload = build_scorecard_payload(
+        {}, results, criteria_config, shortlist_size=3, alternatives=alternatives
+    )
+    slim = build_slim_scorecard_payload(
+        {}, results, criteria_config, shortlist_size=3, alternatives=alternatives
+    )
+    assert payload["alternatives"][results[0].vendor.slug][0]["rank"] > 3
+    assert inflate_scorecard_payload(slim) == payload
+
+
+def test_cli_similar_and_score_alternatives(sample_environment, tmp_path, capsys):
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    out = tmp_path / "similar.json"
+    assert cli.main(root + ["similar", "alpha", "--out", str(out)]) == 0
+    assert "beta" in capsys.readouterr().out
+    assert json.loads(out.read_text())["matches"]["alpha"][0]["slug"] == "beta"
+
+    card = tmp_path / "card.json"
+    args = ["score", "--profile", str(sample_environment["profile"]), "--top", "1"]
+    args += ["--out", str(card), "--md", str(tmp_path / "card.md"), "--alternatives", "1"]
+    assert cli.main(root + args) == 0
+    assert json.loads(card.read_text())["alternatives"]["alpha"][0]["slug"] == "beta"
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import DataLoadError
+from crm_eval.migration import build_migration_plan
+from crm_eval.scoring import rank_vendors
+from crm_eval.simulate import (
+    BULK_LIMITS,
+    REST_LIMITS,
+    ImportLimits,
+    estimate_catalog,
+    migration_volumes,
+    simulate_import,
+    vendor_limits,
+)
+
+VOLUMES = {"accounts": 20_000, "contacts": 80_000}
+
+
+def _limits(**overrides):
+    base = {
+        "bulk_api": False,
+        "batch_size": 10,
+        "concurrency": 10,
+        "requests_per_minute": 60,
+        "batch_overhead_seconds": 1.0,
+        "seconds_per_record": 0.0,
+        "failure_rate": 0.0,
+    }
+    return ImportLimits(**{**base, **overrides})
+
+
+def test_rate_limit_and_concurrency_bound_the_import():
+    # One request start per second: ten batches start at 0..9 and the last ends at 10.
+    rate_bound = simulate_import({"contacts": 100}, _limits())
+    assert rate_bound.batches == rate_bound.requests == 10
+    assert rate_bound.seconds == pytest.approx(10.0)
+
+    # Two workers and a loose rate limit: five rounds of one-second batches.
+    worker_bound = simulate_import(
+        {"contacts": 95}, _limits(concurrency=2, requests_per_minute=60_000)
+    )
+    assert worker_bound.batches == 10
+    assert worker_bound.seconds == pytest.approx(5.0, abs=0.01)
+
+    # Objects run one after another.
+    phased = simulate_import({"accounts": 50, "contacts": 50}, _limits())
+    assert list(phased.objects) == ["accounts", "contacts"]
+    assert sum(phased.objects.values()) == pytest.approx(phased.seconds)
+
+
+def test_failed_batches_are_retried_then_given_up():
+    limits = _limits(failure_rate=0.5, max_attempts=2, backoff_seconds=1.0)
+    first = simulate_import({"contacts": 1_000}, limits, seed=3)
+    assert first.retries > 0 and first.failed_records > 0
+    assert first.requests == first.batches + first.retries
+    assert first.failed_records % 10 == 0
+    assert simulate_import({"contacts": 1_000}, limits, seed=3) == first
+    clean = simulate_import({"contacts": 1_000}, _limits())
+    assert clean.seconds < first.seconds
+
+
+def test_vendor_limits_defaults_and_overrides(make_vendor_record):
+    bulk = make_vendor_record("Bulk CRM")
+    bulk.payload["data"] = {"bulk_api": True, "import_limits": {"requests_per_minute": 10}}
+    assert vendor_limits(bulk).requests_per_minute == 10
+    assert vendor_limits(bulk).batch_size == BULK_LIMITS.batch_size
+    assert vendor_limits(make_vendor_record("Rest CRM")) == REST_LIMITS
+
+    for overrides in ({"batch_size": 0}, {"rate": 5}, {"concurrency": "many"}, [1]):
+        broken = make_vendor_record("Broken CRM")
+        broken.payload["data"] = {"bulk_api": True, "import_limits": overrides}
+        with pytest.raises(DataLoadError):
+            vendor_limits(broken)
+
+
+def test_catalog_estimates_rank_bulk_vendors_first(make_vendor_record):
+    vendors = [make_vendor_record(f"Vendor {index}") for index in range(6)]
+    for vendor in vendors[::2]:
+        vendor.payload["data"] = {"bulk_api": True}
+    estimates = estimate_catalog(vendors, VOLUMES)
+    assert [estimate.limits.bulk_api for estimate in estimates] == [True] * 3 + [False] * 3
+    assert estimates[0].seconds < estimates[-1].seconds
+    assert estimates[0].records == 100_000
+    assert estimates[-1].as_dict()["objects"].keys() == VOLUMES.keys()
+
+    assert migration_volumes({}) == {}
+    assert migration_volumes({"migration_records": {"deals": "12"}}) == {"deals": 12}
+    for bad in ({"deals": -1}, {"deals": True}, {"deals": "lots"}, ["deals"]):
+        with pytest.raises(ValueError):
+            migration_volumes({"migration_records": bad})
+
+
+def test_migration_plan_and_cli_estimates(
+    criteria_config, make_vendor_record, sample_environment, tmp_path
+):
+    results = rank_vendors([make_vendor_record("Prime CRM")], criteria_config)
+    plan = build_migration_plan({"migration_records": VOLUMES}, results)
+    assert "## Estimated Cutover Windows" in plan
+    assert "| Prime CRM | REST API | 1,000 |" in plan
+    assert "Estimated Cutover Windows" not in build_migration_plan({}, results)
+
+    profile = tmp_path / "volumes.yml"
+    profile.write_text("company_size: '10-50'\nmigration_records:\n  contacts: 5000\n")
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    out = tmp_path / "estimates.json"
+    args = ["migrate", "--profile", str(profile), "--out", str(tmp_path / "plan.md")]
+    assert cli.main(root + args + ["--estimates-out", str(out)]) == 0
+    document = json.loads(out.read_text())
+    assert document["records"] == {"contacts": 5000}
+    assert len(document["estimates"]) == 2
+
+    args[2] = str(sample_environment["profile"])
+    with pytest.raises(SystemExit):
+        cli.main(root + args + ["--estimates-out", str(out)])
@@ -0,0 +1,137 @@
+import json
+import math
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import DataLoadError
+from crm_eval.matrix import vendor_entry_price
+from crm_eval.scoring import rank_vendors
+from crm_eval.tco import (
+    BudgetPolicy,
+    TcoEngine,
+    TcoScenario,
+    scenario_from_profile,
+    scenario_grid,
+    vendor_pricing,
+    vendor_tco,
+)
+
+
+def _priced(make_vendor_record, name, starter, pro, *, min_seats=1, fee=0, scores=None):
+    record = make_vendor_record(name, scores)
+    record.payload["plan_names"] = ["Starter", "Pro"]
+    record.payload["pricing_tco"] = {
+        "tiers": {
+            "Pro": {"per_user_per_month": pro, "min_seats": min_seats},
+            "Starter": {"per_user_per_month": starter, "platform_fee_per_month": fee},
+        },
+        "add_ons": {"ai": {"per_user_per_month": 5, "per_month": 20}},
+    }
+    return record
+
+
+def test_pricing_tiers_are_read_and_validated(make_vendor_record):
+    vendor = _priced(make_vendor_record, "Alpha", 20, 45, min_seats=10, fee=50)
+    pricing = vendor_pricing(vendor)
+    assert [tier.plan for tier in pricing.tiers] == ["Starter", "Pro"]
+    assert pricing.tier("top").min_seats == 10
+    assert pricing.tier("starter").platform_fee_per_month == 50
+    assert vendor_entry_price(vendor) == 20
+    assert vendor_pricing(make_vendor_record("Plain")) is None
+
+    vendor.payload["pricing_tco"]["tiers"]["Ultimate"] = {"per_user_per_month": 99}
+    with pytest.raises(DataLoadError):
+        vendor_pricing(vendor)
+    vendor.payload["pricing_tco"]["tiers"] = {"Pro": {"per_user_per_month": "call us"}}
+    with pytest.raises(DataLoadError):
+        vendor_pricing(vendor)
+
+
+def test_engine_matches_per_vendor_projection(make_vendor_record):
+    vendors = [
+        _priced(make_vendor_record, f"Vendor {i}", 10 + i, 30 + 3 * i, min_seats=i * 4, fee=i * 10)
+        for i in range(8)
+    ]
+    vendors.append(make_vendor_record("Unpriced"))
+    engine = TcoEngine(vendors)
+    scenarios = scenario_grid(
+        [1, 5, 12, 40],
+        plans=["entry", "top", "Pro", "Missing"],
+        growth=[-0.3, 0.0, 0.25],
+        years=[1, 3, 5],
+    )
+    scenarios.append(TcoScenario(seats=6, plan="top", add_ons=("ai",)))
+    scenarios.append(TcoScenario(seats=6, add_ons=("unknown",)))
+
+    for scenario, row in zip(scenarios, engine.project_many(scenarios), strict=True):
+        for vendor, cost in zip(vendors, row, strict=True):
+            expected = vendor_tco(vendor, scenario)
+            if expected is None:
+                assert math.isnan(cost)
+            else:
+                assert cost == pytest.approx(expected)
+    assert engine.priced == 8
+    # Three seats on a twelve-seat minimum are billed as twelve for every year.
+    assert vendor_tco(vendors[3], TcoScenario(seats=3, years=2, plan="top")) == 12 * 2 * 12 * 39
+
+
+def test_budget_policy_penalizes_or_filters(criteria_config, make_vendor_record):
+    cheap = _priced(make_vendor_record, "Cheap", 20, 40, scores={"sales_core": 3})
+    pricey = _priced(make_vendor_record, "Pricey", 45, 90, scores={"sales_core": 5})
+    unpriced = make_vendor_record("Unpriced", {"sales_core": 4})
+    vendors = [cheap, pricey, unpriced]
+    profile = {"budget_per_user_per_month": 30, "company_size": "10-50"}
+
+    baseline = {r.vendor.slug: r for r in rank_vendors(vendors, criteria_config)}
+    penalized = rank_vendors(
+        vendors, criteria_config, budget=BudgetPolicy.from_profile(profile, penalty=10)
+    )
+    by_slug = {result.vendor.slug: result for result in penalized}
+    assert by_slug["pricey"].budget_penalty == pytest.approx(5.0)
+    assert by_slug["pricey"].total == pytest.approx(baseline["pricey"].total - 5.0)
+    assert by_slug["pricey"].as_dict()["budget_penalty"] == 5.0
+    assert by_slug["cheap"].total == baseline["cheap"].total
+    assert by_slug["unpriced"].budget_penalty == 0.0
+
+    filtered = rank_vendors(
+        vendors, criteria_config, budget=BudgetPolicy.from_profile(profile, mode="filter")
+    )
+    assert {result.vendor.slug for result in filtered} == {"cheap", "unpriced"}
+
+
+def test_scenario_from_profile():
+    scenario = scenario_from_profile(
+        {"company_size": "50-100", "seat_growth": 0.5, "tco_years": 3, "plan": "top"}
+    )
+    assert scenario == TcoScenario(seats=100, years=3, growth=0.5, plan="top")
+    assert scenario.seat_schedule() == (100, 150, 225)
+    assert scenario_from_profile({"seats": 7}).seats == 7
+    assert scenario_from_profile({"industry": "retail"}) is None
+    with pytest.raises(ValueError):
+        BudgetPolicy.from_profile({"company_size": "10"})
+
+
+def test_cli_tco_and_budget_filter(sample_environment, tmp_path, capsys):
+    vendors = sample_environment["vendors"]
+    with (vendors / "beta.yml").open("a", encoding="utf-8") as handle:
+        handle.write(
+            "\nplan_names: [Team]\npricing_tco:\n  tiers:\n    Team:\n"
+            "      per_user_per_month: 80\n"
+        )
+    root = ["--vendors-dir", str(vendors), "--criteria", str(sample_environment["criteria"])]
+    out = tmp_path / "tco.json"
+    args = ["tco", "--seats", "10", "20", "--years", "1", "2", "--out", str(out)]
+    assert cli.main(root + args) == 0
+    assert "Beta CRM" in capsys.readouterr().out
+    projections = json.loads(out.read_text())
+    assert projections["vendors"] == ["alpha", "beta"]
+    assert [row["costs"] for row in projections["scenarios"]][0] == [None, 9600.0]
+
+    profile = tmp_path / "budget.yml"
+    profile.write_text("company_size: '10-20'\nbudget_per_user_per_month: 50\n")
+    card = tmp_path / "card.json"
+    args = ["score", "--profile", str(profile), "--budget-mode", "filter"]
+    args += ["--out", str(card), "--md", str(tmp_path / "card.md")]
+    assert cli.main(root + args) == 0
+    assert [entry["slug"] for entry in json.loads(card.read_text())["vendors"]] == ["alpha"]
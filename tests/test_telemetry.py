@@ -0,0 +1,124 @@
+import io
+import json
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.telemetry import DURATION_BUCKETS, Telemetry, read_metrics
+
+
+def _events(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_stages_emit_start_and_end_events():
+    stream = io.StringIO()
+    telemetry = Telemetry("score", events=stream, run_id="run-1")
+    with telemetry.stage("load") as details:
+        details["vendors"] = 3
+    with pytest.raises(RuntimeError):
+        with telemetry.stage("score", normalize="zscore"):
+            raise RuntimeError("boom")
+    telemetry.close("error", exit_code=2)
+
+    events = _events(stream)
+    assert [event["event"] for event in events] == [
+        "run_start",
+        "stage_start",
+        "stage_end",
+        "stage_start",
+        "stage_end",
+        "run_end",
+    ]
+    assert all(event["run"] == "run-1" and event["command"] == "score" for event in events)
+    assert events[2]["vendors"] == 3 and events[2]["status"] == "ok"
+    assert events[4]["status"] == "error" and events[4]["normalize"] == "zscore"
+    assert events[5]["exit_code"] == 2
+
+
+def test_disabled_telemetry_records_nothing(tmp_path):
+    telemetry = Telemetry("score")
+    assert not telemetry.enabled
+    with telemetry.stage("load") as details:
+        details["vendors"] = 1
+    telemetry.count("crm_eval_vendors_loaded_total", 5)
+    telemetry.close("ok")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_metrics_accumulate_across_runs(tmp_path):
+    path = tmp_path / "crm_eval.prom"
+
+    class Cache:
+        hits, misses = 4, 1
+
+    for _ in range(2):
+        telemetry = Telemetry("score", metrics_path=path)
+        telemetry.count("crm_eval_vendors_loaded_total", 10)
+        telemetry.observe("crm_eval_stage_duration_seconds", 0.2, stage='load "x"')
+        telemetry.track_cache("fragments", Cache())
+        telemetry.track_cache("fragments", Cache())
+        telemetry.close("ok")
+
+    text = path.read_text()
+    assert "# TYPE crm_eval_stage_duration_seconds histogram" in text
+    samples = read_metrics(path)
+    score = (("command", "score"),)
+    assert samples[("crm_eval_vendors_loaded_total", score)] == 20
+    assert samples[("crm_eval_runs_total", (*score, ("status", "ok")))] == 2
+    hits = (("cache", "fragments"), *score, ("result", "hit"))
+    assert samples[("crm_eval_cache_requests_total", hits)] == 16
+    stage = (*score, ("stage", 'load "x"'))
+    buckets = [
+        samples[("crm_eval_stage_duration_seconds_bucket", (*score, ("le", f"{b:g}"), stage[1]))]
+        for b in DURATION_BUCKETS
+    ]
+    assert buckets == [0 if bound < 0.2 else 2 for bound in DURATION_BUCKETS]
+    assert samples[("crm_eval_stage_duration_seconds_sum", stage)] == pytest.approx(0.4)
+    assert samples[("crm_eval_stage_duration_seconds_count", stage)] == 2
+
+
+def test_cli_writes_events_and_metrics(sample_environment, tmp_path):
+    events = tmp_path / "events.jsonl"
+    metrics = tmp_path / "metrics.prom"
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"])]
+    root += ["--events", str(events), "--metrics-file", str(metrics)]
+    args = ["score", "--profile", str(sample_environment["profile"])]
+    args += ["--out", str(tmp_path / "card.json"), "--md", str(tmp_path / "card.md")]
+    assert cli.main(root + args) == 0
+
+    lines = [json.loads(line) for line in events.read_text().splitlines()]
+    stages = [line["stage"] for line in lines if line["event"] == "stage_end"]
+    assert stages == ["load", "score", "render"]
+    outputs = [line for line in lines if line["event"] == "output"]
+    assert {line["path"] for line in outputs} == {
+        str(tmp_path / "card.json"),
+        str(tmp_path / "card.md"),
+    }
+    assert lines[-1]["event"] == "run_end" and lines[-1]["status"] == "ok"
+
+    (sample_environment["vendors"] / "broken.yml").write_text("name: [unclosed\n")
+    with pytest.raises(SystemExit):
+        cli.main(root + args)
+    samples = read_metrics(metrics)
+    assert samples[("crm_eval_parse_errors_total", (("command", "score"),))] == 1
+    assert samples[("crm_eval_runs_total", (("command", "score"), ("status", "error")))] == 1
+    assert samples[("crm_eval_vendors_loaded_total", (("command", "score"),))] == 2
+
+
+def test_cli_streamed_writes_report_outputs(sample_environment, tmp_path):
+    metrics = tmp_path / "metrics.prom"
+    root = ["--vendors-dir", str(sample_environment["vendors"])]
+    root += ["--criteria", str(sample_environment["criteria"]), "--metrics-file", str(metrics)]
+    export = tmp_path / "scores.csv"
+    bundle = tmp_path / "catalog.crmb"
+    assert cli.main(root + ["export", "--out", str(export)]) == 0
+    assert cli.main(root + ["bundle", "pack", str(bundle)]) == 0
+
+    samples = read_metrics(metrics)
+    written = [
+        samples[("crm_eval_output_bytes_total", (("command", command),))]
+        for command in ("export", "bundle pack")
+    ]
+    assert written == [export.stat().st_size, bundle.stat().st_size]
@@ -0,0 +1,106 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from crm_eval import cli
+from crm_eval.data import load_criteria, load_profile, load_vendors
+from crm_eval.report import build_scorecard_payload, render_markdown_scorecard
+from crm_eval.scoring import rank_vendors
+from crm_eval.watch import ScoreWatcher
+
+
+def _touch(path: Path, content: str) -> None:
+    stamp = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, ns=(stamp + 10**9, stamp + 10**9))
+
+
+@pytest.fixture
+def watcher(sample_environment, tmp_path: Path) -> ScoreWatcher:
+    return ScoreWatcher(
+        profile_path=sample_environment["profile"],
+        json_out=tmp_path / "out" / "scorecard.json",
+        md_out=tmp_path / "out" / "scorecard.md",
+        criteria_path=sample_environment["criteria"],
+        vendors_dir=sample_environment["vendors"],
+        top=1,
+    )
+
+
+def _expected(env) -> tuple[str, str]:
+    profile = load_profile(env["profile"])
+    criteria = load_criteria(env["criteria"])
+    results = rank_vendors(load_vendors(env["vendors"]), criteria)
+    payload = build_scorecard_payload(profile, results, criteria, shortlist_size=1)
+    markdown = render_markdown_scorecard(profile, results, criteria, shortlist_size=1)
+    return json.dumps(payload, indent=2, sort_keys=True) + "\n", markdown
+
+
+def test_vendor_edit_rescores_one_vendor(watcher, sample_environment):
+    first = watcher.refresh(force=True)
+    assert first.rescored == 2 and len(first.written) == 2
+    assert watcher.refresh() is None
+
+    beta = sample_environment["vendors"] / "beta.yml"
+    _touch(beta, beta.read_text(encoding="utf-8").replace(": 4", ": 5"))
+    update = watcher.refresh()
+    assert update.changed == ("beta.yml",) and update.rescored == 1
+    assert [result.vendor.slug for result in watcher.results] == ["beta", "alpha"]
+
+    expected_json, expected_md = _expected(sample_environment)
+    assert watcher.json_out.read_text(encoding="utf-8") == expected_json
+    assert watcher.md_out.read_text(encoding="utf-8") == expected_md
+
+
+def test_broken_and_removed_files(watcher, sample_environment):
+    watcher.refresh(force=True)
+    vendors_dir = sample_environment["vendors"]
+    _touch(vendors_dir / "alpha.yml", "name: [unclosed")
+    update = watcher.refresh()
+    assert update.errors and update.written == ()
+    assert {result.vendor.slug for result in watcher.results} == {"alpha", "beta"}
+
+    (vendors_dir / "alpha.yml").unlink()
+    watcher.refresh()
+    assert [result.vendor.slug for result in watcher.results] == ["beta"]
+    assert watcher.json_out.read_text(encoding="utf-8") == _expected(sample_environment)[0]
+
+
+def test_criteria_change_rescores_everything(watcher, sample_environment):
+    watcher.refresh(force=True)
+    criteria = sample_environment["criteria"]
+    text = criteria.read_text(encoding="utf-8")
+    text = text.replace("sales_core: 15", "sales_core: 5").replace("service: 7", "service: 17")
+    _touch(criteria, text)
+    update = watcher.refresh()
+    assert update.rescored == 2
+    assert watcher.json_out.read_text(encoding="utf-8") == _expected(sample_environment)[0]
+
+    nested = "sales_core: {weight: 5, metrics: {pipeline: 2, forecasting: 1}}"
+    _touch(criteria, text.replace("sales_core: 5", nested))
+    assert watcher.refresh().rescored == 2
+    expected_json, expected_md = _expected(sample_environment)
+    assert '"category_scores"' in expected_json
+    assert watcher.json_out.read_text(encoding="utf-8") == expected_json
+    assert watcher.md_out.read_text(encoding="utf-8") == expected_md
+
+
+def test_cli_watch_rejects_dedupe(sample_environment, tmp_path: Path):
+    with pytest.raises(SystemExit):
+        cli.main(
+            [
+                "--vendors-dir",
+                str(sample_environment["vendors"]),
+                "--dedupe",
+                "score",
+                "--profile",
+                str(sample_environment["profile"]),
+                "--out",
+                str(tmp_path / "s.json"),
+                "--md",
+                str(tmp_path / "s.md"),
+                "--watch",
+            ]
+        )